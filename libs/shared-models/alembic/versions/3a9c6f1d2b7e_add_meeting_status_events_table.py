@@ -0,0 +1,42 @@
+"""Add append-only meeting_status_events table
+
+Revision ID: 3a9c6f1d2b7e
+Revises: 5befe308fa8b
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '3a9c6f1d2b7e'
+down_revision = '5befe308fa8b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'meeting_status_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('from_status', sa.String(length=50), nullable=True),
+        sa.Column('to_status', sa.String(length=50), nullable=False),
+        sa.Column('source', sa.String(length=50), nullable=True),
+        sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_meeting_status_events_id'), 'meeting_status_events', ['id'], unique=False)
+    op.create_index('ix_meeting_status_events_meeting_id_id', 'meeting_status_events', ['meeting_id', 'id'], unique=False)
+    # Existing data['status_transition'] lists are left in place and read as the
+    # history preceding the first event, so no meeting rows are rewritten here.
+
+
+def downgrade() -> None:
+    op.drop_index('ix_meeting_status_events_meeting_id_id', table_name='meeting_status_events')
+    op.drop_index(op.f('ix_meeting_status_events_id'), table_name='meeting_status_events')
+    op.drop_table('meeting_status_events')
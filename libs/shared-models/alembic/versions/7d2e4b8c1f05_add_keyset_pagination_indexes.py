@@ -0,0 +1,35 @@
+"""Add (created_at, id) indexes for keyset pagination of meetings and users
+
+Revision ID: 7d2e4b8c1f05
+Revises: 3a9c6f1d2b7e
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2e4b8c1f05'
+down_revision = '3a9c6f1d2b7e'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_meeting_user_created_at_id', 'meetings', ['user_id', 'created_at', 'id']),
+    ('ix_meeting_created_at_id', 'meetings', ['created_at', 'id']),
+    ('ix_user_created_at_id', 'users', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    # Built concurrently so listings and writes are not blocked on large tables
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,104 @@
+"""Per-stage latency histograms for the live transcription path.
+
+Segments carry a ``trace`` dict (session uid, audio sample offset and wall-clock
+stage timestamps in epoch seconds) from WhisperLive through the
+transcription-collector to the api-gateway. Each service records the hops it
+can observe into the process-wide ``stage_latency`` recorder and exposes
+``stage_latency.snapshot()`` on its metrics endpoint.
+"""
+import os
+import threading
+from typing import Dict, List, Optional
+
+# Upper bounds in milliseconds; the last bucket is open-ended
+DEFAULT_BUCKETS_MS: List[float] = [5, 10, 25, 50, 100, 250, 500, 1000, 1500, 2000, 3000, 5000, 10000, 30000]
+
+LATENCY_SLO_MS = float(os.environ.get("LATENCY_SLO_MS", "2000"))
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of latencies in milliseconds."""
+
+    def __init__(self, buckets_ms: Optional[List[float]] = None):
+        self.bounds = list(buckets_ms or DEFAULT_BUCKETS_MS)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self.over_slo = 0
+
+    def observe(self, value_ms: float) -> None:
+        value_ms = max(0.0, value_ms)
+        idx = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value_ms <= bound:
+                idx = i
+                break
+        self.counts[idx] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+        if value_ms > LATENCY_SLO_MS:
+            self.over_slo += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Bucket upper bound containing the q-quantile (max observed for the open bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict:
+        buckets = {f"le_{b:g}": c for b, c in zip(self.bounds, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 2) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 2),
+            "over_slo": self.over_slo,
+            "buckets": buckets,
+        }
+
+
+class StageLatencyRecorder:
+    """Thread-safe collection of named stage histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def observe(self, stage: str, seconds: Optional[float]) -> None:
+        if seconds is None:
+            return
+        with self._lock:
+            hist = self._histograms.get(stage)
+            if hist is None:
+                hist = self._histograms[stage] = LatencyHistogram()
+            hist.observe(seconds * 1000.0)
+
+    def observe_between(self, stage: str, start_ts: Optional[float], end_ts: Optional[float]) -> None:
+        """Record end_ts - start_ts (epoch seconds) if both stamps are present."""
+        if start_ts is None or end_ts is None:
+            return
+        try:
+            self.observe(stage, float(end_ts) - float(start_ts))
+        except (TypeError, ValueError):
+            return
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "slo_ms": LATENCY_SLO_MS,
+                "stages": {name: hist.snapshot() for name, hist in sorted(self._histograms.items())},
+            }
+
+
+stage_latency = StageLatencyRecorder()
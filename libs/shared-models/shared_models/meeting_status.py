@@ -0,0 +1,68 @@
+"""
+Meeting status history stored in the append-only ``meeting_status_events`` table.
+
+Writers insert one event per transition instead of rewriting ``meetings.data``.
+Readers rebuild the ``data['status_transition']`` list that API and webhook
+payloads expose: legacy entries already stored in ``data``, then the events.
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Meeting, MeetingStatusEvent
+
+
+def status_event_to_transition(event: MeetingStatusEvent) -> Dict[str, Any]:
+    """Render an event in the legacy ``status_transition`` entry format."""
+    entry: Dict[str, Any] = {
+        'from': event.from_status,
+        'to': event.to_status,
+        'timestamp': event.created_at.isoformat() if event.created_at else None,
+        'source': event.source,
+    }
+    for k, v in (event.details or {}).items():
+        if k not in entry:
+            entry[k] = v
+    return entry
+
+
+async def load_status_transitions(db: AsyncSession, meeting_ids: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """Transitions recorded as events for each meeting, oldest first (one query)."""
+    ids = list(set(meeting_ids))
+    if not ids:
+        return {}
+    result = await db.execute(
+        select(MeetingStatusEvent)
+        .where(MeetingStatusEvent.meeting_id.in_(ids))
+        .order_by(MeetingStatusEvent.meeting_id, MeetingStatusEvent.id)
+    )
+    transitions: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for event in result.scalars().all():
+        transitions[event.meeting_id].append(status_event_to_transition(event))
+    return transitions
+
+
+def merge_status_transitions(data: Optional[Dict[str, Any]], transitions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Copy of ``data`` whose ``status_transition`` is the legacy list followed by ``transitions``."""
+    merged = dict(data or {})
+    if not transitions:
+        return merged
+    legacy = merged.get('status_transition')
+    if isinstance(legacy, dict):
+        legacy = [legacy]
+    elif not isinstance(legacy, list):
+        legacy = []
+    merged['status_transition'] = list(legacy) + transitions
+    return merged
+
+
+async def meeting_data_with_transitions(db: AsyncSession, meetings: Iterable[Meeting]) -> Dict[int, Dict[str, Any]]:
+    """``data`` with the full status history for each meeting, keyed by meeting id.
+
+    Returns copies; the ORM objects are not modified (so nothing is written back).
+    """
+    meetings = list(meetings)
+    transitions = await load_status_transitions(db, [m.id for m in meetings])
+    return {m.id: merge_status_transitions(m.data, transitions.get(m.id, [])) for m in meetings}
@@ -23,6 +23,9 @@ class User(Base):
     meetings = relationship("Meeting", back_populates="user")
     api_tokens = relationship("APIToken", back_populates="user")
 
+    # Keyset pagination of admin listings (shared_models.pagination)
+    __table_args__ = (Index('ix_user_created_at_id', 'created_at', 'id'),)
+
 class APIToken(Base):
     __tablename__ = "api_tokens"
     id = Column(Integer, primary_key=True, index=True) # Added index=True
@@ -61,6 +64,9 @@ class Meeting(Base):
             'created_at' # Include created_at because the query orders by it
         ),
         Index('ix_meeting_data_gin', 'data', postgresql_using='gin'),
+        # Keyset pagination (shared_models.pagination): per-user and global listings
+        Index('ix_meeting_user_created_at_id', 'user_id', 'created_at', 'id'),
+        Index('ix_meeting_created_at_id', 'created_at', 'id'),
         # Optional: Unique constraint (uncomment if needed, ensure native_meeting_id cannot be NULL if unique)
         # UniqueConstraint('user_id', 'platform', 'platform_specific_id', name='_user_platform_native_id_uc'),
     )
@@ -100,6 +106,20 @@ class Transcription(Base):
     # Index for efficient querying by meeting_id and start_time
     __table_args__ = (Index('ix_transcription_meeting_start', 'meeting_id', 'start_time'),)
 
+# Append-only log of meeting status changes (one row per transition)
+class MeetingStatusEvent(Base):
+    __tablename__ = 'meeting_status_events'
+    id = Column(Integer, primary_key=True, index=True)
+    meeting_id = Column(Integer, ForeignKey('meetings.id', ondelete='CASCADE'), nullable=False)
+    from_status = Column(String(50), nullable=True)
+    to_status = Column(String(50), nullable=False)
+    source = Column(String(50), nullable=True)
+    details = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"), default=lambda: {})  # reason, completion_reason, failure_stage, error_details, extra metadata
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # Transitions are always read per meeting in insertion order
+    __table_args__ = (Index('ix_meeting_status_events_meeting_id_id', 'meeting_id', 'id'),)
+
 # New table to store session start times
 class MeetingSession(Base):
     __tablename__ = 'meeting_sessions'
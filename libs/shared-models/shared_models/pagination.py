@@ -0,0 +1,83 @@
+"""
+Keyset pagination over ``(created_at, id)``, newest first.
+
+Pages are fetched with ``WHERE (created_at, id) < (:cursor_created_at, :cursor_id)
+ORDER BY created_at DESC, id DESC LIMIT n+1``, which a composite
+``(..., created_at, id)`` index answers by reading only the page, however deep
+the client has paged. The cursor is an opaque url-safe token; clients pass back
+the ``next_cursor`` of the previous page.
+
+Rows whose ``created_at`` is NULL sort first (PostgreSQL's default for DESC)
+and are paged by id alone.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, or_, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+
+class Cursor(NamedTuple):
+    created_at: Optional[datetime]
+    id: int
+
+
+def encode_cursor(created_at: Optional[datetime], id: int) -> str:
+    raw = json.dumps([created_at.isoformat() if created_at else None, id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Parse a token from ``encode_cursor``; raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_at, id = json.loads(raw)
+        return Cursor(datetime.fromisoformat(created_at) if created_at else None, int(id))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+def keyset_paginate(stmt: Select, created_col, id_col, cursor: Optional[str], limit: int) -> Select:
+    """
+    Order ``stmt`` newest first and restrict it to the page after ``cursor``.
+
+    Fetches ``limit + 1`` rows so ``split_page`` can tell whether another page exists.
+    Raises ValueError for a malformed cursor.
+    """
+    if cursor:
+        after = decode_cursor(cursor)
+        if after.created_at is None:
+            stmt = stmt.where(or_(and_(created_col.is_(None), id_col < after.id), created_col.isnot(None)))
+        else:
+            stmt = stmt.where(tuple_(created_col, id_col) < (after.created_at, after.id))
+    return stmt.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def split_page(
+    rows: Sequence[Any],
+    limit: int,
+    key: Callable[[Any], Tuple[Optional[datetime], int]] = lambda r: (r.created_at, r.id),
+) -> Tuple[List[Any], Optional[str]]:
+    """(rows of this page, cursor of the next page or None) from a ``keyset_paginate`` result."""
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(*key(page[-1]))
+
+
+async def estimated_row_count(db: AsyncSession, model) -> int:
+    """
+    Planner estimate of a table's row count (``pg_class.reltuples``) instead of ``count(*)``.
+
+    Falls back to an exact count for tables that were never analyzed.
+    """
+    estimate = (await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": model.__tablename__},
+    )).scalar()
+    if estimate is not None and estimate >= 0:
+        return int(estimate)
+    return (await db.execute(select(func.count()).select_from(model))).scalar_one()
@@ -578,6 +578,7 @@ class ErrorResponse(BaseModel):
 
 class MeetingListResponse(BaseModel):
     meetings: List[MeetingResponse] 
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page; null on the last page")
 
 # --- ADD Bot Status Schemas ---
 class BotStatus(BaseModel):
@@ -0,0 +1,73 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from whisper_live.audio_archive import (
+    AudioArchive,
+    AudioArchiveReader,
+    INDEX_DTYPE,
+    SAMPLE_RATE,
+    list_sessions,
+    session_paths,
+)
+
+
+class TestAudioArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        rng = np.random.default_rng(0)
+        self.audio = (0.3 * rng.standard_normal(int(7.3 * SAMPLE_RATE))).astype(np.float32)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def archive_session(self, codec, chunk=4096, drop=None):
+        archive = AudioArchive(root=self.root, codec=codec, block_s=2.0)
+        archive.open_session(42, "uid-1", platform="google_meet")
+        for i, start in enumerate(range(0, len(self.audio), chunk)):
+            if drop is not None and i == drop:
+                continue
+            archive.append("uid-1", self.audio[start:start + chunk], start)
+        archive.close_session("uid-1")
+        archive.flush(timeout=10)
+
+    def assert_close(self, actual, expected):
+        self.assertEqual(actual.shape, expected.shape)
+        self.assertLess(np.max(np.abs(actual - np.clip(expected, -1, 1))), 1.0 / 16000)
+
+    def test_pcm16_roundtrip_and_range_reads(self):
+        self.archive_session("pcm16")
+        _, data_path, index_path = session_paths(self.root, 42, "uid-1")
+        self.assertEqual(os.path.getsize(data_path), len(self.audio) * 2)
+        self.assertEqual(len(np.fromfile(index_path, dtype=INDEX_DTYPE)), 4)
+
+        with AudioArchiveReader(self.root, 42, "uid-1") as reader:
+            self.assertAlmostEqual(reader.duration_s, len(self.audio) / SAMPLE_RATE)
+            self.assert_close(reader.read(), self.audio)
+            self.assert_close(reader.read(1.5, 4.25), self.audio[int(1.5 * SAMPLE_RATE):int(4.25 * SAMPLE_RATE)])
+            self.assertEqual(reader.read(100.0, 101.0).shape[0], 0)
+        self.assertEqual([s["session_uid"] for s in list_sessions(self.root, 42)], ["uid-1"])
+
+    def test_dropped_chunk_reads_as_silence(self):
+        self.archive_session("pcm16", chunk=8000, drop=3)
+        expected = self.audio.copy()
+        expected[24000:32000] = 0.0
+        with AudioArchiveReader(self.root, 42, "uid-1") as reader:
+            self.assert_close(reader.read(), expected)
+
+    @unittest.skipUnless(importlib.util.find_spec("soundfile"), "soundfile not installed")
+    def test_flac_roundtrip_is_smaller(self):
+        self.audio = (0.3 * np.sin(2 * np.pi * 220 * np.arange(len(self.audio)) / SAMPLE_RATE)).astype(np.float32)
+        self.archive_session("flac")
+        _, data_path, _ = session_paths(self.root, 42, "uid-1")
+        self.assertLess(os.path.getsize(data_path), len(self.audio) * 2)
+        with AudioArchiveReader(self.root, 42, "uid-1") as reader:
+            self.assert_close(reader.read(), self.audio)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import threading
+import unittest
+
+import numpy as np
+from faster_whisper.audio import decode_audio
+
+from whisper_live.vad import WINDOW_SAMPLES, BatchedVadEngine, VoiceActivityDetection, VoiceActivityDetector
+
+CLIP = os.path.join(os.path.dirname(__file__), "..", "assets", "jfk.flac")
+
+
+class TestBatchedVadEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        audio = decode_audio(CLIP)
+        cls.windows = audio[:len(audio) // WINDOW_SAMPLES * WINDOW_SAMPLES].reshape(-1, WINDOW_SAMPLES)
+        cls.engine = BatchedVadEngine(max_batch=2)
+
+    def per_client_probs(self, windows):
+        model = VoiceActivityDetection()
+        return np.array([model(window, 16000)[0, 0] for window in windows], dtype=np.float32)
+
+    def test_batched_matches_per_client(self):
+        # Streams of different lengths and offsets, scored concurrently, so runs mix
+        # streams at different positions and exceed max_batch
+        streams = {
+            "a": self.windows,
+            "b": self.windows[40:],
+            "c": self.windows[::-1].copy(),
+        }
+        results = {}
+
+        def submit(stream_id, windows):
+            # Two calls per stream: state and context must carry over between them
+            half = len(windows) // 2
+            results[stream_id] = np.concatenate([
+                self.engine.score(stream_id, windows[:half]),
+                self.engine.score(stream_id, windows[half:]),
+            ])
+
+        threads = [threading.Thread(target=submit, args=item) for item in streams.items()]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for stream_id, windows in streams.items():
+            np.testing.assert_allclose(results[stream_id], self.per_client_probs(windows), atol=1e-5)
+            self.engine.release(stream_id)
+
+    def test_short_frames_repeat_last_result(self):
+        detector = VoiceActivityDetector(engine=self.engine)
+        speech = self.windows[20:24].reshape(-1)
+        self.assertTrue(detector(speech))
+
+        scored = self.engine.stats()["windows_scored"]
+        silence = np.zeros(WINDOW_SAMPLES, dtype=np.float32)
+        self.assertTrue(detector(silence[:300]))
+        self.assertEqual(self.engine.stats()["windows_scored"], scored)
+
+        # The carried-over samples complete a window on the next call
+        self.assertFalse(detector(silence[300:]))
+        self.assertEqual(self.engine.stats()["windows_scored"], scored + 1)
+        detector.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+from faster_whisper.feature_extractor import FeatureExtractor
+
+from whisper_live.feature_cache import StreamingFeatureCache
+
+
+class TestStreamingFeatureCache(unittest.TestCase):
+    def setUp(self):
+        self.fe = FeatureExtractor()
+        rng = np.random.default_rng(0)
+        self.audio = (0.1 * rng.standard_normal(16000 * 12)).astype(np.float32)
+
+    def assert_matches(self, cache, offset, end, skip=0):
+        window = self.audio[offset:end]
+        expected = self.fe(window)
+        actual = cache.features(window, offset)
+        self.assertEqual(actual.shape, expected.shape)
+        np.testing.assert_allclose(actual[:, skip:], expected[:, skip:], atol=1e-3)
+
+    def test_growing_buffer_matches_feature_extractor(self):
+        cache = StreamingFeatureCache(self.fe)
+        for end in range(16000, len(self.audio) + 1, 8000 + 37):
+            self.assert_matches(cache, 0, end)
+        self.assertGreater(cache.reused_frames, 0)
+
+    def test_advancing_offset_matches_feature_extractor(self):
+        cache = StreamingFeatureCache(self.fe)
+        hop = self.fe.hop_length
+        # Frames whose window reaches left of the offset see real audio instead of reflect padding
+        edge = -(-(self.fe.n_fft // 2) // hop)
+        for step, end in enumerate(range(32000, len(self.audio) + 1, 16000)):
+            self.assert_matches(cache, step * 50 * hop, end, skip=edge if step else 0)
+
+    def test_discontinuity_resets_cache(self):
+        cache = StreamingFeatureCache(self.fe)
+        self.assert_matches(cache, 0, 32000)
+        self.audio = self.audio[::-1].copy()
+        self.assert_matches(cache, 0, 48000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import json
+import unittest
+import urllib.error
+import urllib.request
+
+from whisper_live.server import ClientManager, TranscriptionServer
+
+
+class TestHealthServer(unittest.TestCase):
+    def setUp(self):
+        self.server = TranscriptionServer()
+        self.server.client_manager = ClientManager(max_clients=4, max_connection_time=600)
+        self.server.start_health_check_server("127.0.0.1", 0)
+        self.base = "http://127.0.0.1:%d" % self.server.health_server.server_address[1]
+
+    def tearDown(self):
+        self.server.health_server.shutdown()
+        self.server.health_server.server_close()
+
+    def get(self, path):
+        try:
+            with urllib.request.urlopen(self.base + path, timeout=5) as resp:
+                return resp.status, resp.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def test_ready_reports_startup_phases(self):
+        with self.server.startup.phase("load", device="cpu"):
+            pass
+        status, body = self.get("/ready")
+        self.assertEqual(status, 503)
+        snapshot = json.loads(body)
+        self.assertFalse(snapshot["ready"])
+        self.assertEqual([p["name"] for p in snapshot["phases"]], ["load"])
+
+        self.server.startup.mark_ready()
+        self.server.is_healthy = True
+        status, body = self.get("/ready")
+        self.assertEqual(status, 200)
+        self.assertTrue(json.loads(body)["ready"])
+
+    def test_metrics_is_json(self):
+        status, body = self.get("/metrics")
+        self.assertEqual(status, 200)
+        self.assertIn("current_sessions", json.loads(body))
+
+
+if __name__ == "__main__":
+    unittest.main()
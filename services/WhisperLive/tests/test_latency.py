@@ -0,0 +1,42 @@
+import importlib.util
+import os
+import unittest
+
+from whisper_live import latency
+
+SHARED_LATENCY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "libs", "shared-models", "shared_models", "latency.py"
+)
+
+
+def load_shared_latency():
+    # Loaded from its file: the shared_models package needs database settings on import
+    spec = importlib.util.spec_from_file_location("shared_models_latency", SHARED_LATENCY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@unittest.skipUnless(os.path.exists(SHARED_LATENCY), "shared_models is not checked out next to WhisperLive")
+class TestVendoredLatency(unittest.TestCase):
+    def test_snapshots_match_shared_models(self):
+        shared = load_shared_latency()
+        self.assertEqual(latency.DEFAULT_BUCKETS_MS, shared.DEFAULT_BUCKETS_MS)
+        self.assertEqual(latency.LATENCY_SLO_MS, shared.LATENCY_SLO_MS)
+
+        ours, theirs = latency.StageLatencyRecorder(), shared.StageLatencyRecorder()
+        for recorder in (ours, theirs):
+            for i, seconds in enumerate([0.0, 0.004, 0.12, 0.75, 1.9, 2.5, 45.0, -1.0, None]):
+                recorder.observe("receive_to_transcribed", seconds)
+                recorder.observe_between("capture_to_receive", 1000.0, 1000.0 + (seconds or 0) * i)
+            recorder.observe_between("transcribed_to_xadd", None, 1000.0)
+            recorder.observe_between("transcribed_to_xadd", "bad", 1000.0)
+            recorder.observe("empty_stage_never_created", None)
+
+        snapshot = ours.snapshot()
+        self.assertEqual(snapshot, theirs.snapshot())
+        self.assertEqual(sorted(snapshot["stages"]), ["capture_to_receive", "receive_to_transcribed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from whisper_live.audio_archive import AudioArchive, AudioArchiveReader, SAMPLE_RATE
+from whisper_live.retranscribe import iter_windows, quiet_cut, transcribe_meeting
+
+
+class FakePipeline:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((len(audio), kwargs))
+        seconds = len(audio) / SAMPLE_RATE
+        segments = [SimpleNamespace(start=0.5, end=seconds - 0.5, text=" hello "), SimpleNamespace(start=0, end=0, text=" ")]
+        return iter(segments), SimpleNamespace(language="en")
+
+
+class TestRetranscribe(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        rng = np.random.default_rng(0)
+        self.audio = (0.3 * rng.standard_normal(25 * SAMPLE_RATE)).astype(np.float32)
+        # Silence at 7.0-7.2 s is where the first 10 s window should be cut
+        self.audio[7 * SAMPLE_RATE:int(7.2 * SAMPLE_RATE)] = 0.0
+        archive = AudioArchive(root=self.root, codec="pcm16", block_s=5.0)
+        archive.open_session(7, "uid-1", language=None, task="transcribe")
+        archive.append("uid-1", self.audio, 0)
+        archive.close_session("uid-1")
+        archive.flush(timeout=10)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_quiet_cut_finds_silence(self):
+        cut = quiet_cut(self.audio[:10 * SAMPLE_RATE])
+        self.assertTrue(7 * SAMPLE_RATE <= cut <= int(7.2 * SAMPLE_RATE))
+
+    def test_windows_cover_session_without_overlap(self):
+        with AudioArchiveReader(self.root, 7, "uid-1") as reader:
+            windows = list(iter_windows(reader, 10.0))
+        self.assertGreater(len(windows), 2)
+        self.assertEqual(sum(len(a) for _, a in windows), len(self.audio))
+        for (start, audio), (next_start, _) in zip(windows, windows[1:]):
+            self.assertAlmostEqual(start + len(audio) / SAMPLE_RATE, next_start)
+
+    def test_segments_are_offset_to_session_time(self):
+        pipeline = FakePipeline()
+        result = transcribe_meeting(pipeline, self.root, "7", batch_size=4, window_s=10.0)
+        self.assertEqual(result["meeting_id"], 7)
+        session = result["sessions"][0]
+        self.assertEqual(session["session_uid"], "uid-1")
+        self.assertEqual(session["language"], "en")
+        segments = session["segments"]
+        self.assertEqual(len(segments), len(pipeline.calls))
+        self.assertEqual(segments[0]["start"], 0.5)
+        self.assertEqual(segments[0]["text"], "hello")
+        self.assertTrue(all(a["end"] < b["start"] for a, b in zip(segments, segments[1:])))
+        self.assertEqual(pipeline.calls[0][1]["batch_size"], 4)
+        # Language detected on the first window is forced for the rest
+        self.assertEqual(pipeline.calls[1][1]["language"], "en")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import unittest
+
+import numpy as np
+from faster_whisper.audio import decode_audio
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+from whisper_live.streaming_vad import WINDOW_SAMPLES, StreamingSpeechTimeline
+
+CLIP = os.path.join(os.path.dirname(__file__), "..", "assets", "jfk.flac")
+
+
+class TestStreamingSpeechTimeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        audio = decode_audio(CLIP)
+        # Whole windows only: the timeline leaves a trailing partial window unscored
+        cls.audio = audio[:len(audio) // WINDOW_SAMPLES * WINDOW_SAMPLES]
+        cls.options = VadOptions(min_silence_duration_ms=300)
+
+    def test_whole_clip_matches_get_speech_timestamps(self):
+        expected = get_speech_timestamps(self.audio, self.options)
+        self.assertGreater(len(expected), 1)
+        timeline = StreamingSpeechTimeline()
+        self.assertEqual(timeline.speech_chunks(self.audio, 0, self.options), expected)
+
+    def test_growing_buffer_scores_each_window_once(self):
+        timeline = StreamingSpeechTimeline()
+        step = 10 * WINDOW_SAMPLES + 100
+        for end in range(step, len(self.audio), step):
+            timeline.speech_chunks(self.audio[:end], 0, self.options)
+        chunks = timeline.speech_chunks(self.audio, 0, self.options)
+        self.assertEqual(chunks, get_speech_timestamps(self.audio, self.options))
+        self.assertEqual(timeline.scored_windows, len(self.audio) // WINDOW_SAMPLES)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,302 @@
+"""Per-meeting audio archive: every session's PCM, compressed, with a time index.
+
+The live buffer (``frames_np``) keeps at most ``max_buffer_s`` of audio, so once
+clipped a bad transcript cannot be re-run. With ``WL_AUDIO_ARCHIVE_ENABLED`` each
+client's audio is also appended to an archive written by one background thread,
+off the decode path (``append`` only enqueues; a full queue drops and counts).
+
+Layout, per session (``client_uid``, the collector's ``session_uid``)::
+
+    {WL_AUDIO_ARCHIVE_DIR}/{meeting_id}/{session_uid}.json   metadata
+    {WL_AUDIO_ARCHIVE_DIR}/{meeting_id}/{session_uid}.pcm    concatenated blocks
+    {WL_AUDIO_ARCHIVE_DIR}/{meeting_id}/{session_uid}.idx    one INDEX_DTYPE record per block
+
+Blocks hold ``WL_AUDIO_ARCHIVE_BLOCK_S`` seconds of 16 kHz mono audio as FLAC
+(16-bit; via soundfile) or raw little-endian int16 when FLAC is unavailable or
+disabled. Block sample offsets are stream positions, so archive time equals the
+segment ``start``/``end`` times the server sends for that session.
+``AudioArchiveReader`` memory-maps both files and decodes only the blocks that
+overlap a requested time range.
+"""
+import io
+import json
+import logging
+import mmap
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def _env_bool(name, default):
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+WL_AUDIO_ARCHIVE_ENABLED = _env_bool("WL_AUDIO_ARCHIVE_ENABLED", "false")
+WL_AUDIO_ARCHIVE_DIR = os.getenv("WL_AUDIO_ARCHIVE_DIR", "/data/audio-archive")
+WL_AUDIO_ARCHIVE_CODEC = os.getenv("WL_AUDIO_ARCHIVE_CODEC", "flac").strip().lower()  # flac | pcm16
+WL_AUDIO_ARCHIVE_BLOCK_S = float(os.getenv("WL_AUDIO_ARCHIVE_BLOCK_S", "10"))
+# Chunks waiting for the writer thread; beyond this, audio is dropped rather than stalling clients
+WL_AUDIO_ARCHIVE_QUEUE_MAX = int(os.getenv("WL_AUDIO_ARCHIVE_QUEUE_MAX", "20000"))
+
+SAMPLE_RATE = 16000
+CODEC_PCM16 = 0
+CODEC_FLAC = 1
+INDEX_DTYPE = np.dtype([
+    ("start_sample", "<i8"),   # stream sample offset of the block's first sample
+    ("n_samples", "<u4"),
+    ("offset", "<u8"),         # byte offset in the .pcm file
+    ("length", "<u4"),         # encoded bytes
+    ("codec", "u1"),
+    ("wall_ts", "<f8"),        # server time the block's first chunk was received
+])
+
+
+def session_paths(root: str, meeting_id, session_uid: str) -> Tuple[str, str, str]:
+    base = os.path.join(root, str(meeting_id), str(session_uid))
+    return base + ".json", base + ".pcm", base + ".idx"
+
+
+def _to_int16(samples: np.ndarray) -> np.ndarray:
+    return (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+
+
+def _encode_block(pcm: np.ndarray, codec: int) -> Tuple[bytes, int]:
+    """(encoded bytes, codec actually used) for an int16 block."""
+    if codec == CODEC_FLAC:
+        try:
+            import soundfile as sf
+            buf = io.BytesIO()
+            sf.write(buf, pcm, SAMPLE_RATE, format="FLAC", subtype="PCM_16")
+            return buf.getvalue(), CODEC_FLAC
+        except Exception as e:
+            logging.debug(f"AUDIO_ARCHIVE: FLAC encode unavailable, storing PCM16: {e}")
+    return pcm.tobytes(), CODEC_PCM16
+
+
+def _decode_block(data, codec: int) -> np.ndarray:
+    """float32 samples of one stored block."""
+    if codec == CODEC_FLAC:
+        import soundfile as sf
+        pcm, _ = sf.read(io.BytesIO(bytes(data)), dtype="int16")
+    else:
+        pcm = np.frombuffer(data, dtype="<i2")
+    return pcm.astype(np.float32) / 32767.0
+
+
+class _SessionWriter:
+    """Open files and pending samples of one session; used only on the writer thread."""
+
+    def __init__(self, root: str, meeting_id, session_uid: str, meta: dict, codec: int):
+        meta_path, data_path, index_path = session_paths(root, meeting_id, session_uid)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        self.codec = codec
+        self.data = open(data_path, "ab")
+        self.index = open(index_path, "ab")
+        self.offset = self.data.tell()
+        # Resume the stream position after a previous writer of this session (server restart)
+        self.next_sample = 0
+        if self.index.tell() >= INDEX_DTYPE.itemsize:
+            last = np.fromfile(index_path, dtype=INDEX_DTYPE)[-1]
+            self.next_sample = int(last["start_sample"]) + int(last["n_samples"])
+        self.pending: List[np.ndarray] = []
+        self.pending_samples = 0
+        self.pending_wall_ts: Optional[float] = None
+        if not os.path.exists(meta_path):
+            with open(meta_path, "w") as f:
+                json.dump({**meta, "sample_rate": SAMPLE_RATE, "created_at": time.time()}, f)
+
+    def add(self, samples: np.ndarray, start_sample: int, wall_ts: float, block_samples: int):
+        if start_sample != self.next_sample + self.pending_samples:
+            # Discontinuity (chunks dropped on a full queue): close the block, restart at the new position
+            self.flush(block_samples, final=True)
+            self.next_sample = start_sample
+        if self.pending_wall_ts is None:
+            self.pending_wall_ts = wall_ts
+        self.pending.append(_to_int16(samples))
+        self.pending_samples += samples.shape[0]
+
+    def flush(self, block_samples: int, final: bool = False):
+        """Write out every full block (and the remainder when ``final``)."""
+        if not self.pending:
+            return
+        pcm = np.concatenate(self.pending)
+        written = 0
+        while pcm.shape[0] - written >= block_samples or (final and written < pcm.shape[0]):
+            block = pcm[written:written + block_samples]
+            encoded, codec = _encode_block(block, self.codec)
+            record = np.array(
+                [(self.next_sample, block.shape[0], self.offset, len(encoded), codec, self.pending_wall_ts or time.time())],
+                dtype=INDEX_DTYPE,
+            )
+            self.data.write(encoded)
+            self.data.flush()
+            # Index after data, so a reader never sees a record for bytes not yet written
+            self.index.write(record.tobytes())
+            self.index.flush()
+            self.offset += len(encoded)
+            self.next_sample += block.shape[0]
+            written += block.shape[0]
+            self.pending_wall_ts = None
+        rest = pcm[written:]
+        self.pending = [rest] if rest.shape[0] else []
+        self.pending_samples = rest.shape[0]
+
+    def close(self):
+        self.data.close()
+        self.index.close()
+
+
+class AudioArchive:
+    """Background writer shared by all clients of a server."""
+
+    def __init__(self, root: str = WL_AUDIO_ARCHIVE_DIR, codec: str = WL_AUDIO_ARCHIVE_CODEC,
+                 block_s: float = WL_AUDIO_ARCHIVE_BLOCK_S, queue_max: int = WL_AUDIO_ARCHIVE_QUEUE_MAX):
+        self.root = root
+        self.codec = CODEC_FLAC if codec == "flac" else CODEC_PCM16
+        self.block_samples = max(1, int(block_s * SAMPLE_RATE))
+        self.queue = queue.Queue(maxsize=queue_max)
+        self.dropped_chunks = 0
+        self._sessions: Dict[str, _SessionWriter] = {}
+        self._thread = threading.Thread(target=self._run, name="audio-archive", daemon=True)
+        self._thread.start()
+        logging.info(f"AUDIO_ARCHIVE: writing to {root} (codec={codec}, block={block_s}s)")
+
+    def _put(self, item) -> bool:
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped_chunks += 1
+            if self.dropped_chunks % 100 == 1:
+                logging.warning(f"AUDIO_ARCHIVE: writer queue full, dropped {self.dropped_chunks} chunks so far")
+            return False
+
+    def open_session(self, meeting_id, session_uid: str, **meta):
+        # Once per connection, so never dropped; later appends are ignored without it
+        self.queue.put(("open", session_uid, (meeting_id, meta)))
+
+    def append(self, session_uid: str, samples: np.ndarray, start_sample: int):
+        """Queue float32 samples starting at stream sample ``start_sample``; never blocks the caller."""
+        self._put(("append", session_uid, (samples, start_sample, time.time())))
+
+    def close_session(self, session_uid: str):
+        # Must not be dropped, or the session's last block and file handles would leak
+        self.queue.put(("close", session_uid, None))
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until everything queued so far has been written (tests, shutdown)."""
+        done = threading.Event()
+        self.queue.put(("barrier", None, done))
+        done.wait(timeout)
+
+    def _run(self):
+        while True:
+            op, session_uid, payload = self.queue.get()
+            try:
+                if op == "append":
+                    writer = self._sessions.get(session_uid)
+                    if writer is not None:
+                        writer.add(*payload, self.block_samples)
+                        if writer.pending_samples >= self.block_samples:
+                            writer.flush(self.block_samples)
+                elif op == "open":
+                    if session_uid not in self._sessions:
+                        meeting_id, meta = payload
+                        self._sessions[session_uid] = _SessionWriter(
+                            self.root, meeting_id, session_uid,
+                            {"meeting_id": meeting_id, "session_uid": session_uid, **meta}, self.codec,
+                        )
+                elif op == "close":
+                    writer = self._sessions.pop(session_uid, None)
+                    if writer is not None:
+                        writer.flush(self.block_samples, final=True)
+                        writer.close()
+                elif op == "barrier":
+                    payload.set()
+            except Exception as e:
+                logging.error(f"AUDIO_ARCHIVE: {op} failed for session {session_uid}: {e}", exc_info=True)
+
+
+_archive: Optional[AudioArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_audio_archive() -> Optional[AudioArchive]:
+    """The process-wide archive writer, or None when archiving is disabled."""
+    global _archive
+    if not WL_AUDIO_ARCHIVE_ENABLED:
+        return None
+    with _archive_lock:
+        if _archive is None:
+            _archive = AudioArchive()
+        return _archive
+
+
+class AudioArchiveReader:
+    """Random access by time range to one archived session."""
+
+    def __init__(self, root: str, meeting_id, session_uid: str):
+        meta_path, data_path, index_path = session_paths(root, meeting_id, session_uid)
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+        self.sample_rate = int(self.meta.get("sample_rate", SAMPLE_RATE))
+        self.index = np.fromfile(index_path, dtype=INDEX_DTYPE)
+        self._file = open(data_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def duration_s(self) -> float:
+        if not len(self.index):
+            return 0.0
+        last = self.index[-1]
+        return (int(last["start_sample"]) + int(last["n_samples"])) / self.sample_rate
+
+    def read(self, start_s: float = 0.0, end_s: Optional[float] = None) -> np.ndarray:
+        """float32 samples for [start_s, end_s) in session stream time; gaps read as silence."""
+        lo = max(0, int(start_s * self.sample_rate))
+        hi = int(end_s * self.sample_rate) if end_s is not None else None
+        starts = self.index["start_sample"]
+        ends = starts + self.index["n_samples"].astype(np.int64)
+        mask = ends > lo if hi is None else (ends > lo) & (starts < hi)
+        parts = []
+        pos = lo
+        for rec in self.index[mask]:
+            block = _decode_block(self._data[int(rec["offset"]):int(rec["offset"]) + int(rec["length"])], int(rec["codec"]))
+            first = int(rec["start_sample"])
+            if first > pos:
+                parts.append(np.zeros(first - pos, dtype=np.float32))
+            a = max(pos - first, 0)
+            b = block.shape[0] if hi is None else min(hi - first, block.shape[0])
+            if b > a:
+                parts.append(block[a:b])
+                pos = first + b
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+
+def list_sessions(root: str, meeting_id) -> List[dict]:
+    """Metadata of every archived session of a meeting, oldest first."""
+    directory = os.path.join(root, str(meeting_id))
+    if not os.path.isdir(directory):
+        return []
+    sessions = []
+    for name in os.listdir(directory):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name)) as f:
+                sessions.append(json.load(f))
+    return sorted(sessions, key=lambda m: m.get("created_at", 0))
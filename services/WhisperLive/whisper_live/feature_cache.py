@@ -0,0 +1,184 @@
+"""Incremental log-mel features for a growing live audio buffer.
+
+Each transcription pass re-reads the client's buffer from ``timestamp_offset``
+to the end, so consecutive calls share almost all of their audio. The cache
+keeps the raw (pre-normalisation) log10 mel frames computed on previous calls,
+indexed on an absolute hop grid (frame ``k`` is centred on stream sample
+``k * hop_length``), and only runs the STFT for samples that arrived since the
+last call. Whisper's window-global clamp (``max - 8``) and scaling are cheap and
+are applied to the selected frames on every call.
+
+Frames whose analysis window runs past the end of the buffer are recomputed
+each call with the same zero/reflect right padding as ``FeatureExtractor``.
+Window starts are snapped up to the hop grid, so features may start up to one
+hop (10 ms at 16 kHz) after the requested offset. Once the offset has moved
+past the start of the stream, the first ``ceil(n_fft / 2 / hop)`` frames are built from
+the real audio before the window, not from FeatureExtractor's reflect padding.
+"""
+import logging
+from typing import List, Optional
+
+import numpy as np
+
+
+class StreamingFeatureCache:
+    """Per-stream cache of raw log-mel frames keyed by absolute sample offset."""
+
+    # Samples compared between the cached signal and a new buffer to detect discontinuities
+    CONTINUITY_PROBE = 64
+
+    def __init__(self, feature_extractor):
+        self.hop = feature_extractor.hop_length
+        self.n_fft = feature_extractor.n_fft
+        self.half = self.n_fft // 2
+        self.mel_filters = feature_extractor.mel_filters.astype(np.float32)
+        self.window = np.hanning(self.n_fft + 1)[:-1].astype(np.float32)
+        self.reset()
+
+    def reset(self):
+        # Raw log10 mel for frames base_frame .. base_frame + frames.shape[1] - 1
+        self.frames = np.zeros((self.mel_filters.shape[0], 0), dtype=np.float32)
+        self.base_frame = 0
+        # Audio from signal_start onwards, enough to compute the next frame
+        self.signal = np.zeros(0, dtype=np.float32)
+        self.signal_start = 0
+        self.computed_frames = 0
+        self.reused_frames = 0
+
+    @property
+    def next_frame(self) -> int:
+        return self.base_frame + self.frames.shape[1]
+
+    @property
+    def signal_end(self) -> int:
+        return self.signal_start + len(self.signal)
+
+    def _log_mel(self, samples: np.ndarray, n_frames: int) -> np.ndarray:
+        """Raw log10 mel for ``n_frames`` uncentred windows of ``samples`` at hop spacing."""
+        if n_frames <= 0:
+            return np.zeros((self.mel_filters.shape[0], 0), dtype=np.float32)
+        stride = samples.strides[0]
+        windows = np.lib.stride_tricks.as_strided(
+            samples, shape=(n_frames, self.n_fft), strides=(self.hop * stride, stride), writeable=False
+        )
+        spectrum = np.fft.rfft(windows * self.window, axis=-1)
+        magnitudes = (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32)
+        mel = self.mel_filters @ magnitudes.T
+        return np.log10(np.clip(mel, a_min=1e-10, a_max=None)).astype(np.float32)
+
+    def _start_frame(self, sample: int) -> int:
+        return -(-sample // self.hop)
+
+    def _reset_at(self, audio: np.ndarray, offset: int):
+        """Restart the cache at ``offset``, reflect-padding the left edge like FeatureExtractor."""
+        self.reset()
+        first = self._start_frame(offset)
+        left = first * self.hop - self.half
+        pad = min(offset - left, len(audio) - 1)
+        head = audio[1:pad + 1][::-1] if pad > 0 else audio[:0]
+        if len(head) < offset - left:
+            head = np.concatenate([np.zeros(offset - left - len(head), dtype=np.float32), head])
+        self.signal = np.concatenate([head, audio]).astype(np.float32)
+        self.signal_start = left
+        self.base_frame = first
+
+    def _extend(self, audio: np.ndarray, offset: int) -> bool:
+        """Append the unseen part of ``audio``; False if it does not continue the cached signal."""
+        end = offset + len(audio)
+        if offset > self.signal_end:
+            return False
+        overlap_start = max(offset, self.signal_start)
+        overlap = min(self.signal_end, end) - overlap_start
+        if overlap > 0:
+            probe = min(overlap, self.CONTINUITY_PROBE)
+            probe_at = overlap_start + overlap - probe
+            cached = self.signal[probe_at - self.signal_start:probe_at - self.signal_start + probe]
+            incoming = audio[probe_at - offset:probe_at - offset + probe]
+            if not np.array_equal(cached, incoming):
+                return False
+        if end > self.signal_end:
+            self.signal = np.concatenate([self.signal, audio[self.signal_end - offset:].astype(np.float32)])
+        return True
+
+    def _compute_full_frames(self):
+        """Compute every frame whose analysis window lies inside the cached signal."""
+        first_sample = self.next_frame * self.hop - self.half
+        available = self.signal_end - first_sample - self.n_fft
+        if available < 0:
+            return
+        n_new = available // self.hop + 1
+        start = first_sample - self.signal_start
+        new = self._log_mel(self.signal[start:start + (n_new - 1) * self.hop + self.n_fft], n_new)
+        self.frames = np.concatenate([self.frames, new], axis=1)
+        self.computed_frames += n_new
+        # Keep only the audio the next frame still needs
+        keep_from = self.next_frame * self.hop - self.half
+        if keep_from > self.signal_start:
+            self.signal = self.signal[keep_from - self.signal_start:]
+            self.signal_start = keep_from
+
+    def _tail_frames(self, first: int, last: int, end: int) -> np.ndarray:
+        """Frames ``first..last`` past the cached ones, padded at ``end`` like FeatureExtractor."""
+        if last < first:
+            return np.zeros((self.mel_filters.shape[0], 0), dtype=np.float32)
+        start = first * self.hop - self.half
+        audio = self.signal[max(start, self.signal_start) - self.signal_start:end - self.signal_start]
+        if start < self.signal_start:
+            audio = np.concatenate([np.zeros(self.signal_start - start, dtype=np.float32), audio])
+        padded = np.pad(audio, (0, self.hop))
+        needed = (last - first) * self.hop + self.n_fft
+        if len(padded) > 1:
+            reflect = min(self.half, len(padded) - 1)
+            padded = np.pad(padded, (0, reflect), mode="reflect")
+        if len(padded) < needed:
+            padded = np.pad(padded, (0, needed - len(padded)))
+        return self._log_mel(padded[:needed], last - first + 1)
+
+    def _frames_between(self, first: int, count: int, end: int) -> np.ndarray:
+        last = first + count - 1
+        cached_last = min(last, self.next_frame - 1)
+        parts: List[np.ndarray] = []
+        if cached_last >= first:
+            parts.append(self.frames[:, first - self.base_frame:cached_last - self.base_frame + 1])
+            self.reused_frames += cached_last - first + 1
+        parts.append(self._tail_frames(max(first, cached_last + 1), last, end))
+        return np.concatenate(parts, axis=1)
+
+    def features(self, audio: np.ndarray, offset: int, speech_chunks: Optional[List[dict]] = None) -> np.ndarray:
+        """Normalised log-mel features for ``audio`` starting at absolute sample ``offset``.
+
+        With ``speech_chunks`` (sample ranges relative to ``audio``) the frames of each
+        chunk are gathered in order, matching the layout of features computed on the
+        concatenated chunks up to one hop at each join.
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        first = self._start_frame(offset)
+        if len(self.signal) == 0 or first < self.base_frame or not self._extend(audio, offset):
+            logging.debug(f"Feature cache reset at sample {offset}")
+            self._reset_at(audio, offset)
+        self._compute_full_frames()
+
+        end = offset + len(audio)
+        if speech_chunks:
+            lengths = [chunk["end"] - chunk["start"] for chunk in speech_chunks]
+            total = sum(lengths)
+            parts = []
+            remaining = (total + self.hop) // self.hop
+            for i, chunk in enumerate(speech_chunks):
+                count = remaining if i == len(speech_chunks) - 1 else min(remaining, lengths[i] // self.hop)
+                if count <= 0:
+                    continue
+                parts.append(self._frames_between(self._start_frame(offset + chunk["start"]), count, end))
+                remaining -= count
+            log_spec = np.concatenate(parts, axis=1)
+        else:
+            log_spec = self._frames_between(first, (len(audio) + self.hop) // self.hop, end)
+
+        # Frames before the requested window are never read again
+        if first > self.base_frame:
+            drop = min(first - self.base_frame, self.frames.shape[1])
+            self.frames = self.frames[:, drop:]
+            self.base_frame += drop
+
+        log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+        return ((log_spec + 4.0) / 4.0).astype(np.float32)
@@ -0,0 +1,86 @@
+"""Per-meeting language profile shared across sessions and WhisperLive instances.
+
+The first confident language detection for a meeting is stored in a Redis hash
+(``{prefix}:{meeting_id}``: language, confidence, detected_at, client_uid).
+Later sessions of the same meeting, such as bot reconnects or a restart onto
+another instance, start with that language instead of blocking on detection.
+Clients re-run detection (detection only, no decode) every
+``WL_LANGUAGE_REVALIDATE_S`` seconds and update the profile when the meeting
+switches language.
+"""
+import logging
+import os
+import time
+from typing import Optional
+
+
+def _env_bool(name, default):
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+WL_LANGUAGE_PROFILE_ENABLED = _env_bool("WL_LANGUAGE_PROFILE_ENABLED", "true")
+WL_LANGUAGE_PROFILE_PREFIX = os.getenv("WL_LANGUAGE_PROFILE_PREFIX", "wl:lang")
+WL_LANGUAGE_PROFILE_TTL_S = int(os.getenv("WL_LANGUAGE_PROFILE_TTL_S", "21600"))
+# Minimum detection probability to write a profile or start a session from one
+WL_LANGUAGE_PROFILE_MIN_CONFIDENCE = float(os.getenv("WL_LANGUAGE_PROFILE_MIN_CONFIDENCE", "0.7"))
+# Re-check a profiled/detected language this often (0 disables); switch only above this probability
+WL_LANGUAGE_REVALIDATE_S = float(os.getenv("WL_LANGUAGE_REVALIDATE_S", "120"))
+WL_LANGUAGE_SWITCH_MIN_PROB = float(os.getenv("WL_LANGUAGE_SWITCH_MIN_PROB", "0.8"))
+
+
+class LanguageProfileStore:
+    """Reads and writes meeting language profiles; Redis errors never reach the caller."""
+
+    def __init__(self, redis_client, prefix: str = WL_LANGUAGE_PROFILE_PREFIX,
+                 ttl_s: int = WL_LANGUAGE_PROFILE_TTL_S,
+                 min_confidence: float = WL_LANGUAGE_PROFILE_MIN_CONFIDENCE):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.ttl_s = ttl_s
+        self.min_confidence = min_confidence
+
+    def _key(self, meeting_id) -> str:
+        return f"{self.prefix}:{meeting_id}"
+
+    def get(self, meeting_id) -> Optional[dict]:
+        """The meeting's profile if one exists with at least ``min_confidence``."""
+        if meeting_id is None:
+            return None
+        try:
+            data = self.redis.hgetall(self._key(meeting_id))
+        except Exception as e:
+            logging.warning(f"Language profile read failed for meeting {meeting_id}: {e}")
+            return None
+        if not data or not data.get("language"):
+            return None
+        try:
+            confidence = float(data.get("confidence", 0))
+        except (TypeError, ValueError):
+            return None
+        if confidence < self.min_confidence:
+            return None
+        return {
+            "language": data["language"],
+            "confidence": confidence,
+            "detected_at": float(data.get("detected_at") or 0),
+        }
+
+    def save(self, meeting_id, language: str, confidence: float, client_uid: Optional[str] = None) -> bool:
+        """Store a confident detection and refresh the TTL."""
+        if meeting_id is None or not language or confidence < self.min_confidence:
+            return False
+        key = self._key(meeting_id)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hset(key, mapping={
+                "language": language,
+                "confidence": f"{confidence:.4f}",
+                "detected_at": f"{time.time():.3f}",
+                "client_uid": client_uid or "",
+            })
+            pipe.expire(key, self.ttl_s)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logging.warning(f"Language profile write failed for meeting {meeting_id}: {e}")
+            return False
@@ -0,0 +1,371 @@
+"""
+Multi-stream replay load generator for a WhisperLive server.
+
+Replays WAV files at real-time pace as N concurrent synthetic meetings using the
+`Client` websocket protocol, including the bot's audio_chunk_metadata,
+speaker_activity and session_control messages, and writes a JSON report with
+per-stream latencies and (optionally) server CPU/RSS samples.
+
+Example:
+    python -m whisper_live.loadgen --host localhost --port 9090 \
+        --audio assets/jfk.wav --streams 20 --ramp-s 10 --server-pid 1234 \
+        --output loadgen_report.json
+"""
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+import wave
+
+import numpy as np
+import websocket
+
+from whisper_live.client import Client
+
+try:
+    import psutil
+except ImportError:  # optional, only needed for --server-pid
+    psutil = None
+
+
+RATE = 16000
+
+
+def load_wav(path, rate=RATE):
+    """Reads a 16-bit PCM WAV file as mono float32 at `rate` Hz."""
+    with wave.open(path, "rb") as wavfile:
+        if wavfile.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+        channels = wavfile.getnchannels()
+        source_rate = wavfile.getframerate()
+        audio = np.frombuffer(wavfile.readframes(wavfile.getnframes()), dtype=np.int16)
+    audio = audio.astype(np.float32) / 32768.0
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    if source_rate != rate:
+        duration = len(audio) / source_rate
+        target = np.linspace(0, duration, int(duration * rate), endpoint=False)
+        audio = np.interp(target, np.arange(len(audio)) / source_rate, audio).astype(np.float32)
+    return audio
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    return round(float(np.percentile(values, q)), 3)
+
+
+def summarize(values):
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": round(max(values), 3) if values else None,
+    }
+
+
+class LoadGenClient(Client):
+    """
+    Client that behaves like a meeting bot and records latency metrics instead of printing transcripts.
+    """
+    def __init__(self, host, port, meeting_id, **kwargs):
+        self.meeting_id = meeting_id
+        self.started_at = time.time()
+        self.ready_at = None
+        self.audio_t0 = None
+        self.first_partial_at = None
+        self.partial_latencies = []
+        self.finalize_latencies = []
+        self.finalized_starts = set()
+        self.wait_count = 0
+        self.error_count = 0
+        self.messages = 0
+        self.closed_at = None
+        self.replay_done_at = None
+        super().__init__(host, port, log_transcription=False, **kwargs)
+
+    def on_open(self, ws):
+        initial_payload = {
+            "uid": self.uid,
+            "language": self.language,
+            "task": self.task,
+            "model": self.model,
+            "use_vad": self.use_vad,
+            "platform": self.platform,
+            "meeting_url": self.meeting_url,
+            "token": self.token,
+            "meeting_id": self.meeting_id,
+        }
+        ws.send(json.dumps(initial_payload))
+
+    def on_message(self, ws, message):
+        self.messages += 1
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+        if data.get("message") == "SERVER_READY" and self.ready_at is None:
+            self.ready_at = time.time()
+        super().on_message(ws, message)
+
+    def on_close(self, ws, close_status_code, close_msg):
+        self.closed_at = time.time()
+        super().on_close(ws, close_status_code, close_msg)
+
+    def handle_status_messages(self, message_data):
+        status = message_data.get("status")
+        if status == "WAIT":
+            self.wait_count += 1
+        elif status == "ERROR":
+            self.error_count += 1
+        super().handle_status_messages(message_data)
+
+    def process_segments(self, segments):
+        now = time.time()
+        if self.audio_t0 is not None:
+            if self.first_partial_at is None:
+                self.first_partial_at = now
+            for seg in segments:
+                try:
+                    audio_end = self.audio_t0 + float(seg["end"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if seg.get("completed"):
+                    if seg.get("start") not in self.finalized_starts:
+                        self.finalized_starts.add(seg.get("start"))
+                        self.finalize_latencies.append(now - audio_end)
+            last = segments[-1] if segments else None
+            if last is not None and not last.get("completed"):
+                try:
+                    self.partial_latencies.append(now - (self.audio_t0 + float(last["end"])))
+                except (KeyError, TypeError, ValueError):
+                    pass
+        super().process_segments(segments)
+
+    def send_control(self, message_type, payload):
+        payload = dict(payload, uid=self.uid, token=self.token, platform=self.platform, meeting_id=self.meeting_id)
+        try:
+            self.client_socket.send(json.dumps({"type": message_type, "payload": payload}), websocket.ABNF.OPCODE_TEXT)
+        except Exception as e:
+            logging.debug(f"Control message {message_type} failed: {e}")
+
+    def report(self):
+        return {
+            "uid": self.uid,
+            "meeting_id": self.meeting_id,
+            "ready_s": round(self.ready_at - self.started_at, 3) if self.ready_at else None,
+            "first_partial_s": round(self.first_partial_at - self.audio_t0, 3)
+            if self.first_partial_at and self.audio_t0 else None,
+            "partial_latency_s": summarize(self.partial_latencies),
+            "finalize_latency_s": summarize(self.finalize_latencies),
+            "segments_finalized": len(self.finalized_starts),
+            "messages": self.messages,
+            "wait": self.wait_count,
+            "errors": self.error_count,
+            "server_error": bool(self.server_error),
+            "disconnected_early": self.closed_at is not None and (
+                self.replay_done_at is None or self.closed_at < self.replay_done_at),
+        }
+
+
+class ResourceSampler(threading.Thread):
+    """Samples CPU% and RSS of a server process (and its children) with psutil."""
+
+    def __init__(self, pid, interval_s=1.0):
+        super().__init__(daemon=True)
+        self.process = psutil.Process(pid)
+        self.interval_s = interval_s
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def _processes(self):
+        try:
+            return [self.process] + self.process.children(recursive=True)
+        except psutil.Error:
+            return [self.process]
+
+    def run(self):
+        for proc in self._processes():
+            try:
+                proc.cpu_percent(None)
+            except psutil.Error:
+                pass
+        while not self.stopped.wait(self.interval_s):
+            cpu = rss = 0.0
+            for proc in self._processes():
+                try:
+                    cpu += proc.cpu_percent(None)
+                    rss += proc.memory_info().rss
+                except psutil.Error:
+                    continue
+            self.samples.append({"t": round(time.time(), 3), "cpu_percent": round(cpu, 1), "rss_mb": round(rss / 2**20, 1)})
+
+    def report(self):
+        cpu = [s["cpu_percent"] for s in self.samples]
+        rss = [s["rss_mb"] for s in self.samples]
+        return {
+            "cpu_count": psutil.cpu_count(),
+            "cpu_percent": summarize(cpu),
+            "rss_mb": summarize(rss),
+            "samples": self.samples,
+        }
+
+
+def replay_stream(client, audio, chunk_samples, speaker_turn_s, ready_timeout_s, drain_s):
+    """Streams `audio` to the server at real-time pace, with bot-style control messages."""
+    deadline = time.time() + ready_timeout_s
+    while not client.recording and time.time() < deadline and not client.server_error:
+        time.sleep(0.05)
+    if not client.recording:
+        return
+
+    chunk_s = chunk_samples / RATE
+    speakers = [("Speaker A", "spk-a"), ("Speaker B", "spk-b")]
+    speaker_idx, next_turn_s = 0, 0.0
+    client.audio_t0 = time.time()
+    start = time.monotonic()
+    for i, offset in enumerate(range(0, len(audio), chunk_samples)):
+        if not client.recording:
+            break
+        position_s = offset / RATE
+        if speaker_turn_s and position_s >= next_turn_s:
+            if next_turn_s > 0:
+                name, participant_id = speakers[speaker_idx]
+                client.send_control("speaker_activity", {
+                    "event_type": "SPEAKER_END", "participant_name": name,
+                    "participant_id_meet": participant_id,
+                    "relative_client_timestamp_ms": position_s * 1000.0,
+                })
+                speaker_idx = (speaker_idx + 1) % len(speakers)
+            name, participant_id = speakers[speaker_idx]
+            client.send_control("speaker_activity", {
+                "event_type": "SPEAKER_START", "participant_name": name,
+                "participant_id_meet": participant_id,
+                "relative_client_timestamp_ms": position_s * 1000.0,
+            })
+            next_turn_s += speaker_turn_s
+        chunk = audio[offset:offset + chunk_samples]
+        client.send_control("audio_chunk_metadata", {
+            "length": len(chunk), "sample_rate": RATE, "client_timestamp_ms": time.time() * 1000.0,
+        })
+        client.send_packet_to_server(chunk.astype(np.float32).tobytes())
+        sleep_s = start + (i + 1) * chunk_s - time.monotonic()
+        if sleep_s > 0:
+            time.sleep(sleep_s)
+
+    client.replay_done_at = time.time()
+    client.send_control("session_control", {"event": "LEAVING_MEETING", "client_timestamp_ms": time.time() * 1000.0})
+    time.sleep(drain_s)
+
+
+def run_load(args):
+    audios = [load_wav(path) for path in args.audio]
+    if args.duration_s:
+        target = int(args.duration_s * RATE)
+        audios = [np.resize(audio, target) for audio in audios]
+
+    sampler = None
+    if args.server_pid:
+        if psutil is None:
+            raise SystemExit("--server-pid requires the psutil package")
+        sampler = ResourceSampler(args.server_pid, args.sample_interval_s)
+        sampler.start()
+
+    clients, threads = [], []
+    run_id = args.run_id or uuid.uuid4().hex[:8]
+    started = time.time()
+    for i in range(args.streams):
+        client = LoadGenClient(
+            args.host, args.port, meeting_id=f"{args.meeting_id_base}{i}",
+            lang=args.language, model=args.model, use_vad=args.use_vad,
+            platform="loadgen", meeting_url=f"loadgen://{run_id}/{i}", token=args.token,
+        )
+        clients.append(client)
+        thread = threading.Thread(
+            target=replay_stream,
+            args=(client, audios[i % len(audios)], args.chunk_samples, args.speaker_turn_s,
+                  args.ready_timeout_s, args.drain_s),
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+        if args.ramp_s and args.streams > 1:
+            time.sleep(args.ramp_s / (args.streams - 1))
+
+    for thread in threads:
+        thread.join()
+    for client in clients:
+        client.close_websocket()
+    if sampler is not None:
+        sampler.stopped.set()
+        sampler.join()
+
+    streams = [client.report() for client in clients]
+    first_partial = [s["first_partial_s"] for s in streams if s["first_partial_s"] is not None]
+    finalize = [lat for client in clients for lat in client.finalize_latencies]
+    partial = [lat for client in clients for lat in client.partial_latencies]
+    report = {
+        "run_id": run_id,
+        "started_at": started,
+        "wall_s": round(time.time() - started, 3),
+        "config": {
+            "host": args.host, "port": args.port, "streams": args.streams, "ramp_s": args.ramp_s,
+            "audio": args.audio, "chunk_samples": args.chunk_samples, "model": args.model,
+            "language": args.language, "use_vad": args.use_vad,
+            "audio_s": [round(len(a) / RATE, 3) for a in audios],
+        },
+        "summary": {
+            "streams_ready": sum(1 for s in streams if s["ready_s"] is not None),
+            "streams_with_output": len(first_partial),
+            "wait_responses": sum(s["wait"] for s in streams),
+            "errors": sum(s["errors"] for s in streams),
+            "dropped": sum(1 for s in streams if s["ready_s"] is None or s["server_error"] or s["disconnected_early"]),
+            "first_partial_s": summarize(first_partial),
+            "partial_latency_s": summarize(partial),
+            "finalize_latency_s": summarize(finalize),
+        },
+        "server": sampler.report() if sampler is not None else None,
+        "streams": streams,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay WAV files as concurrent synthetic meetings against WhisperLive.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=9090)
+    parser.add_argument("--audio", nargs="+", required=True, help="WAV files, assigned round-robin to streams")
+    parser.add_argument("--streams", type=int, default=1)
+    parser.add_argument("--ramp-s", type=float, default=0.0, help="Spread stream starts over this many seconds")
+    parser.add_argument("--duration-s", type=float, default=None, help="Loop/trim each file to this duration")
+    parser.add_argument("--chunk-samples", type=int, default=4096)
+    parser.add_argument("--speaker-turn-s", type=float, default=10.0, help="Alternate synthetic speakers (0 disables)")
+    parser.add_argument("--language", default=None)
+    parser.add_argument("--model", default="small", help="Whisper model size requested by each stream")
+    parser.add_argument("--use-vad", action="store_true")
+    parser.add_argument("--token", default="loadgen-token")
+    parser.add_argument("--meeting-id-base", default="9000000")
+    parser.add_argument("--run-id", default=None)
+    parser.add_argument("--ready-timeout-s", type=float, default=60.0)
+    parser.add_argument("--drain-s", type=float, default=5.0, help="Wait for final segments after the audio ends")
+    parser.add_argument("--server-pid", type=int, default=None, help="Sample CPU/RSS of this local server process")
+    parser.add_argument("--sample-interval-s", type=float, default=1.0)
+    parser.add_argument("--output", default="loadgen_report.json")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_load(args)
+    print(json.dumps(report["summary"], indent=2))
+    print(f"[INFO]: Report written to {os.path.abspath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Deterministic synthetic transcriber for capacity testing.
+
+MockTranscriber matches the WhisperModel.transcribe interface but runs no model:
+it splits the audio into speech regions by frame energy and fills each region
+with scripted words, sleeping for a configurable per-call latency (plus jitter
+and an optional real-time factor) to stand in for inference. Frames are aligned
+to the absolute stream position (``audio_offset``), so a segment keeps the same
+boundaries and text prefix as the buffer is re-transcribed on every pass.
+
+Configuration (environment):
+    WL_MOCK_LATENCY_MS   fixed delay per transcribe call (default 50)
+    WL_MOCK_JITTER_MS    uniform extra delay in [0, jitter] (default 0)
+    WL_MOCK_RTF          extra delay per second of audio, as a real-time factor (default 0)
+    WL_MOCK_ENERGY_DB    frame energy threshold in dBFS (default -45)
+    WL_MOCK_SEED         seed for jitter and word choice (default 0)
+    WL_MOCK_LANGUAGE     language reported when none is requested (default "en")
+"""
+
+import os
+import random
+import time
+import zlib
+from typing import List, Optional
+
+import numpy as np
+
+from .transcriber import Segment, TranscriptionInfo
+
+FRAME_SAMPLES = 480  # 30 ms at 16 kHz
+WORDS_PER_SECOND = 2.5
+
+SCRIPT = (
+    "the quarterly numbers look good but we still need to review the hiring plan before "
+    "friday and make sure the roadmap reflects what engineering can actually deliver this "
+    "quarter let us also sync with design on the onboarding flow and follow up with the "
+    "customer about the integration timeline and the open support tickets"
+).split()
+
+
+class MockTranscriber:
+    """
+    Energy-based segmenter with scripted text and simulated inference latency.
+    """
+
+    def __init__(
+        self,
+        sampling_rate: int = 16000,
+        latency_ms: Optional[float] = None,
+        jitter_ms: Optional[float] = None,
+        rtf: Optional[float] = None,
+        energy_db: Optional[float] = None,
+        min_speech_s: float = 0.2,
+        min_silence_s: float = 0.5,
+        max_segment_s: float = 8.0,
+        seed: Optional[int] = None,
+    ):
+        self.sampling_rate = sampling_rate
+        self.latency_s = (latency_ms if latency_ms is not None else float(os.getenv("WL_MOCK_LATENCY_MS", "50"))) / 1000.0
+        self.jitter_s = (jitter_ms if jitter_ms is not None else float(os.getenv("WL_MOCK_JITTER_MS", "0"))) / 1000.0
+        self.rtf = rtf if rtf is not None else float(os.getenv("WL_MOCK_RTF", "0"))
+        self.energy_db = energy_db if energy_db is not None else float(os.getenv("WL_MOCK_ENERGY_DB", "-45"))
+        self.min_speech_frames = max(1, int(min_speech_s * sampling_rate / FRAME_SAMPLES))
+        self.min_silence_frames = max(1, int(min_silence_s * sampling_rate / FRAME_SAMPLES))
+        self.max_segment_frames = max(1, int(max_segment_s * sampling_rate / FRAME_SAMPLES))
+        self.seed = seed if seed is not None else int(os.getenv("WL_MOCK_SEED", "0"))
+        self.default_language = os.getenv("WL_MOCK_LANGUAGE", "en")
+        self.rng = random.Random(self.seed)
+        # Absolute stream sample index of the next audio passed to transcribe()
+        self.audio_offset = 0
+
+    def _simulate_latency(self, duration: float):
+        delay = self.latency_s + duration * self.rtf
+        if self.jitter_s:
+            delay += self.rng.uniform(0.0, self.jitter_s)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _speech_regions(self, audio: np.ndarray, first_sample: int) -> List[tuple]:
+        """(start_frame, end_frame) runs of frames above the energy threshold."""
+        n_frames = (len(audio) - first_sample) // FRAME_SAMPLES
+        if n_frames <= 0:
+            return []
+        frames = audio[first_sample:first_sample + n_frames * FRAME_SAMPLES].reshape(n_frames, FRAME_SAMPLES)
+        energy_db = 10.0 * np.log10(np.mean(frames.astype(np.float64) ** 2, axis=1) + 1e-12)
+        active = np.flatnonzero(energy_db > self.energy_db)
+        regions = []
+        for idx in active:
+            if regions and idx - regions[-1][1] <= self.min_silence_frames:
+                regions[-1][1] = idx + 1
+            else:
+                regions.append([idx, idx + 1])
+        result = []
+        for start, end in regions:
+            if end - start < self.min_speech_frames and end < n_frames:
+                continue
+            while end - start > self.max_segment_frames:
+                result.append((start, start + self.max_segment_frames))
+                start += self.max_segment_frames
+            result.append((start, end))
+        return result
+
+    def _text(self, absolute_frame: int, duration: float) -> str:
+        """Scripted words for a segment; the prefix depends only on where the segment starts."""
+        n_words = max(1, int(round(duration * WORDS_PER_SECOND)))
+        start = zlib.crc32(f"{self.seed}:{absolute_frame}".encode()) % len(SCRIPT)
+        words = [SCRIPT[(start + i) % len(SCRIPT)] for i in range(n_words)]
+        return " " + " ".join(words)
+
+    def transcribe(self, audio: np.ndarray, language: Optional[str] = None, task: str = "transcribe", **kwargs):
+        audio = np.asarray(audio, dtype=np.float32)
+        duration = len(audio) / self.sampling_rate
+        self._simulate_latency(duration)
+
+        offset = int(self.audio_offset or 0)
+        first_frame = -(-offset // FRAME_SAMPLES)
+        first_sample = first_frame * FRAME_SAMPLES - offset
+
+        segments = []
+        for i, (start, end) in enumerate(self._speech_regions(audio, first_sample)):
+            seg_start = (first_sample + start * FRAME_SAMPLES) / self.sampling_rate
+            seg_end = (first_sample + end * FRAME_SAMPLES) / self.sampling_rate
+            segments.append(Segment(
+                id=i,
+                seek=0,
+                start=seg_start,
+                end=seg_end,
+                text=self._text(first_frame + start, seg_end - seg_start),
+                tokens=[],
+                avg_logprob=-0.2,
+                compression_ratio=1.0,
+                no_speech_prob=0.01,
+                words=None,
+                temperature=0.0,
+            ))
+
+        info = TranscriptionInfo(
+            language=language or self.default_language,
+            language_probability=1.0,
+            duration=duration,
+            duration_after_vad=duration,
+            all_language_probs=None,
+            transcription_options=None,
+            vad_options=None,
+        )
+        return segments, info
@@ -0,0 +1,192 @@
+"""Offline batch re-transcription of finished meetings from the audio archive.
+
+The live transcript is whatever the streaming loop produced: window-boundary
+artifacts, repeated partial decodes, and whatever cheap settings the live
+deployment runs with. This job re-decodes archived session audio (see
+``whisper_live.audio_archive``) with ``BatchedInferencePipeline``. Silero VAD
+splits speech into chunks of up to 30 s, which are decoded ``batch_size`` at a
+time. The job then replaces the meeting's transcript through the collector's
+``PUT /internal/meetings/{meeting_id}/transcript``.
+
+Sessions are read in windows of ``--window-s`` seconds, cut at the quietest
+100 ms frame near the window end, so memory stays bounded for long meetings.
+
+Usage (one model load for many meetings; run off-peak, e.g. from cron)::
+
+    python -m whisper_live.retranscribe --meeting-id 123 --meeting-id 124 \\
+        --model large-v3 --device cuda --batch-size 16 \\
+        --collector-url http://transcription-collector:8000
+
+With no ``--meeting-id``, every archived meeting idle for ``--min-idle-s`` and
+not yet re-transcribed is processed. ``--dry-run`` writes the result JSON
+without touching the database.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import time
+import urllib.request
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from whisper_live.audio_archive import SAMPLE_RATE, WL_AUDIO_ARCHIVE_DIR, AudioArchiveReader, list_sessions
+
+# Written into a meeting's archive directory once its transcript has been replaced
+DONE_MARKER = "retranscribed.json"
+
+
+def quiet_cut(audio: np.ndarray, search_s: float = 30.0, frame_s: float = 0.1) -> int:
+    """Sample index of the quietest frame within the last ``search_s`` of ``audio``."""
+    frame = int(frame_s * SAMPLE_RATE)
+    search = min(len(audio), int(search_s * SAMPLE_RATE))
+    tail = audio[len(audio) - search:]
+    n = len(tail) // frame
+    if n < 2:
+        return len(audio)
+    energy = np.square(tail[:n * frame].reshape(n, frame)).mean(axis=1)
+    return len(audio) - search + int(np.argmin(energy)) * frame + frame // 2
+
+
+def iter_windows(reader: AudioArchiveReader, window_s: float) -> Iterator[Tuple[float, np.ndarray]]:
+    """(start seconds, audio) windows covering the session, each cut at a quiet point."""
+    start, total = 0.0, reader.duration_s
+    while start < total:
+        audio = reader.read(start, start + window_s)
+        if start + window_s < total:
+            audio = audio[:quiet_cut(audio)]
+        if not len(audio):
+            break
+        yield start, audio
+        start += len(audio) / SAMPLE_RATE
+
+
+def transcribe_session(pipeline, reader: AudioArchiveReader, language: Optional[str] = None,
+                       task: str = "transcribe", batch_size: int = 16, window_s: float = 600.0,
+                       beam_size: int = 5) -> Tuple[List[dict], Optional[str]]:
+    """(segments in session stream time, detected language) for one archived session."""
+    segments: List[dict] = []
+    for offset, audio in iter_windows(reader, window_s):
+        result, info = pipeline.transcribe(
+            audio,
+            language=language,
+            task=task,
+            batch_size=batch_size,
+            beam_size=beam_size,
+            vad_filter=True,
+            without_timestamps=True,
+        )
+        # Keep the first window's language for the rest of the session
+        language = language or info.language
+        for seg in result:
+            text = seg.text.strip()
+            if text:
+                segments.append({
+                    "start": round(offset + seg.start, 3),
+                    "end": round(offset + seg.end, 3),
+                    "text": text,
+                    "language": language,
+                })
+    return segments, language
+
+
+def transcribe_meeting(pipeline, root: str, meeting_id, batch_size: int = 16,
+                       window_s: float = 600.0, language: Optional[str] = None) -> dict:
+    sessions = []
+    for meta in list_sessions(root, meeting_id):
+        started = time.time()
+        with AudioArchiveReader(root, meeting_id, meta["session_uid"]) as reader:
+            segments, detected = transcribe_session(
+                pipeline, reader,
+                language=language or meta.get("language"),
+                task=meta.get("task") or "transcribe",
+                batch_size=batch_size,
+                window_s=window_s,
+            )
+            duration = reader.duration_s
+        elapsed = time.time() - started
+        logging.info(
+            f"RETRANSCRIBE: meeting={meeting_id} session={meta['session_uid']} audio={duration:.0f}s "
+            f"segments={len(segments)} took={elapsed:.1f}s rtf={elapsed / max(duration, 1e-6):.3f}"
+        )
+        sessions.append({"session_uid": meta["session_uid"], "language": detected, "segments": segments})
+    return {"meeting_id": int(meeting_id), "sessions": sessions}
+
+
+def upload(collector_url: str, result: dict, source: dict, timeout: float = 120.0) -> dict:
+    """Replace the meeting's transcript in the collector; raises on HTTP errors."""
+    body = json.dumps({"sessions": result["sessions"], "source": source}).encode()
+    req = urllib.request.Request(
+        f"{collector_url.rstrip('/')}/internal/meetings/{result['meeting_id']}/transcript",
+        data=body, method="PUT", headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read() or b"{}")
+
+
+def pending_meetings(root: str, min_idle_s: float) -> List[str]:
+    """Archived meetings with no writes for ``min_idle_s`` and no done marker."""
+    now = time.time()
+    pending = []
+    for directory in sorted(glob.glob(os.path.join(root, "*"))):
+        if not os.path.isdir(directory) or os.path.exists(os.path.join(directory, DONE_MARKER)):
+            continue
+        files = glob.glob(os.path.join(directory, "*.idx"))
+        if files and now - max(os.path.getmtime(f) for f in files) >= min_idle_s:
+            pending.append(os.path.basename(directory))
+    return pending
+
+
+def load_pipeline(model: str, device: str, compute_type: str):
+    from whisper_live.transcriber import BatchedInferencePipeline, WhisperModel
+    return BatchedInferencePipeline(WhisperModel(model, device=device, compute_type=compute_type))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-transcribe archived meetings with batched offline decoding")
+    parser.add_argument("--meeting-id", action="append", default=[], help="Meeting to process (repeatable)")
+    parser.add_argument("--archive-dir", default=WL_AUDIO_ARCHIVE_DIR)
+    parser.add_argument("--min-idle-s", type=float, default=600.0,
+                        help="Without --meeting-id: only meetings whose archive has been idle this long")
+    parser.add_argument("--model", default=os.getenv("WL_RETRANSCRIBE_MODEL", "large-v3"))
+    parser.add_argument("--device", default="cuda")
+    parser.add_argument("--compute-type", default="float16")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--window-s", type=float, default=600.0)
+    parser.add_argument("--language", default=None, help="Force a language instead of the archived/detected one")
+    parser.add_argument("--collector-url", default=os.getenv("TRANSCRIPTION_COLLECTOR_URL", "http://transcription-collector:8000"))
+    parser.add_argument("--output-dir", default=None, help="Also write each result as <meeting_id>.json here")
+    parser.add_argument("--dry-run", action="store_true", help="Do not replace transcripts in the database")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    meeting_ids = args.meeting_id or pending_meetings(args.archive_dir, args.min_idle_s)
+    if not meeting_ids:
+        logging.info("RETRANSCRIBE: nothing to do")
+        return 0
+    pipeline = load_pipeline(args.model, args.device, args.compute_type)
+    source = {"model": args.model, "compute_type": args.compute_type, "batch_size": args.batch_size}
+    failures = 0
+    for meeting_id in meeting_ids:
+        try:
+            result = transcribe_meeting(pipeline, args.archive_dir, meeting_id, args.batch_size, args.window_s, args.language)
+            if args.output_dir:
+                os.makedirs(args.output_dir, exist_ok=True)
+                with open(os.path.join(args.output_dir, f"{meeting_id}.json"), "w") as f:
+                    json.dump(result, f)
+            if args.dry_run:
+                continue
+            summary = upload(args.collector_url, result, source)
+            with open(os.path.join(args.archive_dir, str(meeting_id), DONE_MARKER), "w") as f:
+                json.dump({**summary, **source, "retranscribed_at": time.time()}, f)
+            logging.info(f"RETRANSCRIBE: meeting={meeting_id} replaced: {summary}")
+        except Exception as e:
+            failures += 1
+            logging.error(f"RETRANSCRIBE: meeting={meeting_id} failed: {e}", exc_info=True)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
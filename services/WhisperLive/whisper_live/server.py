@@ -4,6 +4,8 @@ import threading
 import json
 import functools
 import logging
+import queue
+import collections
 from enum import Enum
 from typing import List, Optional
 import datetime
@@ -15,8 +17,28 @@ import torch
 import numpy as np
 from websockets.sync.server import serve
 from websockets.exceptions import ConnectionClosed
-from whisper_live.vad import VoiceActivityDetector
+from whisper_live.vad import VoiceActivityDetector, get_shared_vad_engine
+from whisper_live.language_profile import (
+    LanguageProfileStore,
+    WL_LANGUAGE_PROFILE_ENABLED,
+    WL_LANGUAGE_REVALIDATE_S,
+    WL_LANGUAGE_SWITCH_MIN_PROB,
+)
 from whisper_live.transcriber import WhisperModel
+from faster_whisper.vad import VadOptions, collect_chunks, get_speech_timestamps
+from whisper_live.feature_cache import StreamingFeatureCache
+from whisper_live.streaming_vad import StreamingSpeechTimeline
+from whisper_live.mock_transcriber import MockTranscriber
+from whisper_live.latency import stage_latency
+from whisper_live.audio_archive import get_audio_archive
+from whisper_live.startup import (
+    StartupState,
+    WL_PRELOAD_MODEL,
+    WL_WARMUP_AUDIO_S,
+    WL_WARMUP_RUNS,
+    prefetch_model,
+    warmup_model,
+)
 try:
     from whisper_live.transcriber_tensorrt import WhisperTRTLLM
     TENSORRT_AVAILABLE = True
@@ -55,6 +77,12 @@ WL_LOG_HALLUCINATIONS = _def_bool(os.getenv("WL_LOG_HALLUCINATIONS", "false"))
 WL_LOG_CONTROL_EVENTS = _def_bool(os.getenv("WL_LOG_CONTROL_EVENTS", "false"))
 WL_LOG_SPEAKER_EVENTS = _def_bool(os.getenv("WL_LOG_SPEAKER_EVENTS", "false"))
 WL_LOG_SPEAKER_PUBLISH = _def_bool(os.getenv("WL_LOG_SPEAKER_PUBLISH", "false"))
+# Reuse log-mel frames across successive transcribe passes over the same buffer
+WL_FEATURE_CACHE = _def_bool(os.getenv("WL_FEATURE_CACHE", "true"))
+# Score only newly appended audio with Silero instead of the whole window each pass
+WL_STREAMING_VAD = _def_bool(os.getenv("WL_STREAMING_VAD", "true"))
+# Score streaming VAD windows of all clients on the shared batched Silero engine
+WL_BATCHED_VAD = _def_bool(os.getenv("WL_BATCHED_VAD", "true"))
 
 # Suppress external chatter
 _FW_LEVEL = os.getenv("WL_FAST_WHISPER_LOG_LEVEL", "WARNING").strip().upper()
@@ -111,6 +139,33 @@ class TranscriptionCollectorClient:
         
         # Track session_uids for which we've published session_start events
         self.session_starts_published = set()
+
+        # Delta publishing: per-session {segment start: version} of segments already written
+        # to the stream, so each tick only carries new or changed segments.
+        self.published_versions = {}
+        self.versions_lock = threading.Lock()
+
+        # Background publisher: stream writes are queued and flushed as pipelined XADDs
+        try:
+            self.stream_maxlen = int(os.getenv("REDIS_STREAM_MAXLEN", "100000"))
+        except Exception:
+            self.stream_maxlen = 100000
+        try:
+            self.publish_batch_max = int(os.getenv("WL_PUBLISH_BATCH_MAX", "200"))
+        except Exception:
+            self.publish_batch_max = 200
+        try:
+            self.publish_linger_s = float(os.getenv("WL_PUBLISH_LINGER_MS", "0")) / 1000.0
+        except Exception:
+            self.publish_linger_s = 0.0
+        try:
+            publish_queue_max = int(os.getenv("WL_PUBLISH_QUEUE_MAX", "10000"))
+        except Exception:
+            publish_queue_max = 10000
+        self.publish_queue = queue.Queue(maxsize=publish_queue_max)
+        self.publisher_stop = threading.Event()
+        self.publisher_thread = threading.Thread(target=self._publisher_worker, daemon=True)
+        self.publisher_thread.start()
         
         # Connect on initialization 
         self.connect()
@@ -183,8 +238,146 @@ class TranscriptionCollectorClient:
             time.sleep(retry_delay)
             retry_delay = min(retry_delay * 2, max_retry_delay)
     
+    def _enqueue_stream_message(self, payload, on_failure=None):
+        """Queue a message for the transcription stream.
+
+        Args:
+            payload: Event dict, JSON-encoded into the 'payload' field
+            on_failure: Optional callable invoked if the write is dropped or fails
+
+        Returns:
+            Boolean indicating whether the message was queued
+        """
+        try:
+            self.publish_queue.put_nowait(({"payload": json.dumps(payload)}, on_failure, payload.get("trace")))
+            return True
+        except queue.Full:
+            logging.error(f"Publish queue full; dropping {payload.get('type')} for UID {payload.get('uid')}")
+            if on_failure:
+                on_failure()
+            return False
+
+    def _publisher_worker(self):
+        """Drain the publish queue and write batches to Redis in one pipeline round-trip."""
+        while not self.publisher_stop.is_set() or not self.publish_queue.empty():
+            try:
+                batch = [self.publish_queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.publish_linger_s
+            while len(batch) < self.publish_batch_max:
+                try:
+                    remaining = deadline - time.monotonic()
+                    if remaining > 0:
+                        batch.append(self.publish_queue.get(timeout=remaining))
+                    else:
+                        batch.append(self.publish_queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._flush_batch(batch)
+
+    def _flush_batch(self, batch):
+        client = self.redis_client
+        if not self.is_connected or client is None:
+            logging.warning(f"Dropping {len(batch)} queued stream messages: Not connected to Redis")
+            results = [None] * len(batch)
+        else:
+            try:
+                pipe = client.pipeline(transaction=False)
+                for fields, _, _ in batch:
+                    if self.stream_maxlen > 0:
+                        pipe.xadd(self.stream_key, fields, maxlen=self.stream_maxlen, approximate=True)
+                    else:
+                        pipe.xadd(self.stream_key, fields)
+                results = pipe.execute(raise_on_error=False)
+            except Exception as e:
+                logging.error(f"Error flushing {len(batch)} messages to {self.stream_key}: {e}")
+                results = [None] * len(batch)
+
+        failed = 0
+        written_ts = time.time()
+        for (_, on_failure, trace), result in zip(batch, results):
+            if not result or isinstance(result, Exception):
+                failed += 1
+                if on_failure:
+                    try:
+                        on_failure()
+                    except Exception:
+                        pass
+            elif trace:
+                stage_latency.observe_between("transcribed_to_xadd", trace.get("transcribed_ts"), written_ts)
+                stage_latency.observe_between("capture_to_xadd", trace.get("captured_ts"), written_ts)
+        if failed:
+            logging.error(f"Failed to publish {failed}/{len(batch)} messages to {self.stream_key}")
+        else:
+            logging.debug(f"Published batch of {len(batch)} messages to {self.stream_key}")
+
+    def _segment_delta(self, session_uid, segments):
+        """Return the segments whose version differs from what was last published, and record them.
+
+        A version is (end, text, completed, language) keyed by segment start. Versions for
+        segments that have scrolled out of the client's window are pruned.
+
+        Returns:
+            Tuple of (delta segments, {start: previous version} needed to roll back on failure)
+        """
+        delta = []
+        previous = {}
+        with self.versions_lock:
+            versions = self.published_versions.setdefault(session_uid, {})
+            window_start = None
+            for segment in segments:
+                start = segment.get("start") if isinstance(segment, dict) else None
+                if start is None:
+                    # Unkeyed (e.g. TensorRT partial) segments cannot be versioned
+                    delta.append(segment)
+                    continue
+                key = str(start)
+                try:
+                    start_f = float(start)
+                    window_start = start_f if window_start is None else min(window_start, start_f)
+                except (TypeError, ValueError):
+                    pass
+                version = (segment.get("end"), segment.get("text"), bool(segment.get("completed")), segment.get("language"))
+                if versions.get(key) == version:
+                    continue
+                if key not in previous:
+                    previous[key] = versions.get(key)
+                versions[key] = version
+                delta.append(segment)
+            if window_start is not None:
+                for key in list(versions.keys()):
+                    try:
+                        if float(key) < window_start and key not in previous:
+                            del versions[key]
+                    except (TypeError, ValueError):
+                        del versions[key]
+        return delta, previous
+
+    def _rollback_versions(self, session_uid, previous):
+        """Restore versions of a failed write so the segments are re-sent on the next tick."""
+        with self.versions_lock:
+            versions = self.published_versions.get(session_uid)
+            if versions is None:
+                return
+            for key, version in previous.items():
+                if version is None:
+                    versions.pop(key, None)
+                else:
+                    versions[key] = version
+
+    def forget_session(self, session_uid):
+        """Drop delta-publishing state for a finished session."""
+        with self.versions_lock:
+            self.published_versions.pop(session_uid, None)
+
     def disconnect(self):
         """Disconnect from Redis and stop the connection thread."""
+        # Flush queued writes while the connection is still up
+        self.publisher_stop.set()
+        if self.publisher_thread and self.publisher_thread.is_alive():
+            self.publisher_thread.join(timeout=5.0)
+
         with self.connection_lock:
             self.stop_requested = True
             self.is_connected = False
@@ -241,24 +434,14 @@ class TranscriptionCollectorClient:
                 "start_timestamp": timestamp_iso
             }
             
-            # Publish to Redis stream
-            message = {
-                "payload": json.dumps(payload)
-            }
-            
-            result = self.redis_client.xadd(
-                self.stream_key,
-                message
-            )
-            
-            if result:
-                logging.info(f"Published session_start event for session {session_uid}")
-                # Mark this session as having a published start event
-                self.session_starts_published.add(session_uid)
+            # Queue on the transcription stream; the shared queue keeps it ahead of this session's segments.
+            # Marked as published up front so concurrent ticks don't queue duplicates; unmarked on failure.
+            self.session_starts_published.add(session_uid)
+            if self._enqueue_stream_message(payload, on_failure=lambda: self.session_starts_published.discard(session_uid)):
+                logging.info(f"Queued session_start event for session {session_uid}")
                 return True
-            else:
-                logging.error(f"Failed to publish session_start event for {session_uid}")
-                return False
+            logging.error(f"Failed to queue session_start event for {session_uid}")
+            return False
                 
         except Exception as e:
             logging.error(f"Error publishing session_start event: {e}")
@@ -344,23 +527,24 @@ class TranscriptionCollectorClient:
                 "uid": session_uid,
                 "end_timestamp": timestamp_iso
             }
-            message = {"payload": json.dumps(payload)}
-            result = self.redis_client.xadd(self.stream_key, message)
-            if result:
-                logging.info(f"Published session_end event for UID {session_uid} to {self.stream_key}")
+            if self._enqueue_stream_message(payload):
+                logging.info(f"Queued session_end event for UID {session_uid} to {self.stream_key}")
                 # Remove from published starts if present, as session is now considered ended
-                if session_uid in self.session_starts_published:
-                    self.session_starts_published.remove(session_uid)
+                self.session_starts_published.discard(session_uid)
+                self.forget_session(session_uid)
                 return True
             else:
-                logging.error(f"Failed to publish session_end for UID {session_uid} to {self.stream_key}")
+                logging.error(f"Failed to queue session_end for UID {session_uid} to {self.stream_key}")
                 return False
         except Exception as e:
             logging.error(f"Error publishing session_end for UID {session_uid} to {self.stream_key}: {e}")
             return False
 
-    def send_transcription(self, token, platform, meeting_id, segments, session_uid=None):
-        """Send transcription segments to Redis stream (self.stream_key).
+    def send_transcription(self, token, platform, meeting_id, segments, session_uid=None, trace=None):
+        """Send new or changed transcription segments to Redis stream (self.stream_key).
+
+        Segments already published with the same version are skipped; the write itself
+        is queued for the background publisher.
         
         Args:
             token: User's API token
@@ -368,6 +552,7 @@ class TranscriptionCollectorClient:
             meeting_id: Platform-specific meeting ID
             segments: List of transcription segments
             session_uid: Optional unique identifier for this session
+            trace: Optional latency trace context carried alongside the segments
             
         Returns:
             Boolean indicating success or failure
@@ -393,31 +578,27 @@ class TranscriptionCollectorClient:
             self.publish_session_start_event(token, platform, meeting_id, session_uid)
         
         try:
+            delta, previous = self._segment_delta(session_uid, segments)
+            if segments and not delta:
+                logging.debug(f"No new or changed segments for UID {session_uid}; skipping publish")
+                return True
+
             payload = {
                 "type": "transcription", 
                 "token": token,
                 "platform": platform, 
                 "meeting_id": meeting_id,
-                "segments": segments, 
+                "segments": delta, 
                 "uid": session_uid
             }
-            
-            message = {
-                # Per current structure, the whole payload is JSON dumped into one field
-                "payload": json.dumps(payload) 
-            }
-            
-            result = self.redis_client.xadd(
-                self.stream_key, 
-                message
-            )
-            
-            if result:
-                logging.debug(f"Published transcription with {len(segments)} segments for UID {session_uid} to {self.stream_key}")
+            if trace:
+                trace["enqueued_ts"] = time.time()
+                payload["trace"] = trace
+
+            if self._enqueue_stream_message(payload, on_failure=lambda: self._rollback_versions(session_uid, previous)):
+                logging.debug(f"Queued transcription with {len(delta)}/{len(segments)} segments for UID {session_uid} to {self.stream_key}")
                 return True
-            else:
-                logging.error(f"Failed to publish transcription for UID {session_uid} to {self.stream_key}")
-                return False
+            return False
                 
         except Exception as e:
             logging.error(f"Error publishing transcription for UID {session_uid} to {self.stream_key}: {e}")
@@ -526,10 +707,52 @@ class ClientManager:
         return False
 
 
+class InferenceLoadTracker:
+    """
+    Process-wide view of inference pressure, published to the instance registry.
+
+    `queue_depth` counts transcription calls that are running or waiting for the
+    model (e.g. on SINGLE_MODEL_LOCK). `rtf` is an EWMA of processing time over
+    audio duration; values approaching 1.0 mean the instance can no longer keep
+    up with real time.
+    """
+
+    def __init__(self, alpha=0.2):
+        self.alpha = alpha
+        self.lock = threading.Lock()
+        self.queue_depth = 0
+        self.rtf = 0.0
+        self.last_update_ts = None
+
+    def begin(self):
+        with self.lock:
+            self.queue_depth += 1
+        return time.monotonic()
+
+    def end(self, started, audio_duration_s):
+        elapsed = time.monotonic() - started
+        with self.lock:
+            self.queue_depth = max(0, self.queue_depth - 1)
+            if audio_duration_s and audio_duration_s > 0:
+                sample = elapsed / audio_duration_s
+                self.rtf = sample if self.last_update_ts is None else (
+                    self.alpha * sample + (1 - self.alpha) * self.rtf
+                )
+                self.last_update_ts = time.time()
+
+    def snapshot(self):
+        with self.lock:
+            return {"queue_depth": self.queue_depth, "rtf": round(self.rtf, 4)}
+
+
+INFERENCE_LOAD = InferenceLoadTracker()
+
+
 class BackendType(Enum):
     FASTER_WHISPER = "faster_whisper"
     TENSORRT = "tensorrt"
     REMOTE = "remote"
+    MOCK = "mock"
 
     @staticmethod
     def valid_types() -> List[str]:
@@ -548,6 +771,9 @@ class BackendType(Enum):
     def is_remote(self) -> bool:
         return self == BackendType.REMOTE
 
+    def is_mock(self) -> bool:
+        return self == BackendType.MOCK
+
 
 class TranscriptionServer:
     RATE = 16000
@@ -555,6 +781,7 @@ class TranscriptionServer:
     def __init__(self):
         self.client_manager = None
         self.no_voice_activity_chunks = 0
+        self.vad_detectors = {}
         self.use_vad = True
         self.single_model = False
         
@@ -578,6 +805,7 @@ class TranscriptionServer:
             logging.warning("REDIS_STREAM_URL not set. TranscriptionCollectorClient will not be initialized in TranscriptionServer.")
 
         self.is_healthy = False  # Represents WebSocket server readiness primarily
+        self.startup = StartupState()  # Model prefetch/load/warmup phases, served on /ready
         self.health_server = None
         self.backend = None # Initialize backend attribute
 
@@ -633,6 +861,8 @@ class TranscriptionServer:
 
         # --- WL discovery / addressing ---
         self._wl_redis = redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"), decode_responses=True)
+        # Meeting language profiles shared with other sessions and instances
+        self.language_profiles = LanguageProfileStore(self._wl_redis) if WL_LANGUAGE_PROFILE_ENABLED else None
         self._listen_port = int(os.getenv("WL_LISTEN_PORT", os.getenv("PORT", "9090")))
         # Prefer Nomad alloc-id for stable grouping; fall back to HOSTNAME or random uuid
         self._alloc_id = os.getenv("NOMAD_ALLOC_ID", os.getenv("HOSTNAME", str(uuid.uuid4())[:8]))
@@ -667,6 +897,20 @@ class TranscriptionServer:
         logging.info(f"🌐 WEBSOCKET URL CONFIGURED: {self._ws_url}")
         logging.info(f"🌐 WhisperLive WebSocket URL: {self._ws_url}")
         self._metric_stop_evt = threading.Event()
+
+        # --- Load registry (heartbeat consumed by bot-manager for routing) ---
+        self._registry_enabled = _def_bool(os.getenv("WL_REGISTRY_ENABLED", "true"))
+        self._registry_prefix = os.getenv("WL_REGISTRY_PREFIX", "wl:registry")
+        try:
+            self._registry_interval_s = float(os.getenv("WL_REGISTRY_HEARTBEAT_S", "5"))
+        except Exception:
+            self._registry_interval_s = 5.0
+        try:
+            self._registry_ttl_s = int(os.getenv("WL_REGISTRY_TTL_S", "15"))
+        except Exception:
+            self._registry_ttl_s = 15
+        self._registry_key = f"{self._registry_prefix}:{self._alloc_id}"
+        self._registry_device = "cuda" if torch.cuda.is_available() else "cpu"
         
         # Initialize Consul configuration
         self._consul_enabled = os.getenv("CONSUL_ENABLE", "false").strip().lower() in ("1", "true", "yes", "on")
@@ -731,6 +975,62 @@ class TranscriptionServer:
             self._metric_stop_evt.wait(30)  # Check every 30 seconds
     # --- End connection cleanup methods ---
 
+    # --- Load registry helpers ---
+    def _registry_payload(self):
+        clients = len(self.client_manager.clients) if self.client_manager else 0
+        load = INFERENCE_LOAD.snapshot()
+        return {
+            "ws_url": self._ws_url,
+            "backend": self.backend.value if self.backend else "",
+            "device": self._registry_device,
+            "clients": clients,
+            "max_clients": int(self.config_max_clients),
+            "queue_depth": load["queue_depth"],
+            "rtf": load["rtf"],
+            "healthy": 1 if self.is_healthy else 0,
+            "ts": round(time.time(), 3),
+        }
+
+    def _registry_heartbeat(self):
+        """Publish this instance's live load; the hash expires if heartbeats stop."""
+        payload = self._registry_payload()
+        pipe = self._wl_redis.pipeline(transaction=False)
+        pipe.hset(self._registry_key, mapping=payload)
+        pipe.expire(self._registry_key, self._registry_ttl_s)
+        pipe.zadd(self._registry_prefix, {self._alloc_id: payload["ts"]})
+        pipe.execute()
+
+    def _registry_loop(self):
+        """Heartbeat the load registry until shutdown."""
+        while not self._metric_stop_evt.is_set():
+            try:
+                self._registry_heartbeat()
+            except Exception as e:
+                logging.warning(f"REGISTRY_HEARTBEAT failed: {e}")
+            self._metric_stop_evt.wait(self._registry_interval_s)
+
+    def _registry_deregister(self):
+        if not self._registry_enabled:
+            return
+        try:
+            pipe = self._wl_redis.pipeline(transaction=False)
+            pipe.delete(self._registry_key)
+            pipe.zrem(self._registry_prefix, self._alloc_id)
+            pipe.execute()
+            logging.info(f"REGISTRY_DEREGISTERED: {self._alloc_id}")
+        except Exception as e:
+            logging.warning(f"REGISTRY_DEREGISTER failed: {e}")
+
+    def _registry_release_reservation(self, meeting_id):
+        """Drop the slot bot-manager reserved for this meeting now that the bot is counted as a client."""
+        if not self._registry_enabled or not meeting_id:
+            return
+        try:
+            self._wl_redis.zrem(f"{self._registry_prefix}:reservations:{self._alloc_id}", str(meeting_id))
+        except Exception as e:
+            logging.debug(f"REGISTRY_RESERVATION release failed for meeting {meeting_id}: {e}")
+    # --- End load registry helpers ---
+
     def _register_signal_handlers(self):
         import signal
         def _handler(signum, frame):
@@ -749,6 +1049,7 @@ class TranscriptionServer:
             self._metric_stop_evt.set()
         except Exception:
             pass
+        self._registry_deregister()
         
         # Clean up any remaining connections
         try:
@@ -775,6 +1076,16 @@ class TranscriptionServer:
             options = {}
         backend_str = options.get("backend", self.backend)
         backend = BackendType(backend_str)
+
+        # Start from the meeting's known language instead of re-detecting it
+        language = options.get("language")
+        language_source = None
+        if language is None and self.language_profiles is not None and not backend.is_tensorrt():
+            profile = self.language_profiles.get(options.get("meeting_id"))
+            if profile:
+                language = profile["language"]
+                language_source = "profile"
+                logger.info(f"LANGUAGE_PROFILE: meeting={options.get('meeting_id')}, language={language}, confidence={profile['confidence']:.4f}")
         
         # tensorrt client
         if backend.is_tensorrt():
@@ -793,13 +1104,14 @@ class TranscriptionServer:
                 collector_client_ref=self.collector_client,
                 server_options=self.server_options
             )
-        # remote client
-        elif backend.is_remote():
+        # remote client (or the synthetic mock, which shares its request flow)
+        elif backend.is_remote() or backend.is_mock():
             # Get model from options or env, handling None case
             remote_model = options.get("model") or os.getenv("REMOTE_TRANSCRIBER_MODEL")
-            client = ServeClientRemote(
+            client_cls = ServeClientMock if backend.is_mock() else ServeClientRemote
+            client = client_cls(
                 websocket,
-                language=options.get("language"),
+                language=language,
                 task=options.get("task", "transcribe"),
                 client_uid=options.get("uid"),
                 model=remote_model,
@@ -811,13 +1123,15 @@ class TranscriptionServer:
                 token=options.get("token"),
                 meeting_id=options.get("meeting_id"),
                 collector_client_ref=self.collector_client,
-                server_options=self.server_options
+                server_options=self.server_options,
+                language_profiles=self.language_profiles,
+                language_source=language_source
             )
         # faster-whisper client
         else:
             client = ServeClientFasterWhisper(
                 websocket,
-                language=options.get("language"),
+                language=language,
                 task=options.get("task", "transcribe"),
                 client_uid=options.get("uid"),
                 model=self.faster_whisper_custom_model_path or options.get("model", "small.en"),
@@ -830,7 +1144,9 @@ class TranscriptionServer:
                 token=options.get("token"),
                 meeting_id=options.get("meeting_id"),
                 collector_client_ref=self.collector_client,
-                server_options=self.server_options
+                server_options=self.server_options,
+                language_profiles=self.language_profiles,
+                language_source=language_source
             )
         self.client_manager.add_client(websocket, client)
         logging.info(f"Added client {client.client_uid}, total clients: {len(self.client_manager.clients)}")
@@ -961,25 +1277,6 @@ class TranscriptionServer:
         except Exception as e:
             logging.error(f"Error processing speaker activity update: {e}")
 
-    def handle_audio_chunk_metadata(self, websocket, control_message):
-        """
-        Handle audio chunk metadata messages from the bot.
-        These contain information about audio chunks being processed.
-        
-        Args:
-            websocket: The websocket connection
-            control_message: The parsed audio chunk metadata message
-        """
-        try:
-            payload = control_message.get("payload", {})
-            logging.debug(f"Audio Chunk Metadata received: {payload}")
-            
-            # Future Phase 2: Could be used for audio quality monitoring, chunk timing analysis, etc.
-            # For now, just log at debug level to avoid cluttering logs
-            
-        except Exception as e:
-            logging.error(f"Error processing audio chunk metadata: {e}")
-
     def handle_new_connection(self, websocket, faster_whisper_custom_model_path,
                               whisper_tensorrt_path, trt_multilingual):
         try:
@@ -1019,9 +1316,11 @@ class TranscriptionServer:
                 return False  # Indicates that the connection should not continue
 
             if self.backend and self.backend.is_tensorrt(): # Check if self.backend is not None
-                self.vad_detector = VoiceActivityDetector(frame_rate=self.RATE)
+                # One detector (stream on the shared engine) per connection
+                self.vad_detectors[websocket] = VoiceActivityDetector(frame_rate=self.RATE)
             self.initialize_client(websocket, options, faster_whisper_custom_model_path,
                                    whisper_tensorrt_path, trt_multilingual)
+            self._registry_release_reservation(options.get("meeting_id"))
             return True
         except json.JSONDecodeError:
             logging.error("Failed to decode JSON from client")
@@ -1103,10 +1402,10 @@ class TranscriptionServer:
         self.server_options = server_options or {}
         
         # Set max_clients based on backend type
-        if self.backend.is_remote():
+        if self.backend.is_remote() or self.backend.is_mock():
             # Remote mode always uses 1000 max clients (hardcoded for scalability)
             self.config_max_clients = 1000
-            logging.info("CONFIG: max_clients=1000 (hardcoded for remote backend)")
+            logging.info(f"CONFIG: max_clients=1000 (hardcoded for {self.backend.value} backend)")
         else:
             try:
                 self.config_max_clients = int(os.getenv("WL_MAX_CLIENTS", "10"))
@@ -1121,6 +1420,10 @@ class TranscriptionServer:
             self.start_health_check_server(host, 9091)
 
         logger.info(f"SERVER_START: host={host}, port={port}, backend={self.backend.value}, single_model={single_model}")
+        # Load and warm the model before registering anywhere or binding the websocket,
+        # so the first routed client never pays the cold start
+        self._preload_model()
+
         # Consul self-registration (if enabled)
         try:
             if getattr(self, "_consul_enabled", False):
@@ -1130,6 +1433,13 @@ class TranscriptionServer:
         
         # Start periodic connection cleanup
         threading.Thread(target=self._periodic_cleanup, daemon=True).start()
+
+        # Start load registry heartbeat
+        if self._registry_enabled:
+            threading.Thread(target=self._registry_loop, daemon=True).start()
+            logging.info(
+                f"REGISTRY: heartbeating {self._registry_key} every {self._registry_interval_s}s (ttl={self._registry_ttl_s}s)"
+            )
         
         with serve(
             functools.partial(
@@ -1143,6 +1453,7 @@ class TranscriptionServer:
             port
         ) as server:
             self.is_healthy = True # WebSocket server is up
+            self.startup.mark_ready()
             logger.info(f"SERVER_RUNNING: WhisperLive server running on {host}:{port} with health check on {host}:9091/health and max_clients={self.config_max_clients}")
             
             # Server started successfully
@@ -1157,6 +1468,26 @@ class TranscriptionServer:
 
             server.serve_forever()
 
+    def _preload_model(self):
+        if self.backend.is_faster_whisper() and WL_PRELOAD_MODEL and self.faster_whisper_custom_model_path:
+            try:
+                ServeClientFasterWhisper.preload(
+                    self.faster_whisper_custom_model_path, self.startup, single_model=self.single_model
+                )
+            except Exception as e:
+                # Fall back to loading on the first connection, as before
+                logging.error(f"STARTUP: model preload failed, loading on first connection instead: {e}")
+            return
+        if self.backend.is_tensorrt():
+            reason = "tensorrt engine is built and warmed on first connection"
+        elif not self.backend.is_faster_whisper():
+            reason = f"{self.backend.value} backend has no local model"
+        elif not WL_PRELOAD_MODEL:
+            reason = "WL_PRELOAD_MODEL disabled"
+        else:
+            reason = "no server-side model path; clients choose the model"
+        self.startup.skip("preload", reason)
+
     # --- Consul helpers ---
     def _consul_register_service(self):
         if not getattr(self, "_consul_enabled", False):
@@ -1373,7 +1704,7 @@ class TranscriptionServer:
                 after detecting no voice activity for more than three consecutive frames, it also triggers the
                 end-of-speech (EOS) flag for the client.
         """
-        if not self.vad_detector(frame_np):
+        if not self.vad_detectors[websocket](frame_np):
             self.no_voice_activity_chunks += 1
             if self.no_voice_activity_chunks > 3:
                 client = self.client_manager.get_client(websocket)
@@ -1390,6 +1721,9 @@ class TranscriptionServer:
         Args:
             websocket: The websocket associated with the client to be cleaned up.
         """
+        vad_detector = self.vad_detectors.pop(websocket, None)
+        if vad_detector is not None:
+            vad_detector.close()
         client = self.client_manager.get_client(websocket)
         if client:
             client_uid = client.client_uid if hasattr(client, 'client_uid') else 'unknown'
@@ -1456,9 +1790,17 @@ class TranscriptionServer:
                         self.end_headers()
                         self.wfile.write(f"Service Unavailable: {', '.join(unhealthy_reasons)}".encode('utf-8'))
                 
+                elif self.path == '/ready':
+                    # Ready once the model is loaded and warmed and the websocket is bound
+                    snapshot = self.transcription_server_instance.startup.snapshot()
+                    snapshot["ready"] = snapshot["ready"] and server_websocket_healthy
+                    self.send_response(200 if snapshot["ready"] else 503)
+                    self.send_header('Content-type', 'application/json')
+                    self.end_headers()
+                    self.wfile.write(json.dumps(snapshot).encode('utf-8'))
+
                 elif self.path == '/metrics':
                     # Provide JSON metrics for load monitoring
-                    import json
                     import hashlib
                     
                     # Handle case where transcription_server_instance is None
@@ -1502,6 +1844,9 @@ class TranscriptionServer:
                         "active_uid_count": len([u for u in uid_list if u]),
                         "active_token_count": len(set(token_hashes)),
                         "active_token_hashes": token_hashes,
+                        "inference_queue_depth": INFERENCE_LOAD.snapshot()["queue_depth"],
+                        "rtf": INFERENCE_LOAD.snapshot()["rtf"],
+                        "latency": stage_latency.snapshot(),
                         "timestamp": time.time()
                     }
                     
@@ -1640,10 +1985,8 @@ class TranscriptionServer:
         try:
             payload = control_message.get("payload", {})
             logging.debug(f"Audio Chunk Metadata received: {payload}")
-            
-            # Future Phase 2: Could be used for audio quality monitoring, chunk timing analysis, etc.
-            # For now, just log at debug level to avoid cluttering logs
-            
+            # Capture timestamp anchors the next audio chunk for latency tracing
+            client.note_chunk_metadata(payload)
         except Exception as e:
             logging.error(f"Error processing audio chunk metadata: {e}")
 
@@ -1660,12 +2003,18 @@ class ServeClientBase(object):
     def __init__(self, websocket, language="en", task="transcribe", client_uid=None, 
                  platform=None, meeting_url=None, token=None, meeting_id=None,
                  collector_client_ref: Optional[TranscriptionCollectorClient] = None,
-                 server_options: Optional[dict] = None):
+                 server_options: Optional[dict] = None,
+                 language_profiles: Optional[LanguageProfileStore] = None,
+                 language_source: Optional[str] = None):
         self.websocket = websocket
         # Track whether language was explicitly provided (not None)
         # This helps optimize language detection when language is not provided
         self.language_provided = language is not None
         self.language = language
+        # "client" (requested by the bot), "profile" (meeting profile), "detected", or None
+        self.language_source = language_source or ("client" if language is not None else None)
+        self.language_profiles = language_profiles
+        self.language_checked_at = time.time()
         self.task = task
         self.client_uid = client_uid or str(uuid.uuid4())
         self.platform = platform
@@ -1682,6 +2031,8 @@ class ServeClientBase(object):
         self.timestamp_offset = 0.0
         self.frames_np = None
         self.frames_offset = 0.0
+        # Absolute stream sample index of the chunk last returned by get_audio_chunk_for_processing
+        self.chunk_sample_offset = 0
         self.text = []
         self.current_out = ''
         self.prev_out = ''
@@ -1689,6 +2040,11 @@ class ServeClientBase(object):
         self.exit = False
         self.same_output_count = 0
 
+        # Latency tracing: (first sample offset, bot capture ts, server receive ts) per received chunk
+        self.samples_received = 0
+        self.pending_capture_ts = None
+        self.chunk_timeline = collections.deque(maxlen=2048)
+
         server_options = server_options or {}
         self.max_buffer_s = server_options.get("max_buffer_s", 45)
         self.discard_buffer_s = server_options.get("discard_buffer_s", 30)
@@ -1705,6 +2061,11 @@ class ServeClientBase(object):
 
         # threading
         self.lock = threading.Lock()
+
+        # Optional archive of the session's full audio (offline re-transcription, debugging)
+        self.audio_archive = get_audio_archive() if meeting_id is not None else None
+        if self.audio_archive:
+            self.audio_archive.open_session(meeting_id, self.client_uid, platform=platform, language=language, task=task)
         
         # Send SERVER_READY message
         ready_message = json.dumps({"status": self.SERVER_READY, "uid": self.client_uid})
@@ -1817,6 +2178,11 @@ class ServeClientBase(object):
 
         """
         self.lock.acquire()
+        self.chunk_timeline.append((self.samples_received, self.pending_capture_ts, time.time()))
+        self.pending_capture_ts = None
+        if self.audio_archive:
+            self.audio_archive.append(self.client_uid, frame_np, self.samples_received)
+        self.samples_received += frame_np.shape[0]
         if self.frames_np is not None and self.frames_np.shape[0] > self.max_buffer_s * self.RATE:
             self.frames_offset += self.discard_buffer_s
             self.frames_np = self.frames_np[int(self.discard_buffer_s * self.RATE):]
@@ -1831,6 +2197,49 @@ class ServeClientBase(object):
             self.frames_np = np.concatenate((self.frames_np, frame_np), axis=0)
         self.lock.release()
 
+    def note_chunk_metadata(self, payload):
+        """Remember the bot-side capture time of the audio chunk that follows this metadata message."""
+        try:
+            self.pending_capture_ts = float(payload["client_timestamp_ms"]) / 1000.0
+        except (KeyError, TypeError, ValueError):
+            self.pending_capture_ts = None
+
+    def build_trace(self, segments):
+        """
+        Build the latency trace context for the newest segment in `segments`.
+
+        The segment end time is mapped to an absolute sample offset and looked up in the
+        chunk timeline to find when that audio was captured by the bot and received here.
+
+        Returns:
+            dict or None: Trace context, or None if no segment carries an end time.
+        """
+        ends = []
+        for segment in segments:
+            try:
+                ends.append(float(segment["end"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+        if not ends:
+            return None
+        sample_offset = int(max(ends) * self.RATE)
+        captured_ts = received_ts = None
+        with self.lock:
+            for start_sample, capture_ts, recv_ts in reversed(self.chunk_timeline):
+                if start_sample <= sample_offset:
+                    captured_ts, received_ts = capture_ts, recv_ts
+                    break
+        transcribed_ts = time.time()
+        stage_latency.observe_between("capture_to_receive", captured_ts, received_ts)
+        stage_latency.observe_between("receive_to_transcribed", received_ts, transcribed_ts)
+        return {
+            "uid": self.client_uid,
+            "sample_offset": sample_offset,
+            "captured_ts": captured_ts,
+            "received_ts": received_ts,
+            "transcribed_ts": transcribed_ts,
+        }
+
     def clip_audio_if_no_valid_segment(self):
         """
         Update the timestamp offset based on audio buffer status.
@@ -1842,6 +2251,52 @@ class ServeClientBase(object):
                 duration = self.frames_np.shape[0] / self.RATE
                 self.timestamp_offset = self.frames_offset + duration - self.clip_retain_s
 
+    def language_check_due(self):
+        """
+        True when a language that came from the meeting profile or from detection should be
+        re-checked (every WL_LANGUAGE_REVALIDATE_S seconds). Backends run detection only;
+        decoding keeps the current language until revalidate_language accepts a switch.
+        """
+        if (self.language is None or self.language_source not in ("profile", "detected")
+                or WL_LANGUAGE_REVALIDATE_S <= 0):
+            return False
+        now = time.time()
+        if now - self.language_checked_at < WL_LANGUAGE_REVALIDATE_S:
+            return False
+        self.language_checked_at = now
+        return True
+
+    def remember_language(self, language, probability):
+        """Stores a confident detection in the meeting's language profile."""
+        if self.language_source is None:
+            self.language_source = "detected"
+        self.language_checked_at = time.time()
+        if self.language_profiles is not None:
+            self.language_profiles.save(self.meeting_id, language, probability, self.client_uid)
+
+    def revalidate_language(self, language, probability):
+        """
+        Applies the result of a detection-only re-check, switching language when the
+        meeting has confidently moved to another one.
+        """
+        probability = probability or 0.0
+        if not language:
+            return
+        if language == self.language:
+            self.remember_language(language, probability)
+            return
+        if probability < WL_LANGUAGE_SWITCH_MIN_PROB:
+            return
+        logger.info(f"LANGUAGE_SWITCH: client={self.client_uid}, {self.language} -> {language}, confidence={probability:.4f}")
+        self.language = language
+        self.language_source = "detected"
+        self.websocket.send(json.dumps({
+            "uid": self.client_uid,
+            "language": self.language,
+            "language_prob": probability
+        }))
+        self.remember_language(language, probability)
+
     def get_audio_chunk_for_processing(self):
         """
         Retrieves the next chunk of audio data for processing based on the current offsets.
@@ -1859,6 +2314,7 @@ class ServeClientBase(object):
         with self.lock:
             samples_take = max(0, (self.timestamp_offset - self.frames_offset) * self.RATE)
             input_bytes = self.frames_np[int(samples_take):].copy()
+            self.chunk_sample_offset = int(round(self.frames_offset * self.RATE)) + int(samples_take)
         duration = input_bytes.shape[0] / self.RATE
         return input_bytes, duration
 
@@ -1929,7 +2385,8 @@ class ServeClientBase(object):
                     platform=self.platform,
                     meeting_id=self.meeting_id,
                     segments=segments,
-                    session_uid=self.client_uid
+                    session_uid=self.client_uid,
+                    trace=self.build_trace(segments)
                 )
             
             # Logging: summary by default; full text only if WL_LOG_TRANSCRIPTS=true
@@ -1998,6 +2455,13 @@ class ServeClientBase(object):
         """
         logging.info("Cleaning up.")
         self.exit = True
+        if self.collector_client:
+            self.collector_client.forget_session(self.client_uid)
+        vad_timeline = getattr(self, "vad_timeline", None)
+        if vad_timeline is not None:
+            vad_timeline.close()
+        if self.audio_archive:
+            self.audio_archive.close_session(self.client_uid)
 
     def forward_to_collector(self, segments):
         """Forward transcriptions to the collector if available"""
@@ -2190,7 +2654,11 @@ class ServeClientTensorRT(ServeClientBase):
             try:
                 input_sample = input_bytes.copy()
                 logging.debug(f"[WhisperTensorRT:] Processing audio with duration: {duration}")
-                self.transcribe_audio(input_sample)
+                started = INFERENCE_LOAD.begin()
+                try:
+                    self.transcribe_audio(input_sample)
+                finally:
+                    INFERENCE_LOAD.end(started, duration)
 
             except Exception as e:
                 logging.error(f"[ERROR]: {e}")
@@ -2404,9 +2872,12 @@ class ServeClientFasterWhisper(ServeClientBase):
                  vad_parameters=None, use_vad=True, single_model=False, 
                  platform=None, meeting_url=None, token=None, meeting_id=None,
                  collector_client_ref: Optional[TranscriptionCollectorClient] = None,
-                 server_options: Optional[dict] = None):
+                 server_options: Optional[dict] = None,
+                 language_profiles: Optional[LanguageProfileStore] = None,
+                 language_source: Optional[str] = None):
         super().__init__(websocket, language, task, client_uid, platform, meeting_url, token, meeting_id,
-                         collector_client_ref=collector_client_ref, server_options=server_options)
+                         collector_client_ref=collector_client_ref, server_options=server_options,
+                         language_profiles=language_profiles, language_source=language_source)
         self.model_sizes = [
             "tiny", "tiny.en", "base", "base.en", "small", "small.en",
             "medium", "medium.en", "large-v2", "large-v3", "distil-small.en",
@@ -2422,6 +2893,7 @@ class ServeClientFasterWhisper(ServeClientBase):
         if self.model_size_or_path.endswith("en"):
             self.language = "en"
             self.language_provided = True  # Model-based language is considered "provided"
+            self.language_source = "model"
         else:
             self.language = language
             # language_provided is already set in base class based on original language parameter
@@ -2435,12 +2907,7 @@ class ServeClientFasterWhisper(ServeClientBase):
         self.same_output_threshold = server_options.get("same_output_threshold", 10)
         self.end_time_for_same_output = None
 
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        if device == "cuda":
-            major, _ = torch.cuda.get_device_capability(device)
-            self.compute_type = "float16" if major >= 7 else "float32"
-        else:
-            self.compute_type = "default" #"int8" #NOTE: maybe we use default here...
+        device, self.compute_type = self.device_and_compute_type()
 
         if self.model_size_or_path is None:
             return
@@ -2466,6 +2933,15 @@ class ServeClientFasterWhisper(ServeClientBase):
             return
 
         self.use_vad = use_vad
+        # Per-client even with a shared model: frames are keyed by this client's stream offsets
+        self.feature_cache = (
+            StreamingFeatureCache(self.transcriber.feature_extractor) if WL_FEATURE_CACHE else None
+        )
+        self.vad_timeline = None
+        if use_vad and WL_STREAMING_VAD:
+            self.vad_timeline = StreamingSpeechTimeline(
+                engine=get_shared_vad_engine() if WL_BATCHED_VAD else None
+            )
 
         # threading
         self.trans_thread = threading.Thread(target=self.speech_to_text)
@@ -2480,6 +2956,34 @@ class ServeClientFasterWhisper(ServeClientBase):
             )
         )
 
+    @staticmethod
+    def device_and_compute_type():
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        if device == "cuda":
+            major, _ = torch.cuda.get_device_capability(device)
+            return device, "float16" if major >= 7 else "float32"
+        return device, "default" #"int8" #NOTE: maybe we use default here...
+
+    @classmethod
+    def preload(cls, model_size_or_path, startup: StartupState, single_model=True):
+        """
+        Prefetch, load and warm the model before the server accepts connections.
+
+        With single_model the warmed model becomes SINGLE_MODEL, so the first client
+        reuses it; otherwise the load only populates the file and kernel caches.
+        """
+        device, compute_type = cls.device_and_compute_type()
+        with startup.phase("prefetch", model=str(model_size_or_path)) as info:
+            info["path"] = prefetch_model(model_size_or_path)
+        with startup.phase("load", device=device, compute_type=compute_type):
+            model = WhisperModel(info["path"], device=device, compute_type=compute_type, local_files_only=True)
+        with startup.phase("warmup", audio_s=WL_WARMUP_AUDIO_S, runs=WL_WARMUP_RUNS) as warm:
+            warm["segments"] = warmup_model(model)
+        if single_model:
+            with cls.SINGLE_MODEL_LOCK:
+                if cls.SINGLE_MODEL is None:
+                    cls.SINGLE_MODEL = model
+
     def create_model(self, device):
         """
         Instantiates a new model, sets it as the transcriber.
@@ -2537,6 +3041,7 @@ class ServeClientFasterWhisper(ServeClientBase):
             
             # Log the language detection to file in a more readable format
             logger.info(f"LANGUAGE_DETECTION: client={self.client_uid}, language={self.language}, confidence={info.language_probability:.4f}")
+            self.remember_language(self.language, info.language_probability)
 
     def transcribe_audio(self, input_sample):
         """
@@ -2559,21 +3064,52 @@ class ServeClientFasterWhisper(ServeClientBase):
         # Reduce language detection segments if language was not provided to speed up first transcription
         # Default is 10 segments (300 seconds), reduce to 1-2 segments (30-60 seconds) when auto-detecting
         language_detection_segments = 1 if not self.language_provided else int(os.getenv('LANGUAGE_DETECTION_SEGMENTS', '10'))
-        result, info = self.transcriber.transcribe(
-            input_sample,
-            initial_prompt=self.initial_prompt,
-            language=self.language,
-            task=self.task,
-            vad_filter=self.use_vad,
-            vad_parameters=self.vad_parameters if self.use_vad else None,
-            language_detection_segments=language_detection_segments)
-        if ServeClientFasterWhisper.SINGLE_MODEL:
-            ServeClientFasterWhisper.SINGLE_MODEL_LOCK.release()
+        try:
+            if self.language_check_due():
+                self.check_language(input_sample)
+            result, info = self.transcriber.transcribe(
+                input_sample,
+                initial_prompt=self.initial_prompt,
+                language=self.language,
+                task=self.task,
+                vad_filter=self.use_vad,
+                vad_parameters=self.vad_parameters if self.use_vad else None,
+                language_detection_segments=language_detection_segments,
+                feature_cache=self.feature_cache,
+                vad_timeline=self.vad_timeline,
+                audio_offset=self.chunk_sample_offset)
+        finally:
+            if ServeClientFasterWhisper.SINGLE_MODEL:
+                ServeClientFasterWhisper.SINGLE_MODEL_LOCK.release()
 
         if self.language is None and info is not None:
             self.set_language(info)
         return result
 
+    def check_language(self, input_sample):
+        """
+        Detection-only re-check of the session language on the current window: one
+        30-second encoder pass, no decoding, so no transcript is produced in a language
+        that has not been accepted yet.
+        """
+        try:
+            audio = input_sample
+            if self.use_vad:
+                vad_options = self.vad_parameters
+                if isinstance(vad_options, dict):
+                    vad_options = VadOptions(**vad_options)
+                speech_chunks = get_speech_timestamps(audio, vad_options)
+                if not speech_chunks:
+                    return
+                audio = np.concatenate(collect_chunks(audio, speech_chunks)[0], axis=0)
+            language, probability, _ = self.transcriber.detect_language(
+                audio=audio, language_detection_segments=1
+            )
+        except Exception as e:
+            logger.warning(f"LANGUAGE_CHECK: client={self.client_uid} detection failed: {e}")
+            return
+        self.revalidate_language(language, probability)
+
     def get_previous_output(self):
         """
         Retrieves previously generated transcription outputs if no new transcription is available
@@ -2654,7 +3190,11 @@ class ServeClientFasterWhisper(ServeClientBase):
                 continue
             try:
                 input_sample = input_bytes.copy()
-                result = self.transcribe_audio(input_sample)
+                started = INFERENCE_LOAD.begin()
+                try:
+                    result = self.transcribe_audio(input_sample)
+                finally:
+                    INFERENCE_LOAD.end(started, duration)
 
                 # Only block on language detection if language was not provided initially
                 # If language was provided, we can send transcription immediately
@@ -2846,15 +3386,19 @@ class ServeClientFasterWhisper(ServeClientBase):
 
 
 class ServeClientRemote(ServeClientBase):
+    BACKEND = "remote"
 
     def __init__(self, websocket, task="transcribe", language=None, 
                  client_uid=None, model=None, initial_prompt=None, 
                  vad_parameters=None, use_vad=True, 
                  platform=None, meeting_url=None, token=None, meeting_id=None,
                  collector_client_ref: Optional[TranscriptionCollectorClient] = None,
-                 server_options: Optional[dict] = None):
+                 server_options: Optional[dict] = None,
+                 language_profiles: Optional[LanguageProfileStore] = None,
+                 language_source: Optional[str] = None):
         super().__init__(websocket, language, task, client_uid, platform, meeting_url, token, meeting_id,
-                         collector_client_ref=collector_client_ref, server_options=server_options)
+                         collector_client_ref=collector_client_ref, server_options=server_options,
+                         language_profiles=language_profiles, language_source=language_source)
         
         # Log the critical parameters
         logging.info(f"Initializing Remote client {client_uid} with platform={platform}, meeting_url={meeting_url}, token={token}")
@@ -2872,7 +3416,7 @@ class ServeClientRemote(ServeClientBase):
         self.same_output_threshold = server_options.get("same_output_threshold", 10)
         self.end_time_for_same_output = None
 
-        if not REMOTE_AVAILABLE:
+        if self.BACKEND == "remote" and not REMOTE_AVAILABLE:
             logging.error("Remote transcriber is not available. Please install requests package and set REMOTE_TRANSCRIBER_* environment variables.")
             self.websocket.send(json.dumps({
                 "uid": self.client_uid,
@@ -2905,7 +3449,7 @@ class ServeClientRemote(ServeClientBase):
                 {
                     "uid": self.client_uid,
                     "message": self.SERVER_READY,
-                    "backend": "remote"
+                    "backend": self.BACKEND
                 }
             )
         )
@@ -2959,6 +3503,7 @@ class ServeClientRemote(ServeClientBase):
         # Reduce language detection segments if language was not provided to speed up first transcription
         # Default is 10 segments (300 seconds), reduce to 1-2 segments (30-60 seconds) when auto-detecting
         language_detection_segments = 1 if not self.language_provided else int(os.getenv('LANGUAGE_DETECTION_SEGMENTS', '10'))
+        # The remote API has no detection-only call, so a profiled language is not re-checked here
         result, info = self.transcriber.transcribe(
             input_sample,
             initial_prompt=self.initial_prompt,
@@ -3052,7 +3597,11 @@ class ServeClientRemote(ServeClientBase):
                 continue
             try:
                 input_sample = input_bytes.copy()
-                result = self.transcribe_audio(input_sample)
+                started = INFERENCE_LOAD.begin()
+                try:
+                    result = self.transcribe_audio(input_sample)
+                finally:
+                    INFERENCE_LOAD.end(started, duration)
 
                 # Only block on language detection if language was not provided initially
                 # If language was provided, we can send transcription immediately
@@ -3258,6 +3807,31 @@ class ServeClientRemote(ServeClientBase):
                 "language_prob": lang_prob
             }))
             logger.info(f"LANGUAGE_DETECTION: client={self.client_uid}, language={self.language}, confidence={lang_prob:.4f}")
+            self.remember_language(self.language, lang_prob)
+
+
+class ServeClientMock(ServeClientRemote):
+    """
+    Remote client flow driven by the synthetic MockTranscriber instead of a transcription service.
+
+    Used for capacity tests: buffering, VAD, segment bookkeeping and Redis publishing all run as
+    in production, while inference is replaced by scripted text and a configurable delay
+    (see whisper_live/mock_transcriber.py for the WL_MOCK_* settings).
+    """
+    BACKEND = "mock"
+
+    def create_model(self):
+        """
+        Instantiates a per-client MockTranscriber.
+        """
+        self.transcriber = MockTranscriber(sampling_rate=self.RATE)
+        logging.info(f"Mock transcriber for client {self.client_uid}: latency={self.transcriber.latency_s * 1000:.0f}ms, "
+                     f"jitter={self.transcriber.jitter_s * 1000:.0f}ms, rtf={self.transcriber.rtf}")
+
+    def transcribe_audio(self, input_sample):
+        # Keep segment boundaries stable across passes over the same audio
+        self.transcriber.audio_offset = self.chunk_sample_offset
+        return super().transcribe_audio(input_sample)
 
 
 # Add the missing TranscriptionBuffer class
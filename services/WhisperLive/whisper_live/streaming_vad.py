@@ -0,0 +1,221 @@
+"""Streaming Silero VAD over a client's growing audio buffer.
+
+``get_speech_timestamps`` re-scores the whole transcription window on every
+pass. ``StreamingSpeechTimeline`` keeps the per-window speech probabilities
+(512-sample windows on an absolute sample grid) together with the decoder state
+and context, runs the model only on windows completed since the last pass, and
+derives ``collect_chunks``-compatible speech chunks from the cached timeline
+using the same hysteresis and padding rules as faster-whisper.
+
+With a ``BatchedVadEngine`` the windows are scored on the shared engine (which
+then owns the recurrent state) instead of faster-whisper's own Silero sessions.
+"""
+import logging
+import uuid
+from typing import List, Optional
+
+import numpy as np
+
+from faster_whisper.vad import VadOptions, get_vad_model
+
+WINDOW_SAMPLES = 512
+CONTEXT_SAMPLES = 64
+
+
+class StreamingSpeechTimeline:
+    """Per-stream speech probability timeline keyed by absolute sample offset."""
+
+    def __init__(self, sampling_rate: int = 16000, engine=None):
+        self.sampling_rate = sampling_rate
+        self.engine = engine
+        self.stream_id = uuid.uuid4().hex
+        self.model = None if engine is not None else get_vad_model()
+        self.reset()
+
+    def reset(self, start: int = 0):
+        # Probabilities for windows base_window .. base_window + len(probs) - 1
+        self.probs = np.zeros(0, dtype=np.float32)
+        self.base_window = start // WINDOW_SAMPLES
+        # Samples of the window currently being filled, from pending_start
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.pending_start = self.base_window * WINDOW_SAMPLES
+        self.state = np.zeros((2, 1, 128), dtype=np.float32)
+        self.context = np.zeros(CONTEXT_SAMPLES, dtype=np.float32)
+        self.scored_windows = 0
+        if self.engine is not None:
+            self.engine.reset_stream(self.stream_id)
+
+    def close(self):
+        if self.engine is not None:
+            self.engine.release(self.stream_id)
+
+    @property
+    def next_window(self) -> int:
+        return self.base_window + len(self.probs)
+
+    def _score(self, windows: np.ndarray) -> np.ndarray:
+        """Run Silero on consecutive windows, carrying context and decoder state."""
+        if self.engine is not None:
+            probs = self.engine.score(self.stream_id, windows)
+            self.context = windows[-1, -CONTEXT_SAMPLES:].copy()
+            self.scored_windows += len(windows)
+            return probs
+        contexts = np.concatenate([self.context[None, :], windows[:-1, -CONTEXT_SAMPLES:]], axis=0)
+        encoder_input = np.concatenate([contexts, windows], axis=1)
+        encoder_output = self.model.encoder_session.run(None, {"input": encoder_input})[0]
+        encoder_output = encoder_output.reshape(len(windows), -1)
+        probs = np.empty(len(windows), dtype=np.float32)
+        state = self.state
+        for i in range(len(windows)):
+            out, state = self.model.decoder_session.run(
+                None, {"input": encoder_output[i:i + 1], "state": state}
+            )
+            probs[i] = float(np.asarray(out).reshape(-1)[0])
+        self.state = state
+        self.context = windows[-1, -CONTEXT_SAMPLES:].copy()
+        self.scored_windows += len(windows)
+        return probs
+
+    def _extend(self, audio: np.ndarray, offset: int) -> bool:
+        """Score windows completed by ``audio``; False if it does not continue the stream."""
+        cursor = self.pending_start + len(self.pending)
+        end = offset + len(audio)
+        if offset > cursor:
+            return False
+        context_start = self.pending_start - CONTEXT_SAMPLES
+        if self.scored_windows and offset <= context_start and end >= self.pending_start:
+            if not np.array_equal(self.context, audio[context_start - offset:self.pending_start - offset]):
+                return False
+        if len(self.pending) and offset <= self.pending_start:
+            seen = self.pending
+            incoming = audio[self.pending_start - offset:self.pending_start - offset + len(seen)]
+            if len(incoming) == len(seen) and not np.array_equal(seen, incoming):
+                return False
+        if end <= cursor:
+            return True
+        self.pending = np.concatenate([self.pending, audio[cursor - offset:].astype(np.float32)])
+        n_windows = len(self.pending) // WINDOW_SAMPLES
+        if n_windows:
+            windows = self.pending[:n_windows * WINDOW_SAMPLES].reshape(n_windows, WINDOW_SAMPLES)
+            self.probs = np.concatenate([self.probs, self._score(windows)])
+            self.pending = self.pending[n_windows * WINDOW_SAMPLES:]
+            self.pending_start += n_windows * WINDOW_SAMPLES
+        return True
+
+    def speech_chunks(
+        self, audio: np.ndarray, offset: int, vad_options: Optional[VadOptions] = None
+    ) -> List[dict]:
+        """Speech chunks of ``audio`` (sample ranges relative to it), like ``get_speech_timestamps``."""
+        if vad_options is None:
+            vad_options = VadOptions()
+        audio = np.asarray(audio, dtype=np.float32)
+        first = -(-offset // WINDOW_SAMPLES)
+        if first < self.base_window or not self._extend(audio, offset):
+            logging.debug(f"Streaming VAD reset at sample {offset}")
+            self.reset(first * WINDOW_SAMPLES)
+            self._extend(audio[first * WINDOW_SAMPLES - offset:], first * WINDOW_SAMPLES)
+
+        # Windows before the requested range are never read again
+        if first > self.base_window:
+            drop = min(first - self.base_window, len(self.probs))
+            self.probs = self.probs[drop:]
+            self.base_window += drop
+
+        end_window = (offset + len(audio)) // WINDOW_SAMPLES
+        probs = self.probs[first - self.base_window:end_window - self.base_window]
+        return _speeches_from_probs(
+            probs, first * WINDOW_SAMPLES - offset, len(audio), vad_options, self.sampling_rate
+        )
+
+
+def _speeches_from_probs(
+    speech_probs: np.ndarray,
+    first_position: int,
+    audio_length_samples: int,
+    vad_options: VadOptions,
+    sampling_rate: int,
+) -> List[dict]:
+    """faster-whisper's speech segmentation over probabilities of windows starting at first_position."""
+    window_size_samples = WINDOW_SAMPLES
+    onset = vad_options.onset
+    offset = vad_options.offset
+    min_speech_samples = sampling_rate * vad_options.min_speech_duration_ms / 1000
+    speech_pad_samples = sampling_rate * vad_options.speech_pad_ms / 1000
+    max_speech_samples = (
+        sampling_rate * vad_options.max_speech_duration_s
+        - window_size_samples
+        - 2 * speech_pad_samples
+    )
+    min_silence_samples = sampling_rate * vad_options.min_silence_duration_ms / 1000
+    min_silence_samples_at_max_speech = sampling_rate * 98 / 1000
+
+    triggered = False
+    speeches = []
+    current_speech = {}
+    temp_end = 0
+    prev_end = next_start = 0
+
+    for i, speech_prob in enumerate(speech_probs):
+        position = first_position + window_size_samples * i
+        if (speech_prob >= onset) and temp_end:
+            temp_end = 0
+            if next_start < prev_end:
+                next_start = position
+
+        if (speech_prob >= onset) and not triggered:
+            triggered = True
+            current_speech["start"] = position
+            continue
+
+        if triggered and position - current_speech["start"] > max_speech_samples:
+            if prev_end:
+                current_speech["end"] = prev_end
+                speeches.append(current_speech)
+                current_speech = {}
+                if next_start < prev_end:
+                    triggered = False
+                else:
+                    current_speech["start"] = next_start
+                prev_end = next_start = temp_end = 0
+            else:
+                current_speech["end"] = position
+                speeches.append(current_speech)
+                current_speech = {}
+                prev_end = next_start = temp_end = 0
+                triggered = False
+                continue
+
+        if (speech_prob < offset) and triggered:
+            if not temp_end:
+                temp_end = position
+            if position - temp_end > min_silence_samples_at_max_speech:
+                prev_end = temp_end
+            if position - temp_end < min_silence_samples:
+                continue
+            current_speech["end"] = temp_end
+            if (current_speech["end"] - current_speech["start"]) > min_speech_samples:
+                speeches.append(current_speech)
+            current_speech = {}
+            prev_end = next_start = temp_end = 0
+            triggered = False
+            continue
+
+    if current_speech and (audio_length_samples - current_speech["start"]) > min_speech_samples:
+        current_speech["end"] = audio_length_samples
+        speeches.append(current_speech)
+
+    for i, speech in enumerate(speeches):
+        if i == 0:
+            speech["start"] = int(max(0, speech["start"] - speech_pad_samples))
+        if i != len(speeches) - 1:
+            silence_duration = speeches[i + 1]["start"] - speech["end"]
+            if silence_duration < 2 * speech_pad_samples:
+                speech["end"] += int(silence_duration // 2)
+                speeches[i + 1]["start"] = int(max(0, speeches[i + 1]["start"] - silence_duration // 2))
+            else:
+                speech["end"] = int(min(audio_length_samples, speech["end"] + speech_pad_samples))
+                speeches[i + 1]["start"] = int(max(0, speeches[i + 1]["start"] - speech_pad_samples))
+        else:
+            speech["end"] = int(min(audio_length_samples, speech["end"] + speech_pad_samples))
+
+    return speeches
@@ -19,6 +19,8 @@ import tokenizers
 from tqdm import tqdm
 
 from . import settings
+from .feature_cache import StreamingFeatureCache
+from .streaming_vad import StreamingSpeechTimeline
 
 from faster_whisper.audio import decode_audio, pad_or_trim
 from faster_whisper.feature_extractor import FeatureExtractor
@@ -757,6 +759,9 @@ class WhisperModel:
         hotwords: Optional[str] = None,
         language_detection_threshold: Optional[float] = 0.5,
         language_detection_segments: int = int(os.getenv('LANGUAGE_DETECTION_SEGMENTS', '10')), 
+        feature_cache: Optional[StreamingFeatureCache] = None,
+        vad_timeline: Optional[StreamingSpeechTimeline] = None,
+        audio_offset: Optional[int] = None,
     ) -> Tuple[Iterable[Segment], TranscriptionInfo]:
         """Transcribes an input file.
 
@@ -826,6 +831,12 @@ class WhisperModel:
           language_detection_threshold: If the maximum probability of the language tokens is higher
            than this value, the language is detected.
           language_detection_segments: Number of segments to consider for the language detection.
+          feature_cache: Optional StreamingFeatureCache holding log-mel frames from previous
+            calls on the same stream. Used together with audio_offset.
+          vad_timeline: Optional StreamingSpeechTimeline holding VAD probabilities from
+            previous calls on the same stream. Used together with audio_offset.
+          audio_offset: Absolute stream sample index of audio[0] when feature_cache or
+            vad_timeline is set.
         Returns:
           A tuple with:
 
@@ -846,6 +857,7 @@ class WhisperModel:
 
         duration = audio.shape[0] / sampling_rate
         duration_after_vad = duration
+        stream_audio = audio
 
         self.logger.info(
             "Processing audio with duration %s", format_timestamp(duration)
@@ -856,7 +868,10 @@ class WhisperModel:
                 vad_parameters = VadOptions()
             elif isinstance(vad_parameters, dict):
                 vad_parameters = VadOptions(**vad_parameters)
-            speech_chunks = get_speech_timestamps(audio, vad_parameters)
+            if vad_timeline is not None and audio_offset is not None:
+                speech_chunks = vad_timeline.speech_chunks(audio, audio_offset, vad_parameters)
+            else:
+                speech_chunks = get_speech_timestamps(audio, vad_parameters)
             audio_chunks, chunks_metadata = collect_chunks(audio, speech_chunks)
             audio = np.concatenate(audio_chunks, axis=0)
             duration_after_vad = audio.shape[0] / sampling_rate
@@ -883,7 +898,10 @@ class WhisperModel:
             speech_chunks = None
         if audio.shape[0] == 0:
             return None, None
-        features = self.feature_extractor(audio, chunk_length=chunk_length)
+        if feature_cache is not None and audio_offset is not None and chunk_length is None:
+            features = feature_cache.features(stream_audio, audio_offset, speech_chunks)
+        else:
+            features = self.feature_extractor(audio, chunk_length=chunk_length)
 
         encoder_output = None
         all_language_probs = None
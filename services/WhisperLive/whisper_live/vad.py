@@ -1,26 +1,43 @@
 import os
 import subprocess
-import torch
+import threading
+import time
+import uuid
+import logging
 import numpy as np
 import onnxruntime
 import warnings
 
 
-class VoiceActivityDetection():
+WINDOW_SAMPLES = 512
+CONTEXT_SAMPLES = 64
 
-    def __init__(self, force_onnx_cpu=True):
-        path = self.download()
+# Streams scored together in one ONNX run, and how long the batcher waits for more work
+WL_VAD_MAX_BATCH = int(os.getenv("WL_VAD_MAX_BATCH", "256"))
+WL_VAD_LINGER_MS = float(os.getenv("WL_VAD_LINGER_MS", "2"))
+WL_VAD_INTRA_OP_THREADS = int(os.getenv("WL_VAD_INTRA_OP_THREADS", "1"))
 
-        opts = onnxruntime.SessionOptions()
-        opts.log_severity_level = 3
 
-        opts.inter_op_num_threads = 1
-        opts.intra_op_num_threads = 1
+def _session_options(intra_op_threads=1):
+    opts = onnxruntime.SessionOptions()
+    opts.log_severity_level = 3
+    opts.inter_op_num_threads = 1
+    opts.intra_op_num_threads = intra_op_threads
+    return opts
 
-        if force_onnx_cpu and 'CPUExecutionProvider' in onnxruntime.get_available_providers():
-            self.session = onnxruntime.InferenceSession(path, providers=['CPUExecutionProvider'], sess_options=opts)
-        else:
-            self.session = onnxruntime.InferenceSession(path, providers=['CUDAExecutionProvider'], sess_options=opts)
+
+def _create_session(path, force_onnx_cpu=True, intra_op_threads=1):
+    opts = _session_options(intra_op_threads)
+    if force_onnx_cpu and 'CPUExecutionProvider' in onnxruntime.get_available_providers():
+        return onnxruntime.InferenceSession(path, providers=['CPUExecutionProvider'], sess_options=opts)
+    return onnxruntime.InferenceSession(path, providers=['CUDAExecutionProvider'], sess_options=opts)
+
+
+class VoiceActivityDetection():
+
+    def __init__(self, force_onnx_cpu=True):
+        path = self.download()
+        self.session = _create_session(path, force_onnx_cpu)
 
         self.reset_states()
         if '16k' in path:
@@ -30,14 +47,15 @@ class VoiceActivityDetection():
             self.sample_rates = [8000, 16000]
 
     def _validate_input(self, x, sr: int):
-        if x.dim() == 1:
-            x = x.unsqueeze(0)
-        if x.dim() > 2:
-            raise ValueError(f"Too many dimensions for input audio chunk {x.dim()}")
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[None, :]
+        if x.ndim > 2:
+            raise ValueError(f"Too many dimensions for input audio chunk {x.ndim}")
 
         if sr != 16000 and (sr % 16000 == 0):
             step = sr // 16000
-            x = x[:,::step]
+            x = x[:, ::step]
             sr = 16000
 
         if sr not in self.sample_rates:
@@ -48,8 +66,8 @@ class VoiceActivityDetection():
         return x, sr
 
     def reset_states(self, batch_size=1):
-        self._state = torch.zeros((2, batch_size, 128)).float()
-        self._context = torch.zeros(0)
+        self._state = np.zeros((2, batch_size, 128), dtype=np.float32)
+        self._context = np.zeros(0, dtype=np.float32)
         self._last_sr = 0
         self._last_batch_size = 0
 
@@ -72,14 +90,12 @@ class VoiceActivityDetection():
             self.reset_states(batch_size)
 
         if not len(self._context):
-            self._context = torch.zeros(batch_size, context_size)
+            self._context = np.zeros((batch_size, context_size), dtype=np.float32)
 
-        x = torch.cat([self._context, x], dim=1)
+        x = np.concatenate([self._context, x], axis=1)
         if sr in [8000, 16000]:
-            ort_inputs = {'input': x.numpy(), 'state': self._state.numpy(), 'sr': np.array(sr, dtype='int64')}
-            ort_outs = self.session.run(None, ort_inputs)
-            out, state = ort_outs
-            self._state = torch.from_numpy(state)
+            ort_inputs = {'input': x, 'state': self._state, 'sr': np.array(sr, dtype='int64')}
+            out, self._state = self.session.run(None, ort_inputs)
         else:
             raise ValueError()
 
@@ -87,7 +103,6 @@ class VoiceActivityDetection():
         self._last_sr = sr
         self._last_batch_size = batch_size
 
-        out = torch.from_numpy(out)
         return out
 
     def audio_forward(self, x, sr: int):
@@ -98,15 +113,14 @@ class VoiceActivityDetection():
 
         if x.shape[1] % num_samples:
             pad_num = num_samples - (x.shape[1] % num_samples)
-            x = torch.nn.functional.pad(x, (0, pad_num), 'constant', value=0.0)
+            x = np.pad(x, ((0, 0), (0, pad_num)))
 
         for i in range(0, x.shape[1], num_samples):
             wavs_batch = x[:, i:i+num_samples]
             out_chunk = self.__call__(wavs_batch, sr)
             outs.append(out_chunk)
 
-        stacked = torch.cat(outs, dim=1)
-        return stacked.cpu()
+        return np.concatenate(outs, axis=1)
 
     @staticmethod
     def download(model_url="https://github.com/snakers4/silero-vad/raw/v5.0/files/silero_vad.onnx"):
@@ -128,17 +142,177 @@ class VoiceActivityDetection():
         return model_filename
 
 
+class _VadStream:
+    """Recurrent state, context and not-yet-windowed samples of one audio stream."""
+
+    __slots__ = ("state", "context", "pending")
+
+    def __init__(self):
+        self.state = np.zeros((2, 128), dtype=np.float32)
+        self.context = np.zeros(CONTEXT_SAMPLES, dtype=np.float32)
+        self.pending = np.zeros(0, dtype=np.float32)
+
+
+class _VadRequest:
+    __slots__ = ("stream_id", "windows", "probs", "cursor", "done", "error")
+
+    def __init__(self, stream_id, windows):
+        self.stream_id = stream_id
+        self.windows = windows
+        self.probs = np.empty(len(windows), dtype=np.float32)
+        self.cursor = 0
+        self.done = threading.Event()
+        self.error = None
+
+
+class BatchedVadEngine:
+    """Silero VAD shared by all streams of a server process.
+
+    Callers submit 512-sample windows for their stream and block until scored.
+    A single worker thread advances every waiting stream by one window per
+    ONNX run, stacking streams along the batch dimension, so one session call
+    serves up to ``max_batch`` streams. Per-stream decoder state and the 64
+    sample context are owned by the engine and only touched by the worker.
+    """
+
+    def __init__(self, model_path=None, max_batch=WL_VAD_MAX_BATCH, linger_ms=WL_VAD_LINGER_MS,
+                 intra_op_threads=WL_VAD_INTRA_OP_THREADS, force_onnx_cpu=True):
+        self.session = _create_session(model_path or VoiceActivityDetection.download(),
+                                       force_onnx_cpu, intra_op_threads)
+        self.max_batch = max(1, max_batch)
+        self.linger_s = max(0.0, linger_ms) / 1000.0
+        self._sr = np.array(16000, dtype='int64')
+        self._streams = {}
+        self._queue = []
+        self._cond = threading.Condition()
+        self.runs = 0
+        self.windows_scored = 0
+        self._worker = threading.Thread(target=self._run, name="vad-batcher", daemon=True)
+        self._worker.start()
+
+    def score(self, stream_id, windows):
+        """Speech probabilities for consecutive ``(n, 512)`` windows of ``stream_id``."""
+        windows = np.ascontiguousarray(windows, dtype=np.float32).reshape(-1, WINDOW_SAMPLES)
+        if not len(windows):
+            return np.zeros(0, dtype=np.float32)
+        request = _VadRequest(stream_id, windows)
+        with self._cond:
+            self._queue.append(request)
+            self._cond.notify()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.probs
+
+    def process(self, stream_id, audio):
+        """Append ``audio`` to the stream and score every window it completes."""
+        with self._cond:
+            stream = self._streams.setdefault(stream_id, _VadStream())
+            buffered = np.concatenate([stream.pending, np.asarray(audio, dtype=np.float32).reshape(-1)])
+            n_windows = len(buffered) // WINDOW_SAMPLES
+            stream.pending = buffered[n_windows * WINDOW_SAMPLES:]
+        return self.score(stream_id, buffered[:n_windows * WINDOW_SAMPLES])
+
+    def reset_stream(self, stream_id):
+        with self._cond:
+            self._streams[stream_id] = _VadStream()
+
+    def release(self, stream_id):
+        with self._cond:
+            self._streams.pop(stream_id, None)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "streams": len(self._streams),
+                "queued": len(self._queue),
+                "runs": self.runs,
+                "windows_scored": self.windows_scored,
+            }
+
+    def _take_batch(self):
+        """Wait for work, then take at most one request per stream (windows must stay in order)."""
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+        if self.linger_s:
+            time.sleep(self.linger_s)
+        with self._cond:
+            batch, rest, seen = [], [], set()
+            for request in self._queue:
+                if request.stream_id in seen:
+                    rest.append(request)
+                else:
+                    seen.add(request.stream_id)
+                    batch.append(request)
+            self._queue = rest
+            streams = [self._streams.setdefault(r.stream_id, _VadStream()) for r in batch]
+        return batch, streams
+
+    def _run(self):
+        while True:
+            batch, streams = self._take_batch()
+            try:
+                self._advance(batch, streams)
+            except Exception as e:
+                logging.error(f"Batched VAD run failed: {e}")
+                for request in batch:
+                    request.error = e
+            for request in batch:
+                request.done.set()
+
+    def _advance(self, batch, streams):
+        active = list(range(len(batch)))
+        while active:
+            for start in range(0, len(active), self.max_batch):
+                group = active[start:start + self.max_batch]
+                frames = np.stack([
+                    np.concatenate([streams[i].context, batch[i].windows[batch[i].cursor]]) for i in group
+                ])
+                state = np.stack([streams[i].state for i in group], axis=1)
+                out, new_state = self.session.run(None, {'input': frames, 'state': state, 'sr': self._sr})
+                out = np.asarray(out).reshape(len(group), -1)[:, 0]
+                for j, i in enumerate(group):
+                    request, stream = batch[i], streams[i]
+                    request.probs[request.cursor] = out[j]
+                    stream.state = new_state[:, j, :]
+                    stream.context = frames[j, -CONTEXT_SAMPLES:]
+                    request.cursor += 1
+                self.runs += 1
+                self.windows_scored += len(group)
+            active = [i for i in active if batch[i].cursor < len(batch[i].windows)]
+
+
+_shared_engine = None
+_shared_engine_lock = threading.Lock()
+
+
+def get_shared_vad_engine():
+    """Process-wide BatchedVadEngine, created on first use."""
+    global _shared_engine
+    with _shared_engine_lock:
+        if _shared_engine is None:
+            _shared_engine = BatchedVadEngine()
+        return _shared_engine
+
+
 class VoiceActivityDetector:
-    def __init__(self, threshold=0.5, frame_rate=16000):
+    def __init__(self, threshold=0.5, frame_rate=16000, engine=None):
         """
         Initializes the VoiceActivityDetector with a voice activity detection model and a threshold.
 
         Args:
             threshold (float, optional): The probability threshold for detecting voice activity. Defaults to 0.5.
+            engine (BatchedVadEngine, optional): Engine to score frames with. Defaults to the process-wide
+                                                 shared engine; each detector is its own stream on it.
         """
-        self.model = VoiceActivityDetection()
+        if frame_rate != 16000:
+            raise ValueError("VoiceActivityDetector supports only 16000 sampling rate")
+        self.engine = engine or get_shared_vad_engine()
+        self.stream_id = uuid.uuid4().hex
         self.threshold = threshold
         self.frame_rate = frame_rate
+        self.last_result = False
 
     def __call__(self, audio_frame):
         """
@@ -151,7 +325,13 @@ class VoiceActivityDetector:
 
         Returns:
             bool: True if the speech probability exceeds the threshold, indicating the presence of voice activity;
-                  False otherwise.
+                  False otherwise. Samples short of a full 512-sample window are carried over to the next call,
+                  which then repeats the previous result if no window completes.
         """
-        speech_probs = self.model.audio_forward(torch.from_numpy(audio_frame.copy()), self.frame_rate)[0]
-        return torch.any(speech_probs > self.threshold).item()
+        speech_probs = self.engine.process(self.stream_id, audio_frame)
+        if len(speech_probs):
+            self.last_result = bool(np.any(speech_probs > self.threshold))
+        return self.last_result
+
+    def close(self):
+        self.engine.release(self.stream_id)
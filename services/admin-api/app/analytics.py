@@ -0,0 +1,154 @@
+"""
+SQL-side aggregates for the admin analytics endpoints.
+
+Every statement here returns one row (or one row per listed entity) computed by
+PostgreSQL with GROUP BY / FILTER / count(DISTINCT ...), so endpoint memory does
+not grow with a user's meeting count or a meeting's transcript count.
+"""
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import Float, Integer, and_, cast, distinct, func, select, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.sql import Select
+
+from shared_models.models import Meeting, Transcription, User
+from shared_models.pagination import keyset_paginate
+from shared_models.schemas import MeetingStatus, TranscriptionStats, UserMeetingStats, UserUsagePatterns
+
+ACTIVE_STATUSES = (
+    MeetingStatus.REQUESTED.value,
+    MeetingStatus.JOINING.value,
+    MeetingStatus.AWAITING_ADMISSION.value,
+    MeetingStatus.ACTIVE.value,
+)
+PEAK_HOURS = 3
+
+
+def user_with_meeting_stats(user_id: int) -> Select:
+    """The user row joined with its meeting aggregates (one round trip)."""
+    completed_with_duration = and_(
+        Meeting.status == MeetingStatus.COMPLETED.value,
+        Meeting.start_time.isnot(None),
+        Meeting.end_time.isnot(None),
+    )
+    duration = cast(func.extract('epoch', Meeting.end_time - Meeting.start_time), Float)
+
+    hour = cast(func.date_part('hour', Meeting.created_at), Integer).label("hour")
+    hour_counts = (
+        select(hour, func.count().label("n"))
+        .where(Meeting.user_id == user_id)
+        .group_by(hour)
+        .order_by(func.count().desc(), hour)
+        .limit(PEAK_HOURS)
+        .subquery()
+    )
+    peak_hours = select(
+        func.array_agg(aggregate_order_by(hour_counts.c.hour, hour_counts.c.n.desc(), hour_counts.c.hour))
+    ).scalar_subquery()
+    top_platform = (
+        select(Meeting.platform)
+        .where(Meeting.user_id == user_id)
+        .group_by(Meeting.platform)
+        .order_by(func.count().desc(), Meeting.platform)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    stats = (
+        select(
+            func.count().label("total_meetings"),
+            func.count().filter(Meeting.status == MeetingStatus.COMPLETED.value).label("completed_meetings"),
+            func.count().filter(Meeting.status == MeetingStatus.FAILED.value).label("failed_meetings"),
+            func.count().filter(Meeting.status.in_(ACTIVE_STATUSES)).label("active_meetings"),
+            func.sum(duration).filter(completed_with_duration).label("total_duration"),
+            func.avg(duration).filter(completed_with_duration).label("average_duration"),
+            func.min(Meeting.created_at).label("first_activity"),
+            func.max(Meeting.created_at).label("last_activity"),
+            top_platform.label("most_used_platform"),
+            peak_hours.label("peak_usage_hours"),
+        )
+        .where(Meeting.user_id == user_id)
+        .subquery()
+    )
+    return select(User, stats).join(stats, true()).where(User.id == user_id)
+
+
+def user_stats_from_row(row: Any, now: Optional[datetime] = None) -> tuple:
+    """(UserMeetingStats, UserUsagePatterns) from a ``user_with_meeting_stats`` row."""
+    meeting_stats = UserMeetingStats(
+        total_meetings=row.total_meetings,
+        completed_meetings=row.completed_meetings,
+        failed_meetings=row.failed_meetings,
+        active_meetings=row.active_meetings,
+        total_duration=row.total_duration,
+        average_duration=row.average_duration,
+    )
+    meetings_per_day = 0.0
+    if row.total_meetings and row.first_activity:
+        days_since_first = ((now or datetime.utcnow()) - row.first_activity).days + 1
+        meetings_per_day = row.total_meetings / days_since_first if days_since_first > 0 else 0
+    usage_patterns = UserUsagePatterns(
+        most_used_platform=row.most_used_platform,
+        meetings_per_day=meetings_per_day,
+        peak_usage_hours=list(row.peak_usage_hours or []),
+        last_activity=row.last_activity,
+    )
+    return meeting_stats, usage_patterns
+
+
+def meeting_with_transcription_stats(meeting_id: int) -> Select:
+    """The meeting row joined with its transcript aggregates (one round trip)."""
+    speaker = func.nullif(Transcription.speaker, '')
+    language = func.nullif(Transcription.language, '')
+    stats = (
+        select(
+            func.count().label("total_transcriptions"),
+            func.coalesce(cast(func.sum(Transcription.end_time - Transcription.start_time), Float), 0.0).label("total_duration"),
+            func.count(distinct(speaker)).label("unique_speakers"),
+            func.array_agg(distinct(language)).filter(language.isnot(None)).label("languages_detected"),
+        )
+        .where(Transcription.meeting_id == meeting_id)
+        .subquery()
+    )
+    return select(Meeting, stats).join(stats, true()).where(Meeting.id == meeting_id)
+
+
+def transcription_stats_from_row(row: Any) -> Optional[TranscriptionStats]:
+    if not row.total_transcriptions:
+        return None
+    return TranscriptionStats(
+        total_transcriptions=row.total_transcriptions,
+        total_duration=row.total_duration,
+        unique_speakers=row.unique_speakers,
+        languages_detected=list(row.languages_detected or []),
+    )
+
+
+def users_table(cursor: Optional[str], limit: int, skip: int = 0) -> Select:
+    """UserTableResponse columns only (no JSONB), newest first, one keyset page."""
+    stmt = select(
+        User.id,
+        User.email,
+        User.name,
+        User.image_url,
+        User.created_at,
+        User.max_concurrent_bots,
+    )
+    return keyset_paginate(stmt, User.created_at, User.id, cursor, limit).offset(skip)
+
+
+def meetings_table(cursor: Optional[str], limit: int, skip: int = 0) -> Select:
+    """MeetingTableResponse columns only (no JSONB), newest first, one keyset page."""
+    stmt = select(
+        Meeting.id,
+        Meeting.user_id,
+        Meeting.platform,
+        Meeting.platform_specific_id.label("native_meeting_id"),
+        Meeting.status,
+        Meeting.start_time,
+        Meeting.end_time,
+        Meeting.created_at,
+        Meeting.updated_at,
+    )
+    return keyset_paginate(stmt, Meeting.created_at, Meeting.id, cursor, limit).offset(skip)
@@ -2,12 +2,12 @@ import logging
 import secrets
 import string
 import os
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, Security, Response
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, Security, Response, Query
 from fastapi.security import APIKeyHeader
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload, attributes
-from typing import List # Import List for response model
+from typing import List, Optional # Import List for response model
 from datetime import datetime # Import datetime
 from sqlalchemy import func
 from pydantic import BaseModel, HttpUrl
@@ -15,12 +15,14 @@ from pydantic import BaseModel, HttpUrl
 # Import shared models and schemas
 from shared_models.models import User, APIToken, Base, Meeting, Transcription, MeetingSession # Import Base for init_db and Meeting
 from shared_models.schemas import (UserCreate, UserResponse, TokenResponse, UserDetailResponse, UserBase, UserUpdate, MeetingResponse,
-                                 UserTableResponse, MeetingTableResponse, MeetingSessionResponse, TranscriptionStats, 
-                                 MeetingPerformanceMetrics, MeetingTelematicsResponse, UserMeetingStats, 
-                                 UserUsagePatterns, UserAnalyticsResponse) # Import analytics schemas
+                                 UserTableResponse, MeetingTableResponse, MeetingSessionResponse, 
+                                 MeetingPerformanceMetrics, MeetingTelematicsResponse, UserAnalyticsResponse) # Import analytics schemas
 
 # Database utilities (needs to be created)
 from shared_models.database import get_db, init_db # New import
+from shared_models.meeting_status import meeting_data_with_transitions
+from shared_models.pagination import estimated_row_count, keyset_paginate, split_page
+from app import analytics
 
 # Logging configuration
 logging.basicConfig(
@@ -42,6 +44,8 @@ class MeetingUserStat(MeetingResponse): # Inherit from MeetingResponse to get me
 class PaginatedMeetingUserStatResponse(BaseModel):
     total: int
     items: List[MeetingUserStat]
+    next_cursor: Optional[str] = None # Pass as ?cursor= for the next page; None on the last page
+    total_is_estimate: bool = False # total comes from pg_class.reltuples unless exact_total=true
 
 # Security - Reuse logic from bot-manager/auth.py for admin token verification
 API_KEY_HEADER = APIKeyHeader(name="X-Admin-API-Key", auto_error=False) # Use a distinct header
@@ -193,9 +197,23 @@ async def create_user(user_in: UserCreate, response: Response, db: AsyncSession
 @admin_router.get("/users", 
             response_model=List[UserResponse], # Use List import
             summary="List all users")
-async def list_users(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(User).offset(skip).limit(limit))
-    users = result.scalars().all()
+async def list_users(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
+    db: AsyncSession = Depends(get_db)
+):
+    """Lists users newest first; the next page's cursor is returned in the X-Next-Cursor header."""
+    try:
+        stmt = keyset_paginate(select(User), User.created_at, User.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    result = await db.execute(stmt.offset(skip))
+    # Cursor taken before the created_at fix below so it matches the stored key
+    users, next_cursor = split_page(result.scalars().all(), limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     # Fix: Ensure created_at is never None before validation
     needs_commit = False
@@ -401,27 +419,30 @@ async def delete_token(token_id: int, db: AsyncSession = Depends(get_db)):
             response_model=PaginatedMeetingUserStatResponse,
             summary="Get paginated list of meetings joined with users")
 async def list_meetings_with_users(
-    skip: int = 0, 
-    limit: int = 100, 
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    exact_total: bool = False,
+    skip: int = Query(0, ge=0, deprecated=True),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieves a paginated list of all meetings, with user details embedded.
+    Retrieves a keyset-paginated list of all meetings (newest first), with user details embedded.
     This provides a comprehensive overview for administrators.
+    Pass the returned next_cursor as ?cursor= to fetch the next page.
     """
-    # First, get the total count of meetings for pagination headers
-    count_result = await db.execute(select(func.count(Meeting.id)))
-    total = count_result.scalar_one()
+    # Planner estimate unless an exact count is asked for; count(*) scans the whole table
+    if exact_total:
+        total = (await db.execute(select(func.count(Meeting.id)))).scalar_one()
+    else:
+        total = await estimated_row_count(db, Meeting)
 
-    # Then, fetch the paginated list of meetings, joining with users
-    result = await db.execute(
-        select(Meeting)
-        .options(selectinload(Meeting.user))
-        .order_by(Meeting.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    meetings = result.scalars().all()
+    # Then, fetch the page of meetings, joining with users
+    try:
+        stmt = keyset_paginate(select(Meeting).options(selectinload(Meeting.user)), Meeting.created_at, Meeting.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    result = await db.execute(stmt.offset(skip))
+    meetings, next_cursor = split_page(result.scalars().all(), limit)
 
     # Now, construct the response using Pydantic models
     response_items = [
@@ -432,55 +453,62 @@ async def list_meetings_with_users(
         for meeting in meetings if meeting.user
     ]
         
-    return PaginatedMeetingUserStatResponse(total=total, items=response_items)
+    return PaginatedMeetingUserStatResponse(
+        total=total, items=response_items, next_cursor=next_cursor, total_is_estimate=not exact_total
+    )
 
 # --- Analytics Endpoints ---
 @admin_router.get("/analytics/users",
                   response_model=List[UserTableResponse],
                   summary="Get users table structure without sensitive data")
 async def get_users_table(
-    skip: int = 0, 
-    limit: int = 1000,
+    response: Response,
+    limit: int = Query(1000, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Returns user table data for analytics without exposing sensitive information.
     Excludes: data JSONB field, API tokens
+    Newest first; the next page's cursor is returned in the X-Next-Cursor header.
     """
-    result = await db.execute(select(User).offset(skip).limit(limit))
-    users = result.scalars().all()
-    
-    # Fix: Ensure created_at is never None before validation
-    needs_commit = False
-    for user in users:
-        if user.created_at is None:
-            # Use timezone-naive datetime for TIMESTAMP WITHOUT TIME ZONE column
-            user.created_at = datetime.utcnow().replace(tzinfo=None)
-            logger.warning(f"created_at was None for user {user.id}, setting to current time")
-            db.add(user)
-            needs_commit = True
-    
-    # Commit any fixes we made
-    if needs_commit:
-        await db.commit()
-    
-    return [UserTableResponse.model_validate(u) for u in users]
+    try:
+        stmt = analytics.users_table(cursor, limit, skip)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    rows, next_cursor = split_page((await db.execute(stmt)).all(), limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    # A missing created_at is reported as now without writing it back
+    return [
+        UserTableResponse.model_validate({**row._mapping, "created_at": row.created_at or datetime.utcnow()})
+        for row in rows
+    ]
 
 @admin_router.get("/analytics/meetings",
                   response_model=List[MeetingTableResponse], 
                   summary="Get meetings table structure without sensitive data")
 async def get_meetings_table(
-    skip: int = 0,
-    limit: int = 1000, 
+    response: Response,
+    limit: int = Query(1000, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Returns meeting table data for analytics without exposing sensitive information.
     Excludes: data JSONB field, transcriptions content
+    Newest first; the next page's cursor is returned in the X-Next-Cursor header.
     """
-    result = await db.execute(select(Meeting).offset(skip).limit(limit))
-    meetings = result.scalars().all()
-    return [MeetingTableResponse.model_validate(m) for m in meetings]
+    try:
+        stmt = analytics.meetings_table(cursor, limit, skip)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    rows, next_cursor = split_page((await db.execute(stmt)).all(), limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [MeetingTableResponse.model_validate(row) for row in rows]
 
 @admin_router.get("/analytics/meetings/{meeting_id}/telematics",
                   response_model=MeetingTelematicsResponse,
@@ -498,9 +526,12 @@ async def get_meeting_telematics(
     - Transcription statistics (optional)
     - Performance metrics
     """
-    # Get the meeting
-    result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
-    meeting = result.scalars().first()
+    # Meeting row, with transcript aggregates computed in SQL when requested
+    if include_transcriptions:
+        row = (await db.execute(analytics.meeting_with_transcription_stats(meeting_id))).first()
+        meeting = row.Meeting if row else None
+    else:
+        meeting = (await db.execute(select(Meeting).where(Meeting.id == meeting_id))).scalars().first()
     
     if not meeting:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Meeting not found")
@@ -513,25 +544,7 @@ async def get_meeting_telematics(
         )
         sessions = sessions_result.scalars().all()
     
-    # Calculate transcription stats if requested
-    transcription_stats = None
-    if include_transcriptions:
-        transcriptions_result = await db.execute(
-            select(Transcription).where(Transcription.meeting_id == meeting_id)
-        )
-        transcriptions = transcriptions_result.scalars().all()
-        
-        if transcriptions:
-            total_duration = sum(t.end_time - t.start_time for t in transcriptions)
-            unique_speakers = len(set(t.speaker for t in transcriptions if t.speaker))
-            languages_detected = list(set(t.language for t in transcriptions if t.language))
-            
-            transcription_stats = TranscriptionStats(
-                total_transcriptions=len(transcriptions),
-                total_duration=total_duration,
-                unique_speakers=unique_speakers,
-                languages_detected=languages_detected
-            )
+    transcription_stats = analytics.transcription_stats_from_row(row) if include_transcriptions else None
     
     # Calculate performance metrics
     performance_metrics = None
@@ -545,8 +558,10 @@ async def get_meeting_telematics(
             bot_uptime=meeting.data.get('bot_uptime') if meeting.data else None
         )
     
+    meeting_response = MeetingResponse.model_validate(meeting)
+    meeting_response.data = (await meeting_data_with_transitions(db, [meeting]))[meeting.id]
     return MeetingTelematicsResponse(
-        meeting=MeetingResponse.model_validate(meeting),
+        meeting=meeting_response,
         sessions=[MeetingSessionResponse.model_validate(s) for s in sessions],
         transcription_stats=transcription_stats,
         performance_metrics=performance_metrics
@@ -568,81 +583,22 @@ async def get_user_details(
     - Usage patterns
     - API token information (optional)
     """
-    # Get the user with tokens if requested
-    query = select(User)
+    # User row joined with its meeting aggregates, computed in SQL
+    query = analytics.user_with_meeting_stats(user_id)
     if include_tokens:
         query = query.options(selectinload(User.api_tokens))
     
-    result = await db.execute(query.where(User.id == user_id))
-    user = result.scalars().first()
-    
-    if not user:
+    row = (await db.execute(query)).first()
+    if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    user = row.User
     
-    # Fix: Ensure created_at is never None before validation
     if user.created_at is None:
-        # Use timezone-naive datetime for TIMESTAMP WITHOUT TIME ZONE column
-        user.created_at = datetime.utcnow().replace(tzinfo=None)
-        logger.warning(f"created_at was None for user {user.id}, setting to current time")
-        db.add(user)
-        await db.commit()
-    
-    # Calculate meeting stats
-    meetings_result = await db.execute(select(Meeting).where(Meeting.user_id == user_id))
-    meetings = meetings_result.scalars().all()
-    
-    total_meetings = len(meetings)
-    completed_meetings = len([m for m in meetings if m.status == 'completed'])
-    failed_meetings = len([m for m in meetings if m.status == 'failed'])
-    active_meetings = len([m for m in meetings if m.status in ['requested', 'joining', 'awaiting_admission', 'active']])
-    
-    # Calculate duration stats
-    completed_with_duration = [m for m in meetings if m.status == 'completed' and m.start_time and m.end_time]
-    total_duration = sum((m.end_time - m.start_time).total_seconds() for m in completed_with_duration) if completed_with_duration else None
-    average_duration = total_duration / len(completed_with_duration) if completed_with_duration else None
-    
-    meeting_stats = UserMeetingStats(
-        total_meetings=total_meetings,
-        completed_meetings=completed_meetings,
-        failed_meetings=failed_meetings,
-        active_meetings=active_meetings,
-        total_duration=total_duration,
-        average_duration=average_duration
-    )
+        # Read-only endpoint: fill in for validation without writing the row
+        attributes.set_committed_value(user, "created_at", datetime.utcnow())
+        logger.warning(f"created_at was None for user {user.id}")
     
-    # Calculate usage patterns
-    if meetings:
-        # Most used platform
-        platform_counts = {}
-        for meeting in meetings:
-            platform_counts[meeting.platform] = platform_counts.get(meeting.platform, 0) + 1
-        most_used_platform = max(platform_counts, key=platform_counts.get) if platform_counts else None
-        
-        # Meetings per day (based on creation date)
-        days_since_first = (datetime.utcnow() - min(m.created_at for m in meetings)).days + 1
-        meetings_per_day = total_meetings / days_since_first if days_since_first > 0 else 0
-        
-        # Peak usage hours
-        hour_counts = {}
-        for meeting in meetings:
-            hour = meeting.created_at.hour
-            hour_counts[hour] = hour_counts.get(hour, 0) + 1
-        peak_usage_hours = sorted(hour_counts.keys(), key=lambda h: hour_counts[h], reverse=True)[:3]
-        
-        # Last activity
-        last_activity = max(m.created_at for m in meetings)
-    else:
-        most_used_platform = None
-        meetings_per_day = 0.0
-        peak_usage_hours = []
-        last_activity = None
-    
-    usage_patterns = UserUsagePatterns(
-        most_used_platform=most_used_platform,
-        meetings_per_day=meetings_per_day,
-        peak_usage_hours=peak_usage_hours,
-        last_activity=last_activity
-    )
+    meeting_stats, usage_patterns = analytics.user_stats_from_row(row)
     
     return UserAnalyticsResponse(
         user=UserDetailResponse.model_validate(user),
@@ -11,6 +11,7 @@ from pydantic import BaseModel, Field
 from typing import Dict, Any, List, Optional, Set, Tuple
 import asyncio
 import redis.asyncio as aioredis
+import time
 from datetime import datetime
 
 # Import schemas for documentation
@@ -22,6 +23,7 @@ from shared_models.schemas import (
     Platform, # Import Platform enum for path parameters
     BotStatusResponse # ADDED: Import response model for documentation
 )
+from shared_models.latency import stage_latency
 
 load_dotenv()
 
@@ -216,6 +218,11 @@ async def root():
     """Provides a welcome message for the Vexa API Gateway."""
     return {"message": "Welcome to the Vexa API Gateway"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Per-stage latency histograms for transcript updates delivered over /ws."""
+    return {"latency": stage_latency.snapshot()}
+
 # --- Bot Manager Routes --- 
 @app.post("/bots",
          tags=["Bot Management"],
@@ -286,7 +293,7 @@ async def get_bots_status_proxy(request: Request):
 @app.get("/meetings",
         tags=["Transcriptions"],
         summary="Get list of user's meetings",
-        description="Returns a list of all meetings initiated by the user associated with the API key.",
+        description="Returns the meetings initiated by the user associated with the API key, newest first. Paginate with ?limit= and ?cursor=next_cursor.",
         response_model=MeetingListResponse, 
         dependencies=[Depends(api_key_scheme)])
 async def get_meetings_proxy(request: Request):
@@ -336,13 +343,23 @@ async def update_meeting_data_proxy(platform: Platform, native_meeting_id: str,
 @app.delete("/meetings/{platform}/{native_meeting_id}",
             tags=["Transcriptions"],
             summary="Delete meeting transcripts and anonymize data",
-            description="Purges transcripts and anonymizes meeting data for finalized meetings. Only works for completed or failed meetings. Preserves meeting records for telemetry.",
+            description="For completed or failed meetings, starts a background job that deletes the transcripts and then anonymizes the meeting (202 with job_id); repeat the request if the job fails or is interrupted. Preserves meeting records for telemetry.",
             dependencies=[Depends(api_key_scheme)])
 async def delete_meeting_proxy(platform: Platform, native_meeting_id: str, request: Request):
-    """Forward request to Transcription Collector to purge transcripts and anonymize meeting data."""
+    """Forward request to Transcription Collector to purge transcripts, then anonymize meeting data."""
     url = f"{TRANSCRIPTION_COLLECTOR_URL}/meetings/{platform.value}/{native_meeting_id}"
     return await forward_request(app.state.http_client, "DELETE", url, request)
 
+@app.get("/purge-jobs/{job_id}",
+         tags=["Transcriptions"],
+         summary="Get transcript deletion status",
+         description="Progress of the transcript deletion job started by DELETE /meetings/{platform}/{native_meeting_id}.",
+         dependencies=[Depends(api_key_scheme)])
+async def get_purge_job_proxy(job_id: str, request: Request):
+    """Forward request to Transcription Collector to get a purge job's status."""
+    url = f"{TRANSCRIPTION_COLLECTOR_URL}/purge-jobs/{job_id}"
+    return await forward_request(app.state.http_client, "GET", url, request)
+
 # --- User Profile Routes ---
 @app.put("/user/webhook",
          tags=["User"],
@@ -469,6 +486,18 @@ async def forward_mcp_path(request: Request, path: str):
 # --- Removed internal ID resolution and full transcript fetching from Gateway ---
 
 # --- WebSocket Multiplex Endpoint ---
+def _observe_delivery(data: str) -> None:
+    """Record end-to-end latency for a traced transcript update that was just delivered."""
+    try:
+        trace = json.loads(data).get("trace")
+    except Exception:
+        return
+    if not isinstance(trace, dict):
+        return
+    delivered_ts = time.time()
+    stage_latency.observe_between("collector_publish_to_delivery", trace.get("published_ts"), delivered_ts)
+    stage_latency.observe_between("capture_to_delivery", trace.get("captured_ts"), delivered_ts)
+
 @app.websocket("/ws")
 async def websocket_multiplex(ws: WebSocket):
     # Accept first to avoid HTTP 403 during handshake when rejecting
@@ -510,6 +539,8 @@ async def websocket_multiplex(ws: WebSocket):
                         await ws.send_text(data)
                     except Exception:
                         break
+                    if '"trace"' in data:
+                        _observe_delivery(data)
             finally:
                 try:
                     await pubsub.unsubscribe(*channel_names)
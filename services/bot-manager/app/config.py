@@ -12,4 +12,28 @@ DOCKER_NETWORK = os.environ.get("DOCKER_NETWORK", "vexa_default")
 LOCK_TIMEOUT_SECONDS = 300 # 5 minutes
 LOCK_PREFIX = "bot_lock:"
 MAP_PREFIX = "bot_map:"
-STATUS_PREFIX = "bot_status:" 
\ No newline at end of file
+STATUS_PREFIX = "bot_status:" 
+# Webhook delivery settings
+WEBHOOK_STREAM_NAME = os.environ.get("WEBHOOK_STREAM_NAME", "bm:webhooks")
+WEBHOOK_CONSUMER_GROUP = os.environ.get("WEBHOOK_CONSUMER_GROUP", "bm_webhook_dispatchers")
+WEBHOOK_RETRY_KEY = os.environ.get("WEBHOOK_RETRY_KEY", "bm:webhooks:retry")
+WEBHOOK_DEAD_LETTER_KEY = os.environ.get("WEBHOOK_DEAD_LETTER_KEY", "bm:webhooks:dead")
+WEBHOOK_DEAD_LETTER_MAX = int(os.environ.get("WEBHOOK_DEAD_LETTER_MAX", "10000"))
+WEBHOOK_STREAM_MAXLEN = int(os.environ.get("WEBHOOK_STREAM_MAXLEN", "100000"))
+WEBHOOK_MAX_CONNECTIONS = int(os.environ.get("WEBHOOK_MAX_CONNECTIONS", "100"))
+WEBHOOK_MAX_IN_FLIGHT = int(os.environ.get("WEBHOOK_MAX_IN_FLIGHT", "200"))
+WEBHOOK_PER_HOST_CONCURRENCY = int(os.environ.get("WEBHOOK_PER_HOST_CONCURRENCY", "4"))
+WEBHOOK_TIMEOUT_SECONDS = float(os.environ.get("WEBHOOK_TIMEOUT_SECONDS", "10"))
+WEBHOOK_MAX_ATTEMPTS = int(os.environ.get("WEBHOOK_MAX_ATTEMPTS", "6"))
+WEBHOOK_BACKOFF_BASE_SECONDS = float(os.environ.get("WEBHOOK_BACKOFF_BASE_SECONDS", "2"))
+WEBHOOK_BACKOFF_MAX_SECONDS = float(os.environ.get("WEBHOOK_BACKOFF_MAX_SECONDS", "600"))
+# Status events for the same destination are coalesced into one POST when > 0
+WEBHOOK_BATCH_WINDOW_MS = int(os.environ.get("WEBHOOK_BATCH_WINDOW_MS", "0"))
+WEBHOOK_BATCH_MAX_EVENTS = int(os.environ.get("WEBHOOK_BATCH_MAX_EVENTS", "50"))
+# WhisperLive load-aware routing (instances heartbeat into the registry)
+WL_ROUTING_ENABLED = os.environ.get("WL_ROUTING_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+WL_REGISTRY_PREFIX = os.environ.get("WL_REGISTRY_PREFIX", "wl:registry")
+# A reserved slot counts against an instance until the bot connects or this expires
+WL_RESERVATION_TTL_SECONDS = float(os.environ.get("WL_RESERVATION_TTL_SECONDS", "90"))
+WL_ROUTING_RTF_WEIGHT = float(os.environ.get("WL_ROUTING_RTF_WEIGHT", "1.0"))
+WL_ROUTING_QUEUE_WEIGHT = float(os.environ.get("WL_ROUTING_QUEUE_WEIGHT", "0.5"))
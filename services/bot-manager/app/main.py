@@ -22,9 +22,11 @@ from .config import BOT_IMAGE_NAME, REDIS_URL
 from app.orchestrators import (
     get_socket_session, close_docker_client, start_bot_container,
     stop_bot_container, _record_session_start, get_running_bots_status,
+    get_host_admission_status,
 )
 from shared_models.database import init_db, get_db, async_session_local
-from shared_models.models import User, Meeting, MeetingSession, Transcription # <--- ADD MeetingSession and Transcription import
+from shared_models.models import User, Meeting, MeetingSession, Transcription, MeetingStatusEvent # <--- ADD MeetingSession and Transcription import
+from shared_models.meeting_status import meeting_data_with_transitions
 from shared_models.schemas import (
     MeetingCreate, MeetingResponse, Platform, BotStatusResponse, MeetingConfigUpdate,
     MeetingStatus, MeetingCompletionReason, MeetingFailureStage,
@@ -33,7 +35,9 @@ from shared_models.schemas import (
 from app.auth import get_user_and_token # MODIFIED
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_, desc, func
+from sqlalchemy import and_, desc, func, update, bindparam
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime # For start_time
 
 # --- Status Transition Helper ---
@@ -60,7 +64,8 @@ async def update_meeting_status(
         error_details: Additional error details
         
     Returns:
-        True if status was updated, False if transition was invalid
+        True if status was updated, False if the transition was invalid or another
+        update changed the status first
     """
     # Normalize invalid status values to valid enum (safety net for any legacy data)
     try:
@@ -77,84 +82,80 @@ async def update_meeting_status(
         logger.warning(f"Invalid status transition from '{current_status.value}' to '{new_status.value}' for meeting {meeting.id}")
         return False
     
-    # Update status
     old_status = meeting.status
-    meeting.status = new_status.value
-    
-    # Update data field with status-specific information (work on a fresh copy so JSONB change is detected)
-    if not meeting.data:
-        current_data: Dict[str, Any] = {}
-    else:
-        try:
-            current_data = dict(meeting.data)
-        except Exception:
-            current_data = {}
+    now = datetime.utcnow()
+    values: Dict[str, Any] = {"status": new_status.value}
     
+    # Status-specific fields in data (terminal transitions only, so at most once per meeting)
+    data_patch: Dict[str, Any] = {}
     if new_status == MeetingStatus.COMPLETED:
         if completion_reason:
-            current_data['completion_reason'] = completion_reason.value
-        meeting.end_time = datetime.utcnow()
+            data_patch['completion_reason'] = completion_reason.value
+        values["end_time"] = now
         
     elif new_status == MeetingStatus.FAILED:
         if failure_stage:
-            current_data['failure_stage'] = failure_stage.value
+            data_patch['failure_stage'] = failure_stage.value
         if error_details:
-            current_data['error_details'] = error_details
-        meeting.end_time = datetime.utcnow()
+            data_patch['error_details'] = error_details
+        values["end_time"] = now
+    if data_patch:
+        # Merge in SQL (data || patch) instead of rewriting the document from Python
+        values["data"] = Meeting.data.op('||')(bindparam("data_patch", data_patch, type_=JSONB))
     
-    # Add status transition metadata: single canonical list at data['status_transition']
-    transition_entry = {
-        'from': old_status,
-        'to': new_status.value,
-        'timestamp': datetime.utcnow().isoformat(),
-        'source': get_status_source(current_status, new_status)
-    }
+    # Transition entry, appended to meeting_status_events (read back as data['status_transition'])
+    details: Dict[str, Any] = {}
     if transition_reason:
-        transition_entry['reason'] = transition_reason
+        details['reason'] = transition_reason
     if completion_reason:
-        transition_entry['completion_reason'] = completion_reason.value
+        details['completion_reason'] = completion_reason.value
     if failure_stage:
-        transition_entry['failure_stage'] = failure_stage.value
+        details['failure_stage'] = failure_stage.value
     if error_details:
-        transition_entry['error_details'] = error_details
+        details['error_details'] = error_details
     if isinstance(transition_metadata, dict) and transition_metadata:
-        try:
-            # Merge without overwriting existing keys
-            for k, v in transition_metadata.items():
-                if k not in transition_entry:
-                    transition_entry[k] = v
-        except Exception:
-            pass
-    try:
-        existing = current_data.get('status_transition')
-        if isinstance(existing, dict):
-            transitions_list = [existing]
-        elif isinstance(existing, list):
-            transitions_list = existing
-        else:
-            transitions_list = []
-        transitions_list = list(transitions_list) + [transition_entry]
-        current_data['status_transition'] = transitions_list
-        # Remove deprecated key if present
-        if 'status_transitions' in current_data:
-            try:
-                del current_data['status_transitions']
-            except Exception:
-                pass
-    except Exception:
-        current_data['status_transition'] = [transition_entry]
-
-    # Assign back the rebuilt data object so SQLAlchemy marks JSONB as changed
-    meeting.data = current_data
+        # Merge without overwriting existing keys
+        for k, v in transition_metadata.items():
+            if k not in details and k not in ('from', 'to', 'timestamp', 'source'):
+                details[k] = v
+    
+    # Conditional transition: loses cleanly if another callback changed the status first
+    result = await db.execute(
+        update(Meeting)
+        .where(Meeting.id == meeting.id, Meeting.status == old_status)
+        .values(**values)
+        .returning(Meeting.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.first()
+    if row is None:
+        logger.warning(f"Meeting {meeting.id} status changed concurrently (expected '{old_status}'); '{new_status.value}' not applied")
+        return False
     
+    db.add(MeetingStatusEvent(
+        meeting_id=meeting.id,
+        from_status=old_status,
+        to_status=new_status.value,
+        source=get_status_source(current_status, new_status),
+        details=details,
+        created_at=now,
+    ))
     await db.commit()
-    await db.refresh(meeting)
+    
+    # Mirror the row in memory without marking it dirty (no refresh round trip)
+    set_committed_value(meeting, "status", new_status.value)
+    set_committed_value(meeting, "updated_at", row.updated_at)
+    if "end_time" in values:
+        set_committed_value(meeting, "end_time", now)
+    if data_patch:
+        set_committed_value(meeting, "data", {**(meeting.data or {}), **data_patch})
     
     logger.info(f"Meeting {meeting.id} status updated from '{old_status}' to '{new_status.value}'")
     return True
 
 from app.tasks.bot_exit_tasks import run_all_tasks
-from app.tasks.webhook_runner import run_status_webhook_task
+from app.tasks.webhook_dispatcher import enqueue_status_webhook, start_webhook_dispatcher, stop_webhook_dispatcher
+from app.orchestrators.whisperlive_routing import configure_whisperlive_routing, get_whisperlive_registry
 
 def _b64url_encode(data: bytes) -> str:
     """URL-safe base64 encoding without padding."""
@@ -210,13 +211,12 @@ async def publish_meeting_status_change(meeting_id: int, new_status: str, redis_
 
 async def schedule_status_webhook_task(
     meeting: Meeting, 
-    background_tasks: BackgroundTasks,
     old_status: str,
     new_status: str,
     reason: Optional[str] = None,
     transition_source: Optional[str] = None
 ):
-    """Schedule a webhook task for meeting status changes."""
+    """Queue a webhook for meeting status changes (delivered by the webhook dispatcher)."""
     status_change_info = {
         'old_status': old_status,
         'new_status': new_status,
@@ -225,13 +225,9 @@ async def schedule_status_webhook_task(
         'transition_source': transition_source
     }
     
-    # Schedule the webhook task with status change information
-    background_tasks.add_task(
-        run_status_webhook_task,
-        meeting.id,
-        status_change_info
-    )
-    logger.info(f"Scheduled status webhook task for meeting {meeting.id} status change: {old_status} -> {new_status}")
+    # Only an XADD happens here; payload building and delivery run in the dispatcher
+    await enqueue_status_webhook(meeting.id, status_change_info)
+    logger.info(f"Queued status webhook for meeting {meeting.id} status change: {old_status} -> {new_status}")
 
 # Configure logging
 logging.basicConfig(
@@ -306,6 +302,14 @@ async def startup_event():
         redis_client = None # Ensure client is None if connection fails
     # --------------------------------------
 
+    configure_whisperlive_routing(redis_client)
+
+    if redis_client:
+        try:
+            await start_webhook_dispatcher(redis_client)
+        except Exception as e:
+            logger.error(f"Failed to start webhook dispatcher; webhooks will be delivered directly: {e}", exc_info=True)
+
     logger.info("Database, Docker Client (attempted), and Redis Client (attempted) initialized.")
 
 @app.on_event("shutdown")
@@ -314,6 +318,8 @@ async def shutdown_event():
     logger.info("Shutting down Bot Manager...")
     # await close_redis() # Removed redis close if not used
 
+    await stop_webhook_dispatcher()
+
     # --- ADD Redis Client Closing ---
     if redis_client:
         logger.info("Closing Redis connection...")
@@ -496,6 +502,12 @@ async def request_bot(
         await db.refresh(new_meeting)
         meeting_id_for_bot = new_meeting.id # Use this for the bot
         logger.info(f"Created new meeting record with ID: {meeting_id_for_bot}")
+        # The collector caches the user's latest meeting per native ID for WS subscribes
+        if redis_client:
+            try:
+                await redis_client.delete(f"ws_authz:{current_user.id}")
+            except Exception as _cache_err:
+                logger.warning(f"Failed to invalidate WS authorization cache for user {current_user.id}: {_cache_err}")
         # Publish initial 'requested' status so clients receive it via WebSocket
         try:
             await publish_meeting_status_change(meeting_id_for_bot, 'requested', redis_client, req.platform.value, native_meeting_id, current_user.id)
@@ -620,7 +632,9 @@ async def request_bot(
         logger.info(f"Successfully set container ID for meeting {meeting_id}. Status remains 'requested' until bot startup callback.")
 
         logger.info(f"Successfully started bot container {container_id} for meeting {meeting_id}")
-        return MeetingResponse.model_validate(current_meeting_for_bot_launch)
+        response = MeetingResponse.model_validate(current_meeting_for_bot_launch)
+        response.data = (await meeting_data_with_transitions(db, [current_meeting_for_bot_launch]))[current_meeting_for_bot_launch.id]
+        return response
 
     except HTTPException as http_exc:
         logger.warning(f"HTTPException occurred during bot startup for meeting {meeting_id}: {http_exc.status_code} - {http_exc.detail}")
@@ -912,6 +926,27 @@ async def get_user_bots_status(
         )
 # --- END Endpoint: Get Running Bot Status --- 
 
+@app.get("/bots/internal/capacity",
+         summary="Host bot capacity and launch queue (process orchestrator only)",
+         include_in_schema=False)
+async def get_host_capacity():
+    """Reports host-level admission state: slots, queue depth/ETA and display pool usage."""
+    capacity = get_host_admission_status()
+    if capacity is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Host admission control is not used by this orchestrator.")
+    return capacity
+
+@app.get("/bots/internal/whisperlive",
+         summary="WhisperLive instance registry used for bot routing",
+         include_in_schema=False)
+async def get_whisperlive_instances():
+    """Reports live load (clients, reserved slots, queue depth, RTF) of registered WhisperLive instances."""
+    try:
+        return {"instances": await get_whisperlive_registry()}
+    except Exception as e:
+        logger.error(f"Failed to read WhisperLive registry: {e}", exc_info=True)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="WhisperLive registry unavailable.")
+
 # --- ADDED: Endpoint for Vexa-Bot to report its exit status ---
 @app.post("/bots/internal/callback/exited",
           status_code=status.HTTP_200_OK,
@@ -1425,7 +1460,6 @@ async def bot_status_change_callback(
         # Schedule webhook task for status change (for all status changes)
         await schedule_status_webhook_task(
             meeting=meeting,
-            background_tasks=background_tasks,
             old_status=old_status,
             new_status=new_status.value,
             reason=reason,
@@ -34,6 +34,7 @@ from shared_models.models import User, MeetingSession
 
 # Shared concurrency enforcement helper
 from app.orchestrators.common import enforce_user_concurrency_limit, count_user_active_bots
+from app.orchestrators.whisperlive_routing import select_whisperlive_url, release_whisperlive_reservation
 from sqlalchemy import select as sa_select
 
 # Assuming these are still needed from config or env
@@ -230,6 +231,9 @@ async def start_bot_container(
         logger.error("CRITICAL: WHISPER_LIVE_URL is not set in bot-manager's environment. Falling back to default, but this should be fixed in docker-compose.yml for bot-manager service.")
         whisper_live_url_for_bot = 'ws://whisperlive.internal/ws' # Fallback, but log an error.
 
+    # Prefer the least-loaded registered WhisperLive instance over the shared address
+    whisper_live_url_for_bot = await select_whisperlive_url(meeting_id, whisper_live_url_for_bot)
+
     logger.info(f"Passing WHISPER_LIVE_URL to bot: {whisper_live_url_for_bot}")
 
     # These are the environment variables passed to the Node.js process  of the vexa-bot started by your entrypoint.sh.
@@ -270,6 +274,7 @@ async def start_bot_container(
 
         if not container_id:
             logger.error(f"Failed to create container: No ID in response: {container_info}")
+            await release_whisperlive_reservation(meeting_id)
             return None, None
 
         logger.info(f"Container {container_id} created. Starting...")
@@ -280,6 +285,7 @@ async def start_bot_container(
         if response.status_code != 204:
             logger.error(f"Failed to start container {container_id}. Status: {response.status_code}, Response: {response.text}")
             # Consider removing the created container if start fails?
+            await release_whisperlive_reservation(meeting_id)
             return None, None
 
         logger.info(f"Successfully started container {container_id} for meeting: {meeting_id}")
@@ -297,6 +303,8 @@ async def start_bot_container(
     except Exception as e:
         logger.error(f"Unexpected error starting container via socket: {e}", exc_info=True)
 
+    await release_whisperlive_reservation(meeting_id)
+
     # Clean up created container if start failed or exception occurred before returning container_id
     # This requires careful handling to avoid race conditions if another process is managing it.
     # For now, relying on AutoRemove=True might be sufficient if start fails cleanly.
@@ -37,4 +37,5 @@ start_bot_container = mod.start_bot_container  # type: ignore
 stop_bot_container = getattr(mod, "stop_bot_container", lambda *args, **kwargs: None)
 _record_session_start = getattr(mod, "_record_session_start", lambda *args, **kwargs: None)
 get_running_bots_status = getattr(mod, "get_running_bots_status", lambda *args, **kwargs: {})
-verify_container_running = getattr(mod, "verify_container_running", lambda *args, **kwargs: False) 
\ No newline at end of file
+verify_container_running = getattr(mod, "verify_container_running", lambda *args, **kwargs: False) 
+get_host_admission_status = getattr(mod, "get_host_admission_status", lambda *args, **kwargs: None)
@@ -15,6 +15,7 @@ from typing import Optional, Tuple, Dict, Any, List
 import httpx
 from fastapi import HTTPException
 from app.orchestrators.common import enforce_user_concurrency_limit, count_user_active_bots
+from app.orchestrators.whisperlive_routing import select_whisperlive_url, release_whisperlive_reservation
 
 logger = logging.getLogger("bot_manager.nomad_utils")
 
@@ -30,6 +31,11 @@ NOMAD_ADDR = os.getenv("NOMAD_ADDR", f"http://{NOMAD_AGENT_IP}:4646").rstrip("/"
 # Name of the *parameterised* job that represents a vexa-bot instance
 BOT_JOB_NAME = os.getenv("VEXA_BOT_JOB_NAME", "vexa-bot")
 
+# Nomad rejects dispatch meta keys the job does not declare, so the routed
+# WhisperLive URL is only sent when the job spec lists it in meta_optional:
+#   parameterized { meta_optional = [..., "whisper_live_url"] }
+BOT_JOB_ACCEPTS_WHISPER_LIVE_URL = os.getenv("VEXA_BOT_JOB_ACCEPTS_WHISPER_LIVE_URL", "false").strip().lower() in ("1", "true", "yes", "on")
+
 # ---------------------------------------------------------------------------
 # Helper / compatibility no-ops ------------------------------------------------
 
@@ -91,6 +97,8 @@ async def start_bot_container(
         "language": language or "",
         "task": task or "",
     }
+    if BOT_JOB_ACCEPTS_WHISPER_LIVE_URL:
+        meta["whisper_live_url"] = await select_whisperlive_url(meeting_id, os.getenv("WHISPER_LIVE_URL")) or ""
 
     # Nomad job dispatch endpoint
     url = f"{NOMAD_ADDR}/v1/job/{BOT_JOB_NAME}/dispatch"
@@ -138,6 +146,8 @@ async def start_bot_container(
     except Exception as e:  # noqa: BLE001
         logger.exception("Unexpected error dispatching Nomad job: %s", e)
 
+    if BOT_JOB_ACCEPTS_WHISPER_LIVE_URL:
+        await release_whisperlive_reservation(meeting_id)
     return None, None
 
 
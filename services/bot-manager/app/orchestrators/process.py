@@ -12,12 +12,16 @@ orchestrators, implementing the same interface:
 - stop_bot_container() -> terminates the process
 - get_running_bots_status() -> lists active processes
 - verify_container_running() -> checks if process is alive
+
+Launches are gated by host-level admission control and bots get a display
+from a reusable Xvfb pool (see process_resources).
 """
 from __future__ import annotations
 
 import os
 import uuid
 import json
+import math
 import signal
 import logging
 import asyncio
@@ -27,7 +31,19 @@ from pathlib import Path
 from datetime import datetime, timezone
 from typing import Optional, Tuple, Dict, Any, List
 
+from fastapi import HTTPException
+
 from app.orchestrators.common import enforce_user_concurrency_limit, count_user_active_bots
+from app.orchestrators.whisperlive_routing import select_whisperlive_url, release_whisperlive_reservation
+from app.orchestrators.process_resources import (
+    AdmissionRejected,
+    BOT_WARMUP_SECONDS,
+    admission_controller,
+    display_pool,
+    bot_preexec,
+    apply_cpu_weight,
+    remove_cgroup,
+)
 
 logger = logging.getLogger("bot_manager.process_orchestrator")
 
@@ -78,8 +94,8 @@ def get_socket_session(*_args, **_kwargs):
 
 
 def close_client():
-    """Compatibility stub - no persistent client to close."""
-    pass
+    """Stops the pooled Xvfb servers; there is no persistent client to close."""
+    display_pool.shutdown()
 
 
 # Alias for compatibility with existing code
@@ -139,6 +155,19 @@ def _terminate_process_group(pid: int, timeout: int = 10) -> bool:
         return False
 
 
+def _release_process_resources(info: Dict[str, Any]) -> None:
+    """Free everything a bot process held: log handle, display, cgroup and admission slot."""
+    log_handle = info.get("log_handle")
+    if log_handle:
+        try:
+            log_handle.close()
+        except Exception:
+            pass
+    display_pool.release(info.get("process_name"))
+    remove_cgroup(info.get("cgroup"))
+    admission_controller.notify_released()
+
+
 async def _cleanup_dead_processes() -> None:
     """Remove dead processes from the registry."""
     async with _registry_lock:
@@ -150,7 +179,30 @@ async def _cleanup_dead_processes() -> None:
 
         for pid in dead_pids:
             logger.debug(f"Cleaning up dead process {pid} from registry")
-            del _active_processes[pid]
+            _release_process_resources(_active_processes.pop(pid))
+
+
+def _host_bot_counts() -> Tuple[int, int]:
+    """Return (running, warming) bot process counts across all users."""
+    now = time.monotonic()
+    running = len(_active_processes)
+    warming = sum(
+        1 for info in _active_processes.values()
+        if now - info.get("started_monotonic", 0) < BOT_WARMUP_SECONDS
+    )
+    return running, warming
+
+
+async def _count_host_bots() -> Tuple[int, int]:
+    """Reap exited bots, then return (running, warming) counts for admission."""
+    await _cleanup_dead_processes()
+    return _host_bot_counts()
+
+
+def get_host_admission_status() -> Dict[str, Any]:
+    """Snapshot of host capacity, launch queue and Xvfb pool state."""
+    running, warming = _host_bot_counts()
+    return {**admission_controller.status(running, warming), "xvfb_pool": display_pool.status()}
 
 
 # ---------------------------------------------------------------------------
@@ -186,6 +238,10 @@ async def start_bot_container(
 
     Returns:
         Tuple of (process_id, connection_id) on success, (None, None) on failure
+
+    Raises:
+        HTTPException(503): host capacity did not free up within the admission
+            timeout or the launch queue is full (detail carries an ETA)
     """
     # Generate unique identifiers
     connection_id = str(uuid.uuid4())
@@ -236,11 +292,60 @@ async def start_bot_container(
 
     logger.debug(f"Bot config prepared for {process_name}")
 
+    # Verify bot script exists
+    if not Path(BOT_SCRIPT_PATH).exists():
+        logger.error(f"Bot script not found at {BOT_SCRIPT_PATH}")
+        return None, None
+
+    # Host-level admission: wait in the launch queue while the host is saturated
+    try:
+        admission = await admission_controller.acquire(meeting_id, _count_host_bots)
+    except AdmissionRejected as e:
+        logger.warning(f"[Admission] Rejecting bot for meeting {meeting_id}: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "message": str(e),
+                "queue_position": e.queue_position,
+                "eta_seconds": e.eta_seconds,
+            },
+            headers={"Retry-After": str(int(math.ceil(e.eta_seconds or 30)))},
+        )
+
+    try:
+        return await _spawn_bot_process(
+            bot_config, process_name, connection_id, meeting_id, user_id, platform,
+            native_meeting_id, admission,
+        )
+    finally:
+        admission_controller.settle()
+
+
+async def _spawn_bot_process(
+    bot_config: Dict[str, Any],
+    process_name: str,
+    connection_id: str,
+    meeting_id: int,
+    user_id: int,
+    platform: str,
+    native_meeting_id: str,
+    admission: Dict[str, Any],
+) -> Tuple[Optional[str], Optional[str]]:
+    """Spawn an admitted bot process and register it."""
+    # Lease a pooled display; fall back to the shared one if the pool is disabled or exhausted
+    display = DISPLAY
+    if display_pool.enabled:
+        leased = await asyncio.to_thread(display_pool.lease, process_name)
+        if leased:
+            display = leased
+        else:
+            logger.warning(f"No pooled Xvfb display available for {process_name}; using shared {DISPLAY}")
+
     # Prepare environment for the bot process
     env = os.environ.copy()
     env["BOT_CONFIG"] = json.dumps(bot_config)
-    env["WHISPER_LIVE_URL"] = WHISPER_LIVE_URL
-    env["DISPLAY"] = DISPLAY
+    env["WHISPER_LIVE_URL"] = await select_whisperlive_url(meeting_id, WHISPER_LIVE_URL)
+    env["DISPLAY"] = display
     env["LOG_LEVEL"] = os.getenv("LOG_LEVEL", "INFO")
     # Ensure Node.js can find modules
     env["NODE_PATH"] = os.path.join(BOT_WORKING_DIR, "node_modules")
@@ -254,11 +359,6 @@ async def start_bot_container(
 
     log_file = logs_path / f"{process_name}.log"
 
-    # Verify bot script exists
-    if not Path(BOT_SCRIPT_PATH).exists():
-        logger.error(f"Bot script not found at {BOT_SCRIPT_PATH}")
-        return None, None
-
     try:
         # Open log file for the bot process
         log_handle = open(log_file, "w")
@@ -270,10 +370,11 @@ async def start_bot_container(
             stdout=log_handle,
             stderr=subprocess.STDOUT,
             cwd=BOT_WORKING_DIR,
-            preexec_fn=os.setsid  # Create new process group for clean termination
+            preexec_fn=bot_preexec  # New process group for clean termination, lower priority
         )
 
         process_id = str(proc.pid)
+        cgroup = apply_cpu_weight(process_id, proc.pid)
 
         # Register in our tracking dictionary
         async with _registry_lock:
@@ -287,25 +388,30 @@ async def start_bot_container(
                 "native_meeting_id": native_meeting_id,
                 "process_name": process_name,
                 "created_at": datetime.now(timezone.utc).isoformat(),
-                "log_file": str(log_file)
+                "started_monotonic": time.monotonic(),
+                "log_file": str(log_file),
+                "display": display,
+                "cgroup": cgroup,
             }
 
         logger.info(
             f"Successfully started bot process: PID={process_id}, "
-            f"meeting={meeting_id}, name={process_name}"
+            f"meeting={meeting_id}, name={process_name}, display={display}, "
+            f"queued={admission['queued_seconds']:.1f}s"
         )
 
         return process_id, connection_id
 
     except FileNotFoundError as e:
         logger.error(f"Node.js or bot script not found: {e}")
-        return None, None
     except PermissionError as e:
         logger.error(f"Permission denied starting bot process: {e}")
-        return None, None
     except Exception as e:
         logger.error(f"Unexpected error starting bot process: {e}", exc_info=True)
-        return None, None
+
+    display_pool.release(process_name)
+    await release_whisperlive_reservation(meeting_id)
+    return None, None
 
 
 def stop_bot_container(container_id: str) -> bool:
@@ -343,17 +449,9 @@ def stop_bot_container(container_id: str) -> bool:
             logger.info(f"Process {container_id} already stopped")
             success = True
 
-        # Close log file handle
-        log_handle = proc_info.get("log_handle")
-        if log_handle:
-            try:
-                log_handle.close()
-            except Exception:
-                pass
-
-        # Remove from registry (synchronous removal)
-        if container_id in _active_processes:
-            del _active_processes[container_id]
+        # Remove from registry (synchronous removal) and free its resources
+        if _active_processes.pop(container_id, None) is not None:
+            _release_process_resources(proc_info)
 
         return success
 
@@ -426,14 +524,7 @@ async def verify_container_running(container_id: str) -> bool:
         logger.debug(f"Process {container_id} is dead, removing from registry")
         async with _registry_lock:
             if container_id in _active_processes:
-                # Close log handle
-                log_handle = _active_processes[container_id].get("log_handle")
-                if log_handle:
-                    try:
-                        log_handle.close()
-                    except Exception:
-                        pass
-                del _active_processes[container_id]
+                _release_process_resources(_active_processes.pop(container_id))
 
     return is_running
 
@@ -459,4 +550,5 @@ __all__ = [
     "_record_session_start",
     "get_running_bots_status",
     "verify_container_running",
+    "get_host_admission_status",
 ]
@@ -0,0 +1,499 @@
+"""Host resource management for the process orchestrator.
+
+The process orchestrator runs every bot (Node.js + Chromium) on the same host
+as the rest of the stack, so the number of bots must be bounded by what the
+host can actually sustain, not only by per-user limits. This module provides:
+
+- HostAdmissionController: derives bot slots from measured CPU and RAM
+  headroom and queues excess launch requests (FIFO) with an ETA instead of
+  letting every bot start and stutter.
+- XvfbDisplayPool: a managed pool of long-lived Xvfb servers that are leased
+  to bots and reused after the bot exits.
+- CPU weighting (cgroup v2 ``cpu.weight`` on the bots' group when available,
+  nice otherwise) so bots cannot starve WhisperLive and the API services.
+"""
+from __future__ import annotations
+
+import os
+import math
+import time
+import shutil
+import signal
+import asyncio
+import logging
+import subprocess
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger("bot_manager.process_resources")
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+# Estimated steady-state cost of one bot (Node.js + Chromium + audio capture)
+BOT_CPU_CORES = float(os.getenv("BOT_CPU_CORES", "1.0"))
+BOT_MEMORY_MB = int(os.getenv("BOT_MEMORY_MB", "600"))
+
+# Target host CPU utilisation: new bots are admitted only while measured usage
+# leaves room below it, keeping headroom for WhisperLive, Redis and the APIs
+BOT_HOST_CPU_TARGET = float(os.getenv("BOT_HOST_CPU_TARGET", "0.75"))
+# Memory that is never handed out to bots
+BOT_HOST_MEM_RESERVE_MB = int(os.getenv("BOT_HOST_MEM_RESERVE_MB", "2048"))
+
+# Hard cap on bot processes (0 = derive from host size only)
+BOT_MAX_PROCESSES = int(os.getenv("BOT_MAX_PROCESSES", "0"))
+
+# A freshly started bot has not reached its steady-state cost yet; its full
+# cost is reserved for this long so bursts of launches are not over-admitted
+BOT_WARMUP_SECONDS = float(os.getenv("BOT_WARMUP_SECONDS", "30"))
+
+# Admission queue limits
+BOT_ADMISSION_QUEUE_MAX = int(os.getenv("BOT_ADMISSION_QUEUE_MAX", "50"))
+BOT_ADMISSION_TIMEOUT_SECONDS = float(os.getenv("BOT_ADMISSION_TIMEOUT_SECONDS", "120"))
+BOT_ADMISSION_POLL_SECONDS = 1.0
+
+# Xvfb pool ("auto" = one display per bot slot when Xvfb is installed, 0 = use DISPLAY)
+XVFB_POOL_SIZE = os.getenv("XVFB_POOL_SIZE", "auto")
+XVFB_DISPLAY_BASE = int(os.getenv("XVFB_DISPLAY_BASE", "100"))
+XVFB_SCREEN = os.getenv("XVFB_SCREEN", "1920x1080x24")
+XVFB_START_TIMEOUT_SECONDS = 5.0
+
+# CPU weighting: cgroup v2 weight (1-10000, default cgroup weight is 100) and nice fallback
+BOT_CGROUP_PATH = os.getenv("BOT_CGROUP_PATH", "/sys/fs/cgroup/vexa-bots")
+BOT_CPU_WEIGHT = int(os.getenv("BOT_CPU_WEIGHT", "50"))
+BOT_NICE = int(os.getenv("BOT_NICE", "5"))
+
+
+class AdmissionRejected(Exception):
+    """Raised when a bot cannot be admitted (queue full or wait timed out)."""
+
+    def __init__(self, message: str, queue_position: Optional[int] = None, eta_seconds: Optional[float] = None):
+        super().__init__(message)
+        self.queue_position = queue_position
+        self.eta_seconds = eta_seconds
+
+
+# ---------------------------------------------------------------------------
+# Host measurements
+# ---------------------------------------------------------------------------
+
+def _read_meminfo_mb() -> Optional[Dict[str, float]]:
+    try:
+        values = {}
+        with open("/proc/meminfo") as f:
+            for line in f:
+                key, rest = line.split(":", 1)
+                if key in ("MemTotal", "MemAvailable"):
+                    values[key] = int(rest.split()[0]) / 1024.0
+        if "MemTotal" in values and "MemAvailable" in values:
+            return values
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _read_cpu_times() -> Optional[tuple]:
+    """Returns (idle, total) jiffies from /proc/stat."""
+    try:
+        with open("/proc/stat") as f:
+            fields = [int(x) for x in f.readline().split()[1:]]
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0)  # idle + iowait
+        return idle, sum(fields)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class HostSampler:
+    """Samples host CPU busy fraction and memory, rate limited to one read per second."""
+
+    def __init__(self, min_interval: float = 1.0):
+        self.cpu_count = os.cpu_count() or 1
+        self.min_interval = min_interval
+        self._last_cpu = _read_cpu_times()
+        self._last_sample_at = 0.0
+        self._busy_fraction = 0.0
+        self._mem: Optional[Dict[str, float]] = _read_meminfo_mb()
+
+    def sample(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        if now - self._last_sample_at >= self.min_interval:
+            current = _read_cpu_times()
+            if current and self._last_cpu:
+                d_idle = current[0] - self._last_cpu[0]
+                d_total = current[1] - self._last_cpu[1]
+                if d_total > 0:
+                    self._busy_fraction = max(0.0, min(1.0, 1.0 - d_idle / d_total))
+            self._last_cpu = current
+            self._mem = _read_meminfo_mb()
+            self._last_sample_at = now
+        return {
+            "cpu_count": self.cpu_count,
+            "cpu_busy_cores": self._busy_fraction * self.cpu_count,
+            "mem_total_mb": self._mem["MemTotal"] if self._mem else None,
+            "mem_available_mb": self._mem["MemAvailable"] if self._mem else None,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Admission control
+# ---------------------------------------------------------------------------
+
+class HostAdmissionController:
+    """Admits bot launches only while the host has CPU and RAM headroom.
+
+    Launches that cannot be admitted wait in a FIFO queue; waiters re-check
+    capacity every second and whenever a slot is released.
+    """
+
+    def __init__(self, sampler: Optional[HostSampler] = None):
+        self.sampler = sampler or HostSampler()
+        self._queue: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Seconds between slot releases (EWMA), used for queue ETAs
+        self._release_interval = BOT_WARMUP_SECONDS
+        self._last_release_at: Optional[float] = None
+        # Admitted launches whose process is not registered yet
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def max_slots(self) -> int:
+        """Upper bound on concurrent bots derived from host size."""
+        host = self.sampler.sample()
+        cpu_slots = math.floor(host["cpu_count"] * BOT_HOST_CPU_TARGET / BOT_CPU_CORES)
+        slots = cpu_slots
+        if host["mem_total_mb"] is not None:
+            mem_slots = math.floor((host["mem_total_mb"] - BOT_HOST_MEM_RESERVE_MB) / BOT_MEMORY_MB)
+            slots = min(slots, mem_slots)
+        if BOT_MAX_PROCESSES > 0:
+            slots = min(slots, BOT_MAX_PROCESSES)
+        return max(1, slots)
+
+    def free_slots(self, running: int, warming: int) -> int:
+        """Slots currently available given running bots and those still warming up."""
+        host = self.sampler.sample()
+        static_free = self.max_slots() - running
+        if static_free <= 0:
+            return 0
+
+        # Measured headroom; warming bots reserve their full expected cost
+        cpu_budget = host["cpu_count"] * BOT_HOST_CPU_TARGET
+        cpu_headroom = cpu_budget - host["cpu_busy_cores"] - warming * BOT_CPU_CORES
+        dynamic_free = math.floor(cpu_headroom / BOT_CPU_CORES)
+        if host["mem_available_mb"] is not None:
+            mem_headroom = host["mem_available_mb"] - BOT_HOST_MEM_RESERVE_MB - warming * BOT_MEMORY_MB
+            dynamic_free = min(dynamic_free, math.floor(mem_headroom / BOT_MEMORY_MB))
+        # Never block the very first bot on an otherwise busy host
+        if running == 0:
+            dynamic_free = max(dynamic_free, 1)
+        return max(0, min(static_free, dynamic_free))
+
+    def eta_seconds(self, position: int) -> float:
+        """Estimated wait for the request at the given 0-based queue position."""
+        return round((position + 1) * self._release_interval, 1)
+
+    def status(self, running: int, warming: int) -> Dict[str, Any]:
+        host = self.sampler.sample()
+        return {
+            "max_slots": self.max_slots(),
+            "free_slots": self.free_slots(running, warming),
+            "running": running,
+            "warming": warming,
+            "queued": len(self._queue),
+            "next_eta_seconds": self.eta_seconds(0) if self._queue else 0.0,
+            **host,
+        }
+
+    async def _has_capacity(self, count_bots) -> bool:
+        running, warming = await count_bots()
+        return self.free_slots(running + self._pending, warming + self._pending) > 0
+
+    def settle(self):
+        """Marks an admitted launch as registered (or failed); must follow every acquire()."""
+        self._pending = max(0, self._pending - 1)
+
+    def notify_released(self):
+        """Called when a bot slot is freed; safe to call from any thread."""
+        now = time.monotonic()
+        with self._lock:
+            if self._last_release_at is not None:
+                interval = now - self._last_release_at
+                self._release_interval = 0.8 * self._release_interval + 0.2 * interval
+            self._last_release_at = now
+        if self._loop and self._wakeup:
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass  # Loop closed during shutdown
+
+    async def acquire(self, meeting_id: int, count_bots) -> Dict[str, Any]:
+        """Waits until the host can take another bot.
+
+        Args:
+            meeting_id: Meeting the bot is launched for (logging only)
+            count_bots: Callable returning (running, warming) bot counts
+
+        Returns:
+            Dict with the time spent queued and the initial queue position.
+            The caller must call settle() once the bot is registered or has failed.
+
+        Raises:
+            AdmissionRejected: if the queue is full or the wait times out
+        """
+        if self._wakeup is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+
+        if not self._queue and await self._has_capacity(count_bots):
+            self._pending += 1
+            return {"queued_seconds": 0.0, "queue_position": None}
+
+        if len(self._queue) >= BOT_ADMISSION_QUEUE_MAX:
+            position = len(self._queue)
+            raise AdmissionRejected(
+                f"Host is at bot capacity and the launch queue is full ({position} waiting).",
+                queue_position=position,
+                eta_seconds=self.eta_seconds(position),
+            )
+
+        ticket = object()
+        self._queue.append(ticket)
+        initial_position = len(self._queue) - 1
+        started = time.monotonic()
+        logger.warning(
+            f"[Admission] Host at capacity; meeting {meeting_id} queued at position {initial_position} "
+            f"(ETA ~{self.eta_seconds(initial_position)}s)"
+        )
+        try:
+            while True:
+                if self._queue and self._queue[0] is ticket:
+                    if await self._has_capacity(count_bots):
+                        self._queue.popleft()
+                        self._pending += 1
+                        waited = time.monotonic() - started
+                        logger.info(f"[Admission] Meeting {meeting_id} admitted after {waited:.1f}s in queue")
+                        # Let the next waiter re-check immediately
+                        self._wakeup.set()
+                        return {"queued_seconds": waited, "queue_position": initial_position}
+
+                remaining = BOT_ADMISSION_TIMEOUT_SECONDS - (time.monotonic() - started)
+                if remaining <= 0:
+                    position = self._queue.index(ticket)
+                    raise AdmissionRejected(
+                        f"Timed out after {BOT_ADMISSION_TIMEOUT_SECONDS:.0f}s waiting for host capacity.",
+                        queue_position=position,
+                        eta_seconds=self.eta_seconds(position),
+                    )
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=min(BOT_ADMISSION_POLL_SECONDS, remaining))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            try:
+                self._queue.remove(ticket)
+            except ValueError:
+                pass
+
+
+# ---------------------------------------------------------------------------
+# Xvfb display pool
+# ---------------------------------------------------------------------------
+
+class XvfbDisplayPool:
+    """Keeps Xvfb servers alive across bots and leases one display per bot."""
+
+    def __init__(self, size: int, base: int = XVFB_DISPLAY_BASE):
+        self.size = size
+        self.base = base
+        self._servers: Dict[int, subprocess.Popen] = {}
+        self._leases: Dict[str, int] = {}  # process_id -> display number
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def _socket_path(self, display: int) -> Path:
+        return Path(f"/tmp/.X11-unix/X{display}")
+
+    def _ensure_server(self, display: int) -> bool:
+        proc = self._servers.get(display)
+        if proc is not None and proc.poll() is None:
+            return True
+        try:
+            proc = subprocess.Popen(
+                ["Xvfb", f":{display}", "-screen", "0", XVFB_SCREEN, "-ac", "-nolisten", "tcp",
+                 "+extension", "GLX", "+render", "-noreset"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                preexec_fn=os.setsid,
+            )
+        except (FileNotFoundError, PermissionError) as e:
+            logger.error(f"[Xvfb] Could not start display :{display}: {e}")
+            return False
+        self._servers[display] = proc
+
+        deadline = time.monotonic() + XVFB_START_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            if self._socket_path(display).exists():
+                logger.info(f"[Xvfb] Started display :{display} (pid {proc.pid})")
+                return True
+            if proc.poll() is not None:
+                break
+            time.sleep(0.05)
+        logger.error(f"[Xvfb] Display :{display} failed to come up")
+        self._stop_server(display)
+        return False
+
+    def _stop_server(self, display: int):
+        proc = self._servers.pop(display, None)
+        if proc is None:
+            return
+        try:
+            os.killpg(os.getpgid(proc.pid), signal.SIGTERM)
+            proc.wait(timeout=5)
+        except Exception:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
+    def lease(self, process_key: str) -> Optional[str]:
+        """Leases a running display (starting it if needed); returns e.g. ':101' or None."""
+        with self._lock:
+            in_use = set(self._leases.values())
+            # Prefer displays whose server is already running
+            candidates = sorted(
+                (d for d in range(self.base, self.base + self.size) if d not in in_use),
+                key=lambda d: 0 if d in self._servers and self._servers[d].poll() is None else 1,
+            )
+            for display in candidates:
+                if self._ensure_server(display):
+                    self._leases[process_key] = display
+                    return f":{display}"
+        return None
+
+    def release(self, process_key: str):
+        """Returns a display to the pool; the Xvfb server keeps running for reuse."""
+        with self._lock:
+            display = self._leases.pop(process_key, None)
+        if display is not None:
+            logger.debug(f"[Xvfb] Display :{display} released by {process_key}")
+
+    def shutdown(self):
+        with self._lock:
+            for display in list(self._servers):
+                self._stop_server(display)
+            self._leases.clear()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            running = [d for d, p in self._servers.items() if p.poll() is None]
+            return {"size": self.size, "running": len(running), "leased": len(self._leases)}
+
+
+def _resolve_pool_size(admission: HostAdmissionController) -> int:
+    if XVFB_POOL_SIZE.strip().lower() == "auto":
+        if shutil.which("Xvfb") is None:
+            logger.info("[Xvfb] Xvfb binary not found; bots will share DISPLAY")
+            return 0
+        return admission.max_slots()
+    try:
+        return max(0, int(XVFB_POOL_SIZE))
+    except ValueError:
+        logger.warning(f"[Xvfb] Invalid XVFB_POOL_SIZE '{XVFB_POOL_SIZE}', pool disabled")
+        return 0
+
+
+# ---------------------------------------------------------------------------
+# CPU weighting
+# ---------------------------------------------------------------------------
+
+def _enable_cpu_controller(group: Path):
+    """Delegates the cpu controller to ``group``'s children (creates their cpu.weight)."""
+    controllers = group / "cgroup.subtree_control"
+    if controllers.exists() and "cpu" not in controllers.read_text().split():
+        controllers.write_text("+cpu")
+
+
+def _cgroup_available(root: Optional[Path] = None) -> bool:
+    """
+    Prepares the bots' cgroup: BOT_CPU_WEIGHT is set on the group itself, so all bots
+    together compete with sibling services (default weight 100) at that weight, and
+    each bot gets an equal share of it through its own child group.
+    """
+    root = Path(BOT_CGROUP_PATH) if root is None else root
+    try:
+        root.mkdir(exist_ok=True)
+        _enable_cpu_controller(root.parent)
+        if not (root / "cgroup.procs").exists():
+            return False
+        weight_file = root / "cpu.weight"
+        if weight_file.exists():
+            weight_file.write_text(str(BOT_CPU_WEIGHT))
+        else:
+            logger.info(f"[CPU] cpu controller not available for {root}; bots are not weighted")
+        _enable_cpu_controller(root)
+        return True
+    except OSError as e:
+        logger.debug(f"[CPU] cgroup setup failed at {root}: {e}")
+        return False
+
+
+_CGROUPS_ENABLED: Optional[bool] = None
+
+
+def bot_preexec():
+    """preexec_fn for bot processes: new session plus lower scheduling priority."""
+    os.setsid()
+    if BOT_NICE:
+        try:
+            os.nice(BOT_NICE)
+        except OSError:
+            pass
+
+
+def apply_cpu_weight(process_key: str, pid: int) -> Optional[str]:
+    """Moves a bot into its own child of the weighted bots cgroup; returns the cgroup path if applied."""
+    global _CGROUPS_ENABLED
+    if _CGROUPS_ENABLED is None:
+        _CGROUPS_ENABLED = _cgroup_available()
+        if not _CGROUPS_ENABLED:
+            logger.info(f"[CPU] cgroup v2 not writable at {BOT_CGROUP_PATH}; using nice={BOT_NICE} only")
+    if not _CGROUPS_ENABLED:
+        return None
+    group = Path(BOT_CGROUP_PATH) / f"bot-{process_key}"
+    try:
+        group.mkdir(exist_ok=True)
+        (group / "cgroup.procs").write_text(str(pid))
+        return str(group)
+    except OSError as e:
+        logger.debug(f"[CPU] Could not apply cgroup weight to pid {pid}: {e}")
+        return None
+
+
+def remove_cgroup(path: Optional[str]):
+    if not path:
+        return
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass  # Still has processes or already gone; retried on next cleanup
+
+
+# ---------------------------------------------------------------------------
+# Module singletons
+# ---------------------------------------------------------------------------
+
+admission_controller = HostAdmissionController()
+display_pool = XvfbDisplayPool(_resolve_pool_size(admission_controller))
+
+logger.info(
+    f"[Admission] Host bot capacity: {admission_controller.max_slots()} slots "
+    f"(cpu={BOT_CPU_CORES} cores/bot, mem={BOT_MEMORY_MB}MB/bot, target={BOT_HOST_CPU_TARGET:.0%}); "
+    f"Xvfb pool size: {display_pool.size}"
+)
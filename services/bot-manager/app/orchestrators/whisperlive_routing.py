@@ -0,0 +1,168 @@
+"""Load-aware WhisperLive instance selection.
+
+Each WhisperLive instance heartbeats its live load into Redis:
+
+- ``{prefix}`` (zset): instance id -> last heartbeat timestamp
+- ``{prefix}:{id}`` (hash, expires when heartbeats stop): ws_url, backend,
+  device, clients, max_clients, queue_depth, rtf, healthy, ts
+
+When a bot is launched we pick the least-loaded healthy instance and reserve a
+slot on it in ``{prefix}:reservations:{id}`` (zset, member = meeting id). The
+reservation counts against the instance until the bot's connection shows up in
+its client count (WhisperLive removes the member on connect) or it expires.
+Selection and reservation happen in a single Lua script, so concurrent
+launches - including from several bot-manager replicas - never see the same
+free slot twice.
+
+Load is scored as utilisation (``(clients + reserved) / max_clients``) plus
+penalties for inference queue depth and real-time factor, which keeps GPU and
+CPU nodes with different capacities evenly loaded.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import redis.asyncio as aioredis
+
+from app.config import (
+    WL_ROUTING_ENABLED,
+    WL_REGISTRY_PREFIX,
+    WL_RESERVATION_TTL_SECONDS,
+    WL_ROUTING_RTF_WEIGHT,
+    WL_ROUTING_QUEUE_WEIGHT,
+)
+
+logger = logging.getLogger("bot_manager.orchestrators.whisperlive_routing")
+
+# ARGV: prefix, now, reservation_ttl, meeting_id, rtf_weight, queue_weight
+_SELECT_AND_RESERVE_LUA = """
+local prefix = ARGV[1]
+local now = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+local member = ARGV[4]
+local rtf_weight = tonumber(ARGV[5])
+local queue_weight = tonumber(ARGV[6])
+
+local best_id, best_url, best_score, best_occupied, best_max
+for _, id in ipairs(redis.call('ZRANGE', prefix, 0, -1)) do
+    local h = redis.call('HMGET', prefix .. ':' .. id, 'ws_url', 'clients', 'max_clients', 'queue_depth', 'rtf', 'healthy')
+    if not h[1] then
+        -- Heartbeat hash expired: the instance is gone
+        redis.call('ZREM', prefix, id)
+        redis.call('DEL', prefix .. ':reservations:' .. id)
+    elseif h[6] == '1' then
+        local rkey = prefix .. ':reservations:' .. id
+        redis.call('ZREMRANGEBYSCORE', rkey, '-inf', now - ttl)
+        local reserved = redis.call('ZCARD', rkey)
+        if redis.call('ZSCORE', rkey, member) then
+            reserved = reserved - 1
+        end
+        local clients = tonumber(h[2]) or 0
+        local max_clients = tonumber(h[3]) or 0
+        local occupied = clients + reserved
+        if max_clients > 0 and occupied < max_clients then
+            local score = occupied / max_clients
+                + rtf_weight * (tonumber(h[5]) or 0)
+                + queue_weight * (tonumber(h[4]) or 0) / max_clients
+            if best_score == nil or score < best_score
+                    or (score == best_score and occupied < best_occupied) then
+                best_id, best_url, best_score, best_occupied, best_max = id, h[1], score, occupied, max_clients
+            end
+        end
+    end
+end
+
+if best_id == nil then
+    return nil
+end
+local rkey = prefix .. ':reservations:' .. best_id
+redis.call('ZADD', rkey, now, member)
+redis.call('EXPIRE', rkey, math.ceil(ttl) + 60)
+return {best_id, best_url, tostring(best_score), best_occupied + 1, best_max}
+"""
+
+_redis: Optional[aioredis.Redis] = None
+_select_script = None
+
+
+def configure_whisperlive_routing(redis_client: Optional[aioredis.Redis]) -> None:
+    """Attach the shared Redis client used to read the registry."""
+    global _redis, _select_script
+    _redis = redis_client
+    _select_script = redis_client.register_script(_SELECT_AND_RESERVE_LUA) if redis_client else None
+
+
+async def select_whisperlive_url(meeting_id: int, default_url: Optional[str]) -> Optional[str]:
+    """
+    Reserve a slot on the least-loaded healthy WhisperLive instance.
+
+    Falls back to ``default_url`` (usually the load-balanced address) when
+    routing is disabled, Redis is unavailable, no instance is registered, or
+    every registered instance is full.
+    """
+    if not WL_ROUTING_ENABLED or _select_script is None:
+        return default_url
+
+    try:
+        result = await _select_script(
+            args=[
+                WL_REGISTRY_PREFIX,
+                time.time(),
+                WL_RESERVATION_TTL_SECONDS,
+                str(meeting_id),
+                WL_ROUTING_RTF_WEIGHT,
+                WL_ROUTING_QUEUE_WEIGHT,
+            ]
+        )
+    except Exception as e:
+        logger.warning(f"[WL Routing] Registry lookup failed for meeting {meeting_id}; using {default_url}: {e}")
+        return default_url
+
+    if not result:
+        logger.info(f"[WL Routing] No WhisperLive instance with free capacity for meeting {meeting_id}; using {default_url}")
+        return default_url
+
+    instance_id, ws_url, score, occupied, max_clients = result
+    logger.info(
+        f"[WL Routing] Meeting {meeting_id} -> {instance_id} ({ws_url}), "
+        f"slots {occupied}/{max_clients}, score={float(score):.3f}"
+    )
+    return ws_url
+
+
+async def release_whisperlive_reservation(meeting_id: int) -> None:
+    """Drop any slot reserved for a meeting whose bot failed to launch."""
+    if _redis is None:
+        return
+    try:
+        instance_ids = await _redis.zrange(WL_REGISTRY_PREFIX, 0, -1)
+        if not instance_ids:
+            return
+        pipe = _redis.pipeline(transaction=False)
+        for instance_id in instance_ids:
+            pipe.zrem(f"{WL_REGISTRY_PREFIX}:reservations:{instance_id}", str(meeting_id))
+        await pipe.execute()
+    except Exception as e:
+        logger.debug(f"[WL Routing] Failed to release reservation for meeting {meeting_id}: {e}")
+
+
+async def get_whisperlive_registry() -> List[Dict[str, Any]]:
+    """Snapshot of registered instances with their reserved slot counts."""
+    if _redis is None:
+        return []
+    instance_ids = await _redis.zrange(WL_REGISTRY_PREFIX, 0, -1)
+    now = time.time()
+    instances: List[Dict[str, Any]] = []
+    for instance_id in instance_ids:
+        data = await _redis.hgetall(f"{WL_REGISTRY_PREFIX}:{instance_id}")
+        if not data:
+            continue
+        reserved = await _redis.zcount(
+            f"{WL_REGISTRY_PREFIX}:reservations:{instance_id}",
+            now - WL_RESERVATION_TTL_SECONDS,
+            "+inf",
+        )
+        instances.append({"id": instance_id, **data, "reserved": reserved})
+    return instances
@@ -1,13 +1,16 @@
 import logging
-import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 from shared_models.models import Meeting, User
+from shared_models.meeting_status import meeting_data_with_transitions
+
+from app.tasks.webhook_dispatcher import enqueue_webhook
 
 logger = logging.getLogger(__name__)
 
 async def run(meeting: Meeting, db: AsyncSession):
     """
-    Sends a webhook with the completed meeting details to a user-configured URL.
+    Queues a webhook with the completed meeting details to a user-configured URL.
+    The webhook dispatcher performs the actual delivery with retries.
     """
     logger.info(f"Executing send_webhook task for meeting {meeting.id}")
 
@@ -25,7 +28,8 @@ async def run(meeting: Meeting, db: AsyncSession):
             logger.info(f"No webhook URL configured for user {user.email} (meeting {meeting.id})")
             return
 
-        # Prepare the webhook payload
+        # Prepare the webhook payload (status history rebuilt from meeting_status_events)
+        data = (await meeting_data_with_transitions(db, [meeting]))[meeting.id]
         payload = {
             'id': meeting.id,
             'user_id': meeting.user_id,
@@ -36,27 +40,12 @@ async def run(meeting: Meeting, db: AsyncSession):
             'bot_container_id': meeting.bot_container_id,
             'start_time': meeting.start_time.isoformat() if meeting.start_time else None,
             'end_time': meeting.end_time.isoformat() if meeting.end_time else None,
-            'data': meeting.data or {},
+            'data': data,
             'created_at': meeting.created_at.isoformat() if meeting.created_at else None,
             'updated_at': meeting.updated_at.isoformat() if meeting.updated_at else None,
         }
 
-        # Send the webhook
-        async with httpx.AsyncClient() as client:
-            logger.info(f"Sending webhook to {webhook_url} for meeting {meeting.id}")
-            response = await client.post(
-                webhook_url,
-                json=payload,
-                timeout=30.0,
-                headers={'Content-Type': 'application/json'}
-            )
-            
-            if response.status_code >= 200 and response.status_code < 300:
-                logger.info(f"Successfully sent webhook for meeting {meeting.id} to {webhook_url}")
-            else:
-                logger.warning(f"Webhook for meeting {meeting.id} returned status {response.status_code}: {response.text}")
-
-    except httpx.RequestError as e:
-        logger.error(f"Failed to send webhook for meeting {meeting.id}: {e}")
+        await enqueue_webhook(webhook_url, payload, meeting_id=meeting.id, event_type="meeting.completed")
+
     except Exception as e:
-        logger.error(f"Unexpected error sending webhook for meeting {meeting.id}: {e}", exc_info=True) 
\ No newline at end of file
+        logger.error(f"Unexpected error queueing webhook for meeting {meeting.id}: {e}", exc_info=True)
@@ -0,0 +1,485 @@
+"""Durable webhook delivery for bot-manager.
+
+Webhook events are appended to a Redis Stream and delivered by a background
+dispatcher, so callback endpoints never wait on a customer's endpoint:
+
+- one shared, pooled ``httpx.AsyncClient`` for all deliveries
+- a per-destination-host concurrency cap and a hard per-attempt time budget
+- retries with exponential backoff via a Redis sorted set, and a capped
+  dead-letter list for deliveries that exhaust their attempts
+- optional coalescing of status events per destination (WEBHOOK_BATCH_WINDOW_MS)
+"""
+import asyncio
+import json
+import logging
+import random
+import socket
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import redis
+import redis.asyncio as aioredis
+
+from app.config import (
+    WEBHOOK_STREAM_NAME,
+    WEBHOOK_CONSUMER_GROUP,
+    WEBHOOK_RETRY_KEY,
+    WEBHOOK_DEAD_LETTER_KEY,
+    WEBHOOK_DEAD_LETTER_MAX,
+    WEBHOOK_STREAM_MAXLEN,
+    WEBHOOK_MAX_CONNECTIONS,
+    WEBHOOK_MAX_IN_FLIGHT,
+    WEBHOOK_PER_HOST_CONCURRENCY,
+    WEBHOOK_TIMEOUT_SECONDS,
+    WEBHOOK_MAX_ATTEMPTS,
+    WEBHOOK_BACKOFF_BASE_SECONDS,
+    WEBHOOK_BACKOFF_MAX_SECONDS,
+    WEBHOOK_BATCH_WINDOW_MS,
+    WEBHOOK_BATCH_MAX_EVENTS,
+)
+
+logger = logging.getLogger(__name__)
+
+STATUS_CHANGE_EVENT = "meeting.status_change"
+STATUS_CHANGE_BATCH_EVENT = "meeting.status_change.batch"
+
+# Jobs of this kind carry only meeting_id + status_change; URL and payload are
+# resolved by the dispatcher so the callback endpoint does no extra DB work.
+_KIND_STATUS_CHANGE = "status_change"
+_KIND_DELIVERY = "delivery"
+
+_READ_COUNT = 50
+_READ_BLOCK_MS = 2000
+_RETRY_POLL_SECONDS = 1.0
+_RECLAIM_IDLE_MS = 60000
+_RECLAIM_INTERVAL_SECONDS = 30.0
+
+# Atomically move due retries from the sorted set back onto the stream.
+_MOVE_DUE_RETRIES_LUA = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, item in ipairs(items) do
+    redis.call('ZREM', KEYS[1], item)
+    redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*', 'payload', item)
+end
+return #items
+"""
+
+
+class _DeliveryFailed(Exception):
+    def __init__(self, message: str, retryable: bool = True, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def _new_job(kind: str, **fields: Any) -> Dict[str, Any]:
+    job = {"id": uuid.uuid4().hex, "kind": kind, "attempt": 0, "created_at": time.time()}
+    job.update(fields)
+    return job
+
+
+def _host_of(url: str) -> str:
+    try:
+        return urlsplit(url).netloc.lower() or url
+    except Exception:
+        return url
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """Exponential backoff with jitter for the given (1-based) attempt number."""
+    delay = min(WEBHOOK_BACKOFF_MAX_SECONDS, WEBHOOK_BACKOFF_BASE_SECONDS * (2 ** (attempt - 1)))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(WEBHOOK_TIMEOUT_SECONDS, connect=min(5.0, WEBHOOK_TIMEOUT_SECONDS)),
+        limits=httpx.Limits(
+            max_connections=WEBHOOK_MAX_CONNECTIONS,
+            max_keepalive_connections=WEBHOOK_MAX_CONNECTIONS,
+        ),
+        headers={'Content-Type': 'application/json'},
+    )
+
+
+async def _post_webhook(client: httpx.AsyncClient, url: str, payload: Dict[str, Any]) -> None:
+    """POSTs a payload once within the configured time budget; raises _DeliveryFailed on failure."""
+    try:
+        response = await asyncio.wait_for(client.post(url, json=payload), timeout=WEBHOOK_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise _DeliveryFailed(f"timed out after {WEBHOOK_TIMEOUT_SECONDS}s")
+    except httpx.RequestError as e:
+        raise _DeliveryFailed(f"request error: {e!r}")
+
+    if 200 <= response.status_code < 300:
+        return
+
+    retry_after = None
+    header = response.headers.get("Retry-After")
+    if header and header.isdigit():
+        retry_after = float(header)
+    retryable = response.status_code >= 500 or response.status_code in (408, 429)
+    raise _DeliveryFailed(
+        f"HTTP {response.status_code}: {response.text[:200]}",
+        retryable=retryable,
+        retry_after=retry_after,
+    )
+
+
+class WebhookDispatcher:
+    """Consumes the webhook stream and delivers jobs with bounded concurrency."""
+
+    def __init__(self, redis_client: aioredis.Redis, consumer_name: Optional[str] = None):
+        self.redis = redis_client
+        self.consumer_name = consumer_name or f"bot-manager-{socket.gethostname()}"
+        self.http: Optional[httpx.AsyncClient] = None
+        self._in_flight = asyncio.Semaphore(WEBHOOK_MAX_IN_FLIGHT)
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._loops: List[asyncio.Task] = []
+        self._workers: set = set()
+        # Entries this dispatcher holds (in flight or batched); never reclaimed from itself
+        self._held: set = set()
+        # Pending status-change batches keyed by destination URL
+        self._batches: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        self._batch_timers: Dict[str, asyncio.Task] = {}
+        self._move_due_retries = self.redis.register_script(_MOVE_DUE_RETRIES_LUA)
+
+    async def start(self):
+        try:
+            await self.redis.xgroup_create(name=WEBHOOK_STREAM_NAME, groupname=WEBHOOK_CONSUMER_GROUP, id='0', mkstream=True)
+            logger.info(f"Created webhook consumer group '{WEBHOOK_CONSUMER_GROUP}' on stream '{WEBHOOK_STREAM_NAME}'.")
+        except redis.exceptions.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self.http = _build_http_client()
+        self._loops = [
+            asyncio.create_task(self._consume_loop()),
+            asyncio.create_task(self._retry_loop()),
+            asyncio.create_task(self._reclaim_loop()),
+        ]
+        logger.info(f"Webhook dispatcher started (consumer: {self.consumer_name}, per-host limit: {WEBHOOK_PER_HOST_CONCURRENCY}, "
+                    f"timeout: {WEBHOOK_TIMEOUT_SECONDS}s, max attempts: {WEBHOOK_MAX_ATTEMPTS}, batch window: {WEBHOOK_BATCH_WINDOW_MS}ms)")
+
+    async def stop(self, drain_timeout: float = 5.0):
+        for task in self._loops:
+            task.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = []
+
+        # Flush partially filled batches so their events are not held until the next start
+        for timer in self._batch_timers.values():
+            timer.cancel()
+        self._batch_timers.clear()
+        for url in list(self._batches):
+            self._spawn(self._flush_batch(url))
+        if self._workers:
+            _, still_running = await asyncio.wait(set(self._workers), timeout=drain_timeout)
+            for task in still_running:
+                task.cancel()
+            # Unacknowledged entries stay pending in the group and are reclaimed by a live dispatcher
+            if still_running:
+                logger.warning(f"Webhook dispatcher stopped with {len(still_running)} deliveries still in flight.")
+
+        if self.http:
+            await self.http.aclose()
+            self.http = None
+        logger.info("Webhook dispatcher stopped.")
+
+    # --- Stream consumption ---
+
+    async def _consume_loop(self):
+        while True:
+            try:
+                response = await self.redis.xreadgroup(
+                    groupname=WEBHOOK_CONSUMER_GROUP,
+                    consumername=self.consumer_name,
+                    streams={WEBHOOK_STREAM_NAME: '>'},
+                    count=_READ_COUNT,
+                    block=_READ_BLOCK_MS,
+                )
+                for _stream, messages in response or []:
+                    for message_id, fields in messages:
+                        await self._dispatch(message_id, fields)
+            except asyncio.CancelledError:
+                break
+            except redis.exceptions.ConnectionError as e:
+                logger.error(f"Redis connection error in webhook dispatcher: {e}. Retrying after delay...")
+                await asyncio.sleep(5)
+            except Exception as e:
+                logger.error(f"Unhandled error in webhook dispatcher loop: {e}", exc_info=True)
+                await asyncio.sleep(5)
+
+    async def _reclaim_loop(self):
+        # Periodic, so entries of a dispatcher that died are picked up by the survivors
+        while True:
+            try:
+                await self._reclaim_stale_entries()
+                await asyncio.sleep(_RECLAIM_INTERVAL_SECONDS)
+            except asyncio.CancelledError:
+                break
+
+    async def _reclaim_stale_entries(self):
+        """Takes over entries left pending by a crashed or restarted dispatcher."""
+        start_id = '0-0'
+        reclaimed = 0
+        try:
+            while True:
+                result = await self.redis.xautoclaim(
+                    name=WEBHOOK_STREAM_NAME,
+                    groupname=WEBHOOK_CONSUMER_GROUP,
+                    consumername=self.consumer_name,
+                    min_idle_time=_RECLAIM_IDLE_MS,
+                    start_id=start_id,
+                    count=_READ_COUNT,
+                )
+                start_id, messages = result[0], result[1]
+                for message_id, fields in messages:
+                    if fields and message_id not in self._held:
+                        reclaimed += 1
+                        await self._dispatch(message_id, fields)
+                if not messages or start_id in ('0-0', b'0-0'):
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to reclaim stale webhook entries: {e}", exc_info=True)
+        if reclaimed:
+            logger.info(f"Reclaimed {reclaimed} pending webhook deliveries.")
+
+    async def _dispatch(self, message_id: str, fields: Dict[str, Any]):
+        try:
+            job = json.loads(fields.get('payload') or '{}')
+        except (TypeError, json.JSONDecodeError):
+            logger.error(f"Dropping malformed webhook entry {message_id}: {fields}")
+            await self._ack(message_id)
+            return
+        # Bound the number of concurrently processed jobs; this also applies
+        # backpressure to the stream reader when destinations are slow.
+        await self._in_flight.acquire()
+        self._held.add(message_id)
+        self._spawn(self._process(message_id, job), release_slot=True)
+
+    def _spawn(self, coro, release_slot: bool = False):
+        task = asyncio.create_task(coro)
+        self._workers.add(task)
+
+        def _done(t: asyncio.Task):
+            self._workers.discard(t)
+            if release_slot:
+                self._in_flight.release()
+
+        task.add_done_callback(_done)
+
+    async def _ack(self, *message_ids: str):
+        if not message_ids:
+            return
+        self._held.difference_update(message_ids)
+        try:
+            await self.redis.xack(WEBHOOK_STREAM_NAME, WEBHOOK_CONSUMER_GROUP, *message_ids)
+            await self.redis.xdel(WEBHOOK_STREAM_NAME, *message_ids)
+        except Exception as e:
+            logger.error(f"Failed to acknowledge webhook entries {message_ids}: {e}")
+
+    # --- Delivery ---
+
+    async def _process(self, message_id: str, job: Dict[str, Any]):
+        try:
+            if job.get('kind') == _KIND_STATUS_CHANGE:
+                # Lazy import: webhook_runner pulls in shared_models.database
+                from app.tasks.webhook_runner import resolve_status_webhook
+                delivery = await resolve_status_webhook(job.get('meeting_id'), job.get('status_change'))
+                if not delivery:
+                    await self._ack(message_id)
+                    return
+                job = dict(job, kind=_KIND_DELIVERY, url=delivery[0], payload=delivery[1],
+                           event_type=STATUS_CHANGE_EVENT)
+                job.pop('status_change', None)
+
+            if (WEBHOOK_BATCH_WINDOW_MS > 0 and job.get('event_type') == STATUS_CHANGE_EVENT
+                    and job.get('attempt', 0) == 0):
+                self._add_to_batch(message_id, job)
+                return
+
+            await self._deliver(job)
+            await self._ack(message_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Left pending; the reclaim loop retries it once it has been idle long enough
+            self._held.discard(message_id)
+            logger.error(f"Unexpected error processing webhook entry {message_id}: {e}", exc_info=True)
+
+    async def _deliver(self, job: Dict[str, Any]):
+        """Delivers a job once; on failure it is rescheduled or dead-lettered (never raised)."""
+        url = job['url']
+        host = _host_of(url)
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(WEBHOOK_PER_HOST_CONCURRENCY)
+
+        async with limit:
+            try:
+                await _post_webhook(self.http, url, job['payload'])
+                logger.info(f"Delivered {job.get('event_type')} webhook for meeting {job.get('meeting_id')} to {host} (attempt {job['attempt'] + 1})")
+                return
+            except _DeliveryFailed as e:
+                failure = e
+
+        job = dict(job, attempt=job.get('attempt', 0) + 1, last_error=str(failure))
+        if failure.retryable and job['attempt'] < WEBHOOK_MAX_ATTEMPTS:
+            delay = failure.retry_after if failure.retry_after is not None else _backoff_seconds(job['attempt'])
+            await self.redis.zadd(WEBHOOK_RETRY_KEY, {json.dumps(job): time.time() + delay})
+            logger.warning(f"Webhook for meeting {job.get('meeting_id')} to {host} failed ({failure}); retry {job['attempt']}/{WEBHOOK_MAX_ATTEMPTS - 1} in {delay:.1f}s")
+        else:
+            job['dead_lettered_at'] = time.time()
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.lpush(WEBHOOK_DEAD_LETTER_KEY, json.dumps(job))
+                pipe.ltrim(WEBHOOK_DEAD_LETTER_KEY, 0, WEBHOOK_DEAD_LETTER_MAX - 1)
+                await pipe.execute()
+            logger.error(f"Webhook for meeting {job.get('meeting_id')} to {host} dead-lettered after {job['attempt']} attempt(s): {failure}")
+
+    async def _retry_loop(self):
+        while True:
+            try:
+                moved = await self._move_due_retries(
+                    keys=[WEBHOOK_RETRY_KEY, WEBHOOK_STREAM_NAME],
+                    args=[time.time(), _READ_COUNT, WEBHOOK_STREAM_MAXLEN],
+                )
+                if moved:
+                    logger.debug(f"Re-queued {moved} webhook retries.")
+                    continue
+                await asyncio.sleep(_RETRY_POLL_SECONDS)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error re-queueing webhook retries: {e}", exc_info=True)
+                await asyncio.sleep(5)
+
+    # --- Batching ---
+
+    def _add_to_batch(self, message_id: str, job: Dict[str, Any]):
+        url = job['url']
+        batch = self._batches.setdefault(url, [])
+        batch.append((message_id, job))
+        if len(batch) >= WEBHOOK_BATCH_MAX_EVENTS:
+            timer = self._batch_timers.pop(url, None)
+            if timer:
+                timer.cancel()
+            self._spawn(self._flush_batch(url))
+        elif url not in self._batch_timers:
+            self._batch_timers[url] = asyncio.create_task(self._flush_batch_later(url))
+
+    async def _flush_batch_later(self, url: str):
+        try:
+            await asyncio.sleep(WEBHOOK_BATCH_WINDOW_MS / 1000.0)
+        except asyncio.CancelledError:
+            return
+        self._batch_timers.pop(url, None)
+        self._spawn(self._flush_batch(url))
+
+    async def _flush_batch(self, url: str):
+        entries = self._batches.pop(url, [])
+        if not entries:
+            return
+        message_ids = [message_id for message_id, _ in entries]
+        if len(entries) == 1:
+            job = entries[0][1]
+        else:
+            job = _new_job(
+                _KIND_DELIVERY,
+                url=url,
+                event_type=STATUS_CHANGE_BATCH_EVENT,
+                meeting_id=sorted({j.get('meeting_id') for _, j in entries if j.get('meeting_id') is not None}),
+                payload={
+                    'event_type': STATUS_CHANGE_BATCH_EVENT,
+                    'events': [j['payload'] for _, j in entries],
+                },
+            )
+        try:
+            await self._deliver(job)
+            await self._ack(*message_ids)
+        except Exception as e:
+            self._held.difference_update(message_ids)
+            logger.error(f"Unexpected error flushing webhook batch for {_host_of(url)}: {e}", exc_info=True)
+
+
+# --- Module-level API used by tasks and endpoints ---
+
+_dispatcher: Optional[WebhookDispatcher] = None
+_fallback_client: Optional[httpx.AsyncClient] = None
+
+
+async def start_webhook_dispatcher(redis_client: aioredis.Redis) -> WebhookDispatcher:
+    """Starts the process-wide dispatcher on the given Redis client."""
+    global _dispatcher
+    if _dispatcher is None:
+        dispatcher = WebhookDispatcher(redis_client)
+        await dispatcher.start()
+        _dispatcher = dispatcher
+    return _dispatcher
+
+
+async def stop_webhook_dispatcher():
+    global _dispatcher, _fallback_client
+    if _dispatcher is not None:
+        await _dispatcher.stop()
+        _dispatcher = None
+    if _fallback_client is not None:
+        await _fallback_client.aclose()
+        _fallback_client = None
+
+
+async def _enqueue(job: Dict[str, Any]) -> bool:
+    if _dispatcher is not None:
+        try:
+            await _dispatcher.redis.xadd(
+                WEBHOOK_STREAM_NAME,
+                {'payload': json.dumps(job)},
+                maxlen=WEBHOOK_STREAM_MAXLEN,
+                approximate=True,
+            )
+            logger.info(f"Queued {job.get('event_type') or job['kind']} webhook for meeting {job.get('meeting_id')}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to queue webhook for meeting {job.get('meeting_id')}, delivering directly: {e}")
+    else:
+        logger.warning(f"Webhook dispatcher not running; delivering webhook for meeting {job.get('meeting_id')} directly.")
+
+    # Best effort, single attempt, still off the request path
+    asyncio.create_task(_deliver_without_queue(job))
+    return False
+
+
+async def _deliver_without_queue(job: Dict[str, Any]):
+    global _fallback_client
+    try:
+        if job['kind'] == _KIND_STATUS_CHANGE:
+            from app.tasks.webhook_runner import resolve_status_webhook
+            delivery = await resolve_status_webhook(job.get('meeting_id'), job.get('status_change'))
+            if not delivery:
+                return
+            url, payload = delivery
+        else:
+            url, payload = job['url'], job['payload']
+        if _fallback_client is None:
+            _fallback_client = _build_http_client()
+        await _post_webhook(_fallback_client, url, payload)
+        logger.info(f"Delivered webhook for meeting {job.get('meeting_id')} to {_host_of(url)} without queue")
+    except _DeliveryFailed as e:
+        logger.error(f"Direct webhook delivery for meeting {job.get('meeting_id')} failed: {e}")
+    except Exception as e:
+        logger.error(f"Unexpected error in direct webhook delivery for meeting {job.get('meeting_id')}: {e}", exc_info=True)
+
+
+async def enqueue_webhook(url: str, payload: Dict[str, Any], meeting_id: Optional[int] = None, event_type: Optional[str] = None) -> bool:
+    """Queues a ready-to-send webhook. Returns True if it was persisted to the stream."""
+    return await _enqueue(_new_job(_KIND_DELIVERY, url=url, payload=payload, meeting_id=meeting_id, event_type=event_type))
+
+
+async def enqueue_status_webhook(meeting_id: int, status_change_info: Optional[Dict[str, Any]] = None) -> bool:
+    """Queues a status change webhook; the URL and payload are resolved by the dispatcher."""
+    return await _enqueue(_new_job(_KIND_STATUS_CHANGE, meeting_id=meeting_id, status_change=status_change_info,
+                                   event_type=STATUS_CHANGE_EVENT))
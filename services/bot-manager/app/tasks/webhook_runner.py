@@ -1,35 +1,37 @@
 import logging
-import asyncio
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, Optional, Tuple
 from sqlalchemy.orm import selectinload
 from shared_models.models import Meeting
 from shared_models.database import async_session_local
-from .send_status_webhook import run as send_status_webhook
+from shared_models.meeting_status import meeting_data_with_transitions
+from .send_status_webhook import build_status_webhook
 
 logger = logging.getLogger(__name__)
 
-async def run_status_webhook_task(meeting_id: int, status_change_info: dict = None):
+async def resolve_status_webhook(meeting_id: int, status_change_info: dict = None) -> Optional[Tuple[str, Dict[str, Any]]]:
     """
-    Run webhook task with proper database session management.
-    
+    Load the meeting and build its status webhook (URL and payload).
+
+    The database session is closed before returning, so no connection is held
+    while the webhook is being delivered.
+
     Args:
         meeting_id: ID of the meeting to send webhook for
         status_change_info: Optional dict containing status change details
     """
-    logger.info(f"Starting webhook task runner for meeting {meeting_id}")
-    
+    logger.debug(f"Resolving status webhook for meeting {meeting_id}")
+
     async with async_session_local() as db:
         try:
-            # Eager load the User object to avoid separate queries in webhook task
+            # Eager load the User object to avoid separate queries when building the payload
             meeting = await db.get(Meeting, meeting_id, options=[selectinload(Meeting.user)])
             if not meeting:
                 logger.error(f"Could not find meeting with ID {meeting_id} for webhook task")
-                return
-
-            # Run the webhook task
-            await send_status_webhook(meeting, db, status_change_info)
-            
-        except Exception as e:
-            logger.error(f"Error in webhook task runner for meeting_id {meeting_id}: {e}", exc_info=True)
+                return None
 
+            data = (await meeting_data_with_transitions(db, [meeting]))[meeting.id]
+            return build_status_webhook(meeting, status_change_info, data=data)
 
+        except Exception as e:
+            logger.error(f"Error resolving status webhook for meeting_id {meeting_id}: {e}", exc_info=True)
+            return None
@@ -0,0 +1,9 @@
+import os
+import sys
+from pathlib import Path
+
+# app.config requires REDIS_URL at import time
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
@@ -0,0 +1,54 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+MODULE_PATH = Path(__file__).resolve().parent.parent / "app" / "orchestrators" / "process_resources.py"
+
+
+@pytest.fixture
+def resources(monkeypatch):
+    # Loaded from its file so the orchestrator package does not import the docker backend
+    monkeypatch.setenv("XVFB_POOL_SIZE", "0")
+    spec = importlib.util.spec_from_file_location("process_resources_under_test", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_cgroup(path: Path, controllers: str = "") -> Path:
+    """Files the kernel would create for a cgroup v2 directory."""
+    path.mkdir(exist_ok=True)
+    (path / "cgroup.procs").write_text("")
+    (path / "cgroup.subtree_control").write_text(controllers)
+    (path / "cpu.weight").write_text("100")
+    return path
+
+
+def test_weight_is_set_on_the_bots_group(resources, tmp_path, monkeypatch):
+    parent = make_cgroup(tmp_path / "sys")
+    bots = make_cgroup(parent / "vexa-bots")
+    monkeypatch.setattr(resources, "BOT_CGROUP_PATH", str(bots))
+
+    assert resources.apply_cpu_weight("abc", 4242) == str(bots / "bot-abc")
+    # cpu delegated to the bots group (weighted against other services) and to each bot
+    assert (parent / "cgroup.subtree_control").read_text() == "+cpu"
+    assert (bots / "cgroup.subtree_control").read_text() == "+cpu"
+    assert (bots / "cpu.weight").read_text() == str(resources.BOT_CPU_WEIGHT)
+    assert (bots / "bot-abc" / "cgroup.procs").read_text() == "4242"
+    assert not (bots / "bot-abc" / "cpu.weight").exists()
+
+
+def test_controller_already_enabled_is_left_alone(resources, tmp_path):
+    parent = make_cgroup(tmp_path / "sys", controllers="cpu memory")
+    bots = make_cgroup(parent / "vexa-bots", controllers="cpu")
+
+    assert resources._cgroup_available(bots)
+    assert (parent / "cgroup.subtree_control").read_text() == "cpu memory"
+    assert (bots / "cgroup.subtree_control").read_text() == "cpu"
+
+
+def test_not_a_cgroup_falls_back_to_nice(resources, tmp_path, monkeypatch):
+    monkeypatch.setattr(resources, "BOT_CGROUP_PATH", str(tmp_path / "vexa-bots"))
+    assert not resources._cgroup_available()
+    assert resources.apply_cpu_weight("abc", 4242) is None
@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+import fakeredis.aioredis
+
+from app.tasks import webhook_dispatcher
+from app.tasks.webhook_dispatcher import WebhookDispatcher
+from app.config import WEBHOOK_CONSUMER_GROUP, WEBHOOK_STREAM_NAME
+
+
+async def _pending_entry(redis_c, consumer: str) -> str:
+    await redis_c.xgroup_create(WEBHOOK_STREAM_NAME, WEBHOOK_CONSUMER_GROUP, id="0", mkstream=True)
+    job = webhook_dispatcher._new_job("delivery", url="http://example.test/hook", payload={})
+    await redis_c.xadd(WEBHOOK_STREAM_NAME, {"payload": json.dumps(job)})
+    response = await redis_c.xreadgroup(WEBHOOK_CONSUMER_GROUP, consumer, {WEBHOOK_STREAM_NAME: ">"}, count=1)
+    return response[0][1][0][0]
+
+
+def _recording(dispatcher: WebhookDispatcher) -> list:
+    processed = []
+
+    async def process(message_id, job):
+        processed.append(message_id)
+
+    dispatcher._process = process
+    return processed
+
+
+def test_reclaims_entries_of_a_dead_consumer(monkeypatch):
+    monkeypatch.setattr(webhook_dispatcher, "_RECLAIM_IDLE_MS", 0)
+
+    async def scenario():
+        redis_c = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        message_id = await _pending_entry(redis_c, "dead-dispatcher")
+        survivor = WebhookDispatcher(redis_c, consumer_name="survivor")
+        processed = _recording(survivor)
+        await survivor._reclaim_stale_entries()
+        await asyncio.gather(*survivor._workers)
+        return message_id, processed
+
+    message_id, processed = asyncio.run(scenario())
+    assert processed == [message_id]
+
+
+def test_does_not_reclaim_its_own_held_entries(monkeypatch):
+    monkeypatch.setattr(webhook_dispatcher, "_RECLAIM_IDLE_MS", 0)
+
+    async def scenario():
+        redis_c = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        message_id = await _pending_entry(redis_c, "self")
+        dispatcher = WebhookDispatcher(redis_c, consumer_name="self")
+        processed = _recording(dispatcher)
+        dispatcher._held.add(message_id)
+        await dispatcher._reclaim_stale_entries()
+        await asyncio.gather(*dispatcher._workers)
+        return processed
+
+    assert asyncio.run(scenario()) == []
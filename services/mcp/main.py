@@ -1,8 +1,11 @@
+import asyncio
 import json
 import os
+import time
+from collections import OrderedDict
 from fastapi import FastAPI, Header, HTTPException, Depends
 from fastapi_mcp import FastApiMCP
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pydantic import BaseModel, Field
 import httpx
 
@@ -10,6 +13,16 @@ app = FastAPI()
 
 BASE_URL = os.getenv("API_GATEWAY_URL", "http://api-gateway:8000")
 
+# Shared upstream client: one keep-alive pool for all tool calls
+HTTP_TIMEOUT = float(os.getenv("MCP_HTTP_TIMEOUT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("MCP_HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("MCP_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("MCP_HTTP_KEEPALIVE_EXPIRY", "30"))
+# Short-lived cache for polled reads (transcripts, bot status), per API key + URL; 0 disables
+READ_CACHE_TTL = float(os.getenv("MCP_READ_CACHE_TTL", "2"))
+READ_CACHE_MAX_ENTRIES = int(os.getenv("MCP_READ_CACHE_MAX_ENTRIES", "1000"))
+CACHEABLE_PATH_PREFIXES = ("/transcripts/", "/bots/status")
+
 # ---------------------------
 # Dependencies & Utilities
 # ---------------------------
@@ -53,29 +66,127 @@ class UpdateMeetingData(BaseModel):
 # ---------------------------
 # Helper for async requests
 # ---------------------------
-async def make_request(method: str, url: str, api_key: str, payload: Optional[dict] = None):
+_http_client: Optional[httpx.AsyncClient] = None
+# Identical GETs in flight, keyed by (api_key, url); later callers await the first one's task
+_inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+# (api_key, url) -> (monotonic expiry, response JSON)
+_read_cache: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+# api_key -> write count; a GET that overlapped a write must not cache its (possibly stale) result
+_read_generation: Dict[str, int] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+    return _http_client
+
+
+@app.on_event("startup")
+async def startup_event():
+    get_http_client()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _is_cacheable(url: str) -> bool:
+    path = httpx.URL(url).path
+    return READ_CACHE_TTL > 0 and path.startswith(CACHEABLE_PATH_PREFIXES)
+
+
+def _freshness(response: httpx.Response) -> float:
+    """Seconds the response may be served from cache: READ_CACHE_TTL, capped by upstream Cache-Control."""
+    directives = [d.strip().lower() for d in response.headers.get("cache-control", "").split(",") if d.strip()]
+    if "no-store" in directives or "no-cache" in directives:
+        return 0.0
+    for d in directives:
+        if d.startswith("max-age="):
+            try:
+                return min(READ_CACHE_TTL, float(d.split("=", 1)[1]))
+            except ValueError:
+                return 0.0
+    return READ_CACHE_TTL
+
+
+async def _send(method: str, url: str, api_key: str, payload: Optional[dict] = None) -> Tuple[Any, float]:
+    """(JSON result or error dict, seconds it may be cached)."""
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.request(
-                method,
-                url,
-                headers=get_headers(api_key),
-                json=payload
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await get_http_client().request(
+            method,
+            url,
+            headers=get_headers(api_key),
+            json=payload
+        )
+        response.raise_for_status()
+        return response.json(), _freshness(response)
     except httpx.HTTPStatusError as http_err:
         return {
             "error": "HTTP error occurred",
             "status_code": http_err.response.status_code,
             "details": http_err.response.text
-        }
+        }, 0.0
     except httpx.TimeoutException:
-        return {"error": "Request timed out"}
+        return {"error": "Request timed out"}, 0.0
     except httpx.RequestError as req_err:
-        return {"error": "Request failed", "details": str(req_err)}
+        return {"error": "Request failed", "details": str(req_err)}, 0.0
     except Exception as e:
-        return {"error": "Unexpected error", "details": str(e)}
+        return {"error": "Unexpected error", "details": str(e)}, 0.0
+
+
+async def _fetch(key: Tuple[str, str], url: str, api_key: str) -> Any:
+    generation = _read_generation.get(key[0], 0)
+    result, ttl = await _send("GET", url, api_key)
+    if ttl > 0 and _is_cacheable(url) and _read_generation.get(key[0], 0) == generation:
+        _read_cache[key] = (time.monotonic() + ttl, result)
+        _read_cache.move_to_end(key)
+        while len(_read_cache) > READ_CACHE_MAX_ENTRIES:
+            _read_cache.popitem(last=False)
+    return result
+
+
+def _invalidate_reads(api_key: str):
+    """Drop cached reads of this API key after a write (bot stopped, config changed, ...)."""
+    _read_generation[api_key] = _read_generation.get(api_key, 0) + 1
+    for key in [k for k in _read_cache if k[0] == api_key]:
+        del _read_cache[key]
+    # GETs already in flight may have been answered before the write; later callers start fresh
+    for key in [k for k in _inflight if k[0] == api_key]:
+        del _inflight[key]
+
+
+async def make_request(method: str, url: str, api_key: str, payload: Optional[dict] = None):
+    if method != "GET":
+        result, _ = await _send(method, url, api_key, payload)
+        _invalidate_reads(api_key or "")
+        return result
+
+    key = (api_key or "", url)
+    cached = _read_cache.get(key)
+    if cached is not None:
+        if cached[0] > time.monotonic():
+            return cached[1]
+        _read_cache.pop(key, None)
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch(key, url, api_key))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _inflight.pop(key, None) if _inflight.get(key) is t else None)
+    # Shielded so one caller going away does not cancel the request for the others
+    return await asyncio.shield(task)
 
 
 # ---------------------------
@@ -182,14 +293,27 @@ async def stop_bot(
 
 
 @app.get("/meetings", operation_id="list_meetings")
-async def list_meetings(api_key: str = Depends(get_api_key)) -> Dict[str, Any]:
+async def list_meetings(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    api_key: str = Depends(get_api_key)
+) -> Dict[str, Any]:
     """
-    List all meetings associated with your API key.
+    List meetings associated with your API key, newest first, one page at a time.
+    
+    Args:
+        limit: Optional maximum number of meetings to return (server default 100)
+        cursor: Optional next_cursor value from a previous call, to fetch the following page
     
     Returns:
-        JSON with a list of meeting records
+        JSON with a list of meeting records and next_cursor (null on the last page)
     """
     url = f"{BASE_URL}/meetings"
+    params = [f"limit={limit}"] if limit else []
+    if cursor:
+        params.append(f"cursor={cursor}")
+    if params:
+        url += "?" + "&".join(params)
     return await make_request("GET", url, api_key)
 
 
@@ -226,17 +350,19 @@ async def delete_meeting(
     api_key: str = Depends(get_api_key)
 ) -> Dict[str, Any]:
     """
-    Purge transcripts and anonymize meeting data for finalized meetings.
+    Purge transcripts, then anonymize meeting data, for finalized meetings.
     
     Only works for meetings in completed or failed states. Deletes all transcripts
-    but preserves meeting and session records for telemetry.
+    in a background job and anonymizes the meeting once they are gone; meeting and
+    session records are preserved for telemetry.
     
     Args:
         meeting_id: The unique identifier of the meeting
         meeting_platform: The meeting platform (e.g., 'google_meet', 'zoom'). Default is 'google_meet'.
     
     Returns:
-        JSON with confirmation message
+        JSON with confirmation message and the job_id of the background deletion;
+        check it with get_purge_job and repeat this call if the job failed or was interrupted
     
     Raises:
         409 Conflict: If meeting is not in a finalized state.
@@ -245,6 +371,22 @@ async def delete_meeting(
     return await make_request("DELETE", url, api_key)
 
 
+@app.get("/purge-job/{job_id}", operation_id="get_purge_job")
+async def get_purge_job(job_id: str, api_key: str = Depends(get_api_key)) -> Dict[str, Any]:
+    """
+    Get the progress of a transcript deletion job started by delete_meeting.
+    
+    Args:
+        job_id: The job_id returned by delete_meeting
+    
+    Returns:
+        JSON with the job status (queued, running, completed, failed or interrupted)
+        and the number of transcript segments deleted so far
+    """
+    url = f"{BASE_URL}/purge-jobs/{job_id}"
+    return await make_request("GET", url, api_key)
+
+
 # ---------------------------
 # MCP & Server
 # ---------------------------
@@ -1,11 +1,12 @@
 import logging
 import json
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Dict, Tuple
+from typing import Any, List, Optional, Dict, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from sqlalchemy import select, and_, func, distinct, text
+from sqlalchemy import select, and_, func, distinct, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as aioredis
 
@@ -23,7 +24,22 @@ from shared_models.schemas import (
     MeetingStatus
 )
 
-from config import IMMUTABILITY_THRESHOLD
+from shared_models.latency import stage_latency
+from shared_models.meeting_status import meeting_data_with_transitions
+from shared_models.pagination import keyset_paginate, split_page
+from config import (
+    IMMUTABILITY_THRESHOLD, MEETINGS_PAGE_MAX, MEETINGS_PAGE_SIZE, PURGE_MAX_BATCH_MEETINGS,
+    WS_AUTHZ_CACHE_TTL, WS_AUTHZ_MAX_MEETINGS,
+)
+from background.purge import (
+    FINALIZED_STATES,
+    create_purge_job,
+    get_purge_job,
+    purge_meeting,
+    start_purge_job,
+    ws_authz_cache_key,
+)
+from background.retranscription import RetranscriptionConflict, replace_meeting_transcript
 from filters import TranscriptionFilter
 from api.auth import get_current_user
 
@@ -45,6 +61,39 @@ class WsAuthorizeSubscribeResponse(BaseModel):
     errors: List[str] = []
     user_id: Optional[int] = None  # Include user_id for channel isolation
 
+class PurgeJobResponse(BaseModel):
+    job_id: str
+    status: str  # queued, running, completed, failed, interrupted
+    meetings_total: int
+    meetings_done: int
+    rows_deleted: int
+    skipped: List[int] = []
+    failed: List[Dict[str, Any]] = []
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+class BatchPurgeRequest(BaseModel):
+    meeting_ids: List[int]
+
+
+class RetranscribedSegment(BaseModel):
+    start: float
+    end: float
+    text: str
+    language: Optional[str] = None
+
+
+class RetranscribedSession(BaseModel):
+    session_uid: str
+    language: Optional[str] = None
+    segments: List[RetranscribedSegment]
+
+
+class TranscriptReplaceRequest(BaseModel):
+    sessions: List[RetranscribedSession]
+    source: Dict[str, Any] = {}  # model / settings used, recorded in meeting.data
+
 
 async def _get_full_transcript_segments(
     internal_meeting_id: int,
@@ -193,19 +242,34 @@ async def health_check(request: Request, db: AsyncSession = Depends(get_db)):
         timestamp=datetime.now().isoformat()
     )
 
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Per-stage latency histograms for segments processed by this collector."""
+    return {"latency": stage_latency.snapshot()}
+
 @router.get("/meetings", 
             response_model=MeetingListResponse,
             summary="Get list of all meetings for the current user",
             dependencies=[Depends(get_current_user)])
 async def get_meetings(
+    limit: int = Query(MEETINGS_PAGE_SIZE, ge=1, le=MEETINGS_PAGE_MAX, description="Maximum number of meetings to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Returns a list of all meetings initiated by the authenticated user."""
-    stmt = select(Meeting).where(Meeting.user_id == current_user.id).order_by(Meeting.created_at.desc())
+    """Returns the authenticated user's meetings, newest first, one keyset page at a time."""
+    stmt = select(Meeting).where(Meeting.user_id == current_user.id)
+    try:
+        stmt = keyset_paginate(stmt, Meeting.created_at, Meeting.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     result = await db.execute(stmt)
-    meetings = result.scalars().all()
-    return MeetingListResponse(meetings=[MeetingResponse.model_validate(m) for m in meetings])
+    meetings, next_cursor = split_page(result.scalars().all(), limit)
+    data_by_id = await meeting_data_with_transitions(db, meetings)
+    responses = [MeetingResponse.model_validate(m) for m in meetings]
+    for response in responses:
+        response.data = data_by_id[response.id]
+    return MeetingListResponse(meetings=responses, next_cursor=next_cursor)
     
 @router.get("/transcripts/{platform}/{native_meeting_id}",
             response_model=TranscriptionResponse,
@@ -274,11 +338,31 @@ async def get_transcript_by_native_id(
     logger.info(f"[API Meet {internal_meeting_id}] Merged and sorted into {len(sorted_segments)} total segments.")
     
     meeting_details = MeetingResponse.model_validate(meeting)
+    meeting_details.data = (await meeting_data_with_transitions(db, [meeting]))[meeting.id]
     response_data = meeting_details.model_dump()
     response_data["segments"] = sorted_segments
     return TranscriptionResponse(**response_data)
 
 
+async def _resolve_latest_meeting_ids(
+    db: AsyncSession,
+    user_id: int,
+    pairs: List[Tuple[str, str]]
+) -> Dict[Tuple[str, str], int]:
+    """Latest meeting id per (platform, native id) of the user, in one DISTINCT ON query."""
+    stmt = (
+        select(Meeting.platform, Meeting.platform_specific_id, Meeting.id)
+        .where(
+            Meeting.user_id == user_id,
+            tuple_(Meeting.platform, Meeting.platform_specific_id).in_(pairs)
+        )
+        .distinct(Meeting.platform, Meeting.platform_specific_id)
+        .order_by(Meeting.platform, Meeting.platform_specific_id, Meeting.created_at.desc())
+    )
+    rows = (await db.execute(stmt)).all()
+    return {(platform, native_id): meeting_id for platform, native_id, meeting_id in rows}
+
+
 @router.post("/ws/authorize-subscribe",
             response_model=WsAuthorizeSubscribeResponse,
             summary="Authorize WS subscription for meetings",
@@ -286,6 +370,7 @@ async def get_transcript_by_native_id(
             dependencies=[Depends(get_current_user)])
 async def ws_authorize_subscribe(
     payload: WsAuthorizeSubscribeRequest,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -295,12 +380,17 @@ async def ws_authorize_subscribe(
     meetings = payload.meetings or []
     if not meetings:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="'meetings' must be a non-empty list")
+    if len(meetings) > WS_AUTHZ_MAX_MEETINGS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {WS_AUTHZ_MAX_MEETINGS} meetings per subscribe request"
+        )
 
+    # Validate platform/native ID format via construct_meeting_url
+    valid: List[Tuple[int, str, str]] = []
     for idx, meeting_ref in enumerate(meetings):
         platform_value = meeting_ref.platform.value if isinstance(meeting_ref.platform, Platform) else str(meeting_ref.platform)
         native_id = meeting_ref.native_meeting_id
-
-        # Validate platform/native ID format via construct_meeting_url
         try:
             constructed = Platform.construct_meeting_url(platform_value, native_id)
         except Exception:
@@ -308,16 +398,39 @@ async def ws_authorize_subscribe(
         if not constructed:
             errors.append(f"meetings[{idx}] invalid native_meeting_id for platform '{platform_value}'")
             continue
+        valid.append((idx, platform_value, native_id))
 
-        stmt_meeting = select(Meeting).where(
-            Meeting.user_id == current_user.id,
-            Meeting.platform == platform_value,
-            Meeting.platform_specific_id == native_id
-        ).order_by(Meeting.created_at.desc()).limit(1)
+    pairs = list(dict.fromkeys((platform_value, native_id) for _, platform_value, native_id in valid))
+    resolved: Dict[Tuple[str, str], int] = {}
 
-        result = await db.execute(stmt_meeting)
-        meeting = result.scalars().first()
-        if not meeting:
+    # Repeat subscribes (reconnect storms) are answered from the per-user cache
+    redis_c = getattr(request.app.state, 'redis_client', None)
+    cache_key = ws_authz_cache_key(current_user.id)
+    use_cache = bool(redis_c and WS_AUTHZ_CACHE_TTL > 0 and pairs)
+    if use_cache:
+        try:
+            cached = await redis_c.hmget(cache_key, [f"{p}:{n}" for p, n in pairs])
+            resolved = {pair: int(mid) for pair, mid in zip(pairs, cached) if mid}
+        except Exception as e:
+            logger.warning(f"[API] WS authorization cache read failed for user {current_user.id}: {e}")
+
+    missing = [pair for pair in pairs if pair not in resolved]
+    if missing:
+        found = await _resolve_latest_meeting_ids(db, current_user.id, missing)
+        resolved.update(found)
+        # Only positive results are cached, so a newly created meeting authorizes immediately
+        if use_cache and found:
+            try:
+                async with redis_c.pipeline(transaction=True) as pipe:
+                    pipe.hset(cache_key, mapping={f"{p}:{n}": mid for (p, n), mid in found.items()})
+                    pipe.expire(cache_key, WS_AUTHZ_CACHE_TTL)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"[API] WS authorization cache write failed for user {current_user.id}: {e}")
+
+    for idx, platform_value, native_id in valid:
+        meeting_id = resolved.get((platform_value, native_id))
+        if meeting_id is None:
             errors.append(f"meetings[{idx}] not authorized or not found for user")
             continue
 
@@ -325,7 +438,7 @@ async def ws_authorize_subscribe(
             "platform": platform_value, 
             "native_id": native_id,
             "user_id": str(current_user.id),
-            "meeting_id": str(meeting.id)
+            "meeting_id": str(meeting_id)
         })
 
     return WsAuthorizeSubscribeResponse(authorized=authorized, errors=errors, user_id=current_user.id)
@@ -448,7 +561,9 @@ async def update_meeting_data(
     
     logger.debug(f"[API] Meeting.data after commit and refresh: {meeting.data}")
     
-    return MeetingResponse.model_validate(meeting)
+    response = MeetingResponse.model_validate(meeting)
+    response.data = (await meeting_data_with_transitions(db, [meeting]))[meeting.id]
+    return response
 
 @router.delete("/meetings/{platform}/{native_meeting_id}",
               summary="Delete meeting transcripts and anonymize meeting data",
@@ -491,8 +606,7 @@ async def delete_meeting(
         return {"message": f"Meeting {platform.value}/{native_meeting_id} transcripts already deleted and data anonymized"}
     
     # Check if meeting is in finalized state
-    finalized_states = {MeetingStatus.COMPLETED.value, MeetingStatus.FAILED.value}
-    if meeting.status not in finalized_states:
+    if meeting.status not in FINALIZED_STATES:
         logger.warning(f"[API] User {current_user.id} attempted to delete non-finalized meeting {internal_meeting_id} (status: {meeting.status})")
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -501,45 +615,106 @@ async def delete_meeting(
     
     logger.info(f"[API] User {current_user.id} purging transcripts and anonymizing meeting {internal_meeting_id}")
     
-    # Delete transcripts from PostgreSQL
-    stmt_transcripts = select(Transcription).where(Transcription.meeting_id == internal_meeting_id)
-    result_transcripts = await db.execute(stmt_transcripts)
-    transcripts = result_transcripts.scalars().all()
-    
-    for transcript in transcripts:
-        await db.delete(transcript)
-    
-    # Delete transcript segments from Redis and remove from active meetings
     redis_c = getattr(request.app.state, 'redis_client', None)
-    if redis_c:
-        try:
-            hash_key = f"meeting:{internal_meeting_id}:segments"
-            # Use pipeline for atomic operations
-            async with redis_c.pipeline(transaction=True) as pipe:
-                pipe.delete(hash_key)
-                pipe.srem("active_meetings", str(internal_meeting_id))
-                results = await pipe.execute()
-            logger.debug(f"[API] Deleted Redis hash {hash_key} and removed from active_meetings")
-        except Exception as e:
-            logger.error(f"[API] Failed to delete Redis data for meeting {internal_meeting_id}: {e}")
-    
-    # Scrub PII from meeting record while preserving telemetry
-    original_data = meeting.data or {}
-    
-    # Keep only telemetry fields
-    telemetry_fields = {'status_transition', 'completion_reason', 'error', 'diagnostics'}
-    scrubbed_data = {k: v for k, v in original_data.items() if k in telemetry_fields}
-    
-    # Add redaction marker for idempotency
-    scrubbed_data['redacted'] = True
-    
-    # Update meeting record with scrubbed data
-    meeting.platform_specific_id = None  # Clear native meeting ID (this makes constructed_meeting_url return None)
-    meeting.data = scrubbed_data
-    
-    # Note: We keep Meeting and MeetingSession records for telemetry
-    await db.commit()
-    
-    logger.info(f"[API] Successfully purged transcripts and anonymized meeting {internal_meeting_id}")
-    
-    return {"message": f"Meeting {platform.value}/{native_meeting_id} transcripts deleted and data anonymized"} 
\ No newline at end of file
+    if not redis_c:
+        # No Redis to track a job: purge inline, then anonymize
+        await purge_meeting(None, internal_meeting_id)
+        logger.info(f"[API] Purged transcripts and anonymized meeting {internal_meeting_id}")
+        return {"message": f"Meeting {platform.value}/{native_meeting_id} transcripts deleted and data anonymized"}
+    
+    # Transcripts are deleted in chunks by a background job, which anonymizes the meeting
+    # (keeping Meeting and MeetingSession records for telemetry) once they are all gone.
+    # Until then the meeting stays addressable, so an interrupted job can be retried.
+    job_id = await create_purge_job(redis_c, [internal_meeting_id], user_id=current_user.id)
+    start_purge_job(redis_c, job_id, [internal_meeting_id])
+    logger.info(f"[API] Transcript purge job {job_id} started for meeting {internal_meeting_id}")
+    
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "message": f"Meeting {platform.value}/{native_meeting_id} transcript deletion in progress; data is anonymized when it completes",
+            "job_id": job_id,
+            "status_url": f"/purge-jobs/{job_id}",
+        }
+    )
+
+
+@router.get("/purge-jobs/{job_id}",
+            response_model=PurgeJobResponse,
+            summary="Get the status of a transcript deletion job",
+            dependencies=[Depends(get_current_user)])
+async def get_purge_job_status(
+    job_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    redis_c = getattr(request.app.state, 'redis_client', None)
+    job = await get_purge_job(redis_c, job_id) if redis_c else None
+    if not job or job["user_id"] != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Purge job {job_id} not found")
+    return PurgeJobResponse(**job)
+
+
+@router.post("/internal/purge-jobs",
+             response_model=PurgeJobResponse,
+             status_code=status.HTTP_202_ACCEPTED,
+             summary="[Internal] Purge transcripts and anonymize many finalized meetings",
+             include_in_schema=False)
+async def create_batch_purge_job(body: BatchPurgeRequest, request: Request):
+    """
+    Batch purge for retention policies: meetings are purged one at a time in
+    bounded chunks. Non-finalized meetings are skipped; already-redacted ones
+    only have leftover transcripts removed.
+    """
+    redis_c = getattr(request.app.state, 'redis_client', None)
+    if not redis_c:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Redis not available")
+    meeting_ids = list(dict.fromkeys(body.meeting_ids))
+    if not meeting_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="meeting_ids is empty")
+    if len(meeting_ids) > PURGE_MAX_BATCH_MEETINGS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {PURGE_MAX_BATCH_MEETINGS} meetings per purge job"
+        )
+    job_id = await create_purge_job(redis_c, meeting_ids)
+    start_purge_job(redis_c, job_id, meeting_ids)
+    logger.info(f"[Internal API] Batch purge job {job_id} started for {len(meeting_ids)} meetings")
+    return PurgeJobResponse(**await get_purge_job(redis_c, job_id))
+
+
+@router.get("/internal/purge-jobs/{job_id}",
+            response_model=PurgeJobResponse,
+            summary="[Internal] Get the status of a purge job",
+            include_in_schema=False)
+async def get_purge_job_internal(job_id: str, request: Request):
+    redis_c = getattr(request.app.state, 'redis_client', None)
+    job = await get_purge_job(redis_c, job_id) if redis_c else None
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Purge job {job_id} not found")
+    return PurgeJobResponse(**job)
+
+
+@router.put("/internal/meetings/{meeting_id}/transcript",
+            summary="[Internal] Replace a finished meeting's transcript with an offline re-transcription",
+            include_in_schema=False)
+async def replace_transcript_internal(
+    meeting_id: int,
+    body: TranscriptReplaceRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Called by WhisperLive's batch re-transcription job. Replaces the rows of each
+    listed session in one transaction; speakers are carried over from the
+    streaming rows. Only finalized, non-redacted meetings are accepted (409 otherwise).
+    """
+    redis_c = getattr(request.app.state, 'redis_client', None)
+    try:
+        return await replace_meeting_transcript(
+            db, redis_c, meeting_id, [s.model_dump() for s in body.sessions], body.source
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except RetranscriptionConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
@@ -10,7 +10,13 @@ import redis.asyncio as aioredis
 from shared_models.database import async_session_local
 from shared_models.models import Transcription, Meeting
 # No schemas needed directly by these functions as they create Transcription objects
-from config import BACKGROUND_TASK_INTERVAL, IMMUTABILITY_THRESHOLD, REDIS_SPEAKER_EVENT_KEY_PREFIX
+from config import (
+    BACKGROUND_TASK_INTERVAL,
+    IMMUTABILITY_THRESHOLD,
+    REDIS_SPEAKER_EVENT_KEY_PREFIX,
+    SPEAKER_EVENT_MERGE_GAP_MS,
+    SPEAKER_EVENT_TRIM_MARGIN_MS,
+)
 from filters import TranscriptionFilter
 # Speaker re-mapping before persistence
 from mapping.speaker_mapper import (
@@ -21,6 +27,7 @@ from mapping.speaker_mapper import (
     STATUS_MULTIPLE,
     STATUS_ERROR,
 )
+from mapping.speaker_timeline import compact_speaker_events
 
 logger = logging.getLogger(__name__)
 
@@ -81,11 +88,15 @@ async def process_redis_to_postgres(redis_c: aioredis.Redis, local_transcription
                             
                         logger.debug(f"Processing {len(sorted_segment_items)} segments from Redis Hash for meeting {meeting_id} (sorted)")
                         immutability_time = datetime.now(timezone.utc) - timedelta(seconds=IMMUTABILITY_THRESHOLD)
+                        # Earliest segment start per session still in Redis: no later mapping looks before it
+                        session_oldest_start_ms: Dict[str, float] = {}
                         
                         for start_time_str, segment_json in sorted_segment_items:
                             try:
                                 segment_data = json.loads(segment_json)
                                 segment_session_uid = segment_data.get("session_uid")
+                                if segment_session_uid:
+                                    session_oldest_start_ms.setdefault(segment_session_uid, float(start_time_str) * 1000.0)
                                 if 'updated_at' not in segment_data:
                                      logger.warning(f"Segment {start_time_str} in meeting {meeting_id} hash is missing 'updated_at'. Skipping immutability check.")
                                      continue 
@@ -175,6 +186,17 @@ async def process_redis_to_postgres(redis_c: aioredis.Redis, local_transcription
                             except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
                                 logger.error(f"Error processing segment {start_time_str} from hash for meeting {meeting_id}: {e}")
                                 segments_to_delete_from_redis.setdefault(meeting_id, set()).add(start_time_str)
+
+                        for session_uid, oldest_start_ms in session_oldest_start_ms.items():
+                            try:
+                                await compact_speaker_events(
+                                    redis_c,
+                                    f"{REDIS_SPEAKER_EVENT_KEY_PREFIX}:{session_uid}",
+                                    SPEAKER_EVENT_MERGE_GAP_MS,
+                                    trim_before_ms=oldest_start_ms - SPEAKER_EVENT_TRIM_MARGIN_MS,
+                                )
+                            except redis.exceptions.RedisError as compact_err:
+                                logger.warning(f"[SpeakerCompact] Meeting {meeting_id} session {session_uid}: {compact_err}")
                     except Exception as e:
                         logger.error(f"Error processing meeting {meeting_id_str} in Redis-to-PG task: {e}", exc_info=True)
                 
@@ -0,0 +1,212 @@
+"""
+Transcript purge jobs: set-based, chunked deletion of a meeting's transcripts.
+
+A purge deletes transcripts with one ``DELETE ... WHERE meeting_id = :id`` per
+primary-key range of at most PURGE_CHUNK_ROWS rows, committing after each chunk,
+so row locks and WAL volume stay bounded however long the meeting was. Jobs run
+as asyncio tasks in the collector; their progress lives in a Redis hash
+(``purge_job:<id>``) so any collector instance can answer status requests.
+"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import redis.asyncio as aioredis
+from sqlalchemy import delete, select
+
+from shared_models.database import async_session_local
+from shared_models.models import Meeting, Transcription
+from shared_models.schemas import MeetingStatus
+from config import PURGE_CHUNK_ROWS, PURGE_CHUNK_PAUSE_MS, PURGE_JOB_TTL
+
+logger = logging.getLogger(__name__)
+
+FINALIZED_STATES = {MeetingStatus.COMPLETED.value, MeetingStatus.FAILED.value}
+# Meeting.data keys kept after redaction
+TELEMETRY_FIELDS = {'status_transition', 'completion_reason', 'error', 'diagnostics'}
+
+PURGE_JOB_KEY_PREFIX = "purge_job"
+
+# Strong references so running jobs are not garbage collected
+_job_tasks: Set[asyncio.Task] = set()
+
+
+def _job_key(job_id: str) -> str:
+    return f"{PURGE_JOB_KEY_PREFIX}:{job_id}"
+
+
+def ws_authz_cache_key(user_id: int) -> str:
+    # Also invalidated by bot-manager when it creates a meeting for the user
+    return f"ws_authz:{user_id}"
+
+
+def scrub_meeting(meeting: Meeting) -> bool:
+    """Drop PII from the meeting record, keeping telemetry. Returns False if already redacted."""
+    if meeting.data and meeting.data.get('redacted'):
+        return False
+    scrubbed_data = {k: v for k, v in (meeting.data or {}).items() if k in TELEMETRY_FIELDS}
+    # Redaction marker for idempotency
+    scrubbed_data['redacted'] = True
+    meeting.platform_specific_id = None  # Clear native meeting ID (this makes constructed_meeting_url return None)
+    meeting.data = scrubbed_data
+    return True
+
+
+async def drop_redis_segments(redis_c: Optional[aioredis.Redis], meeting_id: int) -> None:
+    """Remove the meeting's mutable segments so the background writer cannot re-insert them."""
+    if not redis_c:
+        return
+    try:
+        async with redis_c.pipeline(transaction=True) as pipe:
+            pipe.delete(f"meeting:{meeting_id}:segments")
+            pipe.srem("active_meetings", str(meeting_id))
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"[Purge] Failed to delete Redis data for meeting {meeting_id}: {e}")
+
+
+async def purge_transcriptions(
+    db,
+    meeting_id: int,
+    chunk_rows: int = PURGE_CHUNK_ROWS,
+    on_chunk: Optional[Callable[[int], Awaitable[Any]]] = None,
+) -> int:
+    """
+    Delete all transcripts of a meeting in primary-key ranges of at most ``chunk_rows`` rows.
+
+    Each range is one DELETE statement in its own transaction. A final unbounded
+    DELETE catches rows written after the id snapshot. Returns the rows deleted.
+    """
+    ids = (await db.execute(
+        select(Transcription.id).where(Transcription.meeting_id == meeting_id).order_by(Transcription.id)
+    )).scalars().all()
+    await db.commit()  # end the snapshot transaction before deleting
+
+    ranges = [(ids[i], ids[min(i + chunk_rows, len(ids)) - 1]) for i in range(0, len(ids), max(1, chunk_rows))]
+    deleted = 0
+    for lo, hi in ranges + [(None, None)]:
+        stmt = delete(Transcription).where(Transcription.meeting_id == meeting_id)
+        if hi is not None:
+            stmt = stmt.where(Transcription.id.between(lo, hi))
+        result = await db.execute(stmt.execution_options(synchronize_session=False))
+        await db.commit()
+        count = result.rowcount or 0
+        deleted += count
+        if on_chunk and count:
+            await on_chunk(count)
+        if hi is not None and PURGE_CHUNK_PAUSE_MS > 0:
+            await asyncio.sleep(PURGE_CHUNK_PAUSE_MS / 1000.0)
+    return deleted
+
+
+async def purge_meeting(redis_c: Optional[aioredis.Redis], meeting_id: int,
+                        on_chunk: Optional[Callable[[int], Awaitable[Any]]] = None) -> str:
+    """
+    Purge one finalized meeting's transcripts, then anonymize it. Returns "purged", "skipped" or "missing".
+
+    The meeting is scrubbed only after its last transcript is gone, so an interrupted or
+    failed purge leaves it findable by its native ID and the user can simply retry.
+    """
+    async with async_session_local() as db:
+        meeting = await db.get(Meeting, meeting_id)
+        if meeting is None:
+            return "missing"
+        if meeting.status not in FINALIZED_STATES:
+            logger.warning(f"[Purge] Skipping non-finalized meeting {meeting_id} (status: {meeting.status})")
+            return "skipped"
+        await drop_redis_segments(redis_c, meeting_id)
+        deleted = await purge_transcriptions(db, meeting_id, on_chunk=on_chunk)
+        await db.refresh(meeting)
+        if scrub_meeting(meeting):
+            await db.commit()
+            if redis_c:
+                try:
+                    await redis_c.delete(ws_authz_cache_key(meeting.user_id))
+                except Exception as e:
+                    logger.warning(f"[Purge] Failed to invalidate WS authorization cache for user {meeting.user_id}: {e}")
+    logger.info(f"[Purge] Meeting {meeting_id}: deleted {deleted} transcripts and anonymized the meeting")
+    return "purged"
+
+
+async def create_purge_job(redis_c: aioredis.Redis, meeting_ids: List[int], user_id: Optional[int] = None) -> str:
+    job_id = uuid.uuid4().hex
+    key = _job_key(job_id)
+    await redis_c.hset(key, mapping={
+        "job_id": job_id,
+        "status": "queued",
+        "user_id": "" if user_id is None else str(user_id),
+        "meeting_ids": json.dumps(meeting_ids),
+        "meetings_total": len(meeting_ids),
+        "meetings_done": 0,
+        "rows_deleted": 0,
+        "skipped": "[]",
+        "failed": "[]",
+        "created_at": time.time(),
+    })
+    await redis_c.expire(key, PURGE_JOB_TTL)
+    return job_id
+
+
+async def get_purge_job(redis_c: aioredis.Redis, job_id: str) -> Optional[Dict[str, Any]]:
+    raw = await redis_c.hgetall(_job_key(job_id))
+    if not raw:
+        return None
+    job: Dict[str, Any] = dict(raw)
+    job["user_id"] = int(job["user_id"]) if job.get("user_id") else None
+    for field in ("meetings_total", "meetings_done", "rows_deleted"):
+        job[field] = int(job.get(field) or 0)
+    for field in ("created_at", "started_at", "finished_at"):
+        if job.get(field):
+            job[field] = float(job[field])
+    for field in ("meeting_ids", "skipped", "failed"):
+        job[field] = json.loads(job.get(field) or "[]")
+    return job
+
+
+async def run_purge_job(redis_c: aioredis.Redis, job_id: str, meeting_ids: List[int]) -> None:
+    key = _job_key(job_id)
+    await redis_c.hset(key, mapping={"status": "running", "started_at": time.time()})
+    skipped: List[int] = []
+    failed: List[Dict[str, Any]] = []
+
+    async def _progress(count: int):
+        await redis_c.hincrby(key, "rows_deleted", count)
+
+    final_status = "failed"
+    try:
+        for meeting_id in meeting_ids:
+            try:
+                outcome = await purge_meeting(redis_c, meeting_id, on_chunk=_progress)
+                if outcome != "purged":
+                    skipped.append(meeting_id)
+            except Exception as e:
+                logger.error(f"[Purge] Job {job_id}: meeting {meeting_id} failed: {e}", exc_info=True)
+                failed.append({"meeting_id": meeting_id, "error": str(e)})
+            await redis_c.hset(key, mapping={"skipped": json.dumps(skipped), "failed": json.dumps(failed)})
+            await redis_c.hincrby(key, "meetings_done", 1)
+        final_status = "failed" if failed else "completed"
+    except asyncio.CancelledError:
+        final_status = "interrupted"
+        raise
+    finally:
+        await redis_c.hset(key, mapping={"status": final_status, "finished_at": time.time()})
+        await redis_c.expire(key, PURGE_JOB_TTL)
+        logger.info(f"[Purge] Job {job_id} finished: {len(meeting_ids)} meetings, {len(skipped)} skipped, {len(failed)} failed")
+
+
+def start_purge_job(redis_c: aioredis.Redis, job_id: str, meeting_ids: List[int]) -> asyncio.Task:
+    task = asyncio.create_task(run_purge_job(redis_c, job_id, meeting_ids))
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+    return task
+
+
+async def cancel_purge_jobs() -> None:
+    """Cancel running jobs on shutdown; the chunk in flight rolls back and the job reads "interrupted"."""
+    for task in list(_job_tasks):
+        task.cancel()
+    if _job_tasks:
+        await asyncio.gather(*_job_tasks, return_exceptions=True)
@@ -0,0 +1,114 @@
+"""
+Replacement of a finished meeting's transcript by an offline re-transcription.
+
+WhisperLive's ``whisper_live.retranscribe`` job decodes archived session audio
+with batched inference and sends the result here. Each session's rows are
+replaced (DELETE + multi-row INSERT) in a single transaction for the meeting,
+and the replacement is recorded in ``meetings.data['retranscription']``.
+Speakers are carried over from the streaming rows that a new segment overlaps
+most, because the speaker events used for live mapping are dropped at session end.
+"""
+import logging
+import time
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Sequence
+
+import redis.asyncio as aioredis
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+
+from shared_models.models import Meeting, Transcription
+from background.purge import FINALIZED_STATES, drop_redis_segments
+
+logger = logging.getLogger(__name__)
+
+
+class RetranscriptionConflict(Exception):
+    """The meeting cannot have its transcript replaced (not finalized, or redacted)."""
+
+
+def carry_over_speakers(segments: List[Dict[str, Any]], old_rows: Sequence[Any]) -> None:
+    """Set each new segment's ``speaker`` from the old row it overlaps most (rows sorted by start_time)."""
+    starts = [r.start_time for r in old_rows]
+    for seg in segments:
+        best, best_overlap = None, 0.0
+        # Rows starting before seg end, walking back over any that could still overlap (segments are < 60 s)
+        i = bisect_right(starts, seg["end"]) - 1
+        while i >= 0 and old_rows[i].start_time > seg["start"] - 60.0:
+            overlap = min(seg["end"], old_rows[i].end_time) - max(seg["start"], old_rows[i].start_time)
+            if overlap > best_overlap and old_rows[i].speaker:
+                best, best_overlap = old_rows[i].speaker, overlap
+            i -= 1
+        seg["speaker"] = best
+
+
+async def replace_meeting_transcript(
+    db,
+    redis_c: Optional[aioredis.Redis],
+    meeting_id: int,
+    sessions: List[Dict[str, Any]],
+    source: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Replace the transcript rows of every given session of a finalized meeting.
+
+    Sessions not listed are left alone. A session whose re-transcription is empty
+    keeps its streaming rows rather than losing them to a bad archive.
+    Raises LookupError if the meeting does not exist, RetranscriptionConflict if it
+    is still live or was redacted.
+    """
+    meeting = (await db.execute(
+        select(Meeting).where(Meeting.id == meeting_id).with_for_update()
+    )).scalars().first()
+    if meeting is None:
+        raise LookupError(f"Meeting {meeting_id} not found")
+    if meeting.status not in FINALIZED_STATES:
+        raise RetranscriptionConflict(f"Meeting {meeting_id} is not finalized (status: {meeting.status})")
+    if (meeting.data or {}).get('redacted'):
+        raise RetranscriptionConflict(f"Meeting {meeting_id} was redacted; its transcript is not restored")
+
+    # A finished meeting should have none; leftovers would be flushed back on top of the new rows
+    await drop_redis_segments(redis_c, meeting_id)
+
+    summary = []
+    for session in sessions:
+        session_uid = session["session_uid"]
+        segments = [dict(s) for s in session.get("segments", [])]
+        old_rows = (await db.execute(
+            select(Transcription.start_time, Transcription.end_time, Transcription.speaker)
+            .where(Transcription.meeting_id == meeting_id, Transcription.session_uid == session_uid)
+            .order_by(Transcription.start_time)
+        )).all()
+        if not segments:
+            summary.append({"session_uid": session_uid, "deleted": 0, "inserted": 0, "kept": len(old_rows)})
+            continue
+        carry_over_speakers(segments, old_rows)
+        await db.execute(
+            delete(Transcription)
+            .where(Transcription.meeting_id == meeting_id, Transcription.session_uid == session_uid)
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(insert(Transcription), [
+            {
+                "meeting_id": meeting_id,
+                "session_uid": session_uid,
+                "start_time": s["start"],
+                "end_time": s["end"],
+                "text": s["text"],
+                "language": s.get("language") or session.get("language"),
+                "speaker": s.get("speaker"),
+            }
+            for s in segments
+        ])
+        summary.append({"session_uid": session_uid, "deleted": len(old_rows), "inserted": len(segments)})
+
+    record = {"retranscription": {**(source or {}), "at": time.time(), "sessions": summary}}
+    await db.execute(
+        update(Meeting)
+        .where(Meeting.id == meeting_id)
+        .values(data=Meeting.data.op('||')(bindparam("data_patch", record, type_=JSONB)))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    logger.info(f"[Retranscribe] Meeting {meeting_id}: {summary}")
+    return {"meeting_id": meeting_id, "sessions": summary}
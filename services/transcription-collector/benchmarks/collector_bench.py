@@ -0,0 +1,638 @@
+"""
+Throughput benchmark for the transcription-collector hot paths.
+
+Drives the real processing code (process_stream_message, process_speaker_event_message,
+get_speaker_mapping_for_segment, TranscriptionFilter.filter_segment and the
+process_redis_to_postgres flush loop) with a synthetic workload:
+
+    meetings x segments/sec x speaker events/sec x re-send factor
+
+Each meeting emits new segments at --segments-per-sec. Every segment is sent
+--resend-factor times (the text grows on each revision, the last one is final),
+and every message also repeats the previous --context-segments final segments
+unchanged, like WhisperLive does. Speaker START/END events arrive at
+--speaker-events-per-sec per meeting on their own consumer, as in production.
+
+Messages are handed to the processors directly (no XREADGROUP/XACK), one
+sequential consumer per stream. By default they are paced open-loop at the
+target rate; --max-rate removes pacing to find saturation throughput.
+
+Backends:
+    Redis    --redis-url redis://localhost:6379/15 (the DB is flushed first) or
+             --fake-redis (fakeredis, in-process)
+    Postgres real database from the DB_* environment variables, or --fake-db
+             (in-memory session that only records what would be committed)
+
+Reported: messages/sec, per-message latency (p50/p99, queueing included) and
+service time, Redis commands and round trips per message, per-call timings of
+speaker mapping and filtering, and flush lag (last segment update -> committed).
+
+Usage (from services/transcription-collector):
+    python benchmarks/collector_bench.py --fake-redis --fake-db --meetings 50 --duration 30
+"""
+
+import argparse
+import asyncio
+import base64
+import contextvars
+import hashlib
+import hmac
+import heapq
+import json
+import logging
+import os
+import sys
+import time
+import types
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+COLLECTOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHARED_MODELS_DIR = os.path.join(COLLECTOR_DIR, "..", "..", "libs", "shared-models")
+
+logger = logging.getLogger("collector_bench")
+
+# Which consumer issued a Redis command ("transcription", "speaker", "flush", "setup")
+_current_path = contextvars.ContextVar("bench_path", default="setup")
+
+WORDS = (
+    "so the plan for this sprint is to finish the migration and then we can look at the "
+    "dashboard numbers again before the review on thursday with the whole team"
+).split()
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def summarize(values: List[float], scale: float = 1000.0) -> Dict[str, Optional[float]]:
+    """count/p50/p99/max of ``values`` (seconds by default, reported in ms)."""
+    if not values:
+        return {"count": 0, "p50": None, "p99": None, "max": None}
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50) * scale, 3),
+        "p99": round(percentile(values, 99) * scale, 3),
+        "max": round(max(values) * scale, 3),
+    }
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def mint_meeting_token(secret: str, meeting_id: int, native_meeting_id: str) -> str:
+    """HS256 MeetingToken with the claims verify_meeting_token expects."""
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64url(json.dumps({
+        "meeting_id": meeting_id,
+        "platform": "google_meet",
+        "native_meeting_id": native_meeting_id,
+        "aud": "transcription-collector",
+        "iss": "bot-manager",
+        "scope": "transcribe:write",
+        "exp": int(time.time()) + 24 * 3600,
+    }).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode("ascii"), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64url(signature)}"
+
+
+# --- Redis command accounting -------------------------------------------------
+
+class RedisCounter:
+    """Counts commands and round trips per consumer path on an asyncio Redis client."""
+
+    def __init__(self):
+        self.commands = defaultdict(int)
+        self.round_trips = defaultdict(int)
+
+    def instrument(self, client):
+        counter = self
+        original_execute = client.execute_command
+        original_pipeline = client.pipeline
+
+        async def execute_command(*args, **kwargs):
+            path = _current_path.get()
+            counter.commands[path] += 1
+            counter.round_trips[path] += 1
+            return await original_execute(*args, **kwargs)
+
+        def pipeline(*args, **kwargs):
+            pipe = original_pipeline(*args, **kwargs)
+            pipe_execute = pipe.execute
+
+            async def execute(*e_args, **e_kwargs):
+                path = _current_path.get()
+                counter.commands[path] += len(pipe.command_stack)
+                counter.round_trips[path] += 1
+                return await pipe_execute(*e_args, **e_kwargs)
+
+            pipe.execute = execute
+            return pipe
+
+        client.execute_command = execute_command
+        client.pipeline = pipeline
+        return client
+
+
+# --- Database ----------------------------------------------------------------
+
+class FlushRecorder:
+    """Commit times of flushed segments, keyed by (meeting_id, start key)."""
+
+    def __init__(self):
+        self.committed: Dict[tuple, float] = {}
+        self.commits = 0
+        self.commit_times: List[float] = []
+
+    def record(self, objects, started: float):
+        now = time.time()
+        self.commits += 1
+        self.commit_times.append(now - started)
+        for obj in objects:
+            start = getattr(obj, "start_time", None)
+            if start is not None and getattr(obj, "meeting_id", None) is not None:
+                self.committed[(obj.meeting_id, f"{float(start):.3f}")] = now
+
+
+class _EmptyResult:
+    def scalars(self):
+        return self
+
+    def first(self):
+        return None
+
+    def all(self):
+        return []
+
+
+class FakeSession:
+    """In-memory stand-in for AsyncSession: records adds, commits after a configurable delay."""
+
+    def __init__(self, meetings: Dict[int, object], commit_latency_s: float):
+        self.meetings = meetings
+        self.commit_latency_s = commit_latency_s
+        self.pending = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get(self, model, ident):
+        return self.meetings.get(int(ident))
+
+    async def execute(self, *args, **kwargs):
+        return _EmptyResult()
+
+    def add(self, obj):
+        self.pending.append(obj)
+
+    def add_all(self, objs):
+        self.pending.extend(objs)
+
+    async def commit(self):
+        if self.commit_latency_s:
+            await asyncio.sleep(self.commit_latency_s)
+        self.pending = []
+
+    async def rollback(self):
+        self.pending = []
+
+
+class RecordingSession:
+    """Wraps a session so committed Transcription rows are timestamped for flush lag."""
+
+    def __init__(self, inner, recorder: FlushRecorder):
+        self._inner = inner
+        self._recorder = recorder
+        self._added = []
+
+    async def __aenter__(self):
+        self._session = await self._inner.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self._inner.__aexit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    def add(self, obj):
+        self._added.append(obj)
+        self._session.add(obj)
+
+    def add_all(self, objs):
+        objs = list(objs)
+        self._added.extend(objs)
+        self._session.add_all(objs)
+
+    async def commit(self):
+        started = time.time()
+        await self._session.commit()
+        self._recorder.record(self._added, started)
+        self._added = []
+
+    async def rollback(self):
+        self._added = []
+        await self._session.rollback()
+
+
+def install_fake_database(meetings: Dict[int, object], commit_latency_s: float):
+    """Provide shared_models.database without an engine (benchmark --fake-db mode only)."""
+    module = types.ModuleType("shared_models.database")
+    module.async_session_local = lambda: FakeSession(meetings, commit_latency_s)
+    module.engine = None
+    sys.modules["shared_models.database"] = module
+
+
+async def seed_meetings(count: int) -> List[int]:
+    """Create a benchmark user and ``count`` meetings in the real database."""
+    from shared_models.database import async_session_local
+    from shared_models.models import Meeting, User
+
+    async with async_session_local() as db:
+        user = User(email=f"collector-bench-{uuid.uuid4().hex[:8]}@example.invalid", name="collector-bench")
+        db.add(user)
+        await db.flush()
+        meetings = [
+            Meeting(user_id=user.id, platform="google_meet", platform_specific_id=f"bench-{i}", status="active")
+            for i in range(count)
+        ]
+        db.add_all(meetings)
+        await db.commit()
+        return [m.id for m in meetings]
+
+
+async def cleanup_meetings(meeting_ids: List[int]):
+    from sqlalchemy import delete
+    from shared_models.database import async_session_local
+    from shared_models.models import Meeting, MeetingSession, Transcription, User
+
+    async with async_session_local() as db:
+        user_ids = {m.user_id for m in [await db.get(Meeting, mid) for mid in meeting_ids] if m}
+        await db.execute(delete(Transcription).where(Transcription.meeting_id.in_(meeting_ids)))
+        await db.execute(delete(MeetingSession).where(MeetingSession.meeting_id.in_(meeting_ids)))
+        await db.execute(delete(Meeting).where(Meeting.id.in_(meeting_ids)))
+        if user_ids:
+            await db.execute(delete(User).where(User.id.in_(user_ids)))
+        await db.commit()
+
+
+# --- Workload ----------------------------------------------------------------
+
+class MeetingWorkload:
+    """Synthetic WhisperLive output and speaker events for one meeting."""
+
+    def __init__(self, meeting_id: int, token: str, args):
+        self.meeting_id = meeting_id
+        self.token = token
+        self.session_uid = f"bench-{meeting_id}-{uuid.uuid4().hex[:8]}"
+        self.segment_s = 1.0 / args.segments_per_sec
+        self.resend = max(1, args.resend_factor)
+        self.context = max(0, args.context_segments)
+        self.participants = [f"Speaker {i}" for i in range(max(1, args.participants))]
+        self.speaker_event_s = 1.0 / args.speaker_events_per_sec if args.speaker_events_per_sec > 0 else None
+        self.message_index = 0
+        self.speaker_index = 0
+
+    def _segment(self, index: int, revision: int) -> dict:
+        start = index * self.segment_s
+        n_words = max(1, int(len(WORDS) * (revision + 1) / self.resend) // 2)
+        offset = (index * 7) % len(WORDS)
+        text = " ".join(WORDS[(offset + i) % len(WORDS)] for i in range(n_words))
+        return {
+            "start": f"{start:.3f}",
+            "end": f"{start + self.segment_s * 0.9 * (revision + 1) / self.resend:.3f}",
+            "text": text,
+            "language": "en",
+            "completed": revision == self.resend - 1,
+        }
+
+    def session_start_message(self) -> dict:
+        payload = {
+            "type": "session_start",
+            "token": self.token,
+            "platform": "google_meet",
+            "meeting_id": f"bench-{self.meeting_id}",
+            "uid": self.session_uid,
+            "start_timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        return {"payload": json.dumps(payload)}
+
+    def next_transcription(self):
+        """(message_data, {start key: segment}) for the next message."""
+        index, revision = divmod(self.message_index, self.resend)
+        self.message_index += 1
+        segments = [self._segment(i, self.resend - 1) for i in range(max(0, index - self.context), index)]
+        segments.append(self._segment(index, revision))
+        payload = {
+            "type": "transcription",
+            "token": self.token,
+            "platform": "google_meet",
+            "meeting_id": f"bench-{self.meeting_id}",
+            "uid": self.session_uid,
+            "segments": segments,
+        }
+        return {"payload": json.dumps(payload)}, segments
+
+    def next_speaker_event(self) -> dict:
+        turn, phase = divmod(self.speaker_index, 2)
+        self.speaker_index += 1
+        name = self.participants[turn % len(self.participants)]
+        return {
+            "uid": self.session_uid,
+            "relative_client_timestamp_ms": str(round(self.speaker_index * self.speaker_event_s * 1000.0, 1)),
+            "event_type": "SPEAKER_START" if phase == 0 else "SPEAKER_END",
+            "participant_name": name,
+            "participant_id_meet": f"p-{turn % len(self.participants)}",
+            "meeting_id": f"bench-{self.meeting_id}",
+        }
+
+
+# --- Benchmark ----------------------------------------------------------------
+
+class Timings:
+    def __init__(self):
+        self.latency = defaultdict(list)
+        self.service = defaultdict(list)
+        self.failures = defaultdict(int)
+        self.calls = defaultdict(list)
+
+
+def _timed_async(fn, samples: list):
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+    return wrapper
+
+
+def _timed_sync(fn, samples: list):
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+    return wrapper
+
+
+async def _consumer(name: str, queue: asyncio.Queue, handler, timings: Timings):
+    _current_path.set(name)
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        scheduled, message_id, data = item
+        started = time.perf_counter()
+        ok = await handler(message_id, data)
+        finished = time.perf_counter()
+        timings.service[name].append(finished - started)
+        timings.latency[name].append(finished - scheduled)
+        if not ok:
+            timings.failures[name] += 1
+
+
+async def run_benchmark(args) -> dict:
+    secret = os.environ.setdefault("ADMIN_TOKEN", "collector-bench-secret")
+    meeting_rows: Dict[int, object] = {}
+    recorder = FlushRecorder()
+
+    if args.fake_db:
+        install_fake_database(meeting_rows, args.fake_commit_ms / 1000.0)
+
+    from streaming import processors
+    from background import db_writer
+    from filters import TranscriptionFilter
+
+    if args.fake_db:
+        meeting_ids = list(range(1, args.meetings + 1))
+        for mid in meeting_ids:
+            meeting_rows[mid] = types.SimpleNamespace(
+                id=mid, platform="google_meet", platform_specific_id=f"bench-{mid}"
+            )
+    else:
+        meeting_ids = await seed_meetings(args.meetings)
+
+    session_factory = processors.async_session_local
+    db_writer.async_session_local = lambda: RecordingSession(session_factory(), recorder)
+    db_writer.BACKGROUND_TASK_INTERVAL = args.flush_interval
+    db_writer.IMMUTABILITY_THRESHOLD = args.immutability_s
+
+    if args.fake_redis:
+        import fakeredis
+        redis_c = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    else:
+        import redis.asyncio as aioredis
+        redis_c = aioredis.Redis.from_url(args.redis_url, decode_responses=True)
+        await redis_c.flushdb()
+    counter = RedisCounter()
+    counter.instrument(redis_c)
+
+    timings = Timings()
+    processors.get_speaker_mapping_for_segment = _timed_async(
+        processors.get_speaker_mapping_for_segment, timings.calls["get_speaker_mapping_for_segment"]
+    )
+    db_writer.get_speaker_mapping_for_segment = _timed_async(
+        db_writer.get_speaker_mapping_for_segment, timings.calls["get_speaker_mapping_for_segment.final"]
+    )
+    transcription_filter = TranscriptionFilter()
+    transcription_filter.filter_segment = _timed_sync(
+        transcription_filter.filter_segment, timings.calls["filter_segment"]
+    )
+
+    workloads = [
+        MeetingWorkload(mid, mint_meeting_token(secret, mid, f"bench-{mid}"), args) for mid in meeting_ids
+    ]
+    for w in workloads:
+        await processors.process_stream_message(f"0-{w.meeting_id}", w.session_start_message(), redis_c)
+
+    last_update: Dict[tuple, float] = {}
+    transcription_q: asyncio.Queue = asyncio.Queue()
+    speaker_q: asyncio.Queue = asyncio.Queue()
+
+    async def handle_transcription(message_id, data):
+        return await processors.process_stream_message(message_id, data, redis_c)
+
+    async def handle_speaker(message_id, data):
+        return await processors.process_speaker_event_message(message_id, data, redis_c)
+
+    consumers = [
+        asyncio.create_task(_consumer("transcription", transcription_q, handle_transcription, timings)),
+        asyncio.create_task(_consumer("speaker", speaker_q, handle_speaker, timings)),
+    ]
+
+    async def flush_loop():
+        _current_path.set("flush")
+        await db_writer.process_redis_to_postgres(redis_c, transcription_filter)
+
+    flush_task = asyncio.create_task(flush_loop())
+
+    # Schedule of (due offset, sequence, kind, workload index); meetings are phase-shifted
+    schedule = []
+    transcription_interval = 1.0 / (args.segments_per_sec * max(1, args.resend_factor))
+    for i, w in enumerate(workloads):
+        phase = (i / max(1, len(workloads)))
+        heapq.heappush(schedule, (phase * transcription_interval, len(schedule), "t", i))
+        if w.speaker_event_s:
+            heapq.heappush(schedule, (phase * w.speaker_event_s, len(schedule), "s", i))
+
+    sequence = len(schedule)
+    started = time.perf_counter()
+    wall_started = time.time()
+    produced = defaultdict(int)
+    while schedule:
+        due, _, kind, i = heapq.heappop(schedule)
+        if due >= args.duration:
+            continue
+        if not args.max_rate:
+            delay = started + due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        scheduled = time.perf_counter() if args.max_rate else started + due
+        w = workloads[i]
+        sequence += 1
+        message_id = f"{int(wall_started * 1000 + due * 1000)}-{sequence}"
+        if kind == "t":
+            data, segments = w.next_transcription()
+            now = time.time()
+            for seg in segments:
+                last_update[(w.meeting_id, f"{float(seg['start']):.3f}")] = now
+            transcription_q.put_nowait((scheduled, message_id, data))
+            produced["transcription"] += 1
+            heapq.heappush(schedule, (due + transcription_interval, sequence, "t", i))
+        else:
+            speaker_q.put_nowait((scheduled, message_id, w.next_speaker_event()))
+            produced["speaker"] += 1
+            heapq.heappush(schedule, (due + w.speaker_event_s, sequence, "s", i))
+        if args.max_rate and sequence % 256 == 0:
+            await asyncio.sleep(0)
+
+    transcription_q.put_nowait(None)
+    speaker_q.put_nowait(None)
+    await asyncio.gather(*consumers)
+    processing_elapsed = time.perf_counter() - started
+
+    # Let the flush loop persist everything still in Redis
+    drain_deadline = time.time() + args.drain_timeout
+    pending_flush = len(last_update)
+    while time.time() < drain_deadline:
+        pending_flush = sum(1 for key in last_update if key not in recorder.committed)
+        remaining = await redis_c.scard("active_meetings")
+        if pending_flush == 0 or remaining == 0:
+            break
+        await asyncio.sleep(0.2)
+    flush_task.cancel()
+    await asyncio.gather(flush_task, return_exceptions=True)
+
+    flush_lag = [
+        recorder.committed[key] - updated for key, updated in last_update.items() if key in recorder.committed
+    ]
+
+    per_path = {}
+    for path in ("transcription", "speaker"):
+        processed = len(timings.service[path])
+        per_path[path] = {
+            "produced": produced[path],
+            "processed": processed,
+            "failures": timings.failures[path],
+            "messages_per_sec": round(processed / processing_elapsed, 2) if processing_elapsed else None,
+            "latency_ms": summarize(timings.latency[path]),
+            "service_ms": summarize(timings.service[path]),
+            "redis_commands_per_message": round(counter.commands[path] / processed, 2) if processed else None,
+            "redis_round_trips_per_message": round(counter.round_trips[path] / processed, 2) if processed else None,
+        }
+
+    total_processed = sum(p["processed"] for p in per_path.values())
+    report = {
+        "config": {
+            "meetings": args.meetings,
+            "segments_per_sec": args.segments_per_sec,
+            "speaker_events_per_sec": args.speaker_events_per_sec,
+            "resend_factor": args.resend_factor,
+            "context_segments": args.context_segments,
+            "duration_s": args.duration,
+            "max_rate": args.max_rate,
+            "redis": "fakeredis" if args.fake_redis else args.redis_url,
+            "database": "fake" if args.fake_db else "postgres",
+            "flush_interval_s": args.flush_interval,
+            "immutability_s": args.immutability_s,
+        },
+        "elapsed_s": round(processing_elapsed, 3),
+        "messages_per_sec": round(total_processed / processing_elapsed, 2) if processing_elapsed else None,
+        "paths": per_path,
+        "calls_ms": {name: summarize(samples) for name, samples in timings.calls.items()},
+        "flush": {
+            "segments_tracked": len(last_update),
+            "segments_committed": len(flush_lag),
+            "segments_pending": pending_flush,
+            "commits": recorder.commits,
+            "commit_ms": summarize(recorder.commit_times),
+            "redis_commands": counter.commands["flush"],
+            "redis_round_trips": counter.round_trips["flush"],
+            # Includes the configured immutability threshold and flush interval
+            "lag_ms": summarize(flush_lag),
+        },
+    }
+
+    if hasattr(redis_c, "aclose"):
+        await redis_c.aclose()
+    else:
+        await redis_c.close()
+    if not args.fake_db and not args.keep_data:
+        await cleanup_meetings(meeting_ids)
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Transcription-collector throughput benchmark")
+    parser.add_argument("--meetings", type=int, default=20, help="Concurrent meetings")
+    parser.add_argument("--segments-per-sec", type=float, default=0.5, help="New segments per meeting per second")
+    parser.add_argument("--resend-factor", type=int, default=4, help="Messages each segment appears in as the active segment")
+    parser.add_argument("--context-segments", type=int, default=2, help="Final segments repeated unchanged in every message")
+    parser.add_argument("--speaker-events-per-sec", type=float, default=0.5, help="Speaker events per meeting per second (0 disables)")
+    parser.add_argument("--participants", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of workload to generate")
+    parser.add_argument("--max-rate", action="store_true", help="Do not pace messages; measure saturation throughput")
+    parser.add_argument("--redis-url", default=os.getenv("BENCH_REDIS_URL", "redis://localhost:6379/15"),
+                        help="Redis to benchmark against (the database is flushed)")
+    parser.add_argument("--fake-redis", action="store_true", help="Use in-process fakeredis")
+    parser.add_argument("--fake-db", action="store_true", help="Use an in-memory session instead of Postgres")
+    parser.add_argument("--fake-commit-ms", type=float, default=2.0, help="Simulated commit latency with --fake-db")
+    parser.add_argument("--keep-data", action="store_true", help="Keep seeded meetings and transcriptions in Postgres")
+    parser.add_argument("--flush-interval", type=float, default=1.0, help="process_redis_to_postgres interval (s)")
+    parser.add_argument("--immutability-s", type=float, default=2.0, help="Segment immutability threshold (s)")
+    parser.add_argument("--drain-timeout", type=float, default=30.0, help="Max wait for the final flush (s)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--log-level", default="WARNING")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.WARNING),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    for path in (COLLECTOR_DIR, SHARED_MODELS_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    report = asyncio.run(run_benchmark(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
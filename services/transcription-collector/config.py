@@ -14,12 +14,30 @@ REDIS_SPEAKER_EVENTS_STREAM_NAME = os.environ.get("REDIS_SPEAKER_EVENTS_STREAM_N
 REDIS_SPEAKER_EVENTS_CONSUMER_GROUP = os.environ.get("REDIS_SPEAKER_EVENTS_CONSUMER_GROUP", "collector_speaker_group")
 REDIS_SPEAKER_EVENT_KEY_PREFIX = os.environ.get("REDIS_SPEAKER_EVENT_KEY_PREFIX", "speaker_events") # For sorted sets
 REDIS_SPEAKER_EVENT_TTL = int(os.environ.get("REDIS_SPEAKER_EVENT_TTL", "86400")) # 24 hours default TTL for speaker events sorted sets
+# Speaker event compaction: START/END pairs become SPEAKER_INTERVAL records, old intervals are trimmed
+SPEAKER_EVENT_MERGE_GAP_MS = float(os.environ.get("SPEAKER_EVENT_MERGE_GAP_MS", "500"))  # same-participant gaps up to this are merged (flapping)
+SPEAKER_EVENT_TRIM_MARGIN_MS = float(os.environ.get("SPEAKER_EVENT_TRIM_MARGIN_MS", "60000"))  # kept before the oldest unflushed segment
+SPEAKER_EVENT_COMPACT_AT = int(os.environ.get("SPEAKER_EVENT_COMPACT_AT", "200"))  # compact on ingest each time the set size reaches a multiple of this; 0 disables
 
 # Configuration for background processing
 BACKGROUND_TASK_INTERVAL = int(os.environ.get("BACKGROUND_TASK_INTERVAL", "10"))  # seconds
 IMMUTABILITY_THRESHOLD = int(os.environ.get("IMMUTABILITY_THRESHOLD", "30"))  # seconds
 REDIS_SEGMENT_TTL = int(os.environ.get("REDIS_SEGMENT_TTL", "3600"))  # 1 hour default TTL for Redis segments
 
+# WS subscribe authorization cache: per-user Redis hash of (platform, native id) -> meeting id
+WS_AUTHZ_CACHE_TTL = int(os.environ.get("WS_AUTHZ_CACHE_TTL", "15"))  # seconds; 0 disables
+WS_AUTHZ_MAX_MEETINGS = int(os.environ.get("WS_AUTHZ_MAX_MEETINGS", "500"))  # meetings per subscribe request
+
+# Transcript purge jobs (meeting deletion / retention)
+PURGE_CHUNK_ROWS = int(os.environ.get("PURGE_CHUNK_ROWS", "5000"))  # rows per DELETE statement / transaction
+PURGE_CHUNK_PAUSE_MS = int(os.environ.get("PURGE_CHUNK_PAUSE_MS", "50"))  # pause between chunks to spread WAL and locks
+PURGE_JOB_TTL = int(os.environ.get("PURGE_JOB_TTL", "86400"))  # seconds a finished job's status stays queryable
+PURGE_MAX_BATCH_MEETINGS = int(os.environ.get("PURGE_MAX_BATCH_MEETINGS", "1000"))  # meetings per batch purge request
+
+# GET /meetings keyset pagination
+MEETINGS_PAGE_SIZE = int(os.environ.get("MEETINGS_PAGE_SIZE", "100"))  # default page size
+MEETINGS_PAGE_MAX = int(os.environ.get("MEETINGS_PAGE_MAX", "1000"))  # largest page a client may request
+
 # Logging configuration
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
 
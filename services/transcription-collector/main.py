@@ -30,6 +30,7 @@ from config import (
 from api.endpoints import router as api_router
 from streaming.consumer import claim_stale_messages, consume_redis_stream, consume_speaker_events_stream
 from background.db_writer import process_redis_to_postgres
+from background.purge import cancel_purge_jobs
 
 app = FastAPI(
     title="Transcription Collector",
@@ -133,6 +134,7 @@ async def shutdown():
                 logger.info(f"Background task {i+1} cancelled.")
             except Exception as e:
                 logger.error(f"Error during background task {i+1} cancellation: {e}", exc_info=True)
+    await cancel_purge_jobs()
     
     # Close Redis connection
     if redis_client:
@@ -4,6 +4,8 @@ import json
 import redis.asyncio as aioredis
 import redis
 
+from mapping.speaker_timeline import EVENT_INTERVAL
+
 logger = logging.getLogger(__name__)
 
 # Speaker mapping statuses
@@ -81,14 +83,28 @@ def map_speaker_to_segment(
 
     # Parse speaker events from JSON string to dict
     parsed_events: List[Dict[str, Any]] = []
+    has_intervals = False
     for event_json, timestamp in speaker_events_for_session:
         try:
             event = json.loads(event_json)
+            if event.get("event_type") == EVENT_INTERVAL:
+                # Compacted interval: expand back into a START/END pair
+                has_intervals = True
+                for event_type, ts in (("SPEAKER_START", event["start_ms"]), ("SPEAKER_END", event["end_ms"])):
+                    parsed_events.append({
+                        "event_type": event_type,
+                        "participant_name": event.get("participant_name"),
+                        "participant_id_meet": event.get("participant_id_meet"),
+                        "relative_client_timestamp_ms": float(ts),
+                    })
+                continue
             event['relative_client_timestamp_ms'] = timestamp # Ensure timestamp is part of the event dict
             parsed_events.append(event)
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
             logger.warning(f"Failed to parse speaker event JSON: {event_json}")
             continue
+    if has_intervals:
+        parsed_events.sort(key=lambda e: e['relative_client_timestamp_ms'])
     
     if not parsed_events:
         return {"speaker_name": None, "participant_id_meet": None, "status": STATUS_ERROR} # Error parsing all events
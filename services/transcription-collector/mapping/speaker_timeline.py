@@ -0,0 +1,150 @@
+"""
+Compaction of a session's speaker events (``speaker_events:{session_uid}`` sorted set).
+
+Bots report speaking-indicator flips as raw SPEAKER_START / SPEAKER_END events, and
+in big meetings these flap in bursts. The compactor pairs them per participant into
+intervals, merges intervals separated by at most ``merge_gap_ms`` (hysteresis), and
+stores each closed interval as a single record scored by its start::
+
+    {"event_type": "SPEAKER_INTERVAL", "participant_name": ..., "participant_id_meet": ...,
+     "start_ms": ..., "end_ms": ...}
+
+A participant still speaking keeps one SPEAKER_START. Intervals that ended before
+``trim_before_ms`` (the oldest segment that may still be mapped) are dropped, so the
+set and the mapping work per segment stay bounded however long the session runs.
+``map_speaker_to_segment`` expands interval records back into START/END pairs.
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+EVENT_INTERVAL = "SPEAKER_INTERVAL"
+
+
+def _participant_key(event: Dict[str, Any]) -> Optional[str]:
+    return event.get("participant_id_meet") or event.get("participant_name")
+
+
+def interval_record(participant_name: Optional[str], participant_id_meet: Optional[str], start_ms: float, end_ms: float) -> str:
+    # Deterministic JSON so recompacting an unchanged interval keeps the same member
+    return json.dumps({
+        "event_type": EVENT_INTERVAL,
+        "participant_name": participant_name,
+        "participant_id_meet": participant_id_meet,
+        "start_ms": start_ms,
+        "end_ms": end_ms,
+    }, sort_keys=True, separators=(",", ":"))
+
+
+def compact_events(
+    events: List[Tuple[str, float]],
+    merge_gap_ms: float,
+    trim_before_ms: Optional[float] = None,
+) -> Dict[str, float]:
+    """
+    Compacted members (member -> score) for chronologically sorted (member, score) pairs.
+
+    Unparseable members and END events with no open START are dropped. Members that
+    come out unchanged (e.g. a lone open START) are returned as they were. With a
+    ``merge_gap_ms`` of 0 segments map to the same speaker as before, except that a
+    START repeated while speaking can change which concurrent speaker is reported.
+    """
+    per_participant: Dict[str, Dict[str, Any]] = {}
+    for member, score in events:
+        try:
+            event = json.loads(member)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        key = _participant_key(event)
+        if not key:
+            continue
+        state = per_participant.setdefault(key, {"intervals": [], "open": None})
+        # Latest known identity wins (names can be filled in after the first event)
+        state["name"] = event.get("participant_name") or state.get("name")
+        state["id"] = event.get("participant_id_meet") or state.get("id")
+        event_type = event.get("event_type")
+        if event_type == EVENT_INTERVAL:
+            state["intervals"].append([float(event["start_ms"]), float(event["end_ms"])])
+        elif event_type == "SPEAKER_START":
+            # A repeated START while already speaking does not move the interval start
+            if state["open"] is None:
+                state["open"] = (score, member)
+        elif event_type == "SPEAKER_END" and state["open"] is not None:
+            state["intervals"].append([state["open"][0], score])
+            state["open"] = None
+
+    compacted: Dict[str, float] = {}
+    for state in per_participant.values():
+        merged: List[List[float]] = []
+        for start, end in sorted(state["intervals"]):
+            if merged and start - merged[-1][1] <= merge_gap_ms:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        open_start = state["open"]
+        if open_start is not None:
+            open_ts, open_member = open_start
+            if merged and open_ts - merged[-1][1] <= merge_gap_ms:
+                # Speaking resumed within the gap: the open interval starts where the last one did
+                open_ts = merged.pop()[0]
+                open_member = json.dumps({
+                    "event_type": "SPEAKER_START",
+                    "participant_name": state.get("name"),
+                    "participant_id_meet": state.get("id"),
+                    "relative_client_timestamp_ms": open_ts,
+                }, sort_keys=True, separators=(",", ":"))
+            compacted[open_member] = open_ts
+
+        for start, end in merged:
+            if trim_before_ms is not None and end < trim_before_ms:
+                continue
+            compacted[interval_record(state.get("name"), state.get("id"), start, end)] = start
+    return compacted
+
+
+async def compact_speaker_events(
+    redis_c: aioredis.Redis,
+    speaker_event_key: str,
+    merge_gap_ms: float,
+    trim_before_ms: Optional[float] = None,
+) -> Optional[Tuple[int, int]]:
+    """
+    Rewrite a session's speaker event set in compacted form.
+
+    Runs under WATCH, so an event added meanwhile aborts the rewrite; the next pass
+    picks it up. Returns (members before, members after), or None if nothing was done.
+    """
+    async with redis_c.pipeline(transaction=True) as pipe:
+        try:
+            await pipe.watch(speaker_event_key)
+            raw = await pipe.zrange(speaker_event_key, 0, -1, withscores=True)
+            if not raw:
+                return None
+            events = [
+                (member.decode("utf-8") if isinstance(member, bytes) else member, float(score))
+                for member, score in raw
+            ]
+            current = dict(events)
+            compacted = compact_events(events, merge_gap_ms, trim_before_ms)
+            to_remove = [m for m in current if m not in compacted]
+            to_add = {m: s for m, s in compacted.items() if current.get(m) != s}
+            if not to_remove and not to_add:
+                return None
+            pipe.multi()
+            # Add before removing so the key (and its TTL) never disappears mid-transaction
+            if to_add:
+                pipe.zadd(speaker_event_key, to_add)
+            if to_remove:
+                pipe.zrem(speaker_event_key, *to_remove)
+            await pipe.execute()
+        except redis.exceptions.WatchError:
+            logger.debug(f"[SpeakerCompact] {speaker_event_key} changed during compaction; will retry next pass")
+            return None
+    logger.debug(f"[SpeakerCompact] {speaker_event_key}: {len(current)} -> {len(compacted)} members")
+    return len(current), len(compacted)
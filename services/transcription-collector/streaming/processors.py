@@ -4,6 +4,7 @@ import uuid
 import os
 import hmac
 import base64
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, List, Tuple
 
@@ -16,9 +17,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from shared_models.database import async_session_local # For DB sessions
 from shared_models.models import User, Meeting, MeetingSession, APIToken
 from shared_models.schemas import Platform # WhisperLiveData not directly used by these functions from snippet
+from shared_models.latency import stage_latency
 from config import REDIS_SEGMENT_TTL, REDIS_SPEAKER_EVENT_KEY_PREFIX, REDIS_SPEAKER_EVENT_TTL # Added new configs (NEW)
+from config import SPEAKER_EVENT_COMPACT_AT, SPEAKER_EVENT_MERGE_GAP_MS
 # MODIFIED: Import the new utility function and only necessary statuses/base mapper if still needed elsewhere
 from mapping.speaker_mapper import get_speaker_mapping_for_segment, STATUS_UNKNOWN, STATUS_ERROR # Removed direct map_speaker_to_segment and other statuses if not directly used by this file
+from mapping.speaker_timeline import compact_speaker_events
 
 logger = logging.getLogger(__name__)
 
@@ -142,6 +146,7 @@ async def process_stream_message(message_id: str, message_data: Dict[str, Any],
     False if a potentially recoverable error occurred (should not be ACKed).
     """
     payload_json = "" 
+    received_ts = time.time()
     try:
         if 'payload' not in message_data:
             logger.warning(f"Message {message_id} missing 'payload' field. Skipping.")
@@ -255,6 +260,16 @@ async def process_stream_message(message_id: str, message_data: Dict[str, Any],
 
             if not session_uid_from_payload:
                 logger.warning(f"[Msg {message_id}/Meet {internal_meeting_id}] Message missing 'uid' for transcription segments. Cannot map speakers. Segments in this message will not have speaker info.")
+
+            # Latency trace from WhisperLive; the stream entry ID carries the XADD time in ms
+            trace = stream_data.get('trace') if isinstance(stream_data.get('trace'), dict) else None
+            if trace is not None:
+                try:
+                    trace["stream_ts"] = int(str(message_id).split('-', 1)[0]) / 1000.0
+                except (TypeError, ValueError):
+                    trace["stream_ts"] = None
+                trace["collector_ts"] = received_ts
+                stage_latency.observe_between("xadd_to_collector", trace.get("stream_ts"), received_ts)
             
             for i, segment in enumerate(stream_data.get('segments', [])):
                  if not isinstance(segment, dict) or segment.get('start') is None or segment.get('end') is None:
@@ -400,9 +415,15 @@ async def process_stream_message(message_id: str, message_data: Dict[str, Any],
                             "payload": {"segments": changed_segments},
                             "ts": datetime.now(timezone.utc).isoformat()
                         }
+                        if trace is not None:
+                            trace["published_ts"] = time.time()
+                            event_payload["trace"] = trace
                         channel = f"tc:meeting:{internal_meeting_id}:mutable"
                         await redis_c.publish(channel, json.dumps(event_payload))
                         logger.info(f"Published {len(changed_segments)} changed segments to {channel}")
+                        if trace is not None:
+                            stage_latency.observe_between("collector_processing", received_ts, trace["published_ts"])
+                            stage_latency.observe_between("capture_to_collector_publish", trace.get("captured_ts"), trace["published_ts"])
                     except Exception as pub_err:
                         logger.error(f"Failed to publish mutable transcript update for meeting {internal_meeting_id}: {pub_err}")
                 else:
@@ -448,8 +469,14 @@ async def process_speaker_event_message(message_id: str, event_data: Dict[str, A
         async with redis_c.pipeline(transaction=True) as pipe:
             pipe.zadd(sorted_set_key, {event_payload_json: relative_timestamp_ms})
             pipe.expire(sorted_set_key, REDIS_SPEAKER_EVENT_TTL)
+            pipe.zcard(sorted_set_key)
             results = await pipe.execute()
 
+        # Bursty flapping between background passes: merge it now rather than let the set grow.
+        # Triggering on multiples keeps this to one pass per SPEAKER_EVENT_COMPACT_AT new events.
+        if SPEAKER_EVENT_COMPACT_AT and results[-1] % SPEAKER_EVENT_COMPACT_AT == 0:
+            await compact_speaker_events(redis_c, sorted_set_key, SPEAKER_EVENT_MERGE_GAP_MS)
+
         # Check pipeline results (optional, zadd returns num added, expire returns 1 or 0)
         # For simplicity, we assume success if no exception
         logger.debug(f"[SpeakerProcessor] Stored speaker event for UID '{session_uid}' at {relative_timestamp_ms}ms. Key: {sorted_set_key}. Message ID: {message_id}")
@@ -0,0 +1,11 @@
+import os
+import sys
+from pathlib import Path
+
+# shared_models.database builds its engine at import; the unit tests never connect
+for name, value in {"DB_HOST": "localhost", "DB_PORT": "5432", "DB_NAME": "test", "DB_USER": "test", "DB_PASSWORD": "test"}.items():
+    os.environ.setdefault(name, value)
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
+sys.path.insert(0, str(SERVICE_DIR.parent.parent / "libs" / "shared-models"))
@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+import background.purge as purge
+
+
+class RecordingSession:
+    """Stands in for AsyncSession: returns ``ids`` for the id snapshot and records DELETEs."""
+
+    def __init__(self, ids, late_rows=0):
+        self.ids = ids
+        self.late_rows = late_rows
+        self.deletes = []
+        self.commits = 0
+
+    async def execute(self, stmt):
+        if stmt.is_select:
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: list(self.ids)))
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        bounds = (compiled.params.get("id_1"), compiled.params.get("id_2"))
+        self.deletes.append(bounds)
+        if bounds == (None, None):
+            return SimpleNamespace(rowcount=self.late_rows)
+        return SimpleNamespace(rowcount=sum(1 for i in self.ids if bounds[0] <= i <= bounds[1]))
+
+    async def commit(self):
+        self.commits += 1
+
+
+def run_purge(db, chunk_rows):
+    progress = []
+
+    async def on_chunk(count):
+        progress.append(count)
+
+    deleted = asyncio.run(purge.purge_transcriptions(db, 7, chunk_rows=chunk_rows, on_chunk=on_chunk))
+    return deleted, progress
+
+
+def test_deletes_in_primary_key_ranges_then_catch_all(monkeypatch):
+    monkeypatch.setattr(purge, "PURGE_CHUNK_PAUSE_MS", 0)
+    db = RecordingSession(ids=[3, 4, 9, 10, 11, 20, 21], late_rows=2)
+    deleted, progress = run_purge(db, chunk_rows=3)
+
+    assert db.deletes == [(3, 9), (10, 20), (21, 21), (None, None)]
+    assert deleted == 9
+    assert progress == [3, 3, 1, 2]
+    # Snapshot transaction plus one commit per DELETE
+    assert db.commits == 1 + len(db.deletes)
+
+
+def test_empty_meeting_runs_only_the_catch_all(monkeypatch):
+    monkeypatch.setattr(purge, "PURGE_CHUNK_PAUSE_MS", 0)
+    db = RecordingSession(ids=[])
+    deleted, progress = run_purge(db, chunk_rows=1000)
+
+    assert db.deletes == [(None, None)]
+    assert deleted == 0
+    assert progress == []
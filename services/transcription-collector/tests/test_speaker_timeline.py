@@ -0,0 +1,157 @@
+import asyncio
+import json
+import random
+
+import fakeredis.aioredis
+
+from mapping.speaker_mapper import map_speaker_to_segment
+from mapping.speaker_timeline import EVENT_INTERVAL, compact_events, compact_speaker_events
+
+PARTICIPANTS = [("Alice", "id-a"), ("Bob", "id-b"), ("Carol", "id-c")]
+
+
+def event(event_type, name, participant_id, ts):
+    # Shaped like the payloads the collector stores from the speaker events stream
+    member = json.dumps({
+        "uid": "session-1",
+        "event_type": event_type,
+        "participant_name": name,
+        "participant_id_meet": participant_id,
+        "relative_client_timestamp_ms": ts,
+    })
+    return member, float(ts)
+
+
+def sorted_members(compacted):
+    return sorted(compacted.items(), key=lambda item: item[1])
+
+
+def random_session(rng, n_events=150, repeat_starts=False):
+    """Overlapping turns ending with speakers still talking; optionally STARTs repeated while speaking."""
+    events, speaking, ts = [], set(), 0.0
+    for _ in range(n_events):
+        ts += rng.uniform(1, 800)
+        name, participant_id = rng.choice(PARTICIPANTS)
+        if participant_id in speaking and not (repeat_starts and rng.random() < 0.2):
+            events.append(event("SPEAKER_END", name, participant_id, ts))
+            speaking.discard(participant_id)
+        else:
+            events.append(event("SPEAKER_START", name, participant_id, ts))
+            speaking.add(participant_id)
+    return events, ts
+
+
+def mapping(start, end, events):
+    result = map_speaker_to_segment(start, end, events)
+    return result["speaker_name"], result["participant_id_meet"], result["status"]
+
+
+def random_segments(rng, last_ts, n=100):
+    for _ in range(n):
+        start = rng.uniform(0, last_ts)
+        yield start, start + rng.uniform(200, 8000)
+
+
+def test_zero_gap_compaction_keeps_speaker_mapping():
+    rng = random.Random(7)
+    mismatches = []
+    for _ in range(15):
+        events, last_ts = random_session(rng)
+        compacted = sorted_members(compact_events(events, merge_gap_ms=0))
+        assert len(compacted) < len(events)
+        for start, end in random_segments(rng, last_ts):
+            if mapping(start, end, events) != mapping(start, end, compacted):
+                mismatches.append((start, end))
+    assert mismatches == []
+
+
+def test_repeated_starts_keep_mapping_status():
+    # A repeated START does not move the interval start, so among concurrent speakers
+    # the one reported may differ; single-speaker mappings and statuses may not
+    rng = random.Random(13)
+    for _ in range(10):
+        events, last_ts = random_session(rng, repeat_starts=True)
+        compacted = sorted_members(compact_events(events, merge_gap_ms=0))
+        for start, end in random_segments(rng, last_ts):
+            raw, merged = mapping(start, end, events), mapping(start, end, compacted)
+            assert raw[2] == merged[2]
+            if raw[2] != "MULTIPLE_CONCURRENT_SPEAKERS":
+                assert raw == merged
+
+
+def test_flapping_is_merged_within_gap():
+    events = []
+    for i in range(10):
+        events.append(event("SPEAKER_START", "Alice", "id-a", i * 1000))
+        events.append(event("SPEAKER_END", "Alice", "id-a", i * 1000 + 700))
+    events.append(event("SPEAKER_START", "Bob", "id-b", 20000))
+    events.append(event("SPEAKER_END", "Bob", "id-b", 21000))
+
+    compacted = compact_events(events, merge_gap_ms=500)
+    intervals = sorted((json.loads(m)["participant_name"], json.loads(m)["start_ms"], json.loads(m)["end_ms"])
+                       for m in compacted)
+    # Gaps of 300 ms collapse into one interval; Bob's separate turn stays its own
+    assert intervals == [("Alice", 0.0, 9700.0), ("Bob", 20000.0, 21000.0)]
+    assert all(json.loads(m)["event_type"] == EVENT_INTERVAL for m in compacted)
+    assert mapping(4750, 5200, sorted_members(compacted))[0] == "Alice"
+
+
+def test_open_start_survives_and_is_reanchored_when_merged():
+    lone = [event("SPEAKER_START", "Alice", "id-a", 5000)]
+    # Nothing to compact: the START is kept as it was
+    assert compact_events(lone, merge_gap_ms=500) == dict(lone)
+
+    events = [
+        event("SPEAKER_START", "Alice", "id-a", 1000),
+        event("SPEAKER_END", "Alice", "id-a", 2000),
+        event("SPEAKER_START", "Alice", "id-a", 2300),
+    ]
+    compacted = compact_events(events, merge_gap_ms=500)
+    assert len(compacted) == 1
+    member, score = next(iter(compacted.items()))
+    assert json.loads(member)["event_type"] == "SPEAKER_START"
+    assert json.loads(member)["relative_client_timestamp_ms"] == 1000
+    assert score == 1000
+    assert mapping(1500, 1900, sorted_members(compacted))[0] == "Alice"
+    assert mapping(9000, 9500, sorted_members(compacted))[0] == "Alice"
+
+    # Resumed after the gap: the closed interval and the open START stay separate
+    events[-1] = event("SPEAKER_START", "Alice", "id-a", 3000)
+    compacted = compact_events(events, merge_gap_ms=500)
+    assert sorted(json.loads(m)["event_type"] for m in compacted) == [EVENT_INTERVAL, "SPEAKER_START"]
+    assert compacted[events[-1][0]] == 3000
+
+
+def test_intervals_ending_before_trim_point_are_dropped():
+    events = [
+        event("SPEAKER_START", "Alice", "id-a", 0),
+        event("SPEAKER_END", "Alice", "id-a", 1000),
+        event("SPEAKER_START", "Bob", "id-b", 2000),
+        event("SPEAKER_END", "Bob", "id-b", 6000),
+        event("SPEAKER_START", "Carol", "id-c", 3000),
+    ]
+    compacted = compact_events(events, merge_gap_ms=0, trim_before_ms=5000)
+    names = sorted((json.loads(m)["participant_name"], json.loads(m)["event_type"]) for m in compacted)
+    # Bob's interval overlaps the trim point and an open START is never trimmed
+    assert names == [("Bob", EVENT_INTERVAL), ("Carol", "SPEAKER_START")]
+
+
+def test_recompaction_is_a_fixed_point():
+    events, _ = random_session(random.Random(11))
+    compacted = compact_events(events, merge_gap_ms=500, trim_before_ms=20000)
+    assert compact_events(sorted_members(compacted), merge_gap_ms=500, trim_before_ms=20000) == compacted
+
+    async def scenario():
+        redis_c = fakeredis.aioredis.FakeRedis()
+        key = "speaker_events:session-1"
+        await redis_c.zadd(key, dict(events))
+        first = await compact_speaker_events(redis_c, key, 500, trim_before_ms=20000)
+        second = await compact_speaker_events(redis_c, key, 500, trim_before_ms=20000)
+        stored = await redis_c.zrange(key, 0, -1, withscores=True)
+        return first, second, {m.decode(): s for m, s in stored}
+
+    first, second, stored = asyncio.run(scenario())
+    assert first == (len(events), len(compacted))
+    # The next background pass finds nothing to rewrite
+    assert second is None
+    assert stored == compacted
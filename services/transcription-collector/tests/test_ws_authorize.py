@@ -0,0 +1,114 @@
+import asyncio
+import re
+from pathlib import Path
+from types import SimpleNamespace
+
+import fakeredis.aioredis
+
+import api.endpoints as endpoints
+from api.endpoints import WsAuthorizeSubscribeRequest, WsMeetingRef
+from background.purge import ws_authz_cache_key
+
+USER_ID = 7
+BOT_MANAGER_MAIN = Path(__file__).resolve().parents[2] / "bot-manager" / "app" / "main.py"
+
+
+class BrokenRedis:
+    async def hmget(self, *args, **kwargs):
+        raise ConnectionError("redis down")
+
+    def pipeline(self, *args, **kwargs):
+        raise ConnectionError("redis down")
+
+
+def stub_db(monkeypatch, meetings):
+    """Replaces the DB lookup with ``meetings`` ((platform, native id) -> meeting id) and records calls."""
+    calls = []
+
+    async def resolve(db, user_id, pairs):
+        calls.append(list(pairs))
+        return {pair: meetings[pair] for pair in pairs if pair in meetings}
+
+    monkeypatch.setattr(endpoints, "_resolve_latest_meeting_ids", resolve)
+    return calls
+
+
+async def authorize(redis_c, native_ids):
+    payload = WsAuthorizeSubscribeRequest(
+        meetings=[WsMeetingRef(platform="google_meet", native_meeting_id=n) for n in native_ids]
+    )
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(redis_client=redis_c)))
+    user = SimpleNamespace(id=USER_ID)
+    return await endpoints.ws_authorize_subscribe(payload, request, current_user=user, db=None)
+
+
+def meeting_ids(response):
+    return [(a["native_id"], a["meeting_id"]) for a in response.authorized]
+
+
+def test_cache_hits_are_merged_with_db_results(monkeypatch):
+    calls = stub_db(monkeypatch, {("google_meet", "ddd-eeee-fff"): 22})
+
+    async def scenario():
+        redis_c = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        await redis_c.hset(ws_authz_cache_key(USER_ID), "google_meet:aaa-bbbb-ccc", 11)
+        return await authorize(redis_c, ["aaa-bbbb-ccc", "ddd-eeee-fff"])
+
+    response = asyncio.run(scenario())
+    assert meeting_ids(response) == [("aaa-bbbb-ccc", "11"), ("ddd-eeee-fff", "22")]
+    # Only the cache miss went to the database
+    assert calls == [[("google_meet", "ddd-eeee-fff")]]
+
+
+def test_only_positive_results_are_cached_with_ttl(monkeypatch):
+    key = ws_authz_cache_key(USER_ID)
+
+    async def scenario():
+        redis_c = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        stub_db(monkeypatch, {("google_meet", "aaa-bbbb-ccc"): 11})
+        first = await authorize(redis_c, ["aaa-bbbb-ccc", "zzz-zzzz-zzz"])
+        cached, ttl = await redis_c.hgetall(key), await redis_c.ttl(key)
+        # The unknown meeting is looked up again next time, so it authorizes as soon as it exists
+        calls = stub_db(monkeypatch, {("google_meet", "zzz-zzzz-zzz"): 33})
+        second = await authorize(redis_c, ["aaa-bbbb-ccc", "zzz-zzzz-zzz"])
+        return first, cached, ttl, second, calls
+
+    first, cached, ttl, second, calls = asyncio.run(scenario())
+    assert meeting_ids(first) == [("aaa-bbbb-ccc", "11")]
+    assert first.errors == ["meetings[1] not authorized or not found for user"]
+    assert cached == {"google_meet:aaa-bbbb-ccc": "11"}
+    assert 0 < ttl <= endpoints.WS_AUTHZ_CACHE_TTL
+    assert meeting_ids(second) == [("aaa-bbbb-ccc", "11"), ("zzz-zzzz-zzz", "33")]
+    assert calls == [[("google_meet", "zzz-zzzz-zzz")]]
+
+
+def test_redis_failure_falls_back_to_db(monkeypatch):
+    calls = stub_db(monkeypatch, {("google_meet", "aaa-bbbb-ccc"): 11})
+
+    response = asyncio.run(authorize(BrokenRedis(), ["aaa-bbbb-ccc"]))
+    assert meeting_ids(response) == [("aaa-bbbb-ccc", "11")]
+    assert response.errors == []
+    assert calls == [[("google_meet", "aaa-bbbb-ccc")]]
+
+
+def test_repeated_pairs_keep_input_order(monkeypatch):
+    calls = stub_db(monkeypatch, {("google_meet", "aaa-bbbb-ccc"): 11, ("google_meet", "ddd-eeee-fff"): 22})
+
+    async def scenario():
+        redis_c = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        await redis_c.hset(ws_authz_cache_key(USER_ID), "google_meet:aaa-bbbb-ccc", 11)
+        return await authorize(redis_c, ["ddd-eeee-fff", "zzz-zzzz-zzz", "aaa-bbbb-ccc", "ddd-eeee-fff"])
+
+    response = asyncio.run(scenario())
+    # Cached and looked-up pairs come back in request order, repeats included
+    assert meeting_ids(response) == [("ddd-eeee-fff", "22"), ("aaa-bbbb-ccc", "11"), ("ddd-eeee-fff", "22")]
+    assert response.errors == ["meetings[1] not authorized or not found for user"]
+    # Each distinct uncached pair is looked up once
+    assert calls == [[("google_meet", "ddd-eeee-fff"), ("google_meet", "zzz-zzzz-zzz")]]
+
+
+def test_bot_manager_invalidates_the_same_key():
+    # bot-manager drops the cache when it creates a meeting; its key must match ws_authz_cache_key
+    source = BOT_MANAGER_MAIN.read_text()
+    deleted = re.findall(r'redis_client\.delete\(f"(ws_authz:[^"]*)"\)', source)
+    assert deleted == [ws_authz_cache_key("{current_user.id}")]
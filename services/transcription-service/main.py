@@ -5,7 +5,11 @@ Implements OpenAI Whisper API format for seamless integration with Vexa
 import os
 import io
 import time
+import asyncio
 import logging
+import resource
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 import numpy as np
@@ -15,6 +19,8 @@ from fastapi.responses import JSONResponse
 from fastapi.security import APIKeyHeader
 import uvicorn
 from faster_whisper import WhisperModel
+from faster_whisper.utils import download_model
+from replica_pool import ReplicaPool, plan_replicas
 # faster-whisper uses CTranslate2 internally (no PyTorch needed)
 
 # Logging
@@ -45,6 +51,10 @@ else:
 # CPU threads configuration (for CPU mode optimization)
 CPU_THREADS = int(os.getenv("CPU_THREADS", "0"))  # 0 = auto-detect
 
+# CPU worker mode: K pinned model replicas in this process ("auto" sizes K from cores and memory)
+CPU_REPLICAS = os.getenv("CPU_REPLICAS", "0").strip().lower() or "0"
+CPU_THREADS_PER_REPLICA = int(os.getenv("CPU_THREADS_PER_REPLICA", "0"))  # 0 = split cores evenly (4 with auto)
+
 # Quality / decoding parameters (optional)
 def _env_bool(name: str, default: bool) -> bool:
     raw = os.getenv(name, None)
@@ -86,6 +96,31 @@ VAD_FILTER = _env_bool("VAD_FILTER", True)
 VAD_FILTER_THRESHOLD = _env_float("VAD_FILTER_THRESHOLD", 0.5)
 VAD_MIN_SILENCE_DURATION_MS = _env_int("VAD_MIN_SILENCE_DURATION_MS", 160)
 
+# Cold start: decode this much synthetic audio per model before reporting ready (0 runs = skip)
+STARTUP_WARMUP_AUDIO_S = _env_float("STARTUP_WARMUP_AUDIO_S", 2.0)
+STARTUP_WARMUP_RUNS = _env_int("STARTUP_WARMUP_RUNS", 1)
+MODEL_DOWNLOAD_ROOT = "/app/models"
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this worker process (ru_maxrss is KiB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def _decoding_config() -> Dict[str, Any]:
+    """Settings that affect speed/quality; reported so perf runs can be compared."""
+    return {
+        "model": MODEL_SIZE,
+        "device": DEVICE,
+        "compute_type": COMPUTE_TYPE,
+        "cpu_threads": CPU_THREADS,
+        "cpu_replicas": len(replica_pool.replicas) if replica_pool is not None else 0,
+        "beam_size": BEAM_SIZE,
+        "best_of": BEST_OF,
+        "vad_filter": VAD_FILTER,
+        "vad_filter_threshold": VAD_FILTER_THRESHOLD,
+        "condition_on_previous_text": CONDITION_ON_PREVIOUS_TEXT,
+        "use_temperature_fallback": USE_TEMPERATURE_FALLBACK,
+    }
+
 # Temperature fallback chain
 USE_TEMPERATURE_FALLBACK = _env_bool("USE_TEMPERATURE_FALLBACK", False)
 TEMPERATURE_FALLBACK_CHAIN = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
@@ -148,14 +183,124 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# Global model instance
+# Global model instance (single-model mode) or CPU replica pool (CPU_REPLICAS)
 model: Optional[WhisperModel] = None
+replica_pool: Optional[ReplicaPool] = None
+
+
+# Startup pipeline (prefetch -> load -> warmup), reported on /ready
+startup_state: Dict[str, Any] = {"started_at": time.time(), "ready_at": None, "error": None, "phases": []}
+_startup_lock = threading.Lock()
+
+
+def _model_ready() -> bool:
+    """Models loaded and warmed; requests before this would pay the cold start."""
+    return startup_state["ready_at"] is not None
+
+
+@contextmanager
+def _startup_phase(name: str, **detail):
+    phase = {"name": name, "status": "running", "started_at": time.time(), "duration_s": None, **detail}
+    with _startup_lock:
+        startup_state["phases"].append(phase)
+    try:
+        yield phase
+    except Exception as e:
+        with _startup_lock:
+            phase.update(status="failed", duration_s=round(time.time() - phase["started_at"], 3), error=str(e))
+            startup_state["error"] = f"{name}: {e}"
+        raise
+    with _startup_lock:
+        phase.update(status="done", duration_s=round(time.time() - phase["started_at"], 3))
+    logger.info(f"Worker {WORKER_ID} startup phase {name} took {phase['duration_s']:.2f}s")
+
+
+def _prefetch_model(model_size_or_path: str) -> str:
+    """Local model directory, downloading only when it is not already in the cache."""
+    if os.path.isdir(model_size_or_path):
+        return model_size_or_path
+    try:
+        return download_model(model_size_or_path, local_files_only=True, cache_dir=MODEL_DOWNLOAD_ROOT)
+    except Exception:
+        logger.info(f"Worker {WORKER_ID} model {model_size_or_path} not cached, downloading")
+        return download_model(model_size_or_path, cache_dir=MODEL_DOWNLOAD_ROOT)
+
+
+def _synthetic_audio(seconds: float, sample_rate: int = 16000) -> np.ndarray:
+    """Deterministic voiced-like signal so warmup exercises the encoder and beam search."""
+    t = np.arange(int(seconds * sample_rate), dtype=np.float32) / sample_rate
+    phase = 2 * np.pi * np.cumsum(140.0 + 20.0 * np.sin(2 * np.pi * 0.7 * t)) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = 0.5 * (1.0 - np.cos(2 * np.pi * 4.0 * t))
+    noise = np.random.default_rng(0).standard_normal(len(t)).astype(np.float32)
+    return (0.1 * voiced * envelope + 0.003 * noise).astype(np.float32)
+
+
+def _warmup(whisper_model: WhisperModel) -> None:
+    """Run the request decode path (same decoding settings) on synthetic audio."""
+    audio = _synthetic_audio(STARTUP_WARMUP_AUDIO_S)
+    for _ in range(STARTUP_WARMUP_RUNS):
+        _transcribe_with_fallback(whisper_model, audio, None, "transcribe", None, [0.0])
+
+
+def _load_models() -> None:
+    global model, replica_pool
+    model_kwargs = {
+        "device": DEVICE,
+        "compute_type": COMPUTE_TYPE,
+        "download_root": MODEL_DOWNLOAD_ROOT,
+    }
+    with _startup_phase("prefetch", model=MODEL_SIZE) as phase:
+        model_kwargs["model_size_or_path"] = phase["path"] = _prefetch_model(MODEL_SIZE)
+    warm = STARTUP_WARMUP_RUNS > 0
+
+    if CPU_REPLICAS not in ("0", "1") and DEVICE != "cpu":
+        logger.warning(f"CPU_REPLICAS={CPU_REPLICAS} ignored on device {DEVICE}")
+    elif CPU_REPLICAS not in ("0", "1"):
+        count, threads, core_sets = plan_replicas(CPU_REPLICAS, CPU_THREADS_PER_REPLICA, MODEL_SIZE)
+        logger.info(f"Worker {WORKER_ID} CPU worker mode: {count} replicas x {threads} threads")
+
+        def _replica_model(cpu_threads: int) -> WhisperModel:
+            return WhisperModel(**model_kwargs, cpu_threads=cpu_threads)
+
+        pool = ReplicaPool(_replica_model, core_sets)
+        with _startup_phase("load", replicas=count, threads_per_replica=threads):
+            pool.load()
+        if warm:
+            with _startup_phase("warmup", audio_s=STARTUP_WARMUP_AUDIO_S, runs=STARTUP_WARMUP_RUNS) as phase:
+                phase["replica_s"] = pool.warmup(_warmup)
+        replica_pool = pool
+        logger.info(f"Worker {WORKER_ID} ready - {count} model replicas loaded")
+        return
+
+    # Add CPU threads for CPU mode (optimization from research)
+    if DEVICE == "cpu" and CPU_THREADS > 0:
+        model_kwargs["cpu_threads"] = CPU_THREADS
+        logger.info(f"Worker {WORKER_ID} using {CPU_THREADS} CPU threads")
+
+    with _startup_phase("load", device=DEVICE, compute_type=COMPUTE_TYPE):
+        loaded = WhisperModel(**model_kwargs)
+    if warm:
+        with _startup_phase("warmup", audio_s=STARTUP_WARMUP_AUDIO_S, runs=STARTUP_WARMUP_RUNS):
+            _warmup(loaded)
+    model = loaded
+    logger.info(f"Worker {WORKER_ID} ready - Model loaded successfully")
+
+
+async def _run_startup() -> None:
+    try:
+        await asyncio.to_thread(_load_models)
+    except Exception as e:
+        logger.error(f"Failed to load model: {e}", exc_info=True)
+        # Fail fast so the orchestrator restarts the worker instead of leaving it unready
+        os._exit(1)
+    startup_state["ready_at"] = time.time()
+    logger.info(f"Worker {WORKER_ID} ready in {startup_state['ready_at'] - startup_state['started_at']:.1f}s")
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize Whisper model on startup"""
-    global model
+    """Start loading the Whisper model(s); /health and /ready report 503 until warmed."""
     logger.info(f"Worker {WORKER_ID} starting up...")
     logger.info(f"Device: {DEVICE}, Model: {MODEL_SIZE}, Compute: {COMPUTE_TYPE}")
     logger.info(
@@ -167,50 +312,143 @@ async def startup_event():
         f"no_speech_threshold={NO_SPEECH_THRESHOLD}, "
         f"vad_filter={VAD_FILTER}"
     )
-    
-    try:
-        # Build model initialization parameters
-        model_kwargs = {
-            "model_size_or_path": MODEL_SIZE,
-            "device": DEVICE,
-            "compute_type": COMPUTE_TYPE,
-            "download_root": "/app/models"
-        }
-        
-        # Add CPU threads for CPU mode (optimization from research)
-        if DEVICE == "cpu" and CPU_THREADS > 0:
-            model_kwargs["cpu_threads"] = CPU_THREADS
-            logger.info(f"Worker {WORKER_ID} using {CPU_THREADS} CPU threads")
-        
-        model = WhisperModel(**model_kwargs)
-        logger.info(f"Worker {WORKER_ID} ready - Model loaded successfully")
-    except Exception as e:
-        logger.error(f"Failed to load model: {e}")
-        raise
+
+    # Load in the background so the port answers /ready with progress meanwhile
+    app.state.startup_task = asyncio.create_task(_run_startup())
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint for load balancer"""
     health_status = {
-        "status": "healthy" if model is not None else "unhealthy",
+        "status": "healthy" if _model_ready() else "unhealthy",
         "worker_id": WORKER_ID,
         "timestamp": datetime.utcnow().isoformat(),
         "model": MODEL_SIZE,
         "device": DEVICE,
         "gpu_available": DEVICE == "cuda",
+        "config": _decoding_config(),
     }
     
     if DEVICE == "cuda":
         # CTranslate2 (via faster-whisper) handles GPU automatically
         health_status["compute_type"] = COMPUTE_TYPE
     
-    if model is None:
+    if replica_pool is not None:
+        health_status["replicas"] = replica_pool.stats()
+
+    if not _model_ready():
         return JSONResponse(content=health_status, status_code=503)
     
     return health_status
 
 
+@app.get("/ready")
+async def readiness():
+    """Readiness gate with startup phase timings; 503 until the model is loaded and warmed."""
+    with _startup_lock:
+        payload = {
+            "ready": _model_ready(),
+            "worker_id": WORKER_ID,
+            "error": startup_state["error"],
+            "started_at": startup_state["started_at"],
+            "ready_at": startup_state["ready_at"],
+            "startup_s": round((startup_state["ready_at"] or time.time()) - startup_state["started_at"], 3),
+            "phases": [dict(p) for p in startup_state["phases"]],
+        }
+    return JSONResponse(content=payload, status_code=200 if payload["ready"] else 503)
+
+
+def _transcribe_with_fallback(
+    whisper_model: WhisperModel,
+    audio_array: np.ndarray,
+    language: Optional[str],
+    task: str,
+    prompt: Optional[str],
+    temps: List[float],
+) -> Tuple[Tuple[str, str, float, List[Dict[str, Any]]], int, float]:
+    """
+    Decode with the temperature chain and pick the first acceptable attempt.
+
+    Runs entirely on the calling thread (faster-whisper decodes lazily while the
+    segment generator is consumed), so a replica thread can own the whole request.
+    Returns (best, decoded_tokens, inference_seconds).
+    """
+    best: Optional[Tuple[str, str, float, List[Dict[str, Any]]]] = None
+    last_info = None
+    last_segments: List[Dict[str, Any]] = []
+    decoded_tokens = 0
+    inference_start = time.time()
+
+    for t in temps:
+        segments_list, info = whisper_model.transcribe(
+            audio_array,
+            language=language,
+            task=task,
+            initial_prompt=prompt,
+            temperature=t,
+            beam_size=BEAM_SIZE,
+            best_of=BEST_OF,
+            compression_ratio_threshold=COMPRESSION_RATIO_THRESHOLD,
+            log_prob_threshold=LOG_PROB_THRESHOLD,
+            no_speech_threshold=NO_SPEECH_THRESHOLD,
+            condition_on_previous_text=CONDITION_ON_PREVIOUS_TEXT,
+            prompt_reset_on_temperature=PROMPT_RESET_ON_TEMPERATURE,
+            vad_filter=VAD_FILTER,
+            vad_parameters={
+                "threshold": VAD_FILTER_THRESHOLD,
+                "min_silence_duration_ms": VAD_MIN_SILENCE_DURATION_MS,
+            },
+            word_timestamps=False,
+        )
+        last_info = info
+
+        # Convert segments to list (faster-whisper returns generator)
+        segments: List[Dict[str, Any]] = []
+        for idx, segment in enumerate(segments_list):
+            decoded_tokens += len(segment.tokens or [])
+            segments.append({
+                "id": idx,
+                "seek": 0,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "tokens": [],  # Not needed for PoC
+                "temperature": t,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob,
+                # Add audio_ fields that RemoteTranscriber looks for
+                "audio_start": segment.start,
+                "audio_end": segment.end,
+            })
+        last_segments = segments
+
+        if _looks_like_silence(segments):
+            best = ("", info.language, 0.0, [])
+            logger.info(f"Worker {WORKER_ID} detected silence (temp={t})")
+            break
+
+        if not _looks_like_hallucination(segments):
+            full_text = " ".join([s["text"].strip() for s in segments]).strip()
+            duration = segments[-1]["end"] if segments else 0.0
+            best = (full_text, info.language, duration, segments)
+            logger.info(f"Worker {WORKER_ID} accepted transcription (temp={t})")
+            break
+        else:
+            logger.info(f"Worker {WORKER_ID} rejected transcription as hallucination/low-confidence (temp={t})")
+
+    if best is None:
+        # Fall back to last attempt (even if it looks low-quality) to preserve backward behavior.
+        info = last_info
+        segments = last_segments
+        full_text = " ".join([s["text"].strip() for s in segments]).strip()
+        duration = segments[-1]["end"] if segments else 0.0
+        best = (full_text, info.language if info else (language or "unknown"), duration, segments)
+
+    return best, decoded_tokens, time.time() - inference_start
+
+
 @app.post("/v1/audio/transcriptions")
 async def transcribe_audio(
     request: Request,
@@ -234,6 +472,9 @@ async def transcribe_audio(
     """
     if not requested_model:
         raise HTTPException(status_code=400, detail="Model parameter is required")
+    if not _model_ready():
+        # Still loading/warming: let the load balancer retry another worker
+        raise HTTPException(status_code=503, detail="Model is loading", headers={"Retry-After": "5"})
     
     start_time = time.time()
     logger.info(f"Worker {WORKER_ID} received transcription request - filename: {file.filename}, content_type: {file.content_type}")
@@ -270,79 +511,20 @@ async def transcribe_audio(
             f"temps: {temps}, language: {language}, task: {task}, vad_filter: {VAD_FILTER}"
         )
 
-        best: Optional[Tuple[str, str, float, List[Dict[str, Any]]]] = None
-        last_info = None
-        last_segments: List[Dict[str, Any]] = []
-
-        for t in temps:
-            segments_list, info = model.transcribe(
-                audio_array,
-                language=language,
-                task=task,
-                initial_prompt=prompt,
-                temperature=t,
-                beam_size=BEAM_SIZE,
-                best_of=BEST_OF,
-                compression_ratio_threshold=COMPRESSION_RATIO_THRESHOLD,
-                log_prob_threshold=LOG_PROB_THRESHOLD,
-                no_speech_threshold=NO_SPEECH_THRESHOLD,
-                condition_on_previous_text=CONDITION_ON_PREVIOUS_TEXT,
-                prompt_reset_on_temperature=PROMPT_RESET_ON_TEMPERATURE,
-                vad_filter=VAD_FILTER,
-                vad_parameters={
-                    "threshold": VAD_FILTER_THRESHOLD,
-                    "min_silence_duration_ms": VAD_MIN_SILENCE_DURATION_MS,
-                },
-                word_timestamps=False,
+        if replica_pool is not None:
+            best, decoded_tokens, inference_time = await replica_pool.run(
+                _transcribe_with_fallback, audio_array, language, task, prompt, temps
+            )
+        else:
+            best, decoded_tokens, inference_time = _transcribe_with_fallback(
+                model, audio_array, language, task, prompt, temps
             )
-            last_info = info
-
-            # Convert segments to list (faster-whisper returns generator)
-            segments: List[Dict[str, Any]] = []
-            for idx, segment in enumerate(segments_list):
-                segments.append({
-                    "id": idx,
-                    "seek": 0,
-                    "start": segment.start,
-                    "end": segment.end,
-                    "text": segment.text,
-                    "tokens": [],  # Not needed for PoC
-                    "temperature": t,
-                    "avg_logprob": segment.avg_logprob,
-                    "compression_ratio": segment.compression_ratio,
-                    "no_speech_prob": segment.no_speech_prob,
-                    # Add audio_ fields that RemoteTranscriber looks for
-                    "audio_start": segment.start,
-                    "audio_end": segment.end,
-                })
-            last_segments = segments
-
-            if _looks_like_silence(segments):
-                best = ("", info.language, 0.0, [])
-                logger.info(f"Worker {WORKER_ID} detected silence (temp={t})")
-                break
-
-            if not _looks_like_hallucination(segments):
-                full_text = " ".join([s["text"].strip() for s in segments]).strip()
-                duration = segments[-1]["end"] if segments else 0.0
-                best = (full_text, info.language, duration, segments)
-                logger.info(f"Worker {WORKER_ID} accepted transcription (temp={t})")
-                break
-            else:
-                logger.info(f"Worker {WORKER_ID} rejected transcription as hallucination/low-confidence (temp={t})")
-
-        if best is None:
-            # Fall back to last attempt (even if it looks low-quality) to preserve backward behavior.
-            info = last_info
-            segments = last_segments
-            full_text = " ".join([s["text"].strip() for s in segments]).strip()
-            duration = segments[-1]["end"] if segments else 0.0
-            best = (full_text, info.language if info else (language or "unknown"), duration, segments)
 
         full_text, detected_language, duration, segments = best
         logger.info(f"Worker {WORKER_ID} transcription completed - language: {detected_language}")
         
         processing_time = time.time() - start_time
+        audio_seconds = len(audio_array) / float(sample_rate) if sample_rate else 0.0
         logger.info(
             f"Worker {WORKER_ID} completed in {processing_time:.2f}s - "
             f"Duration: {duration:.2f}s, Segments: {len(segments)}, Language: {detected_language}"
@@ -354,6 +536,17 @@ async def transcribe_audio(
             "language": detected_language,
             "duration": duration,
             "segments": segments,
+            # Extra field ignored by OpenAI-compatible clients; used by the perf regression suite
+            "performance": {
+                "worker_id": WORKER_ID,
+                "audio_sec": audio_seconds,
+                "processing_sec": processing_time,
+                "inference_sec": inference_time,
+                "rtf": (processing_time / audio_seconds) if audio_seconds > 0 else None,
+                "tokens": decoded_tokens,
+                "tokens_per_sec": (decoded_tokens / inference_time) if inference_time > 0 else None,
+                "peak_rss_mb": _peak_rss_mb(),
+            },
         }
         
         # CTranslate2 handles memory management automatically
@@ -373,10 +566,11 @@ async def root():
         "worker_id": WORKER_ID,
         "model": MODEL_SIZE,
         "device": DEVICE,
-        "status": "ready" if model is not None else "initializing",
+        "status": "ready" if _model_ready() else "initializing",
         "endpoints": {
             "transcribe": "/v1/audio/transcriptions",
-            "health": "/health"
+            "health": "/health",
+            "ready": "/ready"
         }
     }
 
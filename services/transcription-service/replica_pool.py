@@ -0,0 +1,206 @@
+"""
+CPU replica pool: K independent WhisperModel replicas in one service process.
+
+Each replica owns a dedicated worker thread pinned to its own core set. The model
+is created on that thread, so CTranslate2's intra-op threads inherit the pinning
+and replicas never compete for the same cores. Requests go to the replica with
+the fewest in-flight requests (round robin on ties) and queue on its thread.
+
+Sizing (CPU_REPLICAS=auto): K = usable cores // CPU_THREADS_PER_REPLICA, capped by
+available memory / REPLICA_MEMORY_MB and never below 1.
+"""
+import asyncio
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rough resident size of one INT8 CPU replica, used to cap auto-sizing
+_REPLICA_MEMORY_MB_BY_MODEL = {
+    "tiny": 150,
+    "base": 250,
+    "small": 600,
+    "medium": 1400,
+    "large-v2": 2600,
+    "large-v3": 2600,
+    "large-v3-turbo": 1700,
+    "distil-large-v3": 1600,
+}
+_DEFAULT_REPLICA_MEMORY_MB = 2000
+
+
+def usable_cores() -> List[int]:
+    """Cores this process may run on (respects cpusets/docker --cpuset-cpus)."""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+
+def available_memory_mb() -> Optional[float]:
+    """Memory left for new replicas: cgroup limit minus usage, else MemAvailable."""
+    try:
+        with open("/sys/fs/cgroup/memory.max") as f:
+            limit = f.read().strip()
+        if limit != "max":
+            with open("/sys/fs/cgroup/memory.current") as f:
+                used = int(f.read().strip())
+            return (int(limit) - used) / (1024 * 1024)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024.0
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def replica_memory_mb(model_size: str) -> float:
+    raw = os.getenv("REPLICA_MEMORY_MB", "").strip()
+    if raw:
+        return float(raw)
+    return float(_REPLICA_MEMORY_MB_BY_MODEL.get(os.path.basename(str(model_size)), _DEFAULT_REPLICA_MEMORY_MB))
+
+
+def plan_replicas(requested: str, threads_per_replica: int, model_size: str) -> tuple:
+    """
+    (replicas, threads per replica, core sets) for CPU_REPLICAS / CPU_THREADS_PER_REPLICA.
+
+    ``requested`` is "auto" or a replica count; ``threads_per_replica`` 0 means split
+    the usable cores evenly (or 4 per replica when the count is auto-sized).
+    """
+    cores = usable_cores()
+    if requested == "auto":
+        threads = min(threads_per_replica or 4, len(cores))
+        count = max(1, len(cores) // max(1, threads))
+        memory = available_memory_mb()
+        if memory is not None:
+            by_memory = max(1, int(memory // replica_memory_mb(model_size)))
+            if by_memory < count:
+                logger.info(f"Replica count limited by memory: {by_memory} (of {count} by cores, {memory:.0f} MB available)")
+                count = by_memory
+    else:
+        count = max(1, int(requested))
+        threads = threads_per_replica or max(1, len(cores) // count)
+
+    core_sets = []
+    for i in range(count):
+        chunk = cores[i * threads:(i + 1) * threads]
+        # More replicas than whole core sets: share cores round-robin rather than fail
+        core_sets.append(chunk or [cores[(i * threads + j) % len(cores)] for j in range(threads)])
+    return count, threads, core_sets
+
+
+class _Replica:
+    def __init__(self, index: int, cores: List[int]):
+        self.index = index
+        self.cores = cores
+        self.model = None
+        self.inflight = 0
+        self.served = 0
+        self.busy_s = 0.0
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"replica-{index}")
+
+    def _pin(self):
+        if self.cores and hasattr(os, "sched_setaffinity"):
+            try:
+                # pid 0 = the calling thread on Linux
+                os.sched_setaffinity(0, set(self.cores))
+            except OSError as e:
+                logger.warning(f"Replica {self.index}: could not pin to cores {self.cores}: {e}")
+
+    def load(self, factory: Callable[[], Any]):
+        def _load():
+            self._pin()
+            self.model = factory()
+        self.executor.submit(_load).result()
+
+
+class ReplicaPool:
+    """Least-busy dispatch over pinned WhisperModel replicas."""
+
+    def __init__(self, model_factory: Callable[[int], Any], core_sets: List[List[int]]):
+        self.replicas = [_Replica(i, cores) for i, cores in enumerate(core_sets)]
+        self._factory = model_factory
+        self._lock = threading.Lock()
+        self._rr = itertools.count()
+
+    def load(self):
+        """Create every replica's model on its pinned thread (sequentially, to bound peak memory)."""
+        for replica in self.replicas:
+            started = time.time()
+            replica.load(lambda: self._factory(len(replica.cores)))
+            logger.info(f"Replica {replica.index} loaded on cores {replica.cores} in {time.time() - started:.1f}s")
+
+    def warmup(self, fn: Callable[[Any], Any]) -> List[float]:
+        """Run ``fn(model)`` once on every replica's thread, in parallel; returns seconds per replica."""
+
+        def _timed(replica: _Replica) -> float:
+            started = time.time()
+            fn(replica.model)
+            return round(time.time() - started, 3)
+
+        futures = [r.executor.submit(_timed, r) for r in self.replicas]
+        return [f.result() for f in futures]
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.replicas) and all(r.model is not None for r in self.replicas)
+
+    def _acquire(self) -> _Replica:
+        with self._lock:
+            start = next(self._rr)
+            n = len(self.replicas)
+            replica = min(
+                (self.replicas[(start + i) % n] for i in range(n)),
+                key=lambda r: r.inflight,
+            )
+            replica.inflight += 1
+            return replica
+
+    def _release(self, replica: _Replica, busy_s: float, served: bool = True):
+        with self._lock:
+            replica.inflight -= 1
+            replica.served += 1 if served else 0
+            replica.busy_s += busy_s
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs):
+        """Run ``fn(model, *args, **kwargs)`` on the least-busy replica's thread."""
+        replica = self._acquire()
+
+        def _call():
+            started = time.time()
+            try:
+                return fn(replica.model, *args, **kwargs)
+            finally:
+                self._release(replica, time.time() - started)
+
+        future = replica.executor.submit(_call)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Client went away before the replica started the call: it will never release itself
+            if future.cancel():
+                self._release(replica, 0.0, served=False)
+            raise
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "replica": r.index,
+                    "cores": r.cores,
+                    "inflight": r.inflight,
+                    "served": r.served,
+                    "busy_s": round(r.busy_s, 2),
+                }
+                for r in self.replicas
+            ]
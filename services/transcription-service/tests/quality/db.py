@@ -21,7 +21,13 @@ CREATE TABLE IF NOT EXISTS test_runs (
   passed_cases INTEGER NOT NULL DEFAULT 0,
   failed_cases INTEGER NOT NULL DEFAULT 0,
   avg_wer REAL,
-  avg_cer REAL
+  avg_cer REAL,
+  is_baseline INTEGER NOT NULL DEFAULT 0,
+  avg_latency_sec REAL,
+  p95_latency_sec REAL,
+  avg_rtf REAL,
+  tokens_per_sec REAL,
+  peak_rss_mb REAL
 );
 
 CREATE TABLE IF NOT EXISTS test_cases (
@@ -41,6 +47,13 @@ CREATE TABLE IF NOT EXISTS test_cases (
   duration_sec REAL,
   meta_json TEXT NOT NULL,
   created_at TEXT NOT NULL,
+  latency_sec REAL,
+  processing_sec REAL,
+  audio_sec REAL,
+  rtf REAL,
+  tokens INTEGER,
+  tokens_per_sec REAL,
+  peak_rss_mb REAL,
   FOREIGN KEY(run_id) REFERENCES test_runs(id)
 );
 
@@ -48,6 +61,27 @@ CREATE INDEX IF NOT EXISTS idx_test_cases_run_id ON test_cases(run_id);
 CREATE INDEX IF NOT EXISTS idx_test_cases_language ON test_cases(language);
 """
 
+# Columns added after the first schema; ALTERed into older databases by init_db
+_ADDED_COLUMNS = {
+    "test_runs": {
+        "is_baseline": "INTEGER NOT NULL DEFAULT 0",
+        "avg_latency_sec": "REAL",
+        "p95_latency_sec": "REAL",
+        "avg_rtf": "REAL",
+        "tokens_per_sec": "REAL",
+        "peak_rss_mb": "REAL",
+    },
+    "test_cases": {
+        "latency_sec": "REAL",
+        "processing_sec": "REAL",
+        "audio_sec": "REAL",
+        "rtf": "REAL",
+        "tokens": "INTEGER",
+        "tokens_per_sec": "REAL",
+        "peak_rss_mb": "REAL",
+    },
+}
+
 
 def utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -57,6 +91,11 @@ def init_db(db_path: Path) -> None:
     db_path.parent.mkdir(parents=True, exist_ok=True)
     with sqlite3.connect(str(db_path)) as conn:
         conn.executescript(SCHEMA)
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for name, decl in columns.items():
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
         conn.commit()
 
 
@@ -89,14 +128,22 @@ def insert_case(
     error: Optional[str],
     duration_sec: Optional[float],
     meta: dict[str, Any],
+    latency_sec: Optional[float] = None,
+    processing_sec: Optional[float] = None,
+    audio_sec: Optional[float] = None,
+    rtf: Optional[float] = None,
+    tokens: Optional[int] = None,
+    tokens_per_sec: Optional[float] = None,
+    peak_rss_mb: Optional[float] = None,
 ) -> None:
     with sqlite3.connect(str(db_path)) as conn:
         conn.execute(
             """
             INSERT INTO test_cases(
               run_id, case_id, language, kind, snr_db, audio_path, expected_text,
-              transcript, wer, cer, passed, error, duration_sec, meta_json, created_at
-            ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+              transcript, wer, cer, passed, error, duration_sec, meta_json, created_at,
+              latency_sec, processing_sec, audio_sec, rtf, tokens, tokens_per_sec, peak_rss_mb
+            ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
             """,
             (
                 run_id,
@@ -114,6 +161,13 @@ def insert_case(
                 duration_sec,
                 json.dumps(meta, ensure_ascii=False),
                 utc_now(),
+                latency_sec,
+                processing_sec,
+                audio_sec,
+                rtf,
+                tokens,
+                tokens_per_sec,
+                peak_rss_mb,
             ),
         )
         conn.commit()
@@ -134,15 +188,80 @@ def finalize_run(db_path: Path, run_id: int) -> None:
         )
         avg_wer, avg_cer = cur.fetchone()
 
+        cur.execute(
+            "SELECT latency_sec FROM test_cases WHERE run_id=? AND latency_sec IS NOT NULL AND error=''",
+            (run_id,),
+        )
+        latencies = [row[0] for row in cur.fetchall()]
+        avg_latency = sum(latencies) / len(latencies) if latencies else None
+        p95_latency = percentile(latencies, 95)
+
+        # Throughput over the whole run: total decoded tokens / total inference-side time
+        cur.execute(
+            """
+            SELECT AVG(rtf), SUM(tokens), SUM(tokens / tokens_per_sec), MAX(peak_rss_mb)
+            FROM test_cases WHERE run_id=? AND error=''
+            """,
+            (run_id,),
+        )
+        avg_rtf, sum_tokens, sum_token_time, peak_rss = cur.fetchone()
+        tokens_per_sec = (sum_tokens / sum_token_time) if sum_tokens and sum_token_time else None
+
         cur.execute(
             """
             UPDATE test_runs
-            SET total_cases=?, passed_cases=?, failed_cases=?, avg_wer=?, avg_cer=?
+            SET total_cases=?, passed_cases=?, failed_cases=?, avg_wer=?, avg_cer=?,
+                avg_latency_sec=?, p95_latency_sec=?, avg_rtf=?, tokens_per_sec=?, peak_rss_mb=?
             WHERE id=?
             """,
-            (total, passed, failed, avg_wer, avg_cer, run_id),
+            (total, passed, failed, avg_wer, avg_cer,
+             avg_latency, p95_latency, avg_rtf, tokens_per_sec, peak_rss, run_id),
         )
         conn.commit()
 
 
+def percentile(values: list[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return float(ordered[idx])
+
+
+def mark_baseline(db_path: Path, run_id: int) -> None:
+    """Make ``run_id`` the baseline that later runs are compared against."""
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute("UPDATE test_runs SET is_baseline=0 WHERE is_baseline=1")
+        conn.execute("UPDATE test_runs SET is_baseline=1 WHERE id=?", (run_id,))
+        conn.commit()
+
+
+def resolve_run(db_path: Path, ref: str) -> Optional[int]:
+    """Run id for ``ref``: a numeric id, a run name (latest wins) or "baseline"."""
+    init_db(db_path)
+    with sqlite3.connect(str(db_path)) as conn:
+        if ref == "baseline":
+            row = conn.execute("SELECT id FROM test_runs WHERE is_baseline=1 ORDER BY id DESC LIMIT 1").fetchone()
+        elif ref.isdigit():
+            row = conn.execute("SELECT id FROM test_runs WHERE id=?", (int(ref),)).fetchone()
+        else:
+            row = conn.execute("SELECT id FROM test_runs WHERE run_name=? ORDER BY id DESC LIMIT 1", (ref,)).fetchone()
+    return int(row[0]) if row else None
+
+
+def load_cases(db_path: Path, run_id: int) -> dict[str, dict[str, Any]]:
+    """Cases of a run keyed by case_id."""
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute("SELECT * FROM test_cases WHERE run_id=?", (run_id,)).fetchall()
+    return {row["case_id"]: dict(row) for row in rows}
+
+
+def load_run(db_path: Path, run_id: int) -> Optional[dict[str, Any]]:
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT * FROM test_runs WHERE id=?", (run_id,)).fetchone()
+    return dict(row) if row else None
+
+
 
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from .db import load_cases, load_run, resolve_run
+
+
+@dataclass
+class Tolerances:
+    """Allowed change vs. the baseline before a run counts as a regression."""
+
+    max_latency_regression: float = 0.15  # median per-case latency may grow by 15%
+    max_throughput_regression: float = 0.10  # tokens/sec may drop by 10%
+    max_rtf_regression: float = 0.15  # processing/audio may grow by 15%
+    max_rss_increase: float = 0.20  # peak worker RSS may grow by 20%
+    max_wer_increase: float = 0.02  # absolute mean WER increase
+    max_new_failures: int = 0  # cases passing in the baseline that now fail
+
+
+def add_tolerance_args(ap: argparse.ArgumentParser) -> None:
+    d = Tolerances()
+    ap.add_argument("--max-latency-regression", type=float, default=d.max_latency_regression)
+    ap.add_argument("--max-throughput-regression", type=float, default=d.max_throughput_regression)
+    ap.add_argument("--max-rtf-regression", type=float, default=d.max_rtf_regression)
+    ap.add_argument("--max-rss-increase", type=float, default=d.max_rss_increase)
+    ap.add_argument("--max-wer-increase", type=float, default=d.max_wer_increase)
+    ap.add_argument("--max-new-failures", type=int, default=d.max_new_failures)
+
+
+def tolerances_from_args(args: argparse.Namespace) -> Tolerances:
+    return Tolerances(
+        max_latency_regression=args.max_latency_regression,
+        max_throughput_regression=args.max_throughput_regression,
+        max_rtf_regression=args.max_rtf_regression,
+        max_rss_increase=args.max_rss_increase,
+        max_wer_increase=args.max_wer_increase,
+        max_new_failures=args.max_new_failures,
+    )
+
+
+def _case_latency(case: dict[str, Any]) -> Optional[float]:
+    # Server-side processing time is less noisy than the client round trip
+    return case.get("processing_sec") if case.get("processing_sec") is not None else case.get("latency_sec")
+
+
+def _aggregate(cases: list[dict[str, Any]]) -> dict[str, Optional[float]]:
+    ok = [c for c in cases if not c.get("error")]
+    tokens = sum(c["tokens"] for c in ok if c.get("tokens") and c.get("tokens_per_sec"))
+    token_time = sum(c["tokens"] / c["tokens_per_sec"] for c in ok if c.get("tokens") and c.get("tokens_per_sec"))
+    processing = sum(c["processing_sec"] for c in ok if c.get("processing_sec") and c.get("audio_sec"))
+    audio = sum(c["audio_sec"] for c in ok if c.get("processing_sec") and c.get("audio_sec"))
+    wers = [c["wer"] for c in ok if c.get("wer") is not None]
+    rss = [c["peak_rss_mb"] for c in ok if c.get("peak_rss_mb") is not None]
+    return {
+        "tokens_per_sec": tokens / token_time if token_time else None,
+        "rtf": processing / audio if audio else None,
+        "avg_wer": statistics.mean(wers) if wers else None,
+        "peak_rss_mb": max(rss) if rss else None,
+    }
+
+
+def compare_runs(
+    db_path: Path, run_id: int, baseline_id: int, tol: Tolerances
+) -> tuple[list[str], dict[str, Any]]:
+    """
+    Compare a run with the baseline on the cases both ran.
+
+    Returns (regressions, summary); an empty regression list means the gate passes.
+    """
+    current = load_cases(db_path, run_id)
+    baseline = load_cases(db_path, baseline_id)
+    common = sorted(set(current) & set(baseline))
+    regressions: list[str] = []
+    summary: dict[str, Any] = {"run_id": run_id, "baseline_id": baseline_id, "common_cases": len(common)}
+    if not common:
+        regressions.append("no cases in common with the baseline")
+        return regressions, summary
+
+    cur_cases = [current[k] for k in common]
+    base_cases = [baseline[k] for k in common]
+    cur, base = _aggregate(cur_cases), _aggregate(base_cases)
+    summary["current"], summary["baseline"] = cur, base
+
+    ratios = []
+    for k in common:
+        c, b = _case_latency(current[k]), _case_latency(baseline[k])
+        if c and b and not current[k].get("error") and not baseline[k].get("error"):
+            ratios.append(c / b)
+    if ratios:
+        median_ratio = statistics.median(ratios)
+        summary["median_latency_ratio"] = median_ratio
+        if median_ratio > 1.0 + tol.max_latency_regression:
+            regressions.append(
+                f"median latency {median_ratio:.2f}x baseline (allowed {1.0 + tol.max_latency_regression:.2f}x)"
+            )
+
+    if cur["tokens_per_sec"] and base["tokens_per_sec"]:
+        if cur["tokens_per_sec"] < base["tokens_per_sec"] * (1.0 - tol.max_throughput_regression):
+            regressions.append(
+                f"tokens/sec {cur['tokens_per_sec']:.1f} vs baseline {base['tokens_per_sec']:.1f} "
+                f"(allowed drop {tol.max_throughput_regression:.0%})"
+            )
+    if cur["rtf"] and base["rtf"]:
+        if cur["rtf"] > base["rtf"] * (1.0 + tol.max_rtf_regression):
+            regressions.append(
+                f"RTF {cur['rtf']:.3f} vs baseline {base['rtf']:.3f} (allowed +{tol.max_rtf_regression:.0%})"
+            )
+    if cur["peak_rss_mb"] and base["peak_rss_mb"]:
+        if cur["peak_rss_mb"] > base["peak_rss_mb"] * (1.0 + tol.max_rss_increase):
+            regressions.append(
+                f"peak RSS {cur['peak_rss_mb']:.0f} MB vs baseline {base['peak_rss_mb']:.0f} MB "
+                f"(allowed +{tol.max_rss_increase:.0%})"
+            )
+    if cur["avg_wer"] is not None and base["avg_wer"] is not None:
+        if cur["avg_wer"] > base["avg_wer"] + tol.max_wer_increase:
+            regressions.append(
+                f"mean WER {cur['avg_wer']:.3f} vs baseline {base['avg_wer']:.3f} (allowed +{tol.max_wer_increase:.3f})"
+            )
+
+    new_failures = [k for k in common if baseline[k]["passed"] and not current[k]["passed"]]
+    summary["new_failures"] = new_failures
+    if len(new_failures) > tol.max_new_failures:
+        regressions.append(
+            f"{len(new_failures)} cases newly failing (allowed {tol.max_new_failures}): {', '.join(new_failures[:10])}"
+        )
+    return regressions, summary
+
+
+def print_report(db_path: Path, regressions: list[str], summary: dict[str, Any]) -> None:
+    run = load_run(db_path, summary["run_id"]) or {}
+    base = load_run(db_path, summary["baseline_id"]) or {}
+    print("")
+    print(f"Perf gate: run {summary['run_id']} ({run.get('run_name')}) vs baseline {summary['baseline_id']} ({base.get('run_name')}), "
+          f"{summary['common_cases']} common cases")
+
+    def fmt(v: Optional[float], spec: str) -> str:
+        return format(v, spec) if v is not None else "-"
+
+    cur, ref = summary.get("current", {}), summary.get("baseline", {})
+    for key, spec in (("tokens_per_sec", ".1f"), ("rtf", ".3f"), ("avg_wer", ".3f"), ("peak_rss_mb", ".0f")):
+        print(f"  {key:<15} {fmt(cur.get(key), spec):>10}  (baseline {fmt(ref.get(key), spec)})")
+    if "median_latency_ratio" in summary:
+        print(f"  {'latency ratio':<15} {summary['median_latency_ratio']:>10.2f}x")
+    if regressions:
+        for r in regressions:
+            print(f"  REGRESSION: {r}")
+    else:
+        print("  OK: within tolerances")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Compare a quality/perf run against the baseline run")
+    ap.add_argument("--dataset-dir", default="tests/quality_dataset")
+    ap.add_argument("--run", required=True, help="Run id or run name to check")
+    ap.add_argument("--baseline", default="baseline", help='Run id, run name or "baseline" (the marked baseline run)')
+    add_tolerance_args(ap)
+    args = ap.parse_args()
+
+    db_path = Path(args.dataset_dir) / "test_results.db"
+    run_id = resolve_run(db_path, args.run)
+    baseline_id = resolve_run(db_path, args.baseline)
+    if run_id is None or baseline_id is None:
+        raise SystemExit(f"Unknown run: {args.run if run_id is None else args.baseline}")
+
+    regressions, summary = compare_runs(db_path, run_id, baseline_id, tolerances_from_args(args))
+    print_report(db_path, regressions, summary)
+    if regressions:
+        sys.exit(3)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,15 @@ import json
 import os
 import sys
 import time
+import wave
 from pathlib import Path
 from typing import Any, Optional
 
 import requests
 
-from .db import start_run, insert_case, finalize_run
+from .db import start_run, insert_case, finalize_run, mark_baseline, resolve_run
 from .metrics import wer, cer, normalize_text
+from .perf_gate import add_tolerance_args, compare_runs, print_report, tolerances_from_args
 from .vad_silero import is_likely_silence
 
 
@@ -76,6 +78,26 @@ def _post_transcribe(
         return r.json()
 
 
+def _wav_seconds(audio_path: Path) -> Optional[float]:
+    try:
+        with wave.open(str(audio_path), "rb") as w:
+            return w.getnframes() / float(w.getframerate())
+    except Exception:
+        return None
+
+
+def _service_config(api_url: str, api_token: str, timeout_s: float) -> dict[str, Any]:
+    """Decoding settings reported by the service's /health (beam size, compute type, VAD...)."""
+    health_url = api_url.split("/v1/", 1)[0].rstrip("/") + "/health"
+    headers = {"X-API-Key": api_token} if api_token else {}
+    try:
+        r = requests.get(health_url, headers=headers, timeout=timeout_s)
+        return dict(r.json().get("config") or {})
+    except Exception as ex:
+        print(f"Could not read service config from {health_url}: {ex}")
+        return {}
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--api-url", default=os.getenv("TRANSCRIPTION_API_URL", "http://localhost:8083/v1/audio/transcriptions"))
@@ -87,6 +109,10 @@ def main() -> None:
     ap.add_argument("--timeout", type=float, default=120.0)
     ap.add_argument("--max-cases", type=int, default=0, help="If >0, limit number of cases per language/kind")
     ap.add_argument("--use-vad", action="store_true", help="Use Silero VAD to validate silence detection")
+    ap.add_argument("--warmup", type=int, default=1, help="Unrecorded requests sent first so model load/JIT does not skew latency")
+    ap.add_argument("--baseline", default="", help='Compare against this run (id, run name or "baseline") and exit 3 on regression')
+    ap.add_argument("--set-baseline", action="store_true", help="Mark this run as the baseline for later comparisons")
+    add_tolerance_args(ap)
     args = ap.parse_args()
 
     dataset_dir = Path(args.dataset_dir)
@@ -100,11 +126,23 @@ def main() -> None:
         "thresholds": DEFAULT_THRESHOLDS,
         "languages": args.languages,
         "domains": args.domains,
+        "service_config": _service_config(args.api_url, args.api_token, args.timeout),
     }
+    baseline_id = resolve_run(db_path, args.baseline) if args.baseline else None
+    if args.baseline and baseline_id is None:
+        raise SystemExit(f"Unknown baseline run: {args.baseline}")
     run_id = start_run(db_path, args.run_name, args.api_url, meta)
 
     entries = _load_manifest(manifest_path)
 
+    speech_entries = [e for e in entries if e.get("kind") != "silence"]
+    for e in speech_entries[:max(0, args.warmup)]:
+        try:
+            _post_transcribe(args.api_url, args.api_token, dataset_dir / str(e.get("audio_path")),
+                             language=e.get("language"), timeout_s=args.timeout)
+        except Exception as ex:
+            print(f"Warmup request failed: {type(ex).__name__}: {ex}")
+
     # Optional limiting to keep CI fast
     per_key_seen: dict[tuple[str, str, str, str, str], int] = {}
 
@@ -154,11 +192,13 @@ def main() -> None:
         ok = False
         err = ""
         duration_sec = None
+        perf: dict[str, Any] = {}
 
         try:
             resp = _post_transcribe(args.api_url, args.api_token, audio_path, language=lang, timeout_s=args.timeout)
             transcript = str(resp.get("text", "") or "")
             duration_sec = float(resp.get("duration", 0.0) or 0.0)
+            perf = resp.get("performance") or {}
 
             if kind == "silence":
                 # For silence: transcript should be empty
@@ -186,6 +226,11 @@ def main() -> None:
 
         took = time.time() - started
         passed += 1 if ok else 0
+        audio_sec = perf.get("audio_sec") or _wav_seconds(audio_path)
+        processing_sec = perf.get("processing_sec")
+        rtf = perf.get("rtf")
+        if rtf is None and audio_sec and not err:
+            rtf = took / audio_sec
 
         insert_case(
             db_path,
@@ -203,6 +248,13 @@ def main() -> None:
             error=err or None,
             duration_sec=duration_sec,
             meta={"latency_sec": took, "noise_type": noise_type, "domain": domain},
+            latency_sec=took,
+            processing_sec=processing_sec,
+            audio_sec=audio_sec,
+            rtf=rtf,
+            tokens=perf.get("tokens"),
+            tokens_per_sec=perf.get("tokens_per_sec"),
+            peak_rss_mb=perf.get("peak_rss_mb"),
         )
 
         status = "PASS" if ok else "FAIL"
@@ -213,14 +265,23 @@ def main() -> None:
             noise_str = f" noise={noise_type}" if noise_type else ""
             domain_str = f" domain={domain}" if domain else ""
             extra = f" WER={w:.3f} (thr={_threshold_for(e):.2f}){noise_str}{domain_str}"
-        print(f"[{status}] {case_id} {lang or '-'} {kind} snr={snr_db} took={took:.2f}s{extra}")
+        rtf_str = f" rtf={rtf:.3f}" if rtf is not None else ""
+        print(f"[{status}] {case_id} {lang or '-'} {kind} snr={snr_db} took={took:.2f}s{rtf_str}{extra}")
 
     finalize_run(db_path, run_id)
+    if args.set_baseline:
+        mark_baseline(db_path, run_id)
 
     print("")
     print(f"Run {run_id} done: {passed}/{total} passed")
     print(f"DB: {db_path}")
 
+    if baseline_id is not None:
+        regressions, summary = compare_runs(db_path, run_id, baseline_id, tolerances_from_args(args))
+        print_report(db_path, regressions, summary)
+        if regressions:
+            sys.exit(3)
+
     if passed != total:
         sys.exit(2)
 
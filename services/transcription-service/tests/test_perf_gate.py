@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from tests.quality.db import finalize_run, insert_case, load_run, mark_baseline, resolve_run, start_run
+from tests.quality.perf_gate import Tolerances, compare_runs
+
+
+def _record_run(db_path: Path, name: str, *, processing_sec: float, tokens_per_sec: float,
+                wer: float, rss: float, fail_case: str = "") -> int:
+    run_id = start_run(db_path, name, "http://localhost/v1/audio/transcriptions", {})
+    for i in range(4):
+        case_id = f"case_{i}"
+        insert_case(
+            db_path,
+            run_id,
+            case_id=case_id,
+            language="en",
+            kind="clean",
+            snr_db=None,
+            audio_path=f"audio/{case_id}.wav",
+            expected_text="hello world",
+            transcript="hello world",
+            wer=wer,
+            cer=wer,
+            passed=case_id != fail_case,
+            error=None,
+            duration_sec=2.0,
+            meta={},
+            latency_sec=processing_sec + 0.05,
+            processing_sec=processing_sec,
+            audio_sec=2.0,
+            rtf=processing_sec / 2.0,
+            tokens=20,
+            tokens_per_sec=tokens_per_sec,
+            peak_rss_mb=rss,
+        )
+    finalize_run(db_path, run_id)
+    return run_id
+
+
+def test_perf_gate_passes_within_tolerance(tmp_path):
+    db_path = tmp_path / "test_results.db"
+    base = _record_run(db_path, "base", processing_sec=0.50, tokens_per_sec=100.0, wer=0.10, rss=1000.0)
+    mark_baseline(db_path, base)
+    run = _record_run(db_path, "run", processing_sec=0.52, tokens_per_sec=97.0, wer=0.11, rss=1050.0)
+
+    assert resolve_run(db_path, "baseline") == base
+    assert resolve_run(db_path, "run") == run
+    regressions, summary = compare_runs(db_path, run, base, Tolerances())
+    assert regressions == []
+    assert summary["common_cases"] == 4
+    assert load_run(db_path, run)["tokens_per_sec"] == 97.0
+
+
+def test_perf_gate_flags_throughput_and_quality_regressions(tmp_path):
+    db_path = tmp_path / "test_results.db"
+    base = _record_run(db_path, "base", processing_sec=0.50, tokens_per_sec=100.0, wer=0.10, rss=1000.0)
+    run = _record_run(db_path, "slow", processing_sec=0.80, tokens_per_sec=60.0, wer=0.20, rss=1000.0,
+                      fail_case="case_2")
+
+    regressions, summary = compare_runs(db_path, run, base, Tolerances())
+    text = " ".join(regressions)
+    assert "median latency" in text
+    assert "tokens/sec" in text
+    assert "RTF" in text
+    assert "mean WER" in text
+    assert summary["new_failures"] == ["case_2"]
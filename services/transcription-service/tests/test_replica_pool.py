@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+import replica_pool
+from replica_pool import ReplicaPool, plan_replicas
+
+
+def _cores(monkeypatch, n: int, memory_mb=None):
+    monkeypatch.setattr(replica_pool, "usable_cores", lambda: list(range(n)))
+    monkeypatch.setattr(replica_pool, "available_memory_mb", lambda: memory_mb)
+
+
+def _pool(n: int) -> ReplicaPool:
+    # Fake model factory: each replica's "model" records its thread count
+    pool = ReplicaPool(lambda threads: {"threads": threads}, [[i] for i in range(n)])
+    pool.load()
+    return pool
+
+
+def test_cores_split_into_disjoint_sets(monkeypatch):
+    _cores(monkeypatch, 8)
+    count, threads, core_sets = plan_replicas("4", 0, "small")
+    assert (count, threads) == (4, 2)
+    assert core_sets == [[0, 1], [2, 3], [4, 5], [6, 7]]
+
+
+def test_more_replicas_than_cores_wrap_round_robin(monkeypatch):
+    _cores(monkeypatch, 4)
+    count, threads, core_sets = plan_replicas("3", 2, "small")
+    assert (count, threads) == (3, 2)
+    assert core_sets == [[0, 1], [2, 3], [0, 1]]
+
+    count, threads, core_sets = plan_replicas("6", 0, "small")
+    assert (count, threads) == (6, 1)
+    assert core_sets == [[0], [1], [2], [3], [0], [1]]
+
+
+def test_auto_is_capped_by_memory(monkeypatch):
+    monkeypatch.delenv("REPLICA_MEMORY_MB", raising=False)
+    _cores(monkeypatch, 16, memory_mb=1500)
+    # 4 replicas by cores, but only two "small" replicas (600 MB) fit
+    count, threads, core_sets = plan_replicas("auto", 4, "small")
+    assert (count, threads) == (2, 4)
+    assert core_sets == [[0, 1, 2, 3], [4, 5, 6, 7]]
+
+    _cores(monkeypatch, 16, memory_mb=100)
+    assert plan_replicas("auto", 4, "small")[0] == 1
+
+    _cores(monkeypatch, 16, memory_mb=None)
+    assert plan_replicas("auto", 0, "small")[:2] == (4, 4)
+
+    monkeypatch.setenv("REPLICA_MEMORY_MB", "5000")
+    _cores(monkeypatch, 16, memory_mb=12000)
+    assert plan_replicas("auto", 4, "small")[0] == 2
+
+
+def test_least_busy_dispatch_round_robins_ties():
+    pool = _pool(3)
+    assert pool.ready
+    assert [pool._acquire().index for _ in range(3)] == [0, 1, 2]
+
+    # Replica 1 finishes; it is now the only least-busy one
+    pool._release(pool.replicas[1], 0.0)
+    assert pool._acquire().index == 1
+
+    for replica in pool.replicas:
+        pool._release(replica, 0.0)
+    # All idle again: the tie rotates from where the round robin left off
+    assert [pool._acquire().index for _ in range(3)] == [1, 2, 0]
+
+
+def test_run_releases_slot_and_counts_served():
+    pool = _pool(2)
+
+    async def scenario():
+        return await asyncio.gather(*(pool.run(lambda model, x: (model["threads"], x), i) for i in range(4)))
+
+    assert asyncio.run(scenario()) == [(1, 0), (1, 1), (1, 2), (1, 3)]
+    stats = pool.stats()
+    assert [s["inflight"] for s in stats] == [0, 0]
+    assert [s["served"] for s in stats] == [2, 2]
+
+
+def _blocking(started: threading.Event, unblock: threading.Event):
+    def fn(model):
+        started.set()
+        unblock.wait(5)
+        return "done"
+    return fn
+
+
+def test_cancel_before_start_releases_slot():
+    pool = _pool(1)
+    started, unblock = threading.Event(), threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(_blocking(started, unblock)))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        queued = asyncio.ensure_future(pool.run(lambda model: "never"))
+        await asyncio.sleep(0)
+        assert pool.stats()[0]["inflight"] == 2
+
+        # Still queued behind the running call, so future.cancel() succeeds and the pool releases it
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert pool.stats()[0]["inflight"] == 1
+
+        unblock.set()
+        assert await running == "done"
+
+    asyncio.run(scenario())
+    assert pool.stats()[0]["inflight"] == 0
+    assert pool.stats()[0]["served"] == 1
+
+
+def test_cancel_after_start_leaves_release_to_the_call():
+    pool = _pool(1)
+    started, unblock = threading.Event(), threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(_blocking(started, unblock)))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+
+        # Already running: future.cancel() fails, the slot stays held until the call returns
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        assert pool.stats()[0]["inflight"] == 1
+
+        unblock.set()
+        await asyncio.get_running_loop().run_in_executor(None, pool.replicas[0].executor.submit(lambda: None).result)
+
+    asyncio.run(scenario())
+    # Released exactly once, by the call itself
+    assert pool.stats()[0]["inflight"] == 0
+    assert pool.stats()[0]["served"] == 1